@@ -0,0 +1,75 @@
+"""Hot-path benchmarks for the LLM service."""
+
+import os
+import random
+import sys
+
+SERVICE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "llm_service")
+sys.path.insert(0, SERVICE_DIR)
+
+from harness import Suite  # noqa: E402
+
+
+def build_suite(target_s: float = 0.2, repeat: int = 5) -> Suite:
+    """Register LLM service benchmarks."""
+    from app.clients.gemini_client import GeminiClient
+    from app.clients.translation_cache import TranslationCache
+    from app.context.session_manager import SessionManager
+    
+    suite = Suite("llm", target_s=target_s, repeat=repeat)
+    
+    client = GeminiClient()
+    signs = list("HELLO")
+    context = "Good morning! How are you?"
+    suite.add("gemini._build_prompt", lambda: client._build_prompt(signs, context, "en"))
+    suite.add("gemini._build_prompt_no_context", lambda: client._build_prompt(signs, None, "ru"))
+    
+    # SessionManager with 100k live sessions
+    manager = SessionManager(max_sessions=100_000)
+    session_ids = [manager.create_session() for _ in range(100_000)]
+    rng = random.Random(0)
+    picks = [rng.choice(session_ids) for _ in range(4096)]
+    counter = {"i": 0}
+    
+    def next_id():
+        counter["i"] = (counter["i"] + 1) % len(picks)
+        return picks[counter["i"]]
+    
+    suite.add("session_manager.get_context_100k", lambda: manager.get_context(next_id()))
+    
+    def add_interaction():
+        session_id = next_id()
+        manager.add_interaction(session_id, signs, "Hello!")
+        # Keep history bounded so the benchmark measures lookups, not memory growth
+        history = manager._sessions[session_id].history
+        if len(history) > 50:
+            history.clear()
+    
+    suite.add("session_manager.add_interaction_100k", add_interaction)
+    suite.add("session_manager.cleanup_expired_100k", manager.cleanup_expired)
+    
+    # Translation cache with 100k phrases: exact, one-letter-off and missing lookups
+    alphabet = "ABCDEFGHIKLMNOPQRSTUVWXY0123456789"
+    cache = TranslationCache(max_entries=100_000)
+    phrases = []
+    while len(cache) < 100_000:
+        phrase = [rng.choice(alphabet) for _ in range(rng.randint(2, 14))]
+        cache.put(phrase, "translation", 0.92)
+        phrases.append(phrase)
+    exact = rng.sample(phrases, 4096)
+    near = [p[:-1] + ["V" if p[-1] == "U" else "U"] for p in exact]
+    misses = [[rng.choice(alphabet) for _ in range(rng.randint(4, 14))] for _ in range(4096)]
+    
+    def cycle(queries):
+        state = {"i": 0}
+        
+        def lookup():
+            state["i"] = (state["i"] + 1) % len(queries)
+            return cache.get(queries[state["i"]])
+        return lookup
+    
+    suite.add("translation_cache.get_exact_100k", cycle(exact))
+    suite.add("translation_cache.get_near_100k", cycle(near))
+    suite.add("translation_cache.get_miss_100k", cycle(misses))
+    
+    return suite
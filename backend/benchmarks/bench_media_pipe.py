@@ -0,0 +1,141 @@
+"""Hot-path benchmarks for the MediaPipe service."""
+
+import base64
+import os
+import random
+import sys
+
+import numpy as np
+
+SERVICE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "media_pipe_service")
+sys.path.insert(0, SERVICE_DIR)
+
+from harness import Suite  # noqa: E402
+
+
+def synthetic_landmarks(seed: int = 0) -> list:
+    """An open hand in normalized image coordinates, with a little noise."""
+    rng = random.Random(seed)
+    wrist = (0.5, 0.8)
+    landmarks = [[wrist[0], wrist[1], 0.0]]
+    # Thumb then four fingers, each with 4 joints fanning out from the wrist
+    for finger, angle in enumerate((-0.9, -0.35, 0.0, 0.3, 0.6)):
+        for joint in range(1, 5):
+            reach = 0.06 * joint + (0.02 if finger else 0.0)
+            landmarks.append([
+                wrist[0] + reach * angle * 0.6 + rng.uniform(-0.003, 0.003),
+                wrist[1] - reach + rng.uniform(-0.003, 0.003),
+                rng.uniform(-0.02, 0.02),
+            ])
+    return landmarks
+
+
+def synthetic_jpeg(width: int = 640, height: int = 480, quality: int = 80) -> str:
+    """Base64 JPEG with enough structure that decoding is not trivial."""
+    import cv2
+    y, x = np.mgrid[0:height, 0:width]
+    image = np.stack([
+        (x * 255 // width).astype(np.uint8),
+        (y * 255 // height).astype(np.uint8),
+        ((x + y) % 256).astype(np.uint8),
+    ], axis=-1)
+    noise = np.random.default_rng(0).integers(0, 32, image.shape, dtype=np.uint8)
+    ok, buffer = cv2.imencode(".jpg", image + noise, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    return base64.b64encode(buffer.tobytes()).decode()
+
+
+def build_suite(target_s: float = 0.2, repeat: int = 5) -> Suite:
+    """Register MediaPipe service benchmarks."""
+    from app.models.gesture_classifier import GestureClassifier
+    from app.services.frame_decoder import FrameDecoder
+    from app.services.hand_detector import HandDetector
+    from app.services.sign_buffer import SignBuffer
+    from app.services.landmark_filter import LandmarkFilter
+    from app.services.trajectory_buffer import TrajectoryBuffer
+    from app.models.motion_classifier import MotionClassifier
+    
+    suite = Suite("media_pipe", target_s=target_s, repeat=repeat)
+    
+    classifier = GestureClassifier()
+    detector = HandDetector()
+    landmarks = synthetic_landmarks()
+    normalized = detector.normalize_landmarks(landmarks)
+    
+    # Hot path: protobuf -> float32 array -> normalized into a reused buffer
+    from mediapipe.framework.formats import landmark_pb2
+    hand = landmark_pb2.NormalizedLandmarkList()
+    for x, y, z in landmarks:
+        hand.landmark.add(x=x, y=y, z=z)
+    points = HandDetector.landmarks_to_array([hand])
+    normalize_out = np.empty((1, 21, 3), dtype=np.float32)
+    
+    two_hands = np.stack([normalized, normalized])
+    
+    suite.add("classifier.classify", lambda: classifier.classify(normalized))
+    suite.add("classifier.classify_batch_2_hands", lambda: classifier.classify_batch(two_hands))
+    suite.add("detector.landmarks_to_array", lambda: HandDetector.landmarks_to_array([hand]))
+    suite.add("detector.normalize_landmarks", lambda: detector.normalize_landmarks(landmarks))
+    suite.add("detector.normalize_landmarks_into", lambda: detector.normalize_landmarks(points, out=normalize_out))
+    
+    # One filter step on a warm session, one and two hands
+    landmark_filter = LandmarkFilter(enabled=True)
+    filter_clock = iter(range(1, 10 ** 9))
+    filter_frames = {1: normalize_out, 2: two_hands.copy()}
+    for hands, frame in filter_frames.items():
+        landmark_filter.apply(f"s{hands}", frame, now=0.0)
+        suite.add(f"landmark_filter.apply_{hands}_hand{'s' if hands > 1 else ''}",
+                  lambda hands=hands, frame=frame: landmark_filter.apply(
+                      f"s{hands}", frame, now=next(filter_clock) * 1e-6))
+    
+    # Steady state of a full window: one push evicts one frame
+    trajectory_buffer = TrajectoryBuffer()
+    motion_classifier = MotionClassifier()
+    for i in range(trajectory_buffer.window):
+        trajectory_buffer.push("s", points[0], normalize_out[0], "5", i / 30)
+    
+    def trajectory_push():
+        trajectory = trajectory_buffer.push("s", points[0], normalize_out[0], "5", 1.0)
+        return motion_classifier.classify(trajectory)
+    
+    suite.add("trajectory.push_and_classify", trajectory_push)
+    
+    for label, (width, height) in {"480p": (640, 480), "720p": (1280, 720)}.items():
+        frame = synthetic_jpeg(width, height)
+        suite.add(f"detector.decode_frame_{label}", lambda frame=frame: detector.decode_frame(frame))
+        
+        # Decoder backends at each JPEG reduction, to pick DECODE_BACKEND
+        data = base64.b64decode(frame)
+        for backend in FrameDecoder.BACKENDS:
+            try:
+                FrameDecoder(backend=backend)
+            except ImportError:
+                continue
+            for reduction in (1, 2, 4):
+                decoder = FrameDecoder(backend=backend, max_reduction=reduction, min_side=0, min_hand_px=0)
+                decoder.decode(data, "bench")  # Learn the source size
+                suite.add(f"decode.{backend}_{label}_1/{reduction}",
+                          lambda decoder=decoder, data=data: decoder.decode(data, "bench"))
+    
+    # SignBuffer at scale: many sessions, alternating signs to pass debounce
+    buffer = SignBuffer()
+    session_ids = [f"session-{i}" for i in range(10_000)]
+    signs = ["A", "B", "C", "D"]
+    counter = {"i": 0}
+    
+    def add_sign():
+        i = counter["i"] = counter["i"] + 1
+        buffer.add_sign(session_ids[i % len(session_ids)], signs[(i // len(session_ids)) % 4], 0.9)
+    
+    suite.add("sign_buffer.add_sign_10k_sessions", add_sign)
+    
+    commit_buffer = SignBuffer()
+    
+    def commit_sequence():
+        session = commit_buffer.get_or_create_session("commit")
+        for i in range(100):
+            session.signs.append({"sign": signs[i % 4], "confidence": 0.9, "timestamp": 0.0})
+        return commit_buffer.commit_sequence("commit")
+    
+    suite.add("sign_buffer.commit_sequence_100", commit_sequence)
+    
+    return suite
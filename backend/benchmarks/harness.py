@@ -0,0 +1,143 @@
+"""Minimal benchmark harness: timing, JSON results and baseline comparison."""
+
+import json
+import platform
+import statistics
+import time
+from dataclasses import dataclass, asdict
+from typing import Callable, Dict, List, Optional
+
+
+@dataclass
+class BenchmarkResult:
+    """Timing of one benchmark, per operation in nanoseconds."""
+    name: str
+    loops: int
+    repeat: int
+    min_ns: float
+    median_ns: float
+    mean_ns: float
+    max_ns: float
+    ops_per_sec: float
+
+
+class Suite:
+    """
+    Collects and runs benchmarks.
+
+    Each benchmark is a zero-argument callable timed in a loop. The loop
+    count is calibrated so one repetition takes about ``target_s``; the
+    reported numbers are per call.
+    """
+    
+    def __init__(self, name: str, target_s: float = 0.2, repeat: int = 5):
+        self.name = name
+        self.target_s = target_s
+        self.repeat = repeat
+        self.benchmarks: Dict[str, Callable[[], object]] = {}
+    
+    def add(self, name: str, func: Callable[[], object]):
+        """Register a benchmark."""
+        self.benchmarks[f"{self.name}.{name}"] = func
+    
+    def _calibrate(self, func: Callable[[], object]) -> int:
+        """Find a loop count that runs for about target_s."""
+        loops = 1
+        while True:
+            start = time.perf_counter()
+            for _ in range(loops):
+                func()
+            elapsed = time.perf_counter() - start
+            if elapsed >= self.target_s / 10 or loops >= 1_000_000:
+                return max(1, int(loops * self.target_s / max(elapsed, 1e-9)))
+            loops *= 10
+    
+    def run_one(self, name: str, func: Callable[[], object]) -> BenchmarkResult:
+        """Time a single benchmark."""
+        loops = self._calibrate(func)
+        samples = []
+        for _ in range(self.repeat):
+            start = time.perf_counter_ns()
+            for _ in range(loops):
+                func()
+            samples.append((time.perf_counter_ns() - start) / loops)
+        
+        median = statistics.median(samples)
+        return BenchmarkResult(
+            name=name,
+            loops=loops,
+            repeat=self.repeat,
+            min_ns=min(samples),
+            median_ns=median,
+            mean_ns=statistics.fmean(samples),
+            max_ns=max(samples),
+            ops_per_sec=1e9 / median if median else 0.0,
+        )
+    
+    def run(self, only: Optional[str] = None) -> List[BenchmarkResult]:
+        """Run all benchmarks, optionally filtered by substring."""
+        results = []
+        for name, func in self.benchmarks.items():
+            if only and only not in name:
+                continue
+            results.append(self.run_one(name, func))
+        return results
+
+
+def environment() -> dict:
+    """Describe the machine the results came from."""
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+    }
+
+
+def save_results(path: str, results: List[BenchmarkResult]):
+    """Write results to a JSON file."""
+    with open(path, "w") as f:
+        json.dump({
+            "environment": environment(),
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "results": [asdict(r) for r in results],
+        }, f, indent=2)
+
+
+def load_results(path: str) -> Dict[str, dict]:
+    """Load a results file keyed by benchmark name."""
+    with open(path) as f:
+        data = json.load(f)
+    return {r["name"]: r for r in data["results"]}
+
+
+def compare(results: List[BenchmarkResult], baseline: Dict[str, dict], threshold: float) -> List[dict]:
+    """
+    Compare median times against a baseline.
+    Returns one row per benchmark present in both; rows slower than the
+    baseline by more than ``threshold`` (e.g. 0.1 = 10%) are regressions.
+    """
+    rows = []
+    for result in results:
+        base = baseline.get(result.name)
+        if base is None:
+            continue
+        ratio = result.median_ns / base["median_ns"] if base["median_ns"] else 1.0
+        rows.append({
+            "name": result.name,
+            "baseline_ns": base["median_ns"],
+            "current_ns": result.median_ns,
+            "ratio": ratio,
+            "regression": ratio > 1.0 + threshold,
+        })
+    return rows
+
+
+def format_ns(ns: float) -> str:
+    """Human readable duration."""
+    if ns >= 1e9:
+        return f"{ns / 1e9:.2f} s"
+    if ns >= 1e6:
+        return f"{ns / 1e6:.2f} ms"
+    if ns >= 1e3:
+        return f"{ns / 1e3:.2f} us"
+    return f"{ns:.0f} ns"
@@ -0,0 +1,364 @@
+"""
+WebSocket load generator for the MediaPipe service.
+
+Opens N concurrent camera clients against ``/ws/sign-detection`` and streams
+frames at a fixed rate using the regular ``command``/``frame`` protocol.
+Frames are synthetic JPEGs, recorded JPEGs from a directory, or pre-extracted
+landmark payloads (which skip detection and load only the classify/buffer
+path). Reports throughput, dropped frames and detection round-trip latency
+per client.
+
+A stub LLM service can be started in-process so committed sequences do not
+need a real ``/api/v1/translate`` behind them.
+
+Examples:
+    python benchmarks/loadgen.py --clients 20 --fps 15 --duration 30
+    python benchmarks/loadgen.py --frames-dir recordings/ --clients 10
+    python benchmarks/loadgen.py --mode landmarks --clients 200 --spawn-service
+"""
+
+import argparse
+import asyncio
+import base64
+import glob
+import json
+import math
+import os
+import subprocess
+import sys
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import httpx
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+MEDIA_PIPE_DIR = os.path.join(os.path.dirname(BENCH_DIR), "media_pipe_service")
+sys.path.insert(0, BENCH_DIR)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an unsorted list."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+@dataclass
+class ClientStats:
+    """Counters and latencies of one simulated client."""
+    client_id: int
+    session_id: str
+    sent: int = 0
+    received: int = 0
+    hands: int = 0
+    errors: int = 0
+    dropped: int = 0
+    elapsed_s: float = 0.0
+    latencies_ms: List[float] = field(default_factory=list)
+    error: Optional[str] = None
+    
+    def summary(self) -> dict:
+        """Aggregated view for reports."""
+        return {
+            "client_id": self.client_id,
+            "session_id": self.session_id,
+            "sent": self.sent,
+            "received": self.received,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "hands": self.hands,
+            "fps": self.received / self.elapsed_s if self.elapsed_s else 0.0,
+            "p50_ms": percentile(self.latencies_ms, 50),
+            "p95_ms": percentile(self.latencies_ms, 95),
+            "p99_ms": percentile(self.latencies_ms, 99),
+            "error": self.error,
+        }
+
+
+def load_frames(args) -> List[dict]:
+    """Build the frame payloads every client cycles through."""
+    from bench_media_pipe import synthetic_jpeg, synthetic_landmarks
+    
+    if args.mode == "landmarks":
+        return [{"landmarks": synthetic_landmarks(seed)} for seed in range(30)]
+    
+    if args.frames_dir:
+        paths = sorted(
+            path for pattern in ("*.jpg", "*.jpeg", "*.png")
+            for path in glob.glob(os.path.join(args.frames_dir, pattern))
+        )
+        if not paths:
+            raise SystemExit(f"No images found in {args.frames_dir}")
+        frames = []
+        for path in paths:
+            with open(path, "rb") as f:
+                frames.append({"image": base64.b64encode(f.read()).decode()})
+        return frames
+    
+    return [{"image": synthetic_jpeg(args.width, args.height, args.quality)}]
+
+
+async def run_client(url: str, stats: ClientStats, frames: List[dict], args, start_delay: float):
+    """Stream frames over one socket and measure round-trip latency."""
+    import websockets
+    
+    await asyncio.sleep(start_delay)
+    loop = asyncio.get_running_loop()
+    pending: Dict[int, float] = {}
+    
+    async def receive(ws):
+        async for raw in ws:
+            message = json.loads(raw)
+            if message.get("type") == "detection":
+                payload = message["payload"]
+                sent_at = pending.pop(payload.get("timestamp"), None)
+                if sent_at is not None:
+                    stats.latencies_ms.append((time.perf_counter() - sent_at) * 1000)
+                stats.received += 1
+                stats.hands += bool(payload.get("hand_detected"))
+            elif message.get("type") == "frame_dropped":
+                pending.pop(message["payload"].get("timestamp"), None)
+                stats.dropped += 1
+            elif message.get("type") == "error":
+                stats.errors += 1
+    
+    try:
+        async with websockets.connect(url, max_size=None) as ws:
+            start = {"action": "start", "session_id": stats.session_id}
+            if args.client_max_fps:
+                start["max_fps"] = args.client_max_fps
+            await ws.send(json.dumps({"type": "command", "payload": start}))
+            await ws.recv()
+            
+            receiver = asyncio.create_task(receive(ws))
+            interval = 1.0 / args.fps
+            began = loop.time()
+            next_send = began
+            last_timestamp = 0
+            
+            while loop.time() - began < args.duration:
+                # Timestamps double as frame ids, so keep them unique per client
+                timestamp = max(last_timestamp + 1, int(time.time() * 1000))
+                last_timestamp = timestamp
+                payload = dict(frames[stats.sent % len(frames)])
+                payload.update(timestamp=timestamp, session_id=stats.session_id)
+                pending[timestamp] = time.perf_counter()
+                await ws.send(json.dumps({"type": "frame", "payload": payload}))
+                stats.sent += 1
+                
+                next_send += interval
+                delay = next_send - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                else:
+                    # Behind schedule: keep the rate instead of bursting to catch up
+                    next_send = loop.time()
+            
+            # Give in-flight frames a chance to come back
+            drain_until = loop.time() + args.drain
+            while pending and loop.time() < drain_until:
+                await asyncio.sleep(0.05)
+            stats.elapsed_s = loop.time() - began
+            
+            await ws.send(json.dumps({
+                "type": "command",
+                "payload": {"action": "stop", "session_id": stats.session_id}
+            }))
+            receiver.cancel()
+    except Exception as e:
+        stats.error = str(e) or type(e).__name__
+    finally:
+        # Frames never answered, with neither a detection nor a drop notice
+        stats.dropped += len(pending)
+
+
+def create_llm_stub(latency_ms: float):
+    """Minimal stand-in for the LLM service translate and speculate endpoints."""
+    from fastapi import FastAPI
+    
+    app = FastAPI()
+    app.state.requests = 0
+    app.state.speculations = 0
+    
+    @app.post("/api/v1/translate")
+    async def translate(request: dict):
+        app.state.requests += 1
+        if latency_ms:
+            await asyncio.sleep(latency_ms / 1000)
+        signs = request.get("sign_sequence", [])
+        return {
+            "translation": " ".join(signs),
+            "confidence": 1.0,
+            "session_id": request.get("session_id", ""),
+            "processing_time_ms": int(latency_ms),
+        }
+    
+    @app.post("/api/v1/translate/speculate", status_code=202)
+    async def speculate(request: dict):
+        # The media service speculates by default; accept without translating
+        app.state.speculations += 1
+        return {"session_id": request.get("session_id", ""), "accepted": True}
+    
+    @app.delete("/api/v1/translate/speculate/{session_id}")
+    async def cancel_speculation(session_id: str):
+        return {"session_id": session_id, "cancelled": False}
+    
+    @app.get("/api/v1/health")
+    async def health():
+        return {"status": "healthy", "service": "llm_stub"}
+    
+    return app
+
+
+async def start_llm_stub(port: int, latency_ms: float):
+    """Serve the LLM stub on the running loop."""
+    import uvicorn
+    
+    app = create_llm_stub(latency_ms)
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        if task.done():
+            task.result()
+        await asyncio.sleep(0.05)
+    return app, server, task
+
+
+def spawn_media_service(port: int, llm_url: str) -> subprocess.Popen:
+    """Start the MediaPipe service under uvicorn pointing at the given LLM URL."""
+    env = dict(os.environ, LLM_SERVICE_URL=llm_url, PORT=str(port))
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1",
+         "--port", str(port), "--log-level", "warning"],
+        cwd=MEDIA_PIPE_DIR,
+        env=env,
+    )
+
+
+async def wait_healthy(base_url: str, timeout_s: float = 60.0):
+    """Poll the health endpoint until the service answers."""
+    deadline = time.monotonic() + timeout_s
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                response = await client.get(f"{base_url}/api/v1/health", timeout=1.0)
+                if response.status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.5)
+    raise SystemExit(f"Service at {base_url} did not become healthy")
+
+
+def print_report(results: List[dict], total: dict, stub_requests: Optional[int]):
+    """Print per-client and aggregate results."""
+    header = f"{'client':>6} {'sent':>7} {'recv':>7} {'drop':>6} {'err':>5} {'fps':>7} " \
+             f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+    print(header)
+    for row in results + [total]:
+        label = row["client_id"] if row is not total else "all"
+        print(f"{label:>6} {row['sent']:>7} {row['received']:>7} {row['dropped']:>6} "
+              f"{row['errors']:>5} {row['fps']:>7.1f} {row['p50_ms']:>8.1f} "
+              f"{row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f}"
+              + (f"  {row['error']}" if row.get("error") else ""))
+    if stub_requests is not None:
+        print(f"\nLLM stub translate requests: {stub_requests}")
+
+
+async def main_async(args):
+    stub = None
+    service = None
+    llm_url = f"http://127.0.0.1:{args.llm_stub_port}"
+    base_url = args.url.replace("ws://", "http://").replace("wss://", "https://").split("/ws/")[0]
+    
+    try:
+        if args.llm_stub or args.spawn_service:
+            stub = await start_llm_stub(args.llm_stub_port, args.llm_stub_latency_ms)
+            print(f"LLM stub listening on {llm_url}")
+        if args.spawn_service:
+            port = int(base_url.rsplit(":", 1)[1])
+            service = spawn_media_service(port, llm_url)
+            await wait_healthy(base_url)
+            print(f"MediaPipe service started on port {port}")
+        
+        frames = load_frames(args)
+        clients = [ClientStats(i, f"load-{i}-{uuid.uuid4().hex[:8]}") for i in range(args.clients)]
+        print(f"Running {args.clients} clients at {args.fps} fps for {args.duration}s "
+              f"({args.mode}, {len(frames)} distinct frames)")
+        
+        started = time.perf_counter()
+        await asyncio.gather(*(
+            run_client(args.url, stats, frames, args, args.ramp * i / max(args.clients, 1))
+            for i, stats in enumerate(clients)
+        ))
+        wall_s = time.perf_counter() - started
+        
+        results = [stats.summary() for stats in clients]
+        latencies = [ms for stats in clients for ms in stats.latencies_ms]
+        total = {
+            "client_id": "all",
+            "sent": sum(r["sent"] for r in results),
+            "received": sum(r["received"] for r in results),
+            "dropped": sum(r["dropped"] for r in results),
+            "errors": sum(r["errors"] for r in results),
+            "hands": sum(r["hands"] for r in results),
+            "fps": sum(r["received"] for r in results) / wall_s if wall_s else 0.0,
+            "p50_ms": percentile(latencies, 50),
+            "p95_ms": percentile(latencies, 95),
+            "p99_ms": percentile(latencies, 99),
+        }
+        stub_requests = stub[0].state.requests if stub else None
+        print_report(results, total, stub_requests)
+        
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump({
+                    "config": {k: v for k, v in vars(args).items()},
+                    "wall_s": wall_s,
+                    "total": total,
+                    "clients": results,
+                    "llm_stub_requests": stub_requests,
+                    "llm_stub_speculations": stub[0].state.speculations if stub else None,
+                }, f, indent=2)
+            print(f"Results written to {args.output}")
+    finally:
+        if service is not None:
+            service.terminate()
+            service.wait(timeout=10)
+        if stub is not None:
+            stub[1].should_exit = True
+            await stub[2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test /ws/sign-detection")
+    parser.add_argument("--url", default="ws://127.0.0.1:8001/ws/sign-detection")
+    parser.add_argument("--clients", type=int, default=10)
+    parser.add_argument("--fps", type=float, default=15.0, help="Frames per second per client")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds of streaming per client")
+    parser.add_argument("--ramp", type=float, default=1.0, help="Seconds over which clients connect")
+    parser.add_argument("--drain", type=float, default=2.0, help="Seconds to wait for in-flight replies")
+    parser.add_argument("--mode", choices=["jpeg", "landmarks"], default="jpeg")
+    parser.add_argument("--frames-dir", help="Directory of recorded JPEG/PNG frames")
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=480)
+    parser.add_argument("--quality", type=int, default=80)
+    parser.add_argument("--client-max-fps", type=float, default=None,
+                        help="max_fps sent with the start command")
+    parser.add_argument("--llm-stub", action="store_true", help="Serve a stub LLM service")
+    parser.add_argument("--llm-stub-port", type=int, default=8002)
+    parser.add_argument("--llm-stub-latency-ms", type=float, default=50.0)
+    parser.add_argument("--spawn-service", action="store_true",
+                        help="Start the MediaPipe service (and LLM stub) for the run")
+    parser.add_argument("--output", help="Write results JSON here")
+    args = parser.parse_args()
+    
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
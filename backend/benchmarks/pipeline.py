@@ -0,0 +1,196 @@
+"""
+Full-pipeline benchmark with a stubbed Gemini backend.
+
+Starts the LLM service (GEMINI_BACKEND=stub) and the MediaPipe service
+under uvicorn, then drives ``/api/v1/translate`` with a closed loop of
+concurrent workers at each requested concurrency level and reports
+sustained translations per second and latency. Optional WebSocket
+clients stream landmark frames through the MediaPipe service at the
+same time, so translation numbers are taken under frame load.
+
+Examples:
+    python benchmarks/pipeline.py --concurrency 1,8,32 --duration 10
+    python benchmarks/pipeline.py --stub-latency-ms 800 --stub-error-rate 0.02 --frame-clients 20
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+import uuid
+from typing import List
+
+import httpx
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+LLM_DIR = os.path.join(os.path.dirname(BENCH_DIR), "llm_service")
+sys.path.insert(0, BENCH_DIR)
+
+from loadgen import ClientStats, load_frames, percentile, run_client, spawn_media_service, wait_healthy  # noqa: E402
+
+WORDS = ["HELLO", "THANKS", "GOODMORNING", "HOWAREYOU", "YES", "NO", "PLEASE", "SORRY", "HELP", "WATER"]
+
+
+def spawn_llm_service(port: int, args) -> subprocess.Popen:
+    """Start the LLM service with the stub Gemini backend."""
+    env = dict(
+        os.environ,
+        PORT=str(port),
+        GEMINI_BACKEND="stub",
+        GEMINI_STUB_LATENCY_MS=str(args.stub_latency_ms),
+        GEMINI_STUB_LATENCY_DIST=args.stub_dist,
+        GEMINI_STUB_LATENCY_SIGMA=str(args.stub_sigma),
+        GEMINI_STUB_ERROR_RATE=str(args.stub_error_rate),
+        GEMINI_STUB_HANG_RATE=str(args.stub_hang_rate),
+    )
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1",
+         "--port", str(port), "--log-level", "warning"],
+        cwd=LLM_DIR,
+        env=env,
+    )
+
+
+async def translate_worker(client: httpx.AsyncClient, llm_url: str, deadline: float,
+                           latencies: List[float], counts: dict):
+    """Send translate requests on one session back to back until the deadline."""
+    response = await client.post(f"{llm_url}/api/v1/sessions")
+    session_id = response.json()["session_id"]
+    rng = random.Random(session_id)
+    url = f"{llm_url}/api/v1/translate"
+    while time.perf_counter() < deadline:
+        signs = list(rng.choice(WORDS))
+        start = time.perf_counter()
+        try:
+            response = await client.post(url, json={"sign_sequence": signs, "session_id": session_id})
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            if response.status_code == 200:
+                latencies.append(elapsed_ms)
+                counts["ok"] += 1
+                counts["fallback"] += bool(response.json().get("fallback"))
+            else:
+                counts["errors"] += 1
+        except httpx.HTTPError:
+            counts["errors"] += 1
+
+
+async def run_level(llm_url: str, concurrency: int, duration: float) -> dict:
+    """Measure translate throughput and latency at one concurrency level."""
+    latencies: List[float] = []
+    counts = {"ok": 0, "fallback": 0, "errors": 0}
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=30.0) as client:
+        start = time.perf_counter()
+        deadline = start + duration
+        await asyncio.gather(*(
+            translate_worker(client, llm_url, deadline, latencies, counts)
+            for _ in range(concurrency)
+        ))
+        wall_s = time.perf_counter() - start
+    return {
+        "concurrency": concurrency,
+        "translations": counts["ok"],
+        "fallbacks": counts["fallback"],
+        "errors": counts["errors"],
+        "tps": counts["ok"] / wall_s if wall_s else 0.0,
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+    }
+
+
+async def run_frame_load(args, media_ws_url: str, duration: float) -> dict:
+    """Stream landmark frames through the MediaPipe service."""
+    frame_args = argparse.Namespace(
+        mode="landmarks", frames_dir=None, fps=args.frame_fps, duration=duration,
+        drain=1.0, client_max_fps=None,
+    )
+    frames = load_frames(frame_args)
+    clients = [ClientStats(i, f"pipeline-{i}-{uuid.uuid4().hex[:8]}") for i in range(args.frame_clients)]
+    await asyncio.gather(*(
+        run_client(media_ws_url, stats, frames, frame_args, 0.5 * i / len(clients))
+        for i, stats in enumerate(clients)
+    ))
+    latencies = [ms for stats in clients for ms in stats.latencies_ms]
+    return {
+        "clients": len(clients),
+        "sent": sum(stats.sent for stats in clients),
+        "received": sum(stats.received for stats in clients),
+        "dropped": sum(stats.dropped for stats in clients),
+        "p50_ms": percentile(latencies, 50),
+        "p99_ms": percentile(latencies, 99),
+    }
+
+
+async def main_async(args):
+    llm_url = f"http://127.0.0.1:{args.llm_port}"
+    media_url = f"http://127.0.0.1:{args.media_port}"
+    levels = [int(level) for level in args.concurrency.split(",")]
+    
+    llm = spawn_llm_service(args.llm_port, args)
+    media = spawn_media_service(args.media_port, llm_url)
+    try:
+        await wait_healthy(llm_url)
+        await wait_healthy(media_url)
+        print(f"Services up: LLM {llm_url} (stub {args.stub_dist} {args.stub_latency_ms}ms, "
+              f"errors {args.stub_error_rate:.0%}), MediaPipe {media_url}")
+        
+        frame_task = None
+        if args.frame_clients:
+            total_s = len(levels) * args.duration
+            frame_task = asyncio.create_task(
+                run_frame_load(args, f"ws://127.0.0.1:{args.media_port}/ws/sign-detection", total_s)
+            )
+        
+        results = []
+        print(f"{'conc':>5} {'ok':>7} {'fallbk':>7} {'err':>5} {'tps':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+        for level in levels:
+            row = await run_level(llm_url, level, args.duration)
+            results.append(row)
+            print(f"{row['concurrency']:>5} {row['translations']:>7} {row['fallbacks']:>7} {row['errors']:>5} "
+                  f"{row['tps']:>8.1f} {row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f}")
+        
+        frames = None
+        if frame_task is not None:
+            frames = await frame_task
+            print(f"\nFrame load: {frames['clients']} clients, {frames['received']}/{frames['sent']} "
+                  f"answered, {frames['dropped']} dropped, p50 {frames['p50_ms']:.1f}ms, "
+                  f"p99 {frames['p99_ms']:.1f}ms")
+        
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump({"config": vars(args), "levels": results, "frames": frames}, f, indent=2)
+            print(f"Results written to {args.output}")
+    finally:
+        for process in (media, llm):
+            process.terminate()
+            process.wait(timeout=10)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark both services with a stubbed Gemini backend")
+    parser.add_argument("--concurrency", default="1,8,32", help="Comma separated concurrency levels")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per concurrency level")
+    parser.add_argument("--llm-port", type=int, default=18002)
+    parser.add_argument("--media-port", type=int, default=18001)
+    parser.add_argument("--stub-latency-ms", type=float, default=300.0)
+    parser.add_argument("--stub-dist", default="lognormal",
+                        choices=["fixed", "uniform", "normal", "lognormal", "exponential"])
+    parser.add_argument("--stub-sigma", type=float, default=0.5)
+    parser.add_argument("--stub-error-rate", type=float, default=0.0)
+    parser.add_argument("--stub-hang-rate", type=float, default=0.0)
+    parser.add_argument("--frame-clients", type=int, default=0,
+                        help="WebSocket clients streaming landmark frames during the run")
+    parser.add_argument("--frame-fps", type=float, default=15.0)
+    parser.add_argument("--output", help="Write results JSON here")
+    args = parser.parse_args()
+    
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
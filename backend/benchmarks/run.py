@@ -0,0 +1,100 @@
+"""
+Run the offline microbenchmark suites.
+
+Both services use a top-level ``app`` package, so each suite runs in its
+own subprocess and reports results back as JSON.
+
+Examples:
+    python benchmarks/run.py --output results.json
+    python benchmarks/run.py --baseline baseline.json --threshold 0.15
+    python benchmarks/run.py --suite media_pipe --filter classify
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from dataclasses import asdict
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCH_DIR)
+
+from harness import BenchmarkResult, compare, format_ns, load_results, save_results  # noqa: E402
+
+SUITES = {
+    "media_pipe": "bench_media_pipe",
+    "llm": "bench_llm",
+}
+
+
+def run_suite_worker(suite: str, target_s: float, repeat: int, only: str):
+    """Run one suite in this process and print results as JSON."""
+    module = __import__(SUITES[suite])
+    results = module.build_suite(target_s=target_s, repeat=repeat).run(only=only)
+    print(json.dumps([asdict(r) for r in results]))
+
+
+def run_suite(suite: str, args) -> list:
+    """Run one suite in a subprocess."""
+    cmd = [
+        sys.executable, os.path.join(BENCH_DIR, "run.py"),
+        "--worker", suite,
+        "--target", str(args.target),
+        "--repeat", str(args.repeat),
+    ]
+    if args.filter:
+        cmd += ["--filter", args.filter]
+    proc = subprocess.run(cmd, capture_output=True, text=True, cwd=BENCH_DIR)
+    if proc.returncode != 0:
+        sys.stderr.write(proc.stderr)
+        raise SystemExit(f"Suite {suite} failed")
+    # The suite may log to stdout; results are on the last line
+    return [BenchmarkResult(**r) for r in json.loads(proc.stdout.strip().splitlines()[-1])]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hot-path microbenchmarks")
+    parser.add_argument("--suite", choices=["all", *SUITES], default="all")
+    parser.add_argument("--filter", default=None, help="Only run benchmarks containing this text")
+    parser.add_argument("--target", type=float, default=0.2, help="Seconds per repetition")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="Write results JSON here")
+    parser.add_argument("--baseline", help="Compare against a saved results JSON")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Slowdown ratio flagged as regression (0.10 = 10%%)")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.worker:
+        run_suite_worker(args.worker, args.target, args.repeat, args.filter)
+        return
+    
+    suites = list(SUITES) if args.suite == "all" else [args.suite]
+    results = []
+    for suite in suites:
+        results.extend(run_suite(suite, args))
+    
+    width = max(len(r.name) for r in results) if results else 0
+    for r in results:
+        print(f"{r.name:<{width}}  median {format_ns(r.median_ns):>10}  "
+              f"min {format_ns(r.min_ns):>10}  {r.ops_per_sec:>12,.0f} ops/s")
+    
+    if args.output:
+        save_results(args.output, results)
+        print(f"\nResults written to {args.output}")
+    
+    if args.baseline:
+        rows = compare(results, load_results(args.baseline), args.threshold)
+        regressions = [row for row in rows if row["regression"]]
+        print(f"\nComparison against {args.baseline} (threshold {args.threshold:.0%}):")
+        for row in rows:
+            flag = "REGRESSION" if row["regression"] else "ok"
+            print(f"{row['name']:<{width}}  {format_ns(row['baseline_ns']):>10} -> "
+                  f"{format_ns(row['current_ns']):>10}  x{row['ratio']:.2f}  {flag}")
+        if regressions:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
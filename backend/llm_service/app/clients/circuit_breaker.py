@@ -0,0 +1,133 @@
+"""Circuit breaker and latency tracking for upstream LLM calls."""
+import logging
+import time
+from collections import deque
+from enum import Enum
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitState(str, Enum):
+    """Circuit breaker states."""
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Trips open after a run of consecutive failures.
+
+    While open, requests are rejected until ``reset_timeout_s`` has passed;
+    then a single probe request is let through (half-open). A successful
+    probe closes the circuit, a failed one opens it again.
+    """
+    
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout_s: float = 30.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """Initialize circuit breaker."""
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_s = reset_timeout_s
+        self._clock = clock
+        self.state = CircuitState.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self._probe_in_flight = False
+        self.total_failures = 0
+        self.total_rejected = 0
+        self.times_opened = 0
+    
+    def allow_request(self) -> bool:
+        """Check whether a request may go upstream."""
+        if self.state == CircuitState.CLOSED:
+            return True
+        
+        if self.state == CircuitState.OPEN:
+            if self._clock() - self.opened_at >= self.reset_timeout_s:
+                self.state = CircuitState.HALF_OPEN
+                self._probe_in_flight = False
+                logger.info("Circuit breaker half-open, probing upstream")
+            else:
+                self.total_rejected += 1
+                return False
+        
+        # Half-open: let exactly one probe through
+        if self._probe_in_flight:
+            self.total_rejected += 1
+            return False
+        self._probe_in_flight = True
+        return True
+    
+    def record_success(self):
+        """Record a successful upstream call."""
+        if self.state != CircuitState.CLOSED:
+            logger.info("Circuit breaker closed")
+        self.state = CircuitState.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self._probe_in_flight = False
+    
+    def record_failure(self):
+        """Record a failed or timed out upstream call."""
+        self.total_failures += 1
+        self.consecutive_failures += 1
+        self._probe_in_flight = False
+        
+        if self.state == CircuitState.HALF_OPEN or (
+            self.state == CircuitState.CLOSED
+            and self.consecutive_failures >= self.failure_threshold
+        ):
+            self._open()
+    
+    def record_cancelled(self):
+        """Release a half-open probe whose call was cancelled."""
+        self._probe_in_flight = False
+    
+    def _open(self):
+        """Trip the breaker."""
+        self.state = CircuitState.OPEN
+        self.opened_at = self._clock()
+        self.times_opened += 1
+        logger.warning(
+            f"Circuit breaker open after {self.consecutive_failures} consecutive failures"
+        )
+    
+    def get_stats(self) -> dict:
+        """Get breaker statistics."""
+        return {
+            "state": self.state.value,
+            "consecutive_failures": self.consecutive_failures,
+            "failure_threshold": self.failure_threshold,
+            "total_failures": self.total_failures,
+            "total_rejected": self.total_rejected,
+            "times_opened": self.times_opened
+        }
+
+
+class LatencyTracker:
+    """Sliding window of recent successful call latencies."""
+    
+    def __init__(self, window: int = 200):
+        """Initialize latency tracker."""
+        self._samples = deque(maxlen=window)
+    
+    def __len__(self) -> int:
+        """Number of samples in the window."""
+        return len(self._samples)
+    
+    def record(self, latency_s: float):
+        """Record one latency sample in seconds."""
+        self._samples.append(latency_s)
+    
+    def percentile(self, pct: float) -> Optional[float]:
+        """Get a latency percentile, or None without samples."""
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(len(ordered) * pct / 100))
+        return ordered[index]
@@ -1,36 +1,244 @@
 """Google Gemini API client for sign language translation."""
-import google.generativeai as genai
+import asyncio
 import logging
-from typing import List, Optional
+import re
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, List, Optional
 
+from app.clients.circuit_breaker import CircuitBreaker, CircuitState, LatencyTracker
+from app.clients.stub_model import StubGenerativeModel
+from app.clients.translation_cache import TranslationCache, parse_distance_policy
 from app.config import get_settings
+from app.metrics import metrics
+from app.tracing import current_trace
+
+if TYPE_CHECKING:
+    import google.generativeai as genai
 
 logger = logging.getLogger(__name__)
 
+LANGUAGE_NAMES = {
+    "en": "English",
+    "ru": "Russian",
+    "kz": "Kazakh"
+}
+DEFAULT_LANGUAGE = "en"
+
+SYSTEM_INSTRUCTION = """You are a sign language translator. Convert the sign sequence you are given into natural {lang_name} language.
+
+Rules:
+1. Interpret the signs as ASL (American Sign Language) finger spelling
+2. Form complete, grammatically correct sentences
+3. Add appropriate punctuation
+4. If context is provided, maintain conversational continuity
+"""
+
+# Rough characters-per-token ratio used when the API reports no usage
+CHARS_PER_TOKEN = 4
+
+# "2. Thank you." - one line per sequence in a merged reply
+NUMBERED_LINE_PATTERN = re.compile(r"^\s*(\d+)[.):]\s*(.*\S)")
+
+
+@dataclass(frozen=True)
+class PromptTemplate:
+    """Precompiled prompt pieces for one target language."""
+    language: str
+    system_instruction: str
+    suffix: str
+    merged_suffix: str
+    
+    @classmethod
+    def for_language(cls, language: str, lang_name: str) -> "PromptTemplate":
+        """Build the static parts of the prompt once."""
+        return cls(
+            language=language,
+            system_instruction=SYSTEM_INSTRUCTION.format(lang_name=lang_name),
+            suffix=f"Natural {lang_name} translation:",
+            merged_suffix=f"Natural {lang_name} translation of each numbered sequence, one numbered line each:"
+        )
+
+
+PROMPT_TEMPLATES: Dict[str, PromptTemplate] = {
+    code: PromptTemplate.for_language(code, name)
+    for code, name in LANGUAGE_NAMES.items()
+}
+
+
+@dataclass
+class PromptStats:
+    """Running prompt size counters."""
+    requests: int = 0
+    total_bytes: int = 0
+    total_tokens: int = 0
+    last_bytes: int = 0
+    last_tokens: int = 0
+    static_bytes_saved: int = 0
+    
+    def record(self, prompt_bytes: int, prompt_tokens: int, saved_bytes: int):
+        """Record the size of one request."""
+        self.requests += 1
+        self.total_bytes += prompt_bytes
+        self.total_tokens += prompt_tokens
+        self.last_bytes = prompt_bytes
+        self.last_tokens = prompt_tokens
+        self.static_bytes_saved += saved_bytes
+    
+    def to_dict(self) -> dict:
+        """Convert stats to dictionary."""
+        requests = self.requests or 1
+        return {
+            "requests": self.requests,
+            "total_bytes": self.total_bytes,
+            "total_tokens": self.total_tokens,
+            "avg_bytes": round(self.total_bytes / requests, 1),
+            "avg_tokens": round(self.total_tokens / requests, 1),
+            "last_bytes": self.last_bytes,
+            "last_tokens": self.last_tokens,
+            "static_bytes_saved": self.static_bytes_saved
+        }
+
+
+translations_total = metrics.counter("gemini_requests_total", "Translation requests reaching the Gemini client")
+fallbacks_total = metrics.counter("fallbacks_total", "Translations served by the local fallback")
+model_cache_hits = metrics.counter("model_cache_hits_total", "Per-language model/template cache hits")
+model_cache_misses = metrics.counter("model_cache_misses_total", "Per-language model/template cache misses")
+
 
 class GeminiClient:
     """Client for Google Gemini API."""
     
     def __init__(self):
-        """Initialize Gemini client."""
+        """
+        Initialize Gemini client.
+        The Gemini SDK is imported and configured by ``initialize`` (at
+        start-up, or on the first translation), not on construction.
+        """
         self.settings = get_settings()
         self._model = None
-        self._initialize()
+        self._models: Dict[str, "genai.GenerativeModel"] = {}
+        self._initialized = False
+        self.use_system_instruction = self.settings.GEMINI_USE_SYSTEM_INSTRUCTION
+        self.prompt_stats = PromptStats()
+        
+        # Resilience: breaker, per-request deadline and hedged requests
+        self.breaker = CircuitBreaker(
+            failure_threshold=self.settings.BREAKER_FAILURE_THRESHOLD,
+            reset_timeout_s=self.settings.BREAKER_RESET_TIMEOUT_S
+        )
+        self.latency = LatencyTracker()
+        self.deadline_s = self.settings.GEMINI_DEADLINE_MS / 1000
+        self.hedge_enabled = self.settings.GEMINI_HEDGE_ENABLED
+        self.hedge_percentile = self.settings.GEMINI_HEDGE_PERCENTILE
+        self.hedge_min_samples = self.settings.GEMINI_HEDGE_MIN_SAMPLES
+        self.hedges_sent = 0
+        self.hedges_won = 0
+        self.timeouts = 0
+        
+        # Repeat phrases, allowing for a misread letter, are answered locally
+        self.cache = None
+        if self.settings.TRANSLATION_CACHE_ENABLED:
+            self.cache = TranslationCache(
+                max_entries=self.settings.TRANSLATION_CACHE_MAX_ENTRIES,
+                policy=parse_distance_policy(self.settings.TRANSLATION_CACHE_MAX_DISTANCE),
+                min_confidence=self.settings.TRANSLATION_CACHE_MIN_CONFIDENCE,
+                distance_penalty=self.settings.TRANSLATION_CACHE_DISTANCE_PENALTY,
+                confusable=self.settings.TRANSLATION_CACHE_CONFUSABLE
+            )
     
-    def _initialize(self):
-        """Configure Gemini API."""
+    def initialize(self):
+        """Import and configure the Gemini SDK; later calls do nothing."""
+        if self._initialized:
+            return
+        self._initialized = True
+        
+        if self.settings.GEMINI_BACKEND == "stub":
+            self._model = self._create_model()
+            logger.info("Gemini client using the local stub backend")
+            return
+        
         if not self.settings.GEMINI_API_KEY:
             logger.warning("GEMINI_API_KEY not set. LLM features will be unavailable.")
             return
         
         try:
+            import google.generativeai as genai
             genai.configure(api_key=self.settings.GEMINI_API_KEY)
-            self._model = genai.GenerativeModel(self.settings.GEMINI_MODEL)
+            self._model = self._create_model()
             logger.info(f"Gemini client initialized with model: {self.settings.GEMINI_MODEL}")
         except Exception as e:
             logger.error(f"Failed to initialize Gemini: {e}")
             raise
     
+    def warm_up(self) -> float:
+        """
+        Initialize and build the per-language models ahead of the first
+        request. Makes no API call.
+
+        Returns:
+            Seconds taken
+        """
+        start = time.perf_counter()
+        self.initialize()
+        if self._model is not None and self.use_system_instruction:
+            for language in LANGUAGE_NAMES:
+                self._get_model(language)
+        return time.perf_counter() - start
+    
+    def _create_model(self, system_instruction: Optional[str] = None):
+        """Create a model for the configured backend."""
+        if self.settings.GEMINI_BACKEND == "stub":
+            return StubGenerativeModel.from_settings(self.settings, system_instruction)
+        import google.generativeai as genai
+        return genai.GenerativeModel(self.settings.GEMINI_MODEL, system_instruction=system_instruction)
+    
+    def _get_template(self, language: str) -> PromptTemplate:
+        """Get the precompiled template for a language."""
+        return PROMPT_TEMPLATES.get(language) or PROMPT_TEMPLATES[DEFAULT_LANGUAGE]
+    
+    def _get_model(self, language: str):
+        """
+        Get the model for a language.
+        With system instructions enabled, the static rules are attached
+        to a per-language model once instead of being sent as prompt text.
+        """
+        if not self.use_system_instruction:
+            return self._model
+        
+        template = self._get_template(language)
+        model = self._models.get(template.language)
+        if model is not None:
+            model_cache_hits.inc()
+        else:
+            model_cache_misses.inc()
+            model = self._create_model(template.system_instruction)
+            self._models[template.language] = model
+        return model
+    
+    def _record_prompt_size(self, prompt: str, language: str, response=None):
+        """Record bytes and tokens sent for one request."""
+        prompt_bytes = len(prompt.encode("utf-8"))
+        prompt_tokens = 0
+        
+        usage = getattr(response, "usage_metadata", None)
+        if usage is not None:
+            prompt_tokens = getattr(usage, "prompt_token_count", 0) or 0
+        if not prompt_tokens:
+            prompt_tokens = max(1, len(prompt) // CHARS_PER_TOKEN)
+        
+        saved_bytes = 0
+        if self.use_system_instruction:
+            saved_bytes = len(self._get_template(language).system_instruction.encode("utf-8"))
+        
+        self.prompt_stats.record(prompt_bytes, prompt_tokens, saved_bytes)
+        logger.debug(f"Gemini prompt: {prompt_bytes} bytes, {prompt_tokens} tokens")
+    
+    def get_prompt_stats(self) -> dict:
+        """Get prompt size statistics."""
+        return self.prompt_stats.to_dict()
+    
+    @metrics.timed("gemini_translate")
     async def translate_signs(
         self,
         sign_sequence: List[str],
@@ -48,25 +256,218 @@ class GeminiClient:
         Returns:
             Dictionary with translation and metadata
         """
-        if not self._model:
-            # Fallback when API key not available (for testing)
+        translations_total.inc()
+        cached = self._from_cache(sign_sequence, context, language)
+        if cached is not None:
+            return cached
+        return await self._translate_upstream(sign_sequence, context, language)
+    
+    @metrics.timed("gemini_translate_merged")
+    async def translate_sign_sequences(
+        self,
+        sign_sequences: List[List[str]],
+        context: Optional[str] = None,
+        language: str = "en"
+    ) -> List[dict]:
+        """
+        Translate several consecutive sequences of one session with a single upstream call.
+        
+        Each sequence is translated in the context the one before it
+        leaves, as it would be one by one. Leading sequences found in the
+        cache are not sent, and their translations become the context of
+        the rest. The others go into one numbered prompt and the reply is
+        split back by number. A reply that is not numbered is split by
+        line, or else attributed to the last sequence, with the earlier
+        ones translated locally and marked ``degraded``; it is never
+        re-sent sequence by sequence.
+        
+        Returns:
+            One result per sequence, in order
+        """
+        translations_total.inc(len(sign_sequences))
+        results = []
+        for signs in sign_sequences:
+            cached = self._from_cache(signs, context, language)
+            if cached is None:
+                break
+            results.append(cached)
+            context = cached["translation"]
+        pending = sign_sequences[len(results):]
+        
+        if len(pending) == 1:
+            results.append(await self._translate_upstream(pending[0], context, language))
+            return results
+        
+        reply = None
+        if pending and self._upstream_available():
+            reply = await self._complete(self._build_merged_prompt(pending, context, language), language)
+        if reply is None:
+            return results + [self._fallback_translate(signs, context) for signs in pending]
+        
+        texts = self._split_merged_reply(reply, len(pending))
+        if texts is not None:
+            for signs, text in zip(pending, texts):
+                results.append(self._translated(signs, text, context, language))
+                context = text
+            return results
+        
+        # Unnumbered reply: not trusted enough to cache
+        texts = [line.strip() for line in reply.splitlines() if line.strip()]
+        if len(texts) != len(pending):
+            logger.warning("Merged translation could not be split; attributing it to the last sequence")
+            texts = [None] * (len(pending) - 1) + [reply.strip()]
+        for signs, text in zip(pending, texts):
+            if text is None:
+                results.append({**self._fallback_translate(signs, context), "degraded": True})
+            else:
+                results.append(self._translated(signs, text, context, language, cache=False))
+                context = text
+        return results
+    
+    async def _translate_upstream(self, sign_sequence: List[str], context: Optional[str], language: str) -> dict:
+        """Translate one sequence with Gemini, or locally when it is unavailable."""
+        if not self._upstream_available():
             return self._fallback_translate(sign_sequence, context)
         
         prompt = self._build_prompt(sign_sequence, context, language)
+        text = await self._complete(prompt, language)
+        if text is None:
+            return self._fallback_translate(sign_sequence, context)
+        return self._translated(sign_sequence, text.strip(), context, language)
+    
+    def _from_cache(self, sign_sequence: List[str], context: Optional[str], language: str) -> Optional[dict]:
+        """A result from the translation cache, if it has a confident match in this context."""
+        if self.cache is None:
+            return None
+        cached = self.cache.get(sign_sequence, language, context)
+        if cached is None:
+            return None
+        entry, distance, confidence = cached
+        return {
+            "translation": entry.translation,
+            "confidence": round(confidence, 3),
+            "alternatives": [],
+            "raw_signs": "".join(sign_sequence),
+            "cached": True
+        }
+    
+    def _upstream_available(self) -> bool:
+        """Whether a model is configured and the breaker lets a request through."""
+        if self._model is None:
+            self.initialize()
+        if not self._model:
+            # Fallback when API key not available (for testing)
+            return False
+        # While the upstream is failing, answer locally instead of queueing behind it
+        return self.breaker.allow_request()
+    
+    def _translated(self, sign_sequence: List[str], translation: str, context: Optional[str], language: str,
+                    cache: bool = True) -> dict:
+        """Result of an upstream translation, which is also cached for its context unless ``cache`` is off."""
+        if cache and self.cache is not None:
+            self.cache.put(sign_sequence, translation, 0.92, language, context)
+        return {
+            "translation": translation,
+            "confidence": 0.92,  # Gemini doesn't provide confidence, use default
+            "alternatives": [],
+            "raw_signs": "".join(sign_sequence)
+        }
+    
+    async def _complete(self, prompt: str, language: str) -> Optional[str]:
+        """
+        Send a prompt upstream and record the outcome on the breaker.
+        Returns the reply text, or None when the call failed or timed out.
+        """
+        try:
+            response = await self._generate(self._get_model(language), prompt)
+            self._record_prompt_size(prompt, language, response)
+            text = response.text
+            self.breaker.record_success()
+            return text
+        except asyncio.CancelledError:
+            self.breaker.record_cancelled()
+            raise
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            self.breaker.record_failure()
+            logger.error(f"Gemini API deadline of {self.deadline_s:.1f}s exceeded")
+            return None
+        except Exception as e:
+            self.breaker.record_failure()
+            logger.error(f"Gemini API error: {e}")
+            return None
+    
+    def _hedge_delay(self) -> Optional[float]:
+        """Get the delay after which a hedged request is sent, if any."""
+        if not self.hedge_enabled or len(self.latency) < self.hedge_min_samples:
+            return None
+        return self.latency.percentile(self.hedge_percentile)
+    
+    @metrics.timed("gemini_call")
+    async def _generate(self, model, prompt: str):
+        """
+        Call Gemini within the request deadline.
+        When the primary call outlives the recent p95 latency, a duplicate
+        is sent and whichever answers first wins.
+        """
+        span = current_trace().start_span("gemini_call", prompt_bytes=len(prompt))
+        start = time.perf_counter()
+        deadline = start + self.deadline_s
+        primary = asyncio.ensure_future(model.generate_content_async(prompt))
+        pending = {primary}
+        hedge = None
+        last_error = None
         
         try:
-            response = self._model.generate_content(prompt)
-            translation = response.text.strip()
+            hedge_delay = self._hedge_delay()
+            if hedge_delay is not None and hedge_delay < self.deadline_s:
+                done, _ = await asyncio.wait(pending, timeout=hedge_delay)
+                if not done:
+                    hedge = asyncio.ensure_future(model.generate_content_async(prompt))
+                    pending.add(hedge)
+                    self.hedges_sent += 1
             
-            return {
-                "translation": translation,
-                "confidence": 0.92,  # Gemini doesn't provide confidence, use default
-                "alternatives": [],
-                "raw_signs": "".join(sign_sequence)
+            while pending:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    raise asyncio.TimeoutError()
+                
+                done, pending = await asyncio.wait(
+                    pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    raise asyncio.TimeoutError()
+                
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.hedges_won += 1
+                        self.latency.record(time.perf_counter() - start)
+                        return task.result()
+                    last_error = task.exception()
+            
+            raise last_error
+        finally:
+            for task in pending:
+                task.cancel()
+            span.set_attribute("hedged", hedge is not None)
+            span.end()
+    
+    def get_resilience_stats(self) -> dict:
+        """Get circuit breaker, deadline and hedging statistics."""
+        p95 = self.latency.percentile(95)
+        return {
+            "backend": self.settings.GEMINI_BACKEND,
+            "circuit_breaker": self.breaker.get_stats(),
+            "deadline_ms": int(self.deadline_s * 1000),
+            "timeouts": self.timeouts,
+            "latency_p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+            "hedging": {
+                "enabled": self.hedge_enabled,
+                "sent": self.hedges_sent,
+                "won": self.hedges_won
             }
-        except Exception as e:
-            logger.error(f"Gemini API error: {e}")
-            return self._fallback_translate(sign_sequence, context)
+        }
     
     def _build_prompt(
         self,
@@ -74,32 +475,62 @@ class GeminiClient:
         context: Optional[str],
         language: str
     ) -> str:
-        """Build prompt for Gemini."""
-        signs_text = " ".join(sign_sequence)
+        """
+        Build prompt for Gemini.
+        Only the per-request part is built here; the static rules travel
+        as the model's system instruction unless that is disabled.
+        """
+        template = self._get_template(language)
         
-        lang_names = {
-            "en": "English",
-            "ru": "Russian",
-            "kz": "Kazakh"
-        }
-        lang_name = lang_names.get(language, "English")
+        parts = [f"Sign sequence: {' '.join(sign_sequence)}\n\n"]
+        if context:
+            parts.append(f"Previous context: {context}\n\n")
+        parts.append(template.suffix)
         
-        prompt = f"""You are a sign language translator. Convert the following sign sequence into natural {lang_name} language.
-
-Sign sequence: {signs_text}
-
-Rules:
-1. Interpret the signs as ASL (American Sign Language) finger spelling
-2. Form complete, grammatically correct sentences
-3. Add appropriate punctuation
-4. If context is provided, maintain conversational continuity
-
-"""
+        if not self.use_system_instruction:
+            parts.insert(0, template.system_instruction + "\n")
+        return "".join(parts)
+    
+    def _build_merged_prompt(
+        self,
+        sign_sequences: List[List[str]],
+        context: Optional[str],
+        language: str
+    ) -> str:
+        """
+        Build one prompt asking for a numbered translation of each sequence.
+        The context is that of the first sequence; each later one follows
+        on from the translation of the sequence before it.
+        """
+        template = self._get_template(language)
+        
+        parts = ["Sign sequences, signed one after another; each continues from the translation of the one before:\n"]
+        for number, signs in enumerate(sign_sequences, 1):
+            parts.append(f"{number}. Sign sequence: {' '.join(signs)}\n")
+        parts.append("\n")
         if context:
-            prompt += f"Previous context: {context}\n\n"
+            parts.append(f"Previous context: {context}\n\n")
+        parts.append(template.merged_suffix)
         
-        prompt += f"Natural {lang_name} translation:"
-        return prompt
+        if not self.use_system_instruction:
+            parts.insert(0, template.system_instruction + "\n")
+        return "".join(parts)
+    
+    @staticmethod
+    def _split_merged_reply(reply: str, count: int) -> Optional[List[str]]:
+        """Translations by number from a merged reply, or None unless each of 1..count is there once."""
+        translations = {}
+        for line in reply.splitlines():
+            match = NUMBERED_LINE_PATTERN.match(line)
+            if match is None:
+                continue
+            number = int(match.group(1))
+            if number in translations or not 1 <= number <= count:
+                return None
+            translations[number] = match.group(2)
+        if len(translations) != count:
+            return None
+        return [translations[number] for number in range(1, count + 1)]
     
     def _fallback_translate(
         self,
@@ -107,6 +538,7 @@ Rules:
         context: Optional[str] = None
     ) -> dict:
         """Fallback translation when API is unavailable."""
+        fallbacks_total.inc()
         # Simple concatenation for testing
         text = "".join(sign_sequence).lower()
         
@@ -132,4 +564,4 @@ Rules:
     
     def is_healthy(self) -> bool:
         """Check if client is healthy."""
-        return self._model is not None
+        return self._model is not None and self.breaker.state != CircuitState.OPEN
@@ -0,0 +1,191 @@
+"""Local stand-in for the Gemini model, for tests and benchmarks without network access."""
+import asyncio
+import random
+import re
+from dataclasses import dataclass
+from typing import List, Optional
+
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "normal", "lognormal", "exponential")
+
+SIGN_SEQUENCE_PATTERN = re.compile(r"Sign sequence: ([^\n]*)")
+
+
+class StubError(Exception):
+    """Simulated upstream failure."""
+
+
+@dataclass
+class StubUsage:
+    """Token accounting in the shape of Gemini's usage_metadata."""
+    prompt_token_count: int
+    candidates_token_count: int
+
+
+class StubResponse:
+    """The parts of a Gemini response the client reads."""
+    
+    def __init__(self, text: str, usage_metadata: StubUsage):
+        self.text = text
+        self.usage_metadata = usage_metadata
+
+
+class StubStreamResponse:
+    """
+    Streamed response: iterate to receive chunks as they "arrive".
+    ``text`` holds what has been received so far, so call ``resolve``
+    first to wait for the whole reply.
+    """
+    
+    def __init__(self, chunks: List[str], chunk_delay_s: float, usage_metadata: StubUsage):
+        self._chunks = chunks
+        self._chunk_delay_s = chunk_delay_s
+        self._received: List[str] = []
+        self.usage_metadata = usage_metadata
+    
+    async def __aiter__(self):
+        for chunk in self._received:
+            yield StubResponse(chunk, self.usage_metadata)
+        while len(self._received) < len(self._chunks):
+            if self._received:
+                await asyncio.sleep(self._chunk_delay_s)
+            chunk = self._chunks[len(self._received)]
+            self._received.append(chunk)
+            yield StubResponse(chunk, self.usage_metadata)
+    
+    async def resolve(self):
+        """Wait for all chunks."""
+        async for _ in self:
+            pass
+    
+    @property
+    def text(self) -> str:
+        return "".join(self._received)
+
+
+class StubGenerativeModel:
+    """
+    Drop-in for ``genai.GenerativeModel`` with a configurable latency
+    distribution, error rate, hang rate and streaming.
+
+    Latency is drawn around ``latency_ms``: ``sigma`` is the log-space
+    standard deviation for lognormal and the relative spread for normal
+    and uniform. Hung calls never complete, which exercises deadlines
+    and hedging. Replies spell the sign sequence found in the prompt, as
+    numbered lines when a merged prompt holds several.
+    """
+    
+    def __init__(
+        self,
+        model_name: str = "stub",
+        system_instruction: Optional[str] = None,
+        latency_ms: float = 300.0,
+        distribution: str = "lognormal",
+        sigma: float = 0.5,
+        error_rate: float = 0.0,
+        hang_rate: float = 0.0,
+        stream_chunks: int = 4,
+        stream_chunk_ms: float = 20.0,
+        seed: Optional[int] = None
+    ):
+        if distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(
+                f"Unknown latency distribution '{distribution}', "
+                f"expected one of {', '.join(LATENCY_DISTRIBUTIONS)}"
+            )
+        self.model_name = model_name
+        self.system_instruction = system_instruction
+        self.latency_s = latency_ms / 1000
+        self.distribution = distribution
+        self.sigma = sigma
+        self.error_rate = error_rate
+        self.hang_rate = hang_rate
+        self.stream_chunks = max(1, stream_chunks)
+        self.stream_chunk_s = stream_chunk_ms / 1000
+        self._rng = random.Random(seed)
+        self.calls = 0
+        self.errors = 0
+        self.hangs = 0
+    
+    @classmethod
+    def from_settings(cls, settings, system_instruction: Optional[str] = None) -> "StubGenerativeModel":
+        """Build a stub from the GEMINI_STUB_* settings."""
+        return cls(
+            model_name=settings.GEMINI_MODEL,
+            system_instruction=system_instruction,
+            latency_ms=settings.GEMINI_STUB_LATENCY_MS,
+            distribution=settings.GEMINI_STUB_LATENCY_DIST,
+            sigma=settings.GEMINI_STUB_LATENCY_SIGMA,
+            error_rate=settings.GEMINI_STUB_ERROR_RATE,
+            hang_rate=settings.GEMINI_STUB_HANG_RATE,
+            stream_chunks=settings.GEMINI_STUB_STREAM_CHUNKS,
+            stream_chunk_ms=settings.GEMINI_STUB_STREAM_CHUNK_MS,
+            seed=settings.GEMINI_STUB_SEED
+        )
+    
+    def sample_latency(self) -> float:
+        """Draw one call latency in seconds."""
+        mean = self.latency_s
+        if self.distribution == "fixed":
+            latency = mean
+        elif self.distribution == "uniform":
+            latency = self._rng.uniform(mean * (1 - self.sigma), mean * (1 + self.sigma))
+        elif self.distribution == "normal":
+            latency = self._rng.gauss(mean, mean * self.sigma)
+        elif self.distribution == "lognormal":
+            # latency_ms is the median; sigma sets the tail
+            latency = mean * self._rng.lognormvariate(0.0, self.sigma)
+        else:
+            latency = self._rng.expovariate(1 / mean) if mean > 0 else 0.0
+        return max(0.0, latency)
+    
+    def _reply(self, prompt: str) -> str:
+        """Spell out the sign sequence in the prompt; numbered lines when it has several."""
+        sequences = SIGN_SEQUENCE_PATTERN.findall(prompt)
+        texts = ["".join(signs.split()).lower() for signs in sequences]
+        replies = [f"{text.capitalize()}." if text else "..." for text in texts]
+        if len(replies) > 1:
+            return "\n".join(f"{number}. {reply}" for number, reply in enumerate(replies, 1))
+        return replies[0] if replies else "..."
+    
+    def _usage(self, prompt: str, reply: str) -> StubUsage:
+        """Estimate tokens the way the API counts them, system instruction included."""
+        prompt_chars = len(prompt) + len(self.system_instruction or "")
+        return StubUsage(
+            prompt_token_count=max(1, prompt_chars // 4),
+            candidates_token_count=max(1, len(reply) // 4)
+        )
+    
+    async def generate_content_async(self, prompt: str, stream: bool = False):
+        """Simulate one generate call."""
+        self.calls += 1
+        
+        if self.hang_rate and self._rng.random() < self.hang_rate:
+            self.hangs += 1
+            await asyncio.Event().wait()
+        
+        latency = self.sample_latency()
+        failed = self.error_rate and self._rng.random() < self.error_rate
+        await asyncio.sleep(latency)
+        if failed:
+            self.errors += 1
+            raise StubError("Simulated Gemini error")
+        
+        reply = self._reply(prompt)
+        usage = self._usage(prompt, reply)
+        if not stream:
+            return StubResponse(reply, usage)
+        
+        # Latency above is time to first chunk; later chunks trickle in
+        size = -(-len(reply) // self.stream_chunks)
+        chunks = [reply[i:i + size] for i in range(0, len(reply), size)]
+        return StubStreamResponse(chunks, self.stream_chunk_s, usage)
+    
+    def get_stats(self) -> dict:
+        """Get call counters."""
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "hangs": self.hangs,
+            "latency_ms": self.latency_s * 1000,
+            "distribution": self.distribution
+        }
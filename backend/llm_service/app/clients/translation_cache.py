@@ -0,0 +1,275 @@
+"""Approximate-match cache of sign sequence translations."""
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from itertools import combinations
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Letters the rule-based classifier mixes up; several share a hand shape in ASL
+DEFAULT_CONFUSABLE = "UV,SA,O0,V2,W6,F9,MN"
+
+
+def parse_distance_policy(spec: str) -> List[Tuple[int, int]]:
+    """
+    Parse "min_length:max_edits" pairs, e.g. "4:1,10:2".
+
+    Sequences shorter than the first length must match exactly.
+    """
+    policy = []
+    for part in spec.split(","):
+        if part.strip():
+            length, edits = part.split(":")
+            policy.append((int(length), int(edits)))
+    policy.sort()
+    for (_, low), (_, high) in zip(policy, policy[1:]):
+        if high < low:
+            raise ValueError(f"Edit budget must not shrink with length: {spec!r}")
+    return policy
+
+
+@dataclass
+class CachedTranslation:
+    """A cached upstream translation."""
+    signs: Tuple[str, ...]
+    translation: str
+    confidence: float
+    hits: int = 0
+
+
+class TranslationCache:
+    """
+    LRU cache of translations that also answers near-duplicate sequences.
+
+    The rule-based classifier often swaps one letter (U/V, S/A, 0/O), so
+    a repeat phrase rarely matches exactly. A lookup accepts cached
+    sequences within the edit budget for its length (``policy``). The
+    budget counts insertions, deletions and substitutions. The closest
+    candidate is served if its confidence is still at least
+    ``min_confidence``. Confidence is lowered by ``distance_penalty`` per
+    edit, and a confusable substitution counts as half an edit. With the
+    defaults and Gemini's 0.92, only a confusable swap stays above the
+    floor; any other edit may be a different word, such as a
+    fingerspelled name, and goes upstream.
+
+    Candidates come from a symmetric-deletion index. Every cached
+    sequence is indexed under each variant with up to its budget of signs
+    deleted, and a query probes its own deletion variants. Two sequences
+    within k edits always share a variant with at most k deletions from
+    each. A lookup is therefore a few dict probes plus a distance check on
+    the few candidates, whatever the cache size. Memory grows with the
+    budget: with 1 edit, each entry is indexed under length + 1 keys.
+
+    Entries are kept per target language and context: the same signs
+    after a different previous sentence may translate differently. The
+    context is keyed by a short hash.
+    """
+    
+    def __init__(
+        self,
+        max_entries: int = 100_000,
+        policy: Iterable[Tuple[int, int]] = ((4, 1),),
+        min_confidence: float = 0.85,
+        distance_penalty: float = 0.1,
+        confusable: str = DEFAULT_CONFUSABLE
+    ):
+        self.max_entries = max_entries
+        self.policy = sorted(policy)
+        self.max_edits = max((edits for _, edits in self.policy), default=0)
+        self.min_confidence = min_confidence
+        self.distance_penalty = distance_penalty
+        self._confusable = set()
+        for pair in confusable.split(","):
+            pair = pair.strip()
+            if len(pair) == 2:
+                self._confusable.add((pair[0], pair[1]))
+                self._confusable.add((pair[1], pair[0]))
+        
+        self._entries: "OrderedDict[str, CachedTranslation]" = OrderedDict()  # Least recent first
+        self._index: Dict[str, object] = {}  # Variant -> key, or list of keys when shared
+        self._symbols: Dict[str, str] = {}  # Multi-letter signs -> one private-use character
+        
+        self.lookups = 0
+        self.exact_hits = 0
+        self.fuzzy_hits = 0
+        self.rejected = 0
+        self.evictions = 0
+    
+    def __len__(self) -> int:
+        """Number of cached translations."""
+        return len(self._entries)
+    
+    def edit_budget(self, length: int) -> int:
+        """Edits allowed for a sequence of ``length`` signs."""
+        budget = 0
+        for min_length, edits in self.policy:
+            if length < min_length:
+                break
+            budget = edits
+        return budget
+    
+    @staticmethod
+    def _prefix(language: str, context: Optional[str]) -> str:
+        """Key prefix scoping entries to a language and context; encoded signs never contain NUL."""
+        if not context:
+            return language + "\0"
+        return language + "\0" + hashlib.blake2b(context.encode(), digest_size=8).hexdigest() + "\0"
+    
+    def _encode(self, signs: Iterable[str]) -> str:
+        """One character per sign, so sequences can be sliced and hashed as strings."""
+        chars = []
+        for sign in signs:
+            if len(sign) != 1:
+                symbol = self._symbols.get(sign)
+                if symbol is None:
+                    symbol = self._symbols[sign] = chr(0xE000 + len(self._symbols))
+                sign = symbol
+            chars.append(sign)
+        return "".join(chars)
+    
+    def _index_budget(self, length: int) -> int:
+        """Deletions to index an entry under: the largest budget of a query that may reach it."""
+        budget = 0
+        for query_length in range(max(0, length - self.max_edits), length + self.max_edits + 1):
+            edits = self.edit_budget(query_length)
+            if abs(query_length - length) <= edits:
+                budget = max(budget, edits)
+        return budget
+    
+    @staticmethod
+    def _variants(encoded: str, deletions: int) -> set:
+        """``encoded`` with every choice of up to ``deletions`` characters removed."""
+        variants = {encoded}
+        for count in range(1, min(deletions, len(encoded)) + 1):
+            for positions in combinations(range(len(encoded)), count):
+                variants.add("".join(c for i, c in enumerate(encoded) if i not in positions))
+        return variants
+    
+    def _distance(self, a: str, b: str, limit: int) -> Tuple[int, float]:
+        """
+        Edit distance between two encoded sequences, and the same with
+        confusable substitutions counted as half an edit.
+        Returns (limit + 1, inf) as soon as the edit count exceeds ``limit``.
+        """
+        if abs(len(a) - len(b)) > limit:
+            return limit + 1, float("inf")
+        confusable = self._confusable
+        edits = list(range(len(b) + 1))
+        weighted = [float(j) for j in range(len(b) + 1)]
+        for i, ca in enumerate(a, 1):
+            prev_edits, edits = edits, [i] + [0] * len(b)
+            prev_weighted, weighted = weighted, [float(i)] + [0.0] * len(b)
+            for j, cb in enumerate(b, 1):
+                if ca == cb:
+                    sub, sub_weighted = 0, 0.0
+                else:
+                    sub, sub_weighted = 1, 0.5 if (ca, cb) in confusable else 1.0
+                edits[j] = min(prev_edits[j] + 1, edits[j - 1] + 1, prev_edits[j - 1] + sub)
+                weighted[j] = min(prev_weighted[j] + 1, weighted[j - 1] + 1, prev_weighted[j - 1] + sub_weighted)
+            if min(edits) > limit:
+                return limit + 1, float("inf")
+        return edits[-1], weighted[-1]
+    
+    def get(self, signs: List[str], language: str = "en",
+            context: Optional[str] = None) -> Optional[Tuple[CachedTranslation, float, float]]:
+        """
+        Find the closest cached translation of a sequence.
+
+        Returns:
+            (entry, weighted distance, confidence) of a match confident
+            enough to serve, otherwise None
+        """
+        self.lookups += 1
+        encoded = self._encode(signs)
+        prefix = self._prefix(language, context)
+        key = prefix + encoded
+        
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            entry.hits += 1
+            self.exact_hits += 1
+            return entry, 0.0, entry.confidence
+        
+        budget = self.edit_budget(len(encoded))
+        if budget == 0:
+            return None
+        
+        best = None
+        seen = set()
+        for variant in self._variants(encoded, budget):
+            found = self._index.get(prefix + variant)
+            if found is None:
+                continue
+            for candidate in (found if isinstance(found, list) else (found,)):
+                if candidate in seen:
+                    continue
+                seen.add(candidate)
+                edits, weighted = self._distance(encoded, candidate[len(prefix):], budget)
+                if edits <= budget and (best is None or weighted < best[1]):
+                    best = (candidate, weighted)
+        
+        if best is None:
+            return None
+        candidate, weighted = best
+        entry = self._entries[candidate]
+        confidence = entry.confidence - self.distance_penalty * weighted
+        if confidence < self.min_confidence:
+            self.rejected += 1
+            return None
+        
+        self._entries.move_to_end(candidate)
+        entry.hits += 1
+        self.fuzzy_hits += 1
+        return entry, weighted, confidence
+    
+    def put(self, signs: List[str], translation: str, confidence: float, language: str = "en",
+            context: Optional[str] = None):
+        """Cache an upstream translation, evicting the least recently used entry when full."""
+        encoded = self._encode(signs)
+        prefix = self._prefix(language, context)
+        key = prefix + encoded
+        if key in self._entries:
+            self._entries[key] = CachedTranslation(tuple(signs), translation, confidence)
+            self._entries.move_to_end(key)
+            return
+        
+        self._entries[key] = CachedTranslation(tuple(signs), translation, confidence)
+        for variant in self._variants(encoded, self._index_budget(len(encoded))):
+            variant = prefix + variant
+            found = self._index.get(variant)
+            if found is None:
+                self._index[variant] = key
+            elif isinstance(found, list):
+                found.append(key)
+            else:
+                self._index[variant] = [found, key]
+        
+        if len(self._entries) > self.max_entries:
+            evicted, _ = self._entries.popitem(last=False)
+            self._unindex(evicted)
+            self.evictions += 1
+    
+    def _unindex(self, key: str):
+        prefix, encoded = key.rsplit("\0", 1)
+        for variant in self._variants(encoded, self._index_budget(len(encoded))):
+            variant = prefix + "\0" + variant
+            found = self._index.get(variant)
+            if isinstance(found, list):
+                found.remove(key)
+                if len(found) == 1:
+                    self._index[variant] = found[0]
+            elif found == key:
+                del self._index[variant]
+    
+    def get_stats(self) -> dict:
+        """Get cache statistics."""
+        return {
+            "entries": len(self._entries),
+            "index_keys": len(self._index),
+            "lookups": self.lookups,
+            "exact_hits": self.exact_hits,
+            "fuzzy_hits": self.fuzzy_hits,
+            "rejected": self.rejected,
+            "evictions": self.evictions,
+            "hit_rate": round((self.exact_hits + self.fuzzy_hits) / self.lookups, 3) if self.lookups else 0.0,
+        }
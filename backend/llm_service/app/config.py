@@ -1,6 +1,7 @@
 """Configuration for LLM Service."""
 import os
 from functools import lru_cache
+from typing import Optional
 
 
 class Settings:
@@ -9,6 +10,10 @@ class Settings:
     # API Keys
     GEMINI_API_KEY: str = os.getenv("GEMINI_API_KEY", "")
     GEMINI_MODEL: str = os.getenv("GEMINI_MODEL", "gemini-pro")
+    # "gemini" for the real API, "stub" for a local simulated model (no network)
+    GEMINI_BACKEND: str = os.getenv("GEMINI_BACKEND", "gemini").lower()
+    # Send the static prompt rules as a system instruction
+    GEMINI_USE_SYSTEM_INSTRUCTION: bool = os.getenv("GEMINI_USE_SYSTEM_INSTRUCTION", "true").lower() == "true"
     
     # Server
     PORT: int = int(os.getenv("PORT", "8002"))
@@ -21,14 +26,59 @@ class Settings:
     # Logging
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "info")
     
+    # Observability
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+    TRACING_ENABLED: bool = os.getenv("TRACING_ENABLED", "false").lower() == "true"
+    TRACE_SAMPLE_RATIO: float = float(os.getenv("TRACE_SAMPLE_RATIO", "0.01"))
+    TRACE_EXPORT_PATH: str = os.getenv("TRACE_EXPORT_PATH", "")  # OTLP/JSON lines file
+    TRACE_OTLP_ENDPOINT: str = os.getenv("TRACE_OTLP_ENDPOINT", "")  # e.g. http://localhost:4318
+    
     # LLM Settings
     MAX_CONTEXT_LENGTH: int = 10  # Max previous sentences to keep
     REQUEST_TIMEOUT: int = 30  # seconds
     
+    # Upstream resilience
+    GEMINI_DEADLINE_MS: int = int(os.getenv("GEMINI_DEADLINE_MS", "8000"))
+    BREAKER_FAILURE_THRESHOLD: int = int(os.getenv("BREAKER_FAILURE_THRESHOLD", "5"))
+    BREAKER_RESET_TIMEOUT_S: float = float(os.getenv("BREAKER_RESET_TIMEOUT_S", "30"))
+    GEMINI_HEDGE_ENABLED: bool = os.getenv("GEMINI_HEDGE_ENABLED", "false").lower() == "true"
+    GEMINI_HEDGE_PERCENTILE: float = float(os.getenv("GEMINI_HEDGE_PERCENTILE", "95"))
+    GEMINI_HEDGE_MIN_SAMPLES: int = int(os.getenv("GEMINI_HEDGE_MIN_SAMPLES", "20"))
+    
+    # Approximate-match translation cache in front of Gemini
+    TRANSLATION_CACHE_ENABLED: bool = os.getenv("TRANSLATION_CACHE_ENABLED", "true").lower() == "true"
+    TRANSLATION_CACHE_MAX_ENTRIES: int = int(os.getenv("TRANSLATION_CACHE_MAX_ENTRIES", "100000"))
+    TRANSLATION_CACHE_MAX_DISTANCE: str = os.getenv("TRANSLATION_CACHE_MAX_DISTANCE", "4:1")  # min_length:max_edits,...
+    TRANSLATION_CACHE_MIN_CONFIDENCE: float = float(os.getenv("TRANSLATION_CACHE_MIN_CONFIDENCE", "0.85"))
+    TRANSLATION_CACHE_DISTANCE_PENALTY: float = float(os.getenv("TRANSLATION_CACHE_DISTANCE_PENALTY", "0.1"))
+    TRANSLATION_CACHE_CONFUSABLE: str = os.getenv("TRANSLATION_CACHE_CONFUSABLE", "UV,SA,O0,V2,W6,F9,MN")
+    
+    # Speculative translation of sequences still being signed
+    SPECULATION_MAX_INFLIGHT: int = int(os.getenv("SPECULATION_MAX_INFLIGHT", "8"))
+    SPECULATION_TTL_S: float = float(os.getenv("SPECULATION_TTL_S", "30"))
+    
+    # Admission control: concurrent translations, and how many may wait and for how long (0 concurrent disables)
+    ADMISSION_MAX_CONCURRENT: int = int(os.getenv("ADMISSION_MAX_CONCURRENT", "32"))
+    ADMISSION_MAX_QUEUE: int = int(os.getenv("ADMISSION_MAX_QUEUE", "64"))
+    ADMISSION_MAX_WAIT_MS: float = float(os.getenv("ADMISSION_MAX_WAIT_MS", "1000"))
+    
+    # Merge a session's commits that arrive while its previous translation is in flight into one upstream call
+    AGGREGATION_ENABLED: bool = os.getenv("AGGREGATION_ENABLED", "true").lower() == "true"
+    
+    # Stub backend behaviour (GEMINI_BACKEND=stub)
+    GEMINI_STUB_LATENCY_MS: float = float(os.getenv("GEMINI_STUB_LATENCY_MS", "300"))
+    GEMINI_STUB_LATENCY_DIST: str = os.getenv("GEMINI_STUB_LATENCY_DIST", "lognormal")  # fixed, uniform, normal, lognormal, exponential
+    GEMINI_STUB_LATENCY_SIGMA: float = float(os.getenv("GEMINI_STUB_LATENCY_SIGMA", "0.5"))
+    GEMINI_STUB_ERROR_RATE: float = float(os.getenv("GEMINI_STUB_ERROR_RATE", "0"))
+    GEMINI_STUB_HANG_RATE: float = float(os.getenv("GEMINI_STUB_HANG_RATE", "0"))  # Calls that never answer
+    GEMINI_STUB_STREAM_CHUNKS: int = int(os.getenv("GEMINI_STUB_STREAM_CHUNKS", "4"))
+    GEMINI_STUB_STREAM_CHUNK_MS: float = float(os.getenv("GEMINI_STUB_STREAM_CHUNK_MS", "20"))
+    GEMINI_STUB_SEED: Optional[int] = int(os.getenv("GEMINI_STUB_SEED")) if os.getenv("GEMINI_STUB_SEED") else None
+    
     @property
     def is_configured(self) -> bool:
         """Check if required settings are configured."""
-        return bool(self.GEMINI_API_KEY)
+        return bool(self.GEMINI_API_KEY) or self.GEMINI_BACKEND == "stub"
 
 
 @lru_cache()
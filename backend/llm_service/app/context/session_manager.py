@@ -50,9 +50,13 @@ class SessionManager:
         """Initialize session manager."""
         self._sessions: Dict[str, Session] = {}
         self._max_sessions = max_sessions
-n        self._timeout_minutes = timeout_minutes
+        self._timeout_minutes = timeout_minutes
         logger.info("SessionManager initialized")
     
+    def __len__(self) -> int:
+        """Number of sessions currently held."""
+        return len(self._sessions)
+    
     def create_session(self) -> str:
         """Create a new session."""
         session_id = str(uuid.uuid4())
@@ -1,15 +1,22 @@
 """LLM Service - FastAPI application for sign language translation."""
+import time
+
+_import_started = time.perf_counter()
+
+import asyncio
 import logging
 import os
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import get_settings
 from app.processors.sentence_builder import SentenceBuilder
-from app.routers import translate_router, health_router
-from app.routers.health import set_sentence_builder
+from app.routers import translate_router, health_router, metrics_router
+from app.routers.health import set_sentence_builder, set_startup
+from app.routers import translate
+from app.tracing import tracer, set_current_trace, reset_current_trace
 
 # Configure logging
 logging.basicConfig(
@@ -35,13 +42,22 @@ async def lifespan(app: FastAPI):
         logger.warning("⚠️ GEMINI_API_KEY not set. Running in fallback mode.")
     else:
         logger.info(f"✅ Configuration loaded")
-        logger.info(f"   Model: {settings.GEMINI_MODEL}")
+        logger.info(f"   Model: {settings.GEMINI_MODEL} ({settings.GEMINI_BACKEND} backend)")
     
-    # Initialize sentence builder
-    sentence_builder = SentenceBuilder()
+    # Share the translate router's sentence builder so health reports its stats
+    sentence_builder = translate.sentence_builder
     set_sentence_builder(sentence_builder)
     
-    logger.info(f"🚀 LLM Service started on port {settings.PORT}")
+    # Import the Gemini SDK and build the per-language models now, not on the first request
+    warmup_s = await asyncio.to_thread(sentence_builder.gemini.warm_up)
+    set_startup({
+        "import_ms": round(_import_s * 1000, 1),
+        "warmup_ms": round(warmup_s * 1000, 1),
+        "ready_ms": round((time.perf_counter() - _import_started) * 1000, 1),
+    })
+    
+    logger.info(f"🚀 LLM Service started on port {settings.PORT} "
+                f"(import {_import_s * 1000:.0f} ms, warm-up {warmup_s * 1000:.0f} ms)")
     
     yield
     
@@ -66,9 +82,29 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def trace_requests(request: Request, call_next):
+    """Continue the caller's trace (W3C traceparent) for each request."""
+    trace = tracer.start_trace(
+        f"{request.method} {request.url.path}",
+        traceparent=request.headers.get("traceparent")
+    )
+    token = set_current_trace(trace)
+    try:
+        response = await call_next(request)
+        trace.set_attribute("http.status_code", response.status_code)
+        return response
+    finally:
+        reset_current_trace(token)
+        trace.release()
+
+
 # Include routers
 app.include_router(translate_router)
 app.include_router(health_router)
+app.include_router(metrics_router)
+
+_import_s = time.perf_counter() - _import_started
 
 
 @app.get("/")
@@ -0,0 +1,173 @@
+"""Admission control for translation requests."""
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+
+from app.config import get_settings
+from app.metrics import metrics
+
+# Queued requests are admitted in this order; shed low-priority requests are rejected, the rest degraded
+PRIORITIES = {"high": 0, "normal": 1, "low": 2}
+
+wait_seconds = metrics.histogram("admission_wait_seconds", "Time translation requests queued for admission")
+
+
+class Overloaded(Exception):
+    """A request was shed because the service is at capacity."""
+    
+    def __init__(self, reason: str, retry_after_s: int):
+        super().__init__(f"Overloaded ({reason}), retry after {retry_after_s}s")
+        self.reason = reason
+        self.retry_after_s = retry_after_s
+
+
+class AdmissionController:
+    """
+    Bounds concurrent translation requests.
+
+    Up to ``max_concurrent`` requests run at once. Later ones queue, by
+    priority and then arrival, for at most ``max_wait_ms``. A request is
+    shed when the queue already holds ``max_queue`` requests or its wait
+    runs out, so admitted requests never queue longer than the limit.
+    A freed slot is handed straight to the next queued request.
+
+    ``max_concurrent`` of 0 admits everything.
+    """
+    
+    def __init__(
+        self,
+        max_concurrent: Optional[int] = None,
+        max_queue: Optional[int] = None,
+        max_wait_ms: Optional[float] = None
+    ):
+        settings = get_settings()
+        self.max_concurrent = settings.ADMISSION_MAX_CONCURRENT if max_concurrent is None else max_concurrent
+        self.max_queue = settings.ADMISSION_MAX_QUEUE if max_queue is None else max_queue
+        self.max_wait_s = (settings.ADMISSION_MAX_WAIT_MS if max_wait_ms is None else max_wait_ms) / 1000
+        
+        self._active = 0
+        self._queued = 0
+        self._waiters = []  # (priority rank, arrival, future); cancelled entries are skipped on release
+        self._arrivals = itertools.count()
+        self._service_s = 1.0  # Moving average of time a request holds its slot
+        self._recent_waits = deque(maxlen=1024)
+        
+        self.admitted = 0
+        self.queued_total = 0
+        self.shed: Dict[str, int] = {"queue_full": 0, "timeout": 0, "no_capacity": 0}
+        self.degraded = 0
+        self.rejected = 0
+    
+    @property
+    def enabled(self) -> bool:
+        return self.max_concurrent > 0
+    
+    @property
+    def queue_depth(self) -> int:
+        """Requests waiting for a slot."""
+        return self._queued
+    
+    @asynccontextmanager
+    async def admit(self, priority: str = "normal"):
+        """
+        Hold a slot for the duration of the block.
+
+        Raises:
+            Overloaded: If the request was shed
+        """
+        if not self.enabled:
+            yield
+            return
+        
+        await self._acquire(priority)
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self._service_s += 0.1 * (time.monotonic() - started - self._service_s)
+            self._release()
+    
+    def spare_capacity(self) -> bool:
+        """
+        Whether work that only runs on spare capacity may start now: a
+        slot is free and nothing is queued. Counted as shed if not.
+        The work does not hold a slot.
+        """
+        if not self.enabled or (self._active < self.max_concurrent and not self._queued):
+            return True
+        self.shed["no_capacity"] += 1
+        return False
+    
+    def retry_after(self) -> int:
+        """Seconds until the current queue has likely drained."""
+        return max(1, math.ceil((self._queued + 1) * self._service_s / max(self.max_concurrent, 1)))
+    
+    async def _acquire(self, priority: str):
+        if self._active < self.max_concurrent and not self._queued:
+            self._active += 1
+            self.admitted += 1
+            wait_seconds.observe(0.0)
+            self._recent_waits.append(0.0)
+            return
+        if self._queued >= self.max_queue:
+            raise self._shed("queue_full")
+        
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (PRIORITIES.get(priority, PRIORITIES["normal"]), next(self._arrivals), future))
+        self._queued += 1
+        self.queued_total += 1
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(future, self.max_wait_s)
+        except asyncio.TimeoutError:
+            # The slot may have been handed over just as the wait ran out
+            if not future.done() or future.cancelled():
+                raise self._shed("timeout")
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self._release()
+            raise
+        finally:
+            self._queued -= 1
+        
+        waited = time.monotonic() - started
+        wait_seconds.observe(waited)
+        self._recent_waits.append(waited)
+        self.admitted += 1
+    
+    def _release(self):
+        """Hand the slot to the next queued request, or free it."""
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+        self._active -= 1
+    
+    def _shed(self, reason: str) -> Overloaded:
+        self.shed[reason] += 1
+        return Overloaded(reason, self.retry_after())
+    
+    def get_stats(self) -> dict:
+        """Get admission statistics."""
+        waits = sorted(self._recent_waits)
+        return {
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "max_wait_ms": int(self.max_wait_s * 1000),
+            "active": self._active,
+            "queued": self._queued,
+            "admitted": self.admitted,
+            "queued_total": self.queued_total,
+            "shed": dict(self.shed),
+            "degraded": self.degraded,
+            "rejected": self.rejected,
+            "wait_p50_ms": round(waits[len(waits) // 2] * 1000, 1) if waits else 0.0,
+            "wait_p99_ms": round(waits[int(len(waits) * 0.99)] * 1000, 1) if waits else 0.0,
+            "retry_after_s": self.retry_after(),
+        }
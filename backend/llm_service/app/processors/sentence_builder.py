@@ -1,13 +1,38 @@
 """Sentence builder for sign language translation."""
+import asyncio
 import logging
-from typing import List, Optional
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
 
 from app.clients.gemini_client import GeminiClient
+from app.config import get_settings
 from app.context.session_manager import SessionManager
+from app.processors.admission import PRIORITIES, AdmissionController, Overloaded
+from app.processors.speculation import SpeculationCache
+from app.metrics import metrics
+from app.tracing import current_trace, set_current_trace, reset_current_trace
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class PendingCommit:
+    """A commit waiting for its session's previous translation."""
+    sign_sequence: List[str]
+    priority: str
+    future: asyncio.Future
+
+
+@dataclass
+class CommitBatch:
+    """Commits of one session translated together."""
+    session_id: str
+    context: Optional[str]
+    language: str
+    commits: List[PendingCommit] = field(default_factory=list)
+
+
 class SentenceBuilder:
     """Builds natural language sentences from sign sequences."""
     
@@ -15,46 +40,154 @@ class SentenceBuilder:
         """Initialize sentence builder."""
         self.gemini = GeminiClient()
         self.sessions = SessionManager()
+        self.speculations = SpeculationCache()
+        self.admission = AdmissionController()
+        
+        # Per-session commit aggregation
+        self.aggregation_enabled = get_settings().AGGREGATION_ENABLED
+        self._batches: Dict[str, CommitBatch] = {}  # Batch still accepting commits
+        self._flushes: Dict[str, asyncio.Task] = {}  # Latest batch being translated or stored
+        self.merged_batches = 0
+        self.merged_commits = 0
+        
+        self._register_metrics()
         logger.info("SentenceBuilder initialized")
     
+    def _register_metrics(self):
+        """Expose session and upstream state as scrape-time metrics."""
+        gemini = self.gemini
+        metrics.gauge("sessions", "Active conversation sessions",
+                      callback=lambda: len(self.sessions))
+        metrics.gauge("circuit_breaker_open", "1 while the Gemini circuit breaker is open",
+                      callback=lambda: int(gemini.breaker.state.value == "open"))
+        metrics.counter("gemini_timeouts_total", "Gemini calls cut off at the deadline",
+                        callback=lambda: gemini.timeouts)
+        metrics.counter("gemini_hedges_total", "Hedged duplicate Gemini requests sent",
+                        callback=lambda: gemini.hedges_sent)
+        metrics.counter("gemini_prompt_bytes_total", "Prompt bytes sent to Gemini",
+                        callback=lambda: gemini.prompt_stats.total_bytes)
+        if gemini.cache is not None:
+            cache = gemini.cache
+            metrics.counter("translation_cache_hits_total", "Translations served from the cache", {"match": "exact"},
+                            callback=lambda: cache.exact_hits)
+            metrics.counter("translation_cache_hits_total", "Translations served from the cache", {"match": "fuzzy"},
+                            callback=lambda: cache.fuzzy_hits)
+            metrics.gauge("translation_cache_entries", "Cached translations",
+                          callback=lambda: len(cache))
+        admission = self.admission
+        metrics.gauge("admission_queue_depth", "Translation requests waiting for admission",
+                      callback=lambda: admission.queue_depth)
+        for reason in admission.shed:
+            metrics.counter("admission_shed_total", "Translation requests shed at admission", {"reason": reason},
+                            callback=lambda reason=reason: admission.shed[reason])
+        metrics.counter("admission_degraded_total", "Shed requests translated locally instead",
+                        callback=lambda: admission.degraded)
+        metrics.counter("merged_commits_total", "Commits translated together with others of their session",
+                        callback=lambda: self.merged_commits)
+        speculations = self.speculations
+        metrics.counter("speculations_total", "Speculative translations started",
+                        callback=lambda: speculations.started)
+        metrics.counter("speculation_hits_total", "Committed sequences answered by a speculation",
+                        callback=lambda: speculations.hits)
+        metrics.counter("speculations_cancelled_total", "Speculations cancelled because the sequence changed",
+                        callback=lambda: speculations.cancelled)
+    
+    @metrics.timed("sentence_builder_process")
     async def process(
         self,
         sign_sequence: List[str],
         session_id: str,
         context: Optional[str] = None,
-        language: str = "en"
+        language: str = "en",
+        priority: str = "normal"
     ) -> dict:
         """
         Process sign sequence into natural language.
         
+        A commit is translated at once unless the session's previous
+        translation is still in flight. Commits arriving meanwhile are
+        translated together in one upstream call when it is done; each
+        still gets its own result and history entry, in arrival order.
+        
         Args:
             sign_sequence: List of detected signs
             session_id: Session ID for context tracking
             context: Optional override context
             language: Target language
+            priority: Admission priority (high, normal or low)
             
         Returns:
             Translation result with metadata
+            
+        Raises:
+            Overloaded: If a low-priority request was shed; others are
+                translated locally instead
         """
-        # Ensure session exists
-        session = self.sessions.get_session(session_id)
-        if not session:
-            logger.warning(f"Creating new session: {session_id}")
-            # Create if not exists (or use create_session for new)
+        trace = current_trace()
+        trace.set_attribute("session_id", session_id)
         
-        # Get context from session if not provided
-        if context is None:
-            context = self.sessions.get_context(session_id)
+        if not self.aggregation_enabled:
+            try:
+                async with self.admission.admit(priority):
+                    return await self._process_now(sign_sequence, session_id, context, language)
+            except Overloaded as e:
+                trace.set_attribute("shed", e.reason)
+                return self._process_shed(e, sign_sequence, session_id, priority)
         
-        # Call LLM for translation
-        start_time = __import__('time').time()
-        result = await self.gemini.translate_signs(sign_sequence, context, language)
-        processing_time = int((__import__('time').time() - start_time) * 1000)
+        start_time = time.time()
+        batch = self._batches.get(session_id)
+        if batch is None or batch.context != context or batch.language != language:
+            batch = self._open_batch(session_id, context, language)
+        future = asyncio.get_running_loop().create_future()
+        batch.commits.append(PendingCommit(list(sign_sequence), priority, future))
+        
+        try:
+            result = await future
+        except Overloaded as e:
+            trace.set_attribute("shed", e.reason)
+            raise
+        trace.set_attribute("merged", result.get("merged", 1))
+        result["processing_time_ms"] = int((time.time() - start_time) * 1000)
+        return result
+    
+    async def _process_now(
+        self,
+        sign_sequence: List[str],
+        session_id: str,
+        context: Optional[str],
+        language: str
+    ) -> dict:
+        """Translate one commit and store it in the session."""
+        trace = current_trace()
+        
+        with trace.span("session_context"):
+            # Ensure session exists
+            session = self.sessions.get_session(session_id)
+            if not session:
+                logger.warning(f"Creating new session: {session_id}")
+                # Create if not exists (or use create_session for new)
+            
+            # Get context from session if not provided
+            if context is None:
+                context = self.sessions.get_context(session_id)
+        
+        # Call LLM for translation, unless it was already started speculatively
+        start_time = time.time()
+        with trace.span("translate", signs=len(sign_sequence)) as span:
+            result = await self._speculated(session_id, sign_sequence, context, language)
+            speculated = result is not None
+            if not speculated:
+                result = await self.gemini.translate_signs(sign_sequence, context, language)
+            span.set_attribute("fallback", result.get("fallback", False))
+            span.set_attribute("cached", result.get("cached", False))
+            span.set_attribute("speculated", speculated)
+        processing_time = int((time.time() - start_time) * 1000)
         
         translation = result["translation"]
         
         # Store interaction
-        self.sessions.add_interaction(session_id, sign_sequence, translation)
+        with trace.span("session_store"):
+            self.sessions.add_interaction(session_id, sign_sequence, translation)
         
         return {
             "translation": translation,
@@ -62,14 +195,191 @@ class SentenceBuilder:
             "session_id": session_id,
             "processing_time_ms": processing_time,
             "alternatives": result.get("alternatives", []),
-            "fallback": result.get("fallback", False)
+            "fallback": result.get("fallback", False),
+            "speculated": speculated
         }
     
+    def _process_shed(self, error: Overloaded, sign_sequence: List[str], session_id: str, priority: str) -> dict:
+        """Reject a shed low-priority commit; translate any other locally, without Gemini, and store it."""
+        if priority == "low":
+            self.admission.rejected += 1
+            raise error
+        self.admission.degraded += 1
+        result = self.gemini._fallback_translate(sign_sequence)
+        self.sessions.add_interaction(session_id, sign_sequence, result["translation"])
+        return {
+            "translation": result["translation"],
+            "confidence": result.get("confidence", 0.5),
+            "session_id": session_id,
+            "processing_time_ms": 0,
+            "alternatives": result.get("alternatives", []),
+            "fallback": True,
+            "degraded": True
+        }
+    
+    def _open_batch(self, session_id: str, context: Optional[str], language: str) -> "CommitBatch":
+        """Start collecting a session's commits; they are translated once the previous batch is stored."""
+        batch = CommitBatch(session_id=session_id, context=context, language=language)
+        previous = self._flushes.get(session_id)
+        task = asyncio.create_task(self._flush(batch, previous))
+        self._batches[session_id] = batch
+        self._flushes[session_id] = task
+        task.add_done_callback(lambda done: self._flush_done(session_id, done))
+        return batch
+    
+    def _flush_done(self, session_id: str, task: asyncio.Task):
+        if self._flushes.get(session_id) is task:
+            del self._flushes[session_id]
+    
+    async def _flush(self, batch: "CommitBatch", previous: Optional[asyncio.Task]):
+        """
+        Translate a batch once the session's previous batch has been
+        stored, so context and history stay in order. Commits keep
+        joining the batch until then. The batch takes one admission slot,
+        at the priority of its most urgent commit.
+        """
+        try:
+            if previous is not None:
+                await asyncio.wait([previous])
+            if self._batches.get(batch.session_id) is batch:
+                del self._batches[batch.session_id]
+            
+            commits = batch.commits
+            priority = min((commit.priority for commit in commits),
+                           key=lambda p: PRIORITIES.get(p, PRIORITIES["normal"]))
+            try:
+                async with self.admission.admit(priority):
+                    if len(commits) == 1:
+                        results = [await self._process_now(commits[0].sign_sequence, batch.session_id,
+                                                           batch.context, batch.language)]
+                    else:
+                        results = await self._process_merged(batch)
+            except Overloaded as e:
+                for commit in commits:
+                    if commit.future.done():
+                        continue
+                    try:
+                        commit.future.set_result(self._process_shed(e, commit.sign_sequence, batch.session_id,
+                                                                    commit.priority))
+                    except Overloaded as rejected:
+                        commit.future.set_exception(rejected)
+                return
+            for commit, result in zip(commits, results):
+                if not commit.future.done():
+                    commit.future.set_result(result)
+        except asyncio.CancelledError:
+            for commit in batch.commits:
+                commit.future.cancel()
+            raise
+        except Exception as e:
+            for commit in batch.commits:
+                if not commit.future.done():
+                    commit.future.set_exception(e)
+    
+    async def _process_merged(self, batch: "CommitBatch") -> List[dict]:
+        """Translate several commits of a session in one upstream call and store each."""
+        trace = current_trace()
+        session_id = batch.session_id
+        sequences = [commit.sign_sequence for commit in batch.commits]
+        self.merged_batches += 1
+        self.merged_commits += len(sequences)
+        
+        context = batch.context
+        if context is None:
+            context = self.sessions.get_context(session_id)
+        # None of these is the sequence that was speculated on last
+        self.speculations.cancel(session_id)
+        
+        start_time = time.time()
+        with trace.span("translate", signs=sum(len(signs) for signs in sequences), commits=len(sequences)) as span:
+            results = await self.gemini.translate_sign_sequences(sequences, context, batch.language)
+            span.set_attribute("fallback", any(result.get("fallback", False) for result in results))
+        processing_time = int((time.time() - start_time) * 1000)
+        
+        with trace.span("session_store"):
+            for signs, result in zip(sequences, results):
+                self.sessions.add_interaction(session_id, signs, result["translation"])
+        
+        return [
+            {
+                "translation": result["translation"],
+                "confidence": result.get("confidence", 0.9),
+                "session_id": session_id,
+                "processing_time_ms": processing_time,
+                "alternatives": result.get("alternatives", []),
+                "fallback": result.get("fallback", False),
+                "degraded": result.get("degraded", False),
+                "speculated": False,
+                "merged": len(sequences)
+            }
+            for result in results
+        ]
+    
+    async def speculate(
+        self,
+        sign_sequence: List[str],
+        session_id: str,
+        context: Optional[str] = None,
+        language: str = "en"
+    ) -> bool:
+        """
+        Start translating a sequence that is still being signed.
+        The result is not stored in the session; ``process`` uses it if
+        the same sequence is committed. Only started while admission has
+        spare capacity. The translation outlives the request, so it is
+        traced on its own, linked to the request's trace.
+        
+        Returns:
+            Whether the speculation was accepted
+        """
+        if not self.admission.spare_capacity():
+            return False
+        if context is None:
+            context = self.sessions.get_context(session_id)
+        signs = list(sign_sequence)
+        request_trace = current_trace()
+        
+        async def translate() -> dict:
+            trace = request_trace.start_linked("speculation", session_id=session_id, signs=len(signs))
+            token = set_current_trace(trace)
+            try:
+                return await self.gemini.translate_signs(signs, context, language)
+            except asyncio.CancelledError:
+                trace.set_attribute("cancelled", True)
+                raise
+            finally:
+                reset_current_trace(token)
+                trace.release()
+        
+        return self.speculations.speculate(session_id, (tuple(signs), context, language), translate)
+    
+    async def _speculated(
+        self,
+        session_id: str,
+        sign_sequence: List[str],
+        context: str,
+        language: str
+    ) -> Optional[dict]:
+        """Result of a matching speculation, waiting for it if still running."""
+        task = self.speculations.take(session_id, (tuple(sign_sequence), context, language))
+        if task is None:
+            return None
+        try:
+            return await task
+        except asyncio.CancelledError:
+            if not task.cancelled():
+                raise
+            return None
+        except Exception as e:
+            logger.warning(f"Speculative translation unusable: {e}")
+            return None
+    
     async def translate_batch(
         self,
         sign_sequences: List[List[str]],
         session_id: str,
-        language: str = "en"
+        language: str = "en",
+        priority: str = "normal"
     ) -> List[dict]:
         """
         Process multiple sign sequences.
@@ -78,6 +388,7 @@ class SentenceBuilder:
             sign_sequences: List of sign sequences
             session_id: Session ID
             language: Target language
+            priority: Admission priority of each sequence
             
         Returns:
             List of translation results
@@ -86,7 +397,7 @@ class SentenceBuilder:
         context = ""
         
         for signs in sign_sequences:
-            result = await self.process(signs, session_id, context, language)
+            result = await self.process(signs, session_id, context, language, priority)
             results.append(result)
             context = result["translation"]
         
@@ -105,8 +416,18 @@ class SentenceBuilder:
     
     def clear_session(self, session_id: str) -> bool:
         """Clear a session."""
+        self.speculations.cancel(session_id)
         return self.sessions.delete_session(session_id)
     
+    def get_aggregation_stats(self) -> dict:
+        """Get commit aggregation statistics."""
+        return {
+            "enabled": self.aggregation_enabled,
+            "open_batches": len(self._batches),
+            "merged_batches": self.merged_batches,
+            "merged_commits": self.merged_commits,
+        }
+    
     def is_healthy(self) -> bool:
         """Check if service is healthy."""
         return self.gemini.is_healthy()
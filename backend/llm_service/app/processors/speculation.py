@@ -0,0 +1,143 @@
+"""Speculative translation of sign sequences that are still being signed."""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# What a translation depends on: signs, context and target language
+SpeculationKey = Tuple[Tuple[str, ...], str, str]
+
+
+@dataclass
+class Speculation:
+    """A speculative translation of one session's current sequence."""
+    key: SpeculationKey
+    task: asyncio.Task
+    started_at: float
+
+
+class SpeculationCache:
+    """
+    Holds at most one speculative translation per session.
+
+    The media service speculates on the sequence still being signed once
+    it stops changing. If the same sequence (with the same context and
+    language) is then committed, the finished result, or the request
+    still in flight, is used instead of a new Gemini call. A speculation
+    on a different sequence, a commit that does not match, or an explicit
+    cancel stops the previous one.
+
+    Speculations are low priority. At most ``max_inflight`` run at once,
+    and any more are dropped. Entries older than ``ttl_s`` are discarded.
+    """
+    
+    def __init__(self, max_inflight: Optional[int] = None, ttl_s: Optional[float] = None):
+        settings = get_settings()
+        self.max_inflight = settings.SPECULATION_MAX_INFLIGHT if max_inflight is None else max_inflight
+        self.ttl_s = settings.SPECULATION_TTL_S if ttl_s is None else ttl_s
+        self._speculations: Dict[str, Speculation] = {}  # Oldest first
+        self._inflight = 0
+        self.started = 0
+        self.dropped = 0
+        self.cancelled = 0
+        self.hits = 0
+        self.inflight_hits = 0
+        self.misses = 0
+    
+    def __len__(self) -> int:
+        """Number of sessions with a speculation."""
+        return len(self._speculations)
+    
+    def speculate(self, session_id: str, key: SpeculationKey,
+                  translate: Callable[[], Awaitable[dict]]) -> bool:
+        """
+        Start translating ``key`` for a session, replacing its previous speculation.
+
+        Returns:
+            Whether a speculation for ``key`` is running or done
+        """
+        current = self._speculations.get(session_id)
+        if current is not None and current.key == key and not self._expired(current):
+            return True
+        self.cancel(session_id)
+        self._evict_expired()
+        
+        if self._inflight >= self.max_inflight:
+            self.dropped += 1
+            return False
+        
+        task = asyncio.create_task(translate())
+        self._inflight += 1
+        task.add_done_callback(self._finished)
+        self._speculations[session_id] = Speculation(key=key, task=task, started_at=time.monotonic())
+        self.started += 1
+        return True
+    
+    def take(self, session_id: str, key: SpeculationKey) -> Optional[asyncio.Task]:
+        """
+        Claim a session's speculation for a committed sequence.
+
+        Returns:
+            The speculation's task if it was for ``key``, otherwise None;
+            a non-matching speculation is cancelled
+        """
+        speculation = self._speculations.pop(session_id, None)
+        if speculation is None:
+            return None
+        if speculation.key != key or self._expired(speculation):
+            self.misses += 1
+            self._cancel(speculation)
+            return None
+        
+        self.hits += 1
+        if not speculation.task.done():
+            self.inflight_hits += 1
+        return speculation.task
+    
+    def cancel(self, session_id: str) -> bool:
+        """Drop a session's speculation, cancelling it if still running."""
+        speculation = self._speculations.pop(session_id, None)
+        if speculation is None:
+            return False
+        self._cancel(speculation)
+        return True
+    
+    def _cancel(self, speculation: Speculation):
+        if not speculation.task.done():
+            speculation.task.cancel()
+            self.cancelled += 1
+    
+    def _expired(self, speculation: Speculation) -> bool:
+        return time.monotonic() - speculation.started_at > self.ttl_s
+    
+    def _evict_expired(self):
+        """Drop expired speculations; they are kept in start order."""
+        while self._speculations:
+            session_id, speculation = next(iter(self._speculations.items()))
+            if not self._expired(speculation):
+                break
+            del self._speculations[session_id]
+            self._cancel(speculation)
+    
+    def _finished(self, task: asyncio.Task):
+        self._inflight -= 1
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Speculative translation failed: {task.exception()}")
+    
+    def get_stats(self) -> dict:
+        """Get speculation statistics."""
+        return {
+            "sessions": len(self._speculations),
+            "inflight": self._inflight,
+            "started": self.started,
+            "dropped": self.dropped,
+            "cancelled": self.cancelled,
+            "hits": self.hits,
+            "inflight_hits": self.inflight_hits,
+            "misses": self.misses,
+        }
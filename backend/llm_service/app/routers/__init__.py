@@ -1,5 +1,6 @@
 """API routers."""
 from .translate import router as translate_router
 from .health import router as health_router
+from .metrics import router as metrics_router
 
-__all__ = ["translate_router", "health_router"]
+__all__ = ["translate_router", "health_router", "metrics_router"]
@@ -1,7 +1,9 @@
 """Health check endpoints."""
 import logging
 from datetime import datetime
+from typing import Optional
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
 
 from app.processors.sentence_builder import SentenceBuilder
 
@@ -11,6 +13,9 @@ router = APIRouter(tags=["health"])
 # Access to sentence builder for health checks
 sentence_builder = None
 
+# Start-up timings, set once the Gemini client has been warmed up
+startup: Optional[dict] = None
+
 
 def set_sentence_builder(sb: SentenceBuilder):
     """Set sentence builder instance."""
@@ -18,6 +23,12 @@ def set_sentence_builder(sb: SentenceBuilder):
     sentence_builder = sb
 
 
+def set_startup(stats: dict):
+    """Record start-up timings; the service reports ready from then on."""
+    global startup
+    startup = stats
+
+
 @router.get("/health")
 async def health_check():
     """Basic health check."""
@@ -27,10 +38,25 @@ async def health_check():
         "status": "healthy" if healthy else "degraded",
         "service": "llm_service",
         "timestamp": datetime.utcnow().isoformat(),
-        "gemini_api": "up" if healthy else "down"
+        "gemini_api": "up" if healthy else "down",
+        "prompt": sentence_builder.gemini.get_prompt_stats() if sentence_builder else None,
+        "upstream": sentence_builder.gemini.get_resilience_stats() if sentence_builder else None,
+        "speculation": sentence_builder.speculations.get_stats() if sentence_builder else None,
+        "aggregation": sentence_builder.get_aggregation_stats() if sentence_builder else None,
+        "admission": sentence_builder.admission.get_stats() if sentence_builder else None,
+        "translation_cache": sentence_builder.gemini.cache.get_stats() if sentence_builder and sentence_builder.gemini.cache else None,
+        "startup": startup
     }
 
 
+@router.get("/ready")
+async def readiness_check():
+    """Readiness check; not ready until start-up has warmed up the Gemini client."""
+    if startup is None:
+        return JSONResponse(status_code=503, content={"ready": False, "service": "llm_service"})
+    return {"ready": True, "service": "llm_service"}
+
+
 @router.get("/api/v1/health")
 async def health_check_v1():
     """Versioned health check."""
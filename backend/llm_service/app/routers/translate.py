@@ -1,9 +1,10 @@
 """Translation API endpoints."""
 import logging
-from typing import List, Optional
+from typing import List, Literal, Optional
 from fastapi import APIRouter, HTTPException, status
 from pydantic import BaseModel, Field
 
+from app.processors.admission import Overloaded
 from app.processors.sentence_builder import SentenceBuilder
 
 logger = logging.getLogger(__name__)
@@ -19,6 +20,9 @@ class TranslationRequest(BaseModel):
     session_id: Optional[str] = Field(None, description="Session ID for context")
     context: Optional[str] = Field(None, description="Previous context override")
     language: str = Field("en", description="Target language code")
+    priority: Literal["high", "normal", "low"] = Field(
+        "normal", description="Admission priority; shed low-priority requests get 429, others a local translation"
+    )
 
 
 class TranslationResponse(BaseModel):
@@ -29,6 +33,15 @@ class TranslationResponse(BaseModel):
     processing_time_ms: int
     alternatives: Optional[List[str]] = None
     fallback: bool = False
+    speculated: bool = False  # Served by a speculative translation
+    merged: int = 1  # Commits translated in the same upstream call
+    degraded: bool = False  # Translated locally: shed under load, or lost in an unsplittable merged reply
+
+
+class SpeculationResponse(BaseModel):
+    """Response for a speculative translation request."""
+    session_id: str
+    accepted: bool
 
 
 class SessionResponse(BaseModel):
@@ -55,6 +68,10 @@ async def translate_signs(request: TranslationRequest):
     - **session_id**: Optional session ID (created if not provided)
     - **context**: Optional context override
     - **language**: Target language (en, ru, kz)
+    - **priority**: high, normal or low
+    
+    Beyond the admission limits, low-priority requests get 429 with
+    Retry-After; others get a local translation marked `degraded`.
     """
     try:
         # Create session if not provided
@@ -67,11 +84,18 @@ async def translate_signs(request: TranslationRequest):
             sign_sequence=request.sign_sequence,
             session_id=session_id,
             context=request.context,
-            language=request.language
+            language=request.language,
+            priority=request.priority
         )
         
         return TranslationResponse(**result)
     
+    except Overloaded as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after_s)}
+        )
     except Exception as e:
         logger.error(f"Translation error: {e}")
         raise HTTPException(
@@ -80,6 +104,37 @@ async def translate_signs(request: TranslationRequest):
         )
 
 
+@router.post("/translate/speculate", response_model=SpeculationResponse, status_code=status.HTTP_202_ACCEPTED)
+async def speculate_translation(request: TranslationRequest):
+    """
+    Start a low-priority translation of a sequence that is still being signed.
+    
+    The result is not returned; a later `/translate` of the same sequence,
+    context and language for the session uses it. Replaces the session's
+    previous speculation. Not accepted when too many are already running.
+    """
+    if not request.session_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="session_id is required"
+        )
+    
+    accepted = await sentence_builder.speculate(
+        sign_sequence=request.sign_sequence,
+        session_id=request.session_id,
+        context=request.context,
+        language=request.language
+    )
+    return SpeculationResponse(session_id=request.session_id, accepted=accepted)
+
+
+@router.delete("/translate/speculate/{session_id}")
+async def cancel_speculation(session_id: str):
+    """Cancel a session's speculative translation, e.g. when its sequence changed."""
+    cancelled = sentence_builder.speculations.cancel(session_id)
+    return {"session_id": session_id, "cancelled": cancelled}
+
+
 @router.post("/sessions", response_model=CreateSessionResponse)
 async def create_session():
     """Create a new conversation session."""
@@ -0,0 +1,373 @@
+"""
+Lightweight request tracing with optional OpenTelemetry-compatible export.
+
+A copy of this module lives in media_pipe_service/app/tracing.py; only
+the tracer factory differs, and this service adds the current-trace
+context variable at the end. Change both together; media_pipe_service's
+tests/test_shared_modules.py fails when they drift apart.
+"""
+import json
+import os
+import queue
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from app.config import get_settings
+
+
+def _new_id(nbytes: int) -> str:
+    """Random hex identifier."""
+    return os.urandom(nbytes).hex()
+
+
+@dataclass
+class Span:
+    """A timed operation within a trace."""
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    start_ns: int
+    end_ns: int = 0
+    attributes: dict = field(default_factory=dict)
+    links: List[dict] = field(default_factory=list)  # OTLP links to spans of other traces
+    
+    def set_attribute(self, key: str, value):
+        """Set an attribute on this span."""
+        self.attributes[key] = value
+    
+    def end(self, end_ns: Optional[int] = None):
+        """Mark the span finished, now unless ``end_ns`` is given."""
+        self.end_ns = end_ns or time.time_ns()
+    
+    def to_otlp(self) -> dict:
+        """Convert to an OTLP/JSON span."""
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": 1,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns or self.start_ns),
+            "attributes": [_otlp_attribute(k, v) for k, v in self.attributes.items()],
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        if self.links:
+            span["links"] = self.links
+        return span
+
+
+def _otlp_attribute(key: str, value) -> dict:
+    """Convert an attribute to OTLP/JSON form."""
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+class Trace:
+    """
+    Spans of one unit of work, e.g. a frame from receipt to reply.
+
+    Work that outlives the frame (the LLM request for a committed
+    sequence) holds a reference with ``acquire``; the trace is exported
+    once the last holder calls ``release``. Background work that is not
+    awaited by the unit of work gets a trace of its own from
+    ``start_linked`` instead, so it never adds spans after the export.
+    """
+    
+    sampled = True
+    
+    def __init__(self, tracer: "Tracer", name: str, trace_id: str = None,
+                 parent_id: str = None, start_ns: int = None, attributes: dict = None):
+        self.tracer = tracer
+        self.trace_id = trace_id or _new_id(16)
+        self.root = Span(
+            name=name,
+            trace_id=self.trace_id,
+            span_id=_new_id(8),
+            parent_id=parent_id,
+            start_ns=start_ns or time.time_ns(),
+            attributes=attributes or {},
+        )
+        self.spans: List[Span] = [self.root]
+        self._refs = 1
+        self._lock = threading.Lock()
+    
+    @contextmanager
+    def span(self, name: str, **attributes):
+        """Time a child span of the root."""
+        span = self.start_span(name, **attributes)
+        try:
+            yield span
+        finally:
+            span.end()
+    
+    def start_span(self, name: str, start_ns: int = None, **attributes) -> Span:
+        """Start a child span; the caller ends it with ``end``."""
+        span = Span(
+            name=name,
+            trace_id=self.trace_id,
+            span_id=_new_id(8),
+            parent_id=self.root.span_id,
+            start_ns=start_ns or time.time_ns(),
+            attributes=attributes,
+        )
+        with self._lock:
+            self.spans.append(span)
+        return span
+    
+    def end_span(self, name: str):
+        """End the most recent open span with the given name."""
+        for span in reversed(self.spans):
+            if span.name == name and not span.end_ns:
+                span.end()
+                return
+    
+    def set_attribute(self, key: str, value):
+        """Set an attribute on the root span."""
+        self.root.set_attribute(key, value)
+    
+    def headers(self) -> dict:
+        """W3C trace context headers for outgoing requests."""
+        return {"traceparent": f"00-{self.trace_id}-{self.root.span_id}-01"}
+    
+    def start_linked(self, name: str, **attributes) -> "Trace":
+        """Start a new trace whose root links back to this trace's root; the caller releases it."""
+        self.tracer.started += 1
+        trace = Trace(self.tracer, name, attributes=attributes)
+        trace.root.links.append({"traceId": self.trace_id, "spanId": self.root.span_id})
+        return trace
+    
+    def acquire(self) -> "Trace":
+        """Keep the trace open for work that outlives the caller."""
+        with self._lock:
+            self._refs += 1
+        return self
+    
+    def release(self):
+        """Drop a reference; the last one ends and exports the trace."""
+        with self._lock:
+            self._refs -= 1
+            done = self._refs == 0
+        if done:
+            self.root.end()
+            self.tracer.export(self)
+
+
+class _NoopSpan:
+    """
+    Span stand-in for unsampled traces. One instance is shared by every
+    unsampled trace, so it holds no state and discards writes.
+    """
+    __slots__ = ()
+    end_ns = 0
+    
+    @property
+    def attributes(self) -> dict:
+        return {}
+    
+    def set_attribute(self, key: str, value):
+        pass
+    
+    def end(self, end_ns: Optional[int] = None):
+        pass
+
+
+class NoopTrace:
+    """Trace stand-in used when a unit of work is not sampled."""
+    
+    sampled = False
+    trace_id = None
+    _span = _NoopSpan()
+    
+    @contextmanager
+    def span(self, name: str, **attributes):
+        yield self._span
+    
+    def start_span(self, name: str, start_ns: int = None, **attributes):
+        return self._span
+    
+    def end_span(self, name: str):
+        pass
+    
+    def set_attribute(self, key: str, value):
+        pass
+    
+    def headers(self) -> dict:
+        return {}
+    
+    def start_linked(self, name: str, **attributes) -> "NoopTrace":
+        return self
+    
+    def acquire(self) -> "NoopTrace":
+        return self
+    
+    def release(self):
+        pass
+
+
+NOOP_TRACE = NoopTrace()
+
+
+def parse_traceparent(header: Optional[str]):
+    """Parse a W3C traceparent header into (trace_id, parent_id, sampled)."""
+    if not header:
+        return None
+    parts = header.strip().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    return parts[1], parts[2], parts[3] == "01"
+
+
+class SpanExporter:
+    """
+    Exports finished traces from a background thread.
+    Spans are written as OTLP/JSON lines to a file and/or posted to an
+    OTLP/HTTP collector, so the request path never waits on I/O.
+    """
+    
+    def __init__(self, service_name: str, file_path: str = "", otlp_endpoint: str = "",
+                 batch_size: int = 64, flush_interval_s: float = 2.0):
+        self.service_name = service_name
+        self.file_path = file_path
+        self.otlp_endpoint = otlp_endpoint.rstrip("/")
+        self.batch_size = batch_size
+        self.flush_interval_s = flush_interval_s
+        self._queue: queue.Queue = queue.Queue(maxsize=10000)
+        self.dropped = 0
+        self.exported = 0
+        self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+        self._thread.start()
+    
+    def submit(self, spans: List[Span]):
+        """Queue spans for export; drops them if the exporter is behind."""
+        try:
+            self._queue.put_nowait(spans)
+        except queue.Full:
+            self.dropped += len(spans)
+    
+    def _payload(self, spans: List[Span]) -> dict:
+        """Build an OTLP/JSON export request."""
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": [_otlp_attribute("service.name", self.service_name)]},
+                "scopeSpans": [{
+                    "scope": {"name": "app.tracing"},
+                    "spans": [span.to_otlp() for span in spans],
+                }],
+            }]
+        }
+    
+    def _run(self):
+        """Batch and write spans until the process exits."""
+        while True:
+            batch = []
+            deadline = time.monotonic() + self.flush_interval_s
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.extend(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            if batch:
+                self._write(batch)
+    
+    def _write(self, spans: List[Span]):
+        """Write one batch to the configured sinks."""
+        payload = self._payload(spans)
+        try:
+            if self.file_path:
+                with open(self.file_path, "a") as f:
+                    f.write(json.dumps(payload) + "\n")
+            if self.otlp_endpoint:
+                import httpx
+                httpx.post(f"{self.otlp_endpoint}/v1/traces", json=payload, timeout=5.0)
+            self.exported += len(spans)
+        except Exception as e:
+            self.dropped += len(spans)
+            print(f"Trace export error: {e}")
+
+
+class Tracer:
+    """Creates sampled traces and hands finished ones to the exporter."""
+    
+    def __init__(self, service_name: str, enabled: bool, sample_ratio: float = 1.0,
+                 exporter: Optional[SpanExporter] = None):
+        self.service_name = service_name
+        self.enabled = enabled
+        self.sample_ratio = sample_ratio
+        self.exporter = exporter
+        self.started = 0
+    
+    def start_trace(self, name: str, traceparent: str = None, start_ns: int = None, **attributes):
+        """
+        Start a trace, continuing a remote parent if one is given.
+        Returns NOOP_TRACE when tracing is off or the trace is not sampled.
+        """
+        if not self.enabled:
+            return NOOP_TRACE
+        
+        parent = parse_traceparent(traceparent)
+        if parent is not None:
+            trace_id, parent_id, sampled = parent
+            if not sampled:
+                return NOOP_TRACE
+        else:
+            if random.random() >= self.sample_ratio:
+                return NOOP_TRACE
+            trace_id, parent_id = None, None
+        
+        self.started += 1
+        return Trace(self, name, trace_id=trace_id, parent_id=parent_id,
+                     start_ns=start_ns, attributes=attributes)
+    
+    def export(self, trace: Trace):
+        """Hand a finished trace to the exporter."""
+        if self.exporter is not None:
+            self.exporter.submit(trace.spans)
+
+
+def _create_tracer() -> Tracer:
+    """Build the service tracer from settings."""
+    settings = get_settings()
+    exporter = None
+    if settings.TRACING_ENABLED and (settings.TRACE_EXPORT_PATH or settings.TRACE_OTLP_ENDPOINT):
+        exporter = SpanExporter(
+            "llm_service",
+            file_path=settings.TRACE_EXPORT_PATH,
+            otlp_endpoint=settings.TRACE_OTLP_ENDPOINT,
+        )
+    return Tracer("llm_service", settings.TRACING_ENABLED, settings.TRACE_SAMPLE_RATIO, exporter)
+
+
+tracer = _create_tracer()
+
+# Trace of the request being handled, visible to everything it awaits
+_current_trace: ContextVar = ContextVar("current_trace", default=NOOP_TRACE)
+
+
+def current_trace():
+    """Get the trace of the current request."""
+    return _current_trace.get()
+
+
+def set_current_trace(trace):
+    """Set the trace of the current request; returns a reset token."""
+    return _current_trace.set(trace)
+
+
+def reset_current_trace(token):
+    """Restore the previous current trace."""
+    _current_trace.reset(token)
@@ -0,0 +1,164 @@
+"""Tests for admission control."""
+import asyncio
+import pytest
+from app.processors.admission import AdmissionController, Overloaded
+from app.processors.sentence_builder import SentenceBuilder
+
+
+async def hold(controller, release, order, name, priority="normal"):
+    """Occupy a slot until released, noting the admission order."""
+    async with controller.admit(priority):
+        order.append(name)
+        await release.wait()
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_bounded():
+    """Test requests beyond the limit queue until a slot frees."""
+    controller = AdmissionController(max_concurrent=2, max_queue=10, max_wait_ms=1000)
+    release = asyncio.Event()
+    order = []
+    tasks = [asyncio.create_task(hold(controller, release, order, n)) for n in range(3)]
+    await asyncio.sleep(0)
+    
+    assert order == [0, 1]
+    assert controller.get_stats()["queued"] == 1
+    
+    release.set()
+    await asyncio.gather(*tasks)
+    assert order == [0, 1, 2]
+    assert controller.get_stats()["active"] == 0
+
+
+@pytest.mark.asyncio
+async def test_queue_is_served_by_priority():
+    """Test a freed slot goes to the highest-priority waiter, then the earliest."""
+    controller = AdmissionController(max_concurrent=1, max_queue=10, max_wait_ms=1000)
+    release = asyncio.Event()
+    order = []
+    tasks = [asyncio.create_task(hold(controller, release, order, "first"))]
+    await asyncio.sleep(0)
+    for name, priority in [("low", "low"), ("normal", "normal"), ("high", "high")]:
+        tasks.append(asyncio.create_task(hold(controller, release, order, name, priority)))
+    await asyncio.sleep(0)
+    
+    release.set()
+    await asyncio.gather(*tasks)
+    assert order == ["first", "high", "normal", "low"]
+
+
+@pytest.mark.asyncio
+async def test_full_queue_sheds_immediately():
+    """Test a request is shed without waiting when the queue is full."""
+    controller = AdmissionController(max_concurrent=1, max_queue=1, max_wait_ms=1000)
+    release = asyncio.Event()
+    order = []
+    tasks = [asyncio.create_task(hold(controller, release, order, n)) for n in range(2)]
+    await asyncio.sleep(0)
+    
+    with pytest.raises(Overloaded) as excinfo:
+        async with controller.admit():
+            pass
+    
+    assert excinfo.value.reason == "queue_full"
+    assert excinfo.value.retry_after_s >= 1
+    release.set()
+    await asyncio.gather(*tasks)
+
+
+@pytest.mark.asyncio
+async def test_wait_is_bounded():
+    """Test a queued request is shed once it has waited the limit, and gives up its place."""
+    controller = AdmissionController(max_concurrent=1, max_queue=10, max_wait_ms=20)
+    release = asyncio.Event()
+    order = []
+    task = asyncio.create_task(hold(controller, release, order, 0))
+    await asyncio.sleep(0)
+    
+    with pytest.raises(Overloaded) as excinfo:
+        async with controller.admit():
+            pass
+    
+    assert excinfo.value.reason == "timeout"
+    assert controller.get_stats()["queued"] == 0
+    release.set()
+    await task
+    assert controller.get_stats()["active"] == 0
+
+
+class BlockedTranslator:
+    """Translates only when released; shed requests use the local fallback."""
+    
+    def __init__(self):
+        self.release = asyncio.Event()
+    
+    async def translate_signs(self, signs, context=None, language="en"):
+        await self.release.wait()
+        return {"translation": "upstream", "confidence": 0.9, "alternatives": [], "fallback": False}
+    
+    def _fallback_translate(self, signs, context=None):
+        return {"translation": "".join(signs).capitalize(), "confidence": 0.5, "alternatives": [], "fallback": True}
+
+
+@pytest.fixture
+def builder():
+    """Create sentence builder with one admission slot and no queue."""
+    builder = SentenceBuilder()
+    builder.aggregation_enabled = False
+    builder.gemini = BlockedTranslator()
+    builder.admission = AdmissionController(max_concurrent=1, max_queue=0, max_wait_ms=100)
+    return builder
+
+
+@pytest.mark.asyncio
+async def test_shed_request_degrades_or_is_rejected_by_priority(builder):
+    """Test a shed normal request is translated locally and a shed low-priority one is rejected."""
+    session_id = builder.create_session()
+    busy = asyncio.create_task(builder.process(["A"], session_id))
+    await asyncio.sleep(0)
+    
+    degraded = await builder.process(["H", "I"], session_id)
+    with pytest.raises(Overloaded):
+        await builder.process(["H", "I"], session_id, priority="low")
+    
+    assert degraded["translation"] == "Hi"
+    assert degraded["degraded"] is True
+    stats = builder.admission.get_stats()
+    assert stats["degraded"] == 1
+    assert stats["rejected"] == 1
+    builder.gemini.release.set()
+    assert (await busy)["translation"] == "upstream"
+
+
+@pytest.mark.asyncio
+async def test_speculation_needs_spare_capacity(builder):
+    """Test speculations are not started while admission has no free slot."""
+    session_id = builder.create_session()
+    busy = asyncio.create_task(builder.process(["A"], session_id))
+    await asyncio.sleep(0)
+    
+    assert await builder.speculate(["H", "I"], session_id) is False
+    assert builder.admission.get_stats()["shed"]["no_capacity"] == 1
+    builder.gemini.release.set()
+    await busy
+
+
+@pytest.mark.asyncio
+async def test_shed_batch_handles_each_commit_by_priority(builder):
+    """Test a shed batch of merged commits degrades or rejects each by its own priority."""
+    builder.aggregation_enabled = True
+    busy = asyncio.create_task(builder.process(["A"], builder.create_session()))
+    await asyncio.sleep(0)
+    session_id = builder.create_session()
+    
+    degraded, rejected = await asyncio.gather(
+        builder.process(["H", "I"], session_id),
+        builder.process(["Y", "O"], session_id, priority="low"),
+        return_exceptions=True
+    )
+    
+    assert degraded["degraded"] is True
+    assert isinstance(rejected, Overloaded)
+    assert [entry["signs"] for entry in builder.sessions.get_session(session_id).history] == [["H", "I"]]
+    builder.gemini.release.set()
+    await busy
@@ -0,0 +1,181 @@
+"""Tests for per-session commit aggregation."""
+import asyncio
+import pytest
+from app.clients.gemini_client import GeminiClient
+from app.clients.stub_model import StubGenerativeModel
+from app.clients.translation_cache import TranslationCache
+from app.processors.admission import AdmissionController
+from app.processors.sentence_builder import SentenceBuilder
+
+
+@pytest.fixture
+def builder():
+    """Create sentence builder backed by a fast, uncached stub."""
+    builder = SentenceBuilder()
+    builder.aggregation_enabled = True
+    builder.gemini = GeminiClient()
+    builder.gemini.use_system_instruction = False
+    builder.gemini.cache = None
+    builder.gemini._model = StubGenerativeModel(latency_ms=10, distribution="fixed", seed=1)
+    return builder
+
+
+async def in_flight(builder, signs, session_id):
+    """Start a commit and return once its translation is with the model."""
+    task = asyncio.create_task(builder.process(signs, session_id))
+    while builder.gemini._model.calls == 0:
+        await asyncio.sleep(0)
+    return task
+
+
+@pytest.mark.asyncio
+async def test_lone_commit_is_translated_at_once(builder):
+    """Test a commit with nothing in flight for its session does not wait to be merged."""
+    session_id = builder.create_session()
+    
+    result = await asyncio.wait_for(builder.process(["H", "I"], session_id), timeout=0.05)
+    
+    assert result["translation"] == "Hi."
+    assert "merged" not in result
+
+
+@pytest.mark.asyncio
+async def test_commits_during_flight_share_one_call(builder):
+    """Test commits arriving while the previous one is translated go upstream together, each with its own result."""
+    session_id = builder.create_session()
+    first = await in_flight(builder, ["H", "I"], session_id)
+    results = await asyncio.gather(
+        builder.process(["B", "Y", "E"], session_id),
+        builder.process(["O", "K"], session_id)
+    )
+    
+    assert (await first)["translation"] == "Hi."
+    assert [r["translation"] for r in results] == ["Bye.", "Ok."]
+    assert all(r["merged"] == 2 for r in results)
+    assert builder.gemini._model.calls == 2
+    assert builder.get_aggregation_stats()["merged_commits"] == 2
+
+
+@pytest.mark.asyncio
+async def test_merged_commits_keep_history_order(builder):
+    """Test merged commits are stored after the one in flight, in the order they arrived."""
+    session_id = builder.create_session()
+    first = await in_flight(builder, ["A"], session_id)
+    await asyncio.gather(
+        builder.process(["B"], session_id),
+        builder.process(["C"], session_id)
+    )
+    await first
+    
+    history = builder.sessions.get_session(session_id).history
+    assert [entry["signs"] for entry in history] == [["A"], ["B"], ["C"]]
+
+
+@pytest.mark.asyncio
+async def test_batch_takes_one_admission_slot(builder):
+    """Test commits waiting for the session's translation do not each hold a slot."""
+    builder.admission = AdmissionController(max_concurrent=1, max_queue=0, max_wait_ms=100)
+    session_id = builder.create_session()
+    first = await in_flight(builder, ["H", "I"], session_id)
+    results = await asyncio.gather(
+        builder.process(["B", "Y", "E"], session_id),
+        builder.process(["O", "K"], session_id)
+    )
+    await first
+    
+    assert not any(r.get("degraded") for r in results)
+    assert builder.admission.get_stats()["admitted"] == 2
+
+
+@pytest.mark.asyncio
+async def test_unnumbered_reply_is_split_by_line(builder):
+    """Test a merged reply with one unnumbered line per sequence is used without another call."""
+    model = builder.gemini._model
+    reply = model._reply
+    model._reply = lambda prompt: "Bye.\nOk." if "1. Sign sequence" in prompt else reply(prompt)
+    session_id = builder.create_session()
+    first = await in_flight(builder, ["H", "I"], session_id)
+    results = await asyncio.gather(
+        builder.process(["B", "Y", "E"], session_id),
+        builder.process(["O", "K"], session_id)
+    )
+    await first
+    
+    assert [r["translation"] for r in results] == ["Bye.", "Ok."]
+    assert model.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_unsplittable_reply_goes_to_last_sequence(builder):
+    """Test a merged reply that cannot be split is given to the last sequence, not re-sent."""
+    model = builder.gemini._model
+    reply = model._reply
+    model._reply = lambda prompt: "Bye, ok." if "1. Sign sequence" in prompt else reply(prompt)
+    session_id = builder.create_session()
+    first = await in_flight(builder, ["H", "I"], session_id)
+    results = await asyncio.gather(
+        builder.process(["B", "Y", "E"], session_id),
+        builder.process(["O", "K"], session_id)
+    )
+    await first
+    
+    assert results[0]["fallback"] is True and results[0]["degraded"] is True
+    assert results[1]["translation"] == "Bye, ok."
+    assert results[1]["degraded"] is False
+    assert model.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_sequences_left_out_of_unsplittable_reply_are_degraded():
+    """Test every sequence before the last is marked degraded, and none of the guesses is cached."""
+    client = GeminiClient()
+    client.use_system_instruction = False
+    client.cache = TranslationCache()
+    client._model = StubGenerativeModel(latency_ms=0, distribution="fixed", seed=1)
+    client._model._reply = lambda prompt: "Hi, bye, ok."
+    
+    results = await client.translate_sign_sequences([["H", "I"], ["B", "Y", "E"], ["O", "K"]])
+    
+    assert [r.get("degraded", False) for r in results] == [True, True, False]
+    assert all(r["fallback"] for r in results[:2])
+    assert results[2]["translation"] == "Hi, bye, ok."
+    assert len(client.cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_merged_sequences_chain_context():
+    """Test cached leading sequences become the context of the rest, and results are cached in their own context."""
+    client = GeminiClient()
+    client.use_system_instruction = False
+    client.cache = TranslationCache()
+    client._model = StubGenerativeModel(latency_ms=0, distribution="fixed", seed=1)
+    prompts = []
+    generate = client._model.generate_content_async
+    
+    async def recording(prompt, **kwargs):
+        prompts.append(prompt)
+        return await generate(prompt, **kwargs)
+    
+    client._model.generate_content_async = recording
+    client.cache.put(["H", "I"], "Hi.", 0.92, context="Hello.")
+    
+    results = await client.translate_sign_sequences([["H", "I"], ["B", "Y", "E"], ["O", "K"]], "Hello.")
+    
+    assert [r["translation"] for r in results] == ["Hi.", "Bye.", "Ok."]
+    assert len(prompts) == 1
+    assert "Previous context: Hi." in prompts[0]
+    assert "H I" not in prompts[0]
+    assert client.cache.get(["O", "K"], context="Bye.") is not None
+    assert client.cache.get(["O", "K"], context="Hi.") is None
+
+
+@pytest.mark.asyncio
+async def test_lone_commit_uses_speculation(builder):
+    """Test a lone commit with a matching speculation is answered from it."""
+    session_id = builder.create_session()
+    await builder.speculate(["H", "I"], session_id)
+    
+    result = await asyncio.wait_for(builder.process(["H", "I"], session_id), timeout=1)
+    
+    assert result["speculated"] is True
+    assert builder.gemini._model.calls == 1
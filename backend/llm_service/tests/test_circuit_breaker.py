@@ -0,0 +1,164 @@
+"""Tests for circuit breaker and upstream deadlines."""
+import asyncio
+import pytest
+from app.clients.circuit_breaker import CircuitBreaker, CircuitState, LatencyTracker
+from app.clients.gemini_client import GeminiClient
+
+
+class FakeClock:
+    """Manually advanced clock."""
+    
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+
+class FakeResponse:
+    """Minimal Gemini response."""
+    
+    def __init__(self, text):
+        self.text = text
+        self.usage_metadata = None
+
+
+class FakeModel:
+    """Model whose calls take a scripted amount of time."""
+    
+    def __init__(self, delays, fail=False):
+        self.delays = list(delays)
+        self.fail = fail
+        self.calls = 0
+    
+    async def generate_content_async(self, prompt):
+        delay = self.delays[min(self.calls, len(self.delays) - 1)]
+        self.calls += 1
+        await asyncio.sleep(delay)
+        if self.fail:
+            raise RuntimeError("upstream error")
+        return FakeResponse(f"reply after {delay}")
+
+
+@pytest.fixture
+def clock():
+    """Create fake clock fixture."""
+    return FakeClock()
+
+
+@pytest.fixture
+def breaker(clock):
+    """Create circuit breaker fixture."""
+    return CircuitBreaker(failure_threshold=3, reset_timeout_s=10, clock=clock)
+
+
+@pytest.fixture
+def client():
+    """Create Gemini client with a fake model."""
+    client = GeminiClient()
+    client._model = FakeModel([0.0])
+    client.use_system_instruction = False
+    return client
+
+
+def test_breaker_opens_after_threshold(breaker):
+    """Test that consecutive failures trip the breaker."""
+    for _ in range(3):
+        assert breaker.allow_request()
+        breaker.record_failure()
+    
+    assert breaker.state == CircuitState.OPEN
+    assert not breaker.allow_request()
+    assert breaker.get_stats()["total_rejected"] == 1
+
+
+def test_breaker_success_resets_count(breaker):
+    """Test that a success clears the failure run."""
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    
+    assert breaker.state == CircuitState.CLOSED
+
+
+def test_breaker_half_open_probe(breaker, clock):
+    """Test that a single probe is allowed after the reset timeout."""
+    for _ in range(3):
+        breaker.record_failure()
+    
+    clock.now = 11
+    assert breaker.allow_request()
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert not breaker.allow_request()
+    
+    breaker.record_success()
+    assert breaker.state == CircuitState.CLOSED
+
+
+def test_breaker_failed_probe_reopens(breaker, clock):
+    """Test that a failed probe opens the breaker again."""
+    for _ in range(3):
+        breaker.record_failure()
+    
+    clock.now = 11
+    assert breaker.allow_request()
+    breaker.record_failure()
+    
+    assert breaker.state == CircuitState.OPEN
+    assert breaker.get_stats()["times_opened"] == 2
+
+
+def test_latency_percentile():
+    """Test latency percentile calculation."""
+    tracker = LatencyTracker()
+    assert tracker.percentile(95) is None
+    
+    for i in range(100):
+        tracker.record(i / 100)
+    
+    assert tracker.percentile(95) == pytest.approx(0.95)
+
+
+@pytest.mark.asyncio
+async def test_deadline_falls_back(client):
+    """Test that a slow upstream call is cut off at the deadline."""
+    client._model = FakeModel([1.0])
+    client.deadline_s = 0.05
+    
+    result = await client.translate_signs(["H", "I"])
+    
+    assert result["fallback"] is True
+    assert client.timeouts == 1
+    assert client.breaker.consecutive_failures == 1
+
+
+@pytest.mark.asyncio
+async def test_open_breaker_skips_upstream(client):
+    """Test that an open breaker answers locally without calling upstream."""
+    client._model = FakeModel([0.0], fail=True)
+    client.breaker.failure_threshold = 2
+    
+    for _ in range(2):
+        await client.translate_signs(["H", "I"])
+    calls = client._model.calls
+    result = await client.translate_signs(["H", "I"])
+    
+    assert result["fallback"] is True
+    assert client._model.calls == calls
+    assert client.get_resilience_stats()["circuit_breaker"]["state"] == "open"
+
+
+@pytest.mark.asyncio
+async def test_hedged_request_wins(client):
+    """Test that a hedge is sent once the primary exceeds p95."""
+    client._model = FakeModel([1.0, 0.0])
+    client.hedge_enabled = True
+    client.hedge_min_samples = 1
+    client.latency.record(0.01)
+    
+    result = await client.translate_signs(["H", "I"])
+    
+    assert result["translation"] == "reply after 0.0"
+    assert client.hedges_sent == 1
+    assert client.hedges_won == 1
@@ -33,3 +33,34 @@ async def test_translate_thankyou(client):
     result = await client.translate_signs(["T", "H", "A", "N", "K", "Y", "O", "U"])
     
     assert "thank" in result["translation"].lower()
+
+
+def test_build_prompt_uses_system_instruction(client):
+    """Test that static rules are left out of the per-request prompt."""
+    client.use_system_instruction = True
+    prompt = client._build_prompt(["H", "I"], "Hello!", "ru")
+    
+    assert "Rules:" not in prompt
+    assert "Sign sequence: H I" in prompt
+    assert "Previous context: Hello!" in prompt
+    assert prompt.endswith("Natural Russian translation:")
+
+
+def test_build_prompt_inline_rules(client):
+    """Test that rules are inlined when system instructions are disabled."""
+    client.use_system_instruction = False
+    prompt = client._build_prompt(["H", "I"], None, "xx")
+    
+    assert prompt.startswith("You are a sign language translator.")
+    assert "Previous context" not in prompt
+    assert prompt.endswith("Natural English translation:")
+
+
+def test_record_prompt_size(client):
+    """Test prompt size instrumentation."""
+    client._record_prompt_size("Sign sequence: H I", "en")
+    stats = client.get_prompt_stats()
+    
+    assert stats["requests"] == 1
+    assert stats["last_bytes"] == len("Sign sequence: H I")
+    assert stats["last_tokens"] > 0
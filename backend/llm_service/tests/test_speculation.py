@@ -0,0 +1,145 @@
+"""Tests for speculative translation."""
+import asyncio
+import pytest
+from app.processors.sentence_builder import SentenceBuilder
+from app.processors.speculation import SpeculationCache
+from app.tracing import Tracer, current_trace, set_current_trace, reset_current_trace
+
+
+class SlowTranslator:
+    """Counts translations; each waits until released."""
+    
+    def __init__(self):
+        self.calls = []
+        self.release = asyncio.Event()
+    
+    async def translate_signs(self, signs, context=None, language="en"):
+        self.calls.append(list(signs))
+        await self.release.wait()
+        return {"translation": "".join(signs).lower(), "confidence": 0.9, "alternatives": [], "fallback": False}
+
+
+@pytest.fixture
+def builder():
+    """Create sentence builder with a controllable translator."""
+    builder = SentenceBuilder()
+    builder.gemini = SlowTranslator()
+    return builder
+
+
+@pytest.mark.asyncio
+async def test_commit_reuses_inflight_speculation(builder):
+    """Test a committed sequence waits for the matching speculation instead of calling Gemini again."""
+    session_id = builder.create_session()
+    assert await builder.speculate(["H", "I"], session_id, context="")
+    
+    commit = asyncio.create_task(builder.process(["H", "I"], session_id, context=""))
+    await asyncio.sleep(0)
+    builder.gemini.release.set()
+    result = await commit
+    
+    assert result["translation"] == "hi"
+    assert result["speculated"] is True
+    assert builder.gemini.calls == [["H", "I"]]
+    assert builder.speculations.get_stats()["inflight_hits"] == 1
+    assert len(builder.get_session_context(session_id)["history"]) == 1
+
+
+@pytest.mark.asyncio
+async def test_commit_reuses_finished_speculation(builder):
+    """Test a finished speculation answers the commit at once."""
+    builder.gemini.release.set()
+    session_id = builder.create_session()
+    await builder.speculate(["O", "K"], session_id, context="")
+    await asyncio.sleep(0)
+    
+    result = await builder.process(["O", "K"], session_id, context="")
+    
+    assert result["speculated"] is True
+    assert len(builder.gemini.calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_diverged_commit_cancels_speculation(builder):
+    """Test a different committed sequence cancels the speculation and is translated normally."""
+    session_id = builder.create_session()
+    await builder.speculate(["H", "I"], session_id, context="")
+    await asyncio.sleep(0)
+    
+    commit = asyncio.create_task(builder.process(["H", "I", "M"], session_id, context=""))
+    await asyncio.sleep(0)
+    builder.gemini.release.set()
+    result = await commit
+    
+    assert result["translation"] == "him"
+    assert result["speculated"] is False
+    stats = builder.speculations.get_stats()
+    assert stats["misses"] == 1
+    assert stats["cancelled"] == 1
+
+
+@pytest.mark.asyncio
+async def test_new_speculation_replaces_previous(builder):
+    """Test speculating on a changed sequence cancels the previous speculation; a repeat is a no-op."""
+    session_id = builder.create_session()
+    await builder.speculate(["H"], session_id, context="")
+    await asyncio.sleep(0)
+    first = builder.speculations._speculations[session_id].task
+    
+    await builder.speculate(["H", "E"], session_id, context="")
+    await builder.speculate(["H", "E"], session_id, context="")
+    await asyncio.sleep(0)
+    
+    assert first.cancelled()
+    assert builder.gemini.calls == [["H"], ["H", "E"]]
+    assert len(builder.speculations) == 1
+
+
+@pytest.mark.asyncio
+async def test_speculations_are_bounded():
+    """Test speculations beyond the in-flight limit are dropped."""
+    cache = SpeculationCache(max_inflight=1, ttl_s=30)
+    never = asyncio.Event()
+    
+    assert cache.speculate("a", (("A",), "", "en"), never.wait)
+    assert not cache.speculate("b", (("B",), "", "en"), never.wait)
+    assert cache.get_stats()["dropped"] == 1
+    
+    task = cache._speculations["a"].task
+    assert cache.cancel("a")
+    await asyncio.gather(task, return_exceptions=True)
+    assert cache.speculate("b", (("B",), "", "en"), never.wait)
+    cache.cancel("b")
+
+
+@pytest.mark.asyncio
+async def test_speculation_traced_apart_from_request(builder):
+    """Test a speculation's spans go to its own trace, linked to the request, not the exported request trace."""
+    exported = []
+    tracer = Tracer("test", enabled=True)
+    tracer.export = exported.append
+    
+    class TracedTranslator(SlowTranslator):
+        async def translate_signs(self, signs, context=None, language="en"):
+            with current_trace().span("gemini_call"):
+                return await super().translate_signs(signs, context, language)
+    
+    builder.gemini = TracedTranslator()
+    session_id = builder.create_session()
+    request = tracer.start_trace("POST /api/v1/translate/speculate")
+    token = set_current_trace(request)
+    try:
+        assert await builder.speculate(["H", "I"], session_id, context="")
+    finally:
+        reset_current_trace(token)
+        request.release()
+    await asyncio.sleep(0)
+    builder.gemini.release.set()
+    await asyncio.sleep(0.01)
+    
+    assert [trace.root.name for trace in exported] == ["POST /api/v1/translate/speculate", "speculation"]
+    assert [span.name for span in exported[0].spans] == ["POST /api/v1/translate/speculate"]
+    speculation = exported[1]
+    assert speculation.trace_id != request.trace_id
+    assert [span.name for span in speculation.spans] == ["speculation", "gemini_call"]
+    assert speculation.root.to_otlp()["links"] == [{"traceId": request.trace_id, "spanId": request.root.span_id}]
@@ -0,0 +1,104 @@
+"""Tests for the local Gemini stub backend."""
+import asyncio
+import pytest
+from app.clients.gemini_client import GeminiClient, LANGUAGE_NAMES
+from app.clients.stub_model import StubGenerativeModel, StubError
+
+
+@pytest.fixture
+def client():
+    """Create Gemini client backed by a fast stub."""
+    client = GeminiClient()
+    client.use_system_instruction = False
+    client._model = StubGenerativeModel(latency_ms=0, distribution="fixed", seed=1)
+    return client
+
+
+@pytest.mark.asyncio
+async def test_stub_spells_sign_sequence(client):
+    """Test stub reply is derived from the prompt."""
+    result = await client.translate_signs(["H", "E", "L", "L", "O"])
+    
+    assert result["translation"] == "Hello."
+    assert "fallback" not in result
+    assert client.prompt_stats.last_tokens > 0
+
+
+def test_latency_distributions():
+    """Test sampled latencies follow the configured distribution."""
+    fixed = StubGenerativeModel(latency_ms=200, distribution="fixed")
+    assert fixed.sample_latency() == pytest.approx(0.2)
+    
+    lognormal = StubGenerativeModel(latency_ms=200, distribution="lognormal", sigma=0.5, seed=7)
+    samples = sorted(lognormal.sample_latency() for _ in range(2000))
+    assert samples[1000] == pytest.approx(0.2, rel=0.1)
+    assert samples[-20] > 0.4
+    
+    with pytest.raises(ValueError):
+        StubGenerativeModel(distribution="pareto")
+
+
+@pytest.mark.asyncio
+async def test_errors_use_fallback(client):
+    """Test simulated errors go through the client's failure path."""
+    client._model = StubGenerativeModel(latency_ms=0, error_rate=1.0)
+    
+    with pytest.raises(StubError):
+        await client._model.generate_content_async("Sign sequence: A B")
+    
+    result = await client.translate_signs(["A", "B"])
+    assert result["fallback"] is True
+    assert client.breaker.consecutive_failures == 1
+
+
+@pytest.mark.asyncio
+async def test_hung_calls_hit_deadline(client):
+    """Test hung calls are cut off by the request deadline."""
+    client._model = StubGenerativeModel(hang_rate=1.0)
+    client.deadline_s = 0.05
+    
+    result = await client.translate_signs(["A", "B"])
+    
+    assert result["fallback"] is True
+    assert client.timeouts == 1
+
+
+@pytest.mark.asyncio
+async def test_streaming_delivers_chunks():
+    """Test streamed replies arrive in chunks that join to the full text."""
+    model = StubGenerativeModel(latency_ms=0, stream_chunks=3, stream_chunk_ms=1)
+    
+    response = await model.generate_content_async("Sign sequence: T H A N K S", stream=True)
+    chunks = [chunk.text async for chunk in response]
+    
+    assert len(chunks) == 3
+    assert "".join(chunks) == "Thanks."
+    await response.resolve()
+    assert response.text == "Thanks."
+
+
+def test_client_creates_stub_models(client, monkeypatch):
+    """Test the stub backend is used for per-language models."""
+    monkeypatch.setattr(client.settings, "GEMINI_BACKEND", "stub")
+    client.use_system_instruction = True
+    
+    model = client._get_model("ru")
+    
+    assert isinstance(model, StubGenerativeModel)
+    assert "Russian" in model.system_instruction
+
+
+def test_client_initializes_lazily(monkeypatch):
+    """Test no model is created on construction, only on warm-up."""
+    client = GeminiClient()
+    monkeypatch.setattr(client.settings, "GEMINI_BACKEND", "stub")
+    client.use_system_instruction = True
+    assert client._model is None
+    
+    client.warm_up()
+    model = client._model
+    client.initialize()
+    
+    assert isinstance(model, StubGenerativeModel)
+    assert client._model is model
+    assert set(client._models) == set(LANGUAGE_NAMES)
@@ -0,0 +1,185 @@
+"""Tests for the approximate-match translation cache."""
+import pytest
+from app.clients.gemini_client import GeminiClient
+from app.clients.translation_cache import TranslationCache, parse_distance_policy
+
+
+@pytest.fixture
+def cache():
+    """Create cache fixture: exact below 4 signs, one edit from 4, two from 10."""
+    return TranslationCache(max_entries=100, policy=[(4, 1), (10, 2)], min_confidence=0.85, distance_penalty=0.05)
+
+
+def test_exact_hit(cache):
+    """Test an identical sequence is served with the cached confidence."""
+    cache.put(list("HELLO"), "Hello.", 0.92)
+    
+    entry, distance, confidence = cache.get(list("HELLO"))
+    
+    assert entry.translation == "Hello."
+    assert distance == 0
+    assert confidence == 0.92
+
+
+def test_confusable_swap_costs_half_an_edit(cache):
+    """Test a U/V swap matches with a smaller confidence penalty than another letter."""
+    cache.put(list("YOU"), "You.", 0.92)
+    cache.put(list("LOVE"), "Love.", 0.92)
+    cache.put(list("GOOD"), "Good.", 0.92)
+    
+    _, confusable_distance, confusable_confidence = cache.get(list("LOUE"))
+    _, distance, confidence = cache.get(list("GOOB"))
+    
+    assert confusable_distance == 0.5
+    assert distance == 1.0
+    assert confusable_confidence > confidence >= 0.85
+
+
+def test_short_sequences_must_match_exactly(cache):
+    """Test the edit budget depends on length."""
+    cache.put(list("YOU"), "You.", 0.92)
+    
+    assert cache.get(list("YOV")) is None
+
+
+def test_budget_grows_with_length(cache):
+    """Test long sequences tolerate two errors, shorter ones only one."""
+    cache.put(list("THANKYOUALL"), "Thank you all.", 0.92)
+    cache.put(list("HELLO"), "Hello.", 0.92)
+    
+    assert cache.get(list("THANKY0VALL")) is not None  # O/0 and U/V swaps
+    assert cache.get(list("HELO")) is not None
+    assert cache.get(list("HEO")) is None
+
+
+def test_insertion_and_deletion(cache):
+    """Test an extra or missing sign is within one edit."""
+    cache.put(list("HELLO"), "Hello.", 0.92)
+    
+    assert cache.get(list("HELLLO"))[0].translation == "Hello."
+    assert cache.get(list("HLLO"))[0].translation == "Hello."
+
+
+def test_closest_match_wins(cache):
+    """Test the candidate with the smallest weighted distance is served."""
+    cache.put(list("SAME"), "Same.", 0.92)
+    cache.put(list("SAMA"), "Sama.", 0.92)
+    
+    entry, distance, _ = cache.get(list("SAMS"))  # S/A is confusable, S/E is not
+    
+    assert entry.translation == "Sama."
+    assert distance == 0.5
+
+
+def test_defaults_serve_only_confusable_swaps():
+    """Test a one-letter edit between unrelated letters goes upstream while a confusable swap is served."""
+    cache = TranslationCache()
+    cache.put(list("DAVE"), "Dave.", 0.92)
+    
+    assert cache.get(list("DANE")) is None
+    assert cache.get(list("DAUE"))[0].translation == "Dave."
+    assert GeminiClient().cache.distance_penalty == cache.distance_penalty
+
+
+def test_low_confidence_match_rejected():
+    """Test a near match below the confidence floor is not served."""
+    cache = TranslationCache(policy=[(4, 1)], min_confidence=0.9, distance_penalty=0.05)
+    cache.put(list("GOOD"), "Good.", 0.92)
+    
+    assert cache.get(list("GOOB")) is None
+    assert cache.rejected == 1
+
+
+def test_languages_are_separate(cache):
+    """Test a translation is only served for its target language."""
+    cache.put(list("HELLO"), "Hello.", 0.92, language="en")
+    
+    assert cache.get(list("HELLO"), language="ru") is None
+
+
+def test_contexts_are_separate(cache):
+    """Test a translation is only served, exactly or approximately, in the context it was made in."""
+    cache.put(list("HELLO"), "Hello again.", 0.92, context="Hello.")
+    
+    assert cache.get(list("HELLO"), context="Good morning.") is None
+    assert cache.get(list("HELLO")) is None
+    assert cache.get(list("HELL0"), context="Hello.")[0].translation == "Hello again."
+
+
+def test_multi_letter_signs(cache):
+    """Test word signs count as one symbol."""
+    cache.put(["I", "PLAY", "BOOK"], "I play a book.", 0.92)
+    cache.put(["HELP", "ME", "NAME", "X"], "Help me.", 0.92)
+    
+    assert cache.get(["I", "PLAY", "BOOK"]) is not None
+    assert cache.get(["HELP", "ME", "NAME", "Y"])[1] == 1.0
+
+
+def test_lru_eviction_unindexes():
+    """Test the least recently used entry is evicted and no longer matched."""
+    cache = TranslationCache(max_entries=2, policy=[(4, 1)], distance_penalty=0.05)
+    cache.put(list("ABCD"), "1", 0.92)
+    cache.put(list("EFGH"), "2", 0.92)
+    cache.get(list("ABCD"))
+    cache.put(list("IJKL"), "3", 0.92)
+    
+    assert cache.get(list("EFGX")) is None
+    assert cache.get(list("ABCX")) is not None
+    assert cache.evictions == 1
+    assert all(not isinstance(v, list) or len(v) > 1 for v in cache._index.values())
+
+
+def test_parse_distance_policy():
+    """Test policy parsing and validation."""
+    assert parse_distance_policy("10:2, 4:1") == [(4, 1), (10, 2)]
+    with pytest.raises(ValueError):
+        parse_distance_policy("4:2,10:1")
+
+
+class FakeResponse:
+    """Minimal Gemini response."""
+    
+    def __init__(self, text):
+        self.text = text
+        self.usage_metadata = None
+
+
+class CountingModel:
+    """Model that counts its calls."""
+    
+    def __init__(self):
+        self.calls = 0
+    
+    async def generate_content_async(self, prompt):
+        self.calls += 1
+        return FakeResponse("Love you.")
+
+
+@pytest.mark.asyncio
+async def test_client_serves_near_duplicate_without_upstream_call():
+    """Test the client answers a one-letter variant of a translated phrase from the cache."""
+    client = GeminiClient()
+    client._model = CountingModel()
+    client.use_system_instruction = False
+    
+    first = await client.translate_signs(list("LOVEYOU"))
+    second = await client.translate_signs(list("LOUEYOU"))
+    
+    assert client._model.calls == 1
+    assert second["translation"] == first["translation"]
+    assert second["cached"] is True
+    assert second["confidence"] < first["confidence"]
+
+
+@pytest.mark.asyncio
+async def test_client_does_not_serve_other_context():
+    """Test the same signs after a different previous sentence go upstream again."""
+    client = GeminiClient()
+    client._model = CountingModel()
+    client.use_system_instruction = False
+    
+    await client.translate_signs(list("LOVEYOU"), context="Hello.")
+    second = await client.translate_signs(list("LOVEYOU"), context="Goodbye.")
+    
+    assert client._model.calls == 2
+    assert "cached" not in second
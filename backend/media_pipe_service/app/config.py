@@ -18,6 +18,70 @@ class Settings(BaseSettings):
     MIN_DETECTION_CONFIDENCE: float = 0.5
     MIN_TRACKING_CONFIDENCE: float = 0.5
     
+    # Frame decoding
+    DECODE_BACKEND: str = "cv2"  # cv2, pillow or turbojpeg
+    DECODE_MAX_REDUCTION: int = 4  # Largest JPEG decode downscale (1, 2 or 4), 1 disables
+    DECODE_MIN_SIDE: int = 240  # Never decode the short side below this, pixels
+    DECODE_MIN_HAND_PX: int = 96  # Keep the last seen hand at least this large, pixels
+    
+    # ROI tracking: crop frames to the previous hand position before inference
+    ROI_TRACKING_ENABLED: bool = True
+    ROI_EXPAND: float = 2.0  # Box size relative to the hand's bounding box
+    ROI_MIN_SIZE: int = 128  # Smallest crop side, pixels
+    ROI_MAX_SIZE: int = 0  # Downscale crops whose longest side exceeds this, 0 disables
+    
+    # Motion gating: reuse the last detection while the frame is static
+    MOTION_GATE_ENABLED: bool = True
+    MOTION_THRESHOLD: float = 2.0  # Mean absolute thumbnail difference, 0-255 grayscale
+    MOTION_MAX_LANDMARK_SPEED: float = 0.01  # Mean landmark displacement between detections, frame units
+    MOTION_MAX_SKIP_MS: int = 500  # Force a detection at least this often
+    MOTION_THUMBNAIL_SIZE: int = 32
+    
+    # Idle sampling: throttle sessions with no hand in view
+    IDLE_SAMPLING_ENABLED: bool = True
+    IDLE_AFTER_MS: int = 3000  # No hand for this long makes a session idle
+    IDLE_SAMPLE_EVERY: int = 3  # Process every Nth frame while idle
+    IDLE_CLIENT_FPS: float = 10.0  # Send rate advised to idle clients
+    
+    # Landmark smoothing: One-Euro filter between normalization and classification
+    LANDMARK_FILTER_ENABLED: bool = True
+    LANDMARK_FILTER_MIN_CUTOFF: float = 1.0  # Hz, smoothing of a still hand
+    LANDMARK_FILTER_BETA: float = 0.5  # Cutoff increase per hand size/s of speed
+    LANDMARK_FILTER_DERIVATIVE_CUTOFF: float = 1.0  # Hz, smoothing of the speed estimate
+    LANDMARK_FILTER_RESET_MS: int = 500  # Restart the filter after a gap this long
+    
+    # Dynamic signs: letters drawn in the air (J, Z) from landmark trajectories
+    DYNAMIC_SIGNS_ENABLED: bool = True
+    TRAJECTORY_WINDOW: int = 30  # Frames of the primary hand kept per session
+    TRAJECTORY_MIN_STEP: float = 0.05  # Movement below this, in hand sizes, is jitter
+    
+    # Detector processes: 0 detects in threads of the server process
+    DETECTOR_WORKERS: int = 0
+    DETECTOR_RING_SLOTS: int = 4  # Shared-memory frame slots per worker
+    DETECTOR_SLOT_BYTES: int = 1048576  # Largest encoded frame accepted
+    DETECTOR_TIMEOUT_MS: int = 2000
+    
+    # Run a synthetic frame through each detector before reporting ready
+    WARMUP_ENABLED: bool = True
+    
+    # Frame scheduling
+    SESSION_MAX_FPS: float = 30.0  # Per-session cap, 0 disables
+    SESSION_FPS_BURST: int = 3  # Frames a session may send ahead of its cap
+    SESSION_MAX_QUEUED_FRAMES: int = 2
+    SCHEDULER_QUANTUM: float = 1.0  # Frames per session per round
+    
+    # Observability
+    METRICS_ENABLED: bool = True
+    TRACING_ENABLED: bool = False
+    TRACE_SAMPLE_RATIO: float = 0.01
+    TRACE_EXPORT_PATH: str = ""  # OTLP/JSON lines file
+    TRACE_OTLP_ENDPOINT: str = ""  # e.g. http://localhost:4318
+    
+    # Landmark recording
+    LANDMARK_LOG_DIR: str = ""  # Record landmark streams here when set
+    LANDMARK_LOG_DTYPE: str = "float16"  # float16 or float32
+    LANDMARK_LOG_CHUNK_FRAMES: int = 256
+    
     # LLM Service
     LLM_SERVICE_URL: str = "http://localhost:8002"
     
@@ -25,6 +89,10 @@ class Settings(BaseSettings):
     SIGN_BUFFER_TIMEOUT_MS: int = 2000  # Time before committing sign sequence
     MIN_SEQUENCE_LENGTH: int = 2
     
+    # Speculative translation of the sequence before it is committed
+    SPECULATION_ENABLED: bool = True
+    SPECULATION_STABLE_MS: int = 500  # Unchanged this long, the sequence is sent ahead
+    
     class Config:
         env_file = ".env"
 
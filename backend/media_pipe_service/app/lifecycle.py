@@ -0,0 +1,112 @@
+"""Service start-up: detector creation, warm-up and readiness."""
+
+import asyncio
+import threading
+import time
+from typing import Callable, Optional
+
+from app.config import settings
+
+
+STARTING = "starting"
+WARMING_UP = "warming_up"
+READY = "ready"
+FAILED = "failed"
+
+
+class Lifecycle:
+    """
+    Owns the in-process HandDetector and tracks start-up.
+
+    On start the detector is created and a synthetic frame is run through
+    it (or the detector pool is started and each worker does the same), so
+    the first client frame does not pay for loading MediaPipe. Readiness
+    turns true only after that. Code that never runs start-up (tests, tools)
+    still gets a detector, created on first use.
+
+    Times are seconds from ``started_at``, the start of the app import.
+    """
+    
+    def __init__(self, create_detector: Callable, pool=None, warm_up: bool = settings.WARMUP_ENABLED):
+        self.create_detector = create_detector
+        self.pool = pool
+        self.warm_up_enabled = warm_up
+        self.state = STARTING
+        self.error: Optional[str] = None
+        self._detector = None
+        self._lock = threading.Lock()
+        self.started_at = time.perf_counter()
+        self.import_s: Optional[float] = None
+        self.detector_init_s: Optional[float] = None
+        self.warmup_s: Optional[float] = None
+        self.ready_s: Optional[float] = None
+        self.first_frame_s: Optional[float] = None
+        self.first_frame_latency_s: Optional[float] = None
+    
+    @property
+    def ready(self) -> bool:
+        """Whether start-up has finished."""
+        return self.state == READY
+    
+    @property
+    def detector(self):
+        """The in-process detector, created on first use if start-up did not run."""
+        if self._detector is None:
+            with self._lock:
+                if self._detector is None:
+                    start = time.perf_counter()
+                    self._detector = self.create_detector()
+                    self.detector_init_s = time.perf_counter() - start
+        return self._detector
+    
+    def record_import(self, started_at: float):
+        """Record when the app import began; called once the app is built."""
+        self.started_at = started_at
+        self.import_s = time.perf_counter() - started_at
+    
+    async def start(self):
+        """Create and warm up the detectors, then report ready."""
+        self.state = WARMING_UP
+        try:
+            if self.pool is not None:
+                # Each worker warms up its own detector before reporting ready
+                self.pool.start()
+                if not await self.pool.wait_ready():
+                    raise RuntimeError("detector workers did not become ready")
+            else:
+                await asyncio.to_thread(self._warm_up)
+        except Exception as e:
+            self.state = FAILED
+            self.error = str(e)
+            print(f"Start-up failed: {e}")
+            return
+        self.ready_s = time.perf_counter() - self.started_at
+        self.state = READY
+    
+    def _warm_up(self):
+        detector = self.detector
+        if self.warm_up_enabled:
+            self.warmup_s = detector.warm_up()
+    
+    def frame_processed(self, frame_started: float):
+        """Record the first answered frame (``frame_started`` from perf_counter)."""
+        if self.first_frame_s is None:
+            now = time.perf_counter()
+            self.first_frame_s = now - self.started_at
+            self.first_frame_latency_s = now - frame_started
+    
+    def get_stats(self) -> dict:
+        """Get start-up state and timings in milliseconds."""
+        def ms(seconds):
+            return round(seconds * 1000, 1) if seconds is not None else None
+        
+        return {
+            "state": self.state,
+            "error": self.error,
+            "import_ms": ms(self.import_s),
+            "detector_init_ms": ms(self.detector_init_s),
+            "warmup_ms": ms(self.warmup_s),
+            "ready_ms": ms(self.ready_s),
+            "time_to_first_frame_ms": ms(self.first_frame_s),
+            "first_frame_latency_ms": ms(self.first_frame_latency_s),
+        }
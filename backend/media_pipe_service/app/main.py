@@ -1,11 +1,16 @@
 """FastAPI application entry point for MediaPipe service."""
 
+import time
+
+_import_started = time.perf_counter()
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 
 from app.config import settings
-from app.routers import websocket_router, health_router
+from app.routers import websocket_router, health_router, metrics_router
+from app.routers.websocket import detector_pool, frame_scheduler, landmark_log, lifecycle
 
 
 def create_app() -> FastAPI:
@@ -31,23 +36,38 @@ def create_app() -> FastAPI:
     # Include routers
     app.include_router(health_router, prefix="/api/v1")
     app.include_router(websocket_router)
+    app.include_router(metrics_router)
     
     @app.on_event("startup")
     async def startup_event():
         """Startup event handler."""
         print(f"🚀 MediaPipe Service starting on port {settings.PORT}")
-        print(f"📹 Hand detection ready")
+        await lifecycle.start()
+        if detector_pool is not None:
+            print(f"🧵 {detector_pool.num_workers} detector processes")
+        stats = lifecycle.get_stats()
+        if lifecycle.ready:
+            print(f"📹 Hand detection ready in {stats['ready_ms']} ms "
+                  f"(import {stats['import_ms']} ms, warm-up {stats['warmup_ms']} ms)")
+        else:
+            print(f"⚠️ Hand detection not ready: {stats['error']}")
         print(f"🌐 WebSocket endpoint: ws://localhost:{settings.PORT}/ws/sign-detection")
     
     @app.on_event("shutdown")
     async def shutdown_event():
         """Shutdown event handler."""
+        await frame_scheduler.stop()
+        if detector_pool is not None:
+            await detector_pool.stop()
+        if landmark_log is not None:
+            landmark_log.close()
         print("👋 MediaPipe Service shutting down")
     
     return app
 
 
 app = create_app()
+lifecycle.record_import(_import_started)
 
 
 if __name__ == "__main__":
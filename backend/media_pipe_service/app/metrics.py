@@ -0,0 +1,216 @@
+"""
+Prometheus-style metrics with low-overhead pipeline stage timing.
+
+A copy of this module lives in llm_service/app/metrics.py; only the registry
+instance differs. Change both together; media_pipe_service's
+tests/test_shared_modules.py fails when they drift apart.
+"""
+
+import asyncio
+import time
+from bisect import bisect_left
+from functools import wraps
+from typing import Callable, Dict, Optional, Tuple
+from app.config import settings
+
+# Latency buckets in seconds, from sub-millisecond stages to slow LLM calls
+DEFAULT_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+    0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...], extra: str = "") -> str:
+    """Format a label set for the text exposition format."""
+    parts = [f'{key}="{value}"' for key, value in labels]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value."""
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Counter:
+    """Monotonically increasing counter, or one read from a callback."""
+    kind = "counter"
+    
+    def __init__(self, labels: Tuple[Tuple[str, str], ...] = (), callback: Callable[[], float] = None):
+        self.labels = labels
+        self.value = 0
+        self.callback = callback
+    
+    def inc(self, amount: float = 1):
+        """Increment the counter."""
+        self.value += amount
+    
+    def samples(self, name: str):
+        """Yield exposition lines."""
+        value = self.callback() if self.callback is not None else self.value
+        yield f"{name}{_format_labels(self.labels)} {_format_value(value)}"
+
+
+class Gauge:
+    """Value that can go up and down, or is read from a callback."""
+    kind = "gauge"
+    
+    def __init__(self, labels: Tuple[Tuple[str, str], ...] = (), callback: Callable[[], float] = None):
+        self.labels = labels
+        self.value = 0
+        self.callback = callback
+    
+    def set(self, value: float):
+        """Set the gauge."""
+        self.value = value
+    
+    def samples(self, name: str):
+        """Yield exposition lines."""
+        value = self.callback() if self.callback is not None else self.value
+        yield f"{name}{_format_labels(self.labels)} {_format_value(value)}"
+
+
+class Histogram:
+    """Fixed-bucket histogram; observe is a bisect and two additions."""
+    kind = "histogram"
+    
+    def __init__(self, labels: Tuple[Tuple[str, str], ...] = (), buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.labels = labels
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+    
+    def observe(self, value: float):
+        """Record one observation."""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+    
+    def take(self) -> Tuple[list, float]:
+        """Return the bucket counts and sum observed so far, and start over."""
+        counts, total = self.counts, self.sum
+        self.counts = [0] * len(counts)
+        self.sum = 0.0
+        self.count = 0
+        return counts, total
+    
+    def merge(self, counts: list, total: float):
+        """Add observations taken from a histogram with the same buckets, e.g. in another process."""
+        for i, count in enumerate(counts):
+            self.counts[i] += count
+        self.sum += total
+        self.count += sum(counts)
+    
+    def samples(self, name: str):
+        """Yield exposition lines with cumulative buckets."""
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            cumulative += count
+            le = f'le="{_format_value(bound)}"'
+            yield f"{name}_bucket{_format_labels(self.labels, le)} {cumulative}"
+        yield f"{name}_sum{_format_labels(self.labels)} {_format_value(self.sum)}"
+        yield f"{name}_count{_format_labels(self.labels)} {self.count}"
+
+
+class MetricsRegistry:
+    """
+    Holds all metrics of the service and renders them for /metrics.
+    Metrics are created once and looked up by name and labels.
+    """
+    
+    def __init__(self, namespace: str, enabled: bool = True):
+        self.namespace = namespace
+        self.enabled = enabled
+        self._families: Dict[str, dict] = {}
+    
+    def _get(self, cls, name: str, help_text: str, labels: Optional[dict], **kwargs):
+        """Get or create a metric of a family."""
+        full_name = f"{self.namespace}_{name}"
+        family = self._families.get(full_name)
+        if family is None:
+            family = {"kind": cls.kind, "help": help_text, "metrics": {}}
+            self._families[full_name] = family
+        key = tuple(sorted((labels or {}).items()))
+        metric = family["metrics"].get(key)
+        if metric is None:
+            metric = cls(labels=key, **kwargs)
+            family["metrics"][key] = metric
+        return metric
+    
+    def counter(self, name: str, help_text: str, labels: dict = None, callback: Callable[[], float] = None) -> Counter:
+        """Get or create a counter, optionally read from a callback at scrape time."""
+        counter = self._get(Counter, name, help_text, labels)
+        if callback is not None:
+            counter.callback = callback
+        return counter
+    
+    def gauge(self, name: str, help_text: str, labels: dict = None, callback: Callable[[], float] = None) -> Gauge:
+        """Get or create a gauge, optionally read from a callback at scrape time."""
+        gauge = self._get(Gauge, name, help_text, labels)
+        if callback is not None:
+            gauge.callback = callback
+        return gauge
+    
+    def histogram(self, name: str, help_text: str, labels: dict = None) -> Histogram:
+        """Get or create a histogram."""
+        return self._get(Histogram, name, help_text, labels)
+    
+    def stage(self, stage: str) -> Histogram:
+        """Get the latency histogram of a pipeline stage."""
+        return self.histogram(
+            "stage_duration_seconds",
+            "Time spent in each pipeline stage",
+            {"stage": stage}
+        )
+    
+    def timed(self, stage: str):
+        """
+        Decorator recording a function's duration into its stage histogram.
+        When metrics are disabled the function is returned unwrapped, so
+        the hook costs nothing at call time.
+        """
+        def decorator(func):
+            if not self.enabled:
+                return func
+            histogram = self.stage(stage)
+            clock = time.perf_counter
+            
+            if asyncio.iscoroutinefunction(func):
+                @wraps(func)
+                async def async_wrapper(*args, **kwargs):
+                    start = clock()
+                    try:
+                        return await func(*args, **kwargs)
+                    finally:
+                        histogram.observe(clock() - start)
+                return async_wrapper
+            
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                start = clock()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    histogram.observe(clock() - start)
+            return wrapper
+        
+        return decorator
+    
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines = []
+        for name, family in self._families.items():
+            lines.append(f"# HELP {name} {family['help']}")
+            lines.append(f"# TYPE {name} {family['kind']}")
+            for metric in family["metrics"].values():
+                lines.extend(metric.samples(name))
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry("media_pipe", enabled=settings.METRICS_ENABLED)
@@ -1,8 +1,9 @@
 """Gesture classification using landmarks."""
 
 import numpy as np
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 from app.config import settings
+from app.metrics import metrics
 
 
 class GestureClassifier:
@@ -34,85 +35,163 @@ class GestureClassifier:
     PINKY_DIP = 19
     PINKY_TIP = 20
     
+    FINGER_TIPS = [INDEX_TIP, MIDDLE_TIP, RING_TIP, PINKY_TIP]
+    FINGER_PIPS = [INDEX_PIP, MIDDLE_PIP, RING_PIP, PINKY_PIP]
+    FINGER_NAMES = ['thumb', 'index', 'middle', 'ring', 'pinky']
+    # Tip and base joint of each finger for the finger states, thumb first
+    STATE_TIPS = [THUMB_TIP, INDEX_TIP, MIDDLE_TIP, RING_TIP, PINKY_TIP]
+    STATE_BASES = [THUMB_MCP, INDEX_MCP, MIDDLE_MCP, RING_MCP, PINKY_MCP]
+    # Every distance the rules need, as (from, to) landmark pairs gathered in
+    # one go: thumb tip and IP to the pinky MCP, then each state tip and base
+    # to the wrist
+    DISTANCE_FROM = [THUMB_TIP, THUMB_IP] + STATE_TIPS + STATE_BASES
+    DISTANCE_TO = [PINKY_MCP, PINKY_MCP] + [WRIST] * 10
+    
+    # Two-hand signs: unordered pair of hand shapes -> (sign, max hand distance).
+    # The distance is between hand centres in units of hand size; None means
+    # the hands may be anywhere. Shapes are labels _match_pattern returns, so
+    # the H hand shape of NAME is "2".
+    TWO_HAND_PATTERNS = {
+        ("Y", "Y"): ("PLAY", None),
+        ("0", "0"): ("MORE", 1.5),
+        ("5", "A"): ("HELP", 1.5),
+        ("5", "5"): ("BOOK", 1.5),
+        ("2", "2"): ("NAME", 1.5),
+        ("A", "A"): ("WITH", 1.5),
+    }
+    
     def __init__(self):
         self.confidence_threshold = settings.CONFIDENCE_THRESHOLD
     
-    def classify(self, landmarks: list) -> Tuple[Optional[str], float]:
+    @metrics.timed("classify")
+    def classify(self, landmarks) -> Tuple[Optional[str], float]:
         """
         Classify gesture from landmarks.
         
+        Args:
+            landmarks: (21, 3) normalized landmarks; float32 arrays are
+                used as is, lists are converted
+        
         Returns:
             Tuple of (sign, confidence)
         """
-        if not landmarks or len(landmarks) < 21:
+        if landmarks is None or len(landmarks) < 21:
             return None, 0.0
         
-        landmarks = np.array(landmarks)
+        landmarks = np.asarray(landmarks, dtype=np.float32)
+        return self._classify_hands(landmarks[np.newaxis])[0]
+    
+    @metrics.timed("classify_batch")
+    def classify_batch(self, hands) -> List[Tuple[Optional[str], float]]:
+        """
+        Classify several hands in one call.
+        
+        Args:
+            hands: (H, 21, 3) normalized landmarks
+        
+        Returns:
+            List of (sign, confidence), one per hand
+        """
+        hands = np.asarray(hands, dtype=np.float32)
+        if hands.ndim != 3 or hands.shape[1] < 21:
+            return [(None, 0.0)] * (len(hands) if hands.ndim == 3 else 0)
+        return self._classify_hands(hands)
+    
+    def _classify_hands(self, hands: np.ndarray) -> List[Tuple[Optional[str], float]]:
+        """Shared batch path: features are computed for all hands at once."""
+        distances = self._distances_batch(hands)
         
         # Check which fingers are extended
-        fingers_extended = self._get_extended_fingers(landmarks)
+        fingers_extended = self._extended_fingers_batch(hands, distances)
         
-        # Get finger-to-palm relationships
-        finger_states = self._get_finger_states(landmarks)
+        # Calculate confidence based on clarity of pattern
+        confidences = self._confidence_batch(hands, distances)
         
-        # Classify based on finger patterns
-        sign = self._match_pattern(fingers_extended, finger_states, landmarks)
+        results = []
+        for i in range(len(hands)):
+            # Get finger-to-palm relationships
+            finger_states = self._finger_states_from(hands[i], distances[i])
+            
+            # Classify based on finger patterns
+            sign = self._match_pattern(fingers_extended[i].tolist(), finger_states, hands[i])
+            results.append((sign, float(confidences[i])) if sign else (None, 0.0))
+        return results
+    
+    def classify_two_hands(self, hands, results: List[Tuple[Optional[str], float]]) -> Optional[Tuple[str, float]]:
+        """
+        Match a two-hand sign from two hands' single-hand results.
         
-        if sign:
-            # Calculate confidence based on clarity of pattern
-            confidence = self._calculate_confidence(fingers_extended, landmarks)
-            return sign, confidence
+        Args:
+            hands: (2, 21, 3) landmarks in frame coordinates (not normalized),
+                so the distance between the hands is known
+            results: classify_batch output for the same hands
         
-        return None, 0.0
+        Returns:
+            (sign, confidence) or None when the pair is not a two-hand sign
+        """
+        if len(results) != 2 or not results[0][0] or not results[1][0]:
+            return None
+        pattern = self.TWO_HAND_PATTERNS.get(tuple(sorted((results[0][0], results[1][0]))))
+        if pattern is None:
+            return None
+        sign, max_distance = pattern
+        
+        if max_distance is not None:
+            hands = np.asarray(hands, dtype=np.float32)[:, :, :2]
+            centres = hands.mean(axis=1)
+            size = np.linalg.norm(hands[:, self.MIDDLE_MCP] - hands[:, self.WRIST], axis=-1).mean()
+            if size == 0 or np.linalg.norm(centres[0] - centres[1]) / size > max_distance:
+                return None
+        return sign, min(results[0][1], results[1][1])
     
-    def _get_extended_fingers(self, landmarks: np.ndarray) -> list:
-        """Check which fingers are extended."""
-        fingers = []
+    def _distances_batch(self, hands: np.ndarray) -> np.ndarray:
+        """(H, 12) distances between the DISTANCE_FROM and DISTANCE_TO landmarks."""
+        difference = hands[:, self.DISTANCE_FROM] - hands[:, self.DISTANCE_TO]
+        return np.sqrt(np.einsum("hij,hij->hi", difference, difference))
+    
+    def _extended_fingers_batch(self, hands: np.ndarray, distances: np.ndarray = None) -> np.ndarray:
+        """(H, 5) booleans: which fingers are extended, thumb first."""
+        if distances is None:
+            distances = self._distances_batch(hands)
+        extended = np.empty((len(hands), 5), dtype=bool)
         
-        # Thumb (check x distance from pinky MCP)
-        thumb_tip = landmarks[self.THUMB_TIP]
-        thumb_ip = landmarks[self.THUMB_IP]
-        pinky_mcp = landmarks[self.PINKY_MCP]
-        thumb_extended = np.linalg.norm(thumb_tip - pinky_mcp) > np.linalg.norm(thumb_ip - pinky_mcp)
-        fingers.append(thumb_extended)
+        # Thumb (check distance from pinky MCP)
+        extended[:, 0] = distances[:, 0] > distances[:, 1]
         
         # Other 4 fingers (compare tip y to PIP y)
-        finger_tips = [self.INDEX_TIP, self.MIDDLE_TIP, self.RING_TIP, self.PINKY_TIP]
-        finger_pips = [self.INDEX_PIP, self.MIDDLE_PIP, self.RING_PIP, self.PINKY_PIP]
+        # Note: y increases downward in image coordinates
+        extended[:, 1:] = hands[:, self.FINGER_TIPS, 1] < hands[:, self.FINGER_PIPS, 1]
+        return extended
+    
+    def _finger_states_from(self, landmarks: np.ndarray, distances: np.ndarray) -> dict:
+        """Finger states of one hand from its precomputed distances."""
+        extended = (distances[2:7] > distances[7:12] * 1.5).tolist()
+        tips = landmarks[self.STATE_TIPS, :2].tolist()
+        return {
+            name: {'extended': extended[i], 'tip_y': tips[i][1], 'tip_x': tips[i][0]}
+            for i, name in enumerate(self.FINGER_NAMES)
+        }
+    
+    def _confidence_batch(self, hands: np.ndarray, distances: np.ndarray = None) -> np.ndarray:
+        """(H,) confidence scores based on clarity."""
+        if distances is None:
+            distances = self._distances_batch(hands)
         
-        for tip_idx, pip_idx in zip(finger_tips, finger_pips):
-            # Note: y increases downward in image coordinates
-            extended = landmarks[tip_idx][1] < landmarks[pip_idx][1]
-            fingers.append(extended)
+        # Check landmark stability (variance of the finger tip distances)
+        variance = distances[:, 3:7].var(axis=1)
         
-        return fingers  # [thumb, index, middle, ring, pinky]
+        # Higher confidence for clear, stable patterns
+        base_confidence = 0.7 + (0.2 * (1 - np.minimum(variance, 1.0)))
+        return np.minimum(base_confidence, 0.95)
+    
+    def _get_extended_fingers(self, landmarks: np.ndarray) -> list:
+        """Check which fingers are extended: [thumb, index, middle, ring, pinky]."""
+        return self._extended_fingers_batch(np.asarray(landmarks)[np.newaxis])[0].tolist()
     
     def _get_finger_states(self, landmarks: np.ndarray) -> dict:
         """Get detailed finger states."""
-        wrist = landmarks[self.WRIST]
-        
-        states = {}
-        finger_names = ['thumb', 'index', 'middle', 'ring', 'pinky']
-        
-        for i, name in enumerate(finger_names):
-            base_idx = i * 4 + 1 if i > 0 else 1
-            tip_idx = base_idx + 3 if i > 0 else self.THUMB_TIP
-            
-            # Calculate if finger is pointing up/down/curled
-            tip = landmarks[tip_idx]
-            mcp = landmarks[base_idx] if i > 0 else landmarks[self.THUMB_MCP]
-            
-            # Distance from wrist
-            tip_dist = np.linalg.norm(tip - wrist)
-            mcp_dist = np.linalg.norm(mcp - wrist)
-            
-            states[name] = {
-                'extended': tip_dist > mcp_dist * 1.5,
-                'tip_y': tip[1],
-                'tip_x': tip[0]
-            }
-        
-        return states
+        landmarks = np.asarray(landmarks)
+        return self._finger_states_from(landmarks, self._distances_batch(landmarks[np.newaxis])[0])
     
     def _match_pattern(self, fingers: list, states: dict, landmarks: np.ndarray) -> Optional[str]:
         """
@@ -189,19 +268,4 @@ class GestureClassifier:
     
     def _calculate_confidence(self, fingers: list, landmarks: np.ndarray) -> float:
         """Calculate confidence score based on clarity."""
-        # Higher confidence when pattern is clear
-        extended_count = sum(fingers)
-        
-        # Check landmark stability (distance variance)
-        wrist = landmarks[self.WRIST]
-        distances = []
-        for i in [self.INDEX_TIP, self.MIDDLE_TIP, self.RING_TIP, self.PINKY_TIP]:
-            dist = np.linalg.norm(landmarks[i] - wrist)
-            distances.append(dist)
-        
-        variance = np.var(distances)
-        
-        # Higher confidence for clear, stable patterns
-        base_confidence = 0.7 + (0.2 * (1 - min(variance, 1.0)))
-        
-        return min(base_confidence, 0.95)
+        return float(self._confidence_batch(np.asarray(landmarks)[np.newaxis])[0])
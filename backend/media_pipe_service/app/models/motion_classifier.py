@@ -0,0 +1,74 @@
+"""Dynamic sign classification from landmark trajectories."""
+
+import math
+from typing import Optional, Tuple
+
+from app.services.trajectory_buffer import Trajectory, TrajectoryBuffer, INDEX_TIP, PINKY_TIP
+
+
+class MotionClassifier:
+    """
+    Rule-based classifier for signs drawn in the air.
+
+    Each pattern names the fingertip that draws it, the static hand shape
+    it is signed with, and thresholds on that fingertip's trajectory
+    features (distances in hand sizes, angles in radians).
+    """
+    
+    MOTION_PATTERNS = {
+        # Pinky hooks down and round: I hand shape, a curved path ending lower
+        "J": {
+            "point": PINKY_TIP,
+            "shape": "I",
+            "min_path": 1.2,
+            "min_turning": math.radians(90),
+            "min_dy": 0.3,
+        },
+        # Index draws a Z: 1 hand shape, two sharp turns in opposite directions
+        "Z": {
+            "point": INDEX_TIP,
+            "shape": "1",
+            "min_path": 2.0,
+            "min_sharp_turns": 2,
+            "min_sharp_turns_each_way": 1,
+        },
+    }
+    
+    def __init__(self, min_frames: int = 8, min_shape_ratio: float = 0.5):
+        self.min_frames = min_frames
+        self.min_shape_ratio = min_shape_ratio
+    
+    def classify(self, trajectory: Trajectory) -> Tuple[Optional[str], float]:
+        """
+        Match the window against the motion patterns.
+
+        Returns:
+            Tuple of (sign, confidence); confidence grows with the share
+            of frames showing the pattern's hand shape
+        """
+        frames = len(trajectory.shapes)
+        if frames < self.min_frames:
+            return None, 0.0
+        duration = TrajectoryBuffer.duration(trajectory)
+        
+        for sign, pattern in self.MOTION_PATTERNS.items():
+            shape_ratio = trajectory.shape_counts.get(pattern["shape"], 0) / frames
+            if shape_ratio < self.min_shape_ratio:
+                continue
+            
+            features = trajectory.tracks[pattern["point"]].features(duration)
+            if features["path_length"] < pattern["min_path"]:
+                continue
+            if abs(features["turning"]) < pattern.get("min_turning", 0.0):
+                continue
+            if features["dy"] < pattern.get("min_dy", -math.inf):
+                continue
+            if features["sharp_turns"] < pattern.get("min_sharp_turns", 0):
+                continue
+            each_way = min(features["sharp_turns_cw"], features["sharp_turns_ccw"])
+            if each_way < pattern.get("min_sharp_turns_each_way", 0):
+                continue
+            
+            return sign, min(0.7 + 0.25 * shape_ratio, 0.95)
+        
+        return None, 0.0
@@ -13,7 +13,8 @@ class HandLandmarks(BaseModel):
 
 class FrameData(BaseModel):
     """Incoming video frame from client."""
-    image: str  # base64 encoded JPEG
+    image: Optional[str] = None  # base64 encoded JPEG
+    landmarks: Optional[List[List[float]]] = None  # Pre-extracted 21 landmarks, skips detection
     timestamp: int
     session_id: str
 
@@ -45,3 +46,4 @@ class CommandPayload(BaseModel):
     """Command payload for start/stop."""
     action: Literal["start", "stop", "clear"]
     session_id: str
+    max_fps: Optional[float] = None  # Optional per-session FPS cap on start
@@ -1,4 +1,5 @@
 from .websocket import websocket_router
 from .health import health_router
+from .metrics import metrics_router
 
-__all__ = ["websocket_router", "health_router"]
+__all__ = ["websocket_router", "health_router", "metrics_router"]
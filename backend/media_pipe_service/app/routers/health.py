@@ -1,8 +1,11 @@
 """Health check endpoints."""
 
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
 from datetime import datetime
 
+from app.routers.websocket import connection_manager, detector_pool, frame_decoder, frame_scheduler, idle_sampler, landmark_filter, landmark_log, lifecycle, motion_gate, roi_tracker, speculator, trajectory_buffer
+
 health_router = APIRouter()
 
 
@@ -13,13 +16,31 @@ async def health_check():
         "status": "healthy",
         "service": "media_pipe",
         "timestamp": datetime.utcnow().isoformat(),
-        "version": "1.0.0"
+        "version": "1.0.0",
+        "connections": connection_manager.get_stats(),
+        "scheduler": frame_scheduler.get_stats(),
+        "lifecycle": lifecycle.get_stats(),
+        "decode": frame_decoder.get_stats(),
+        "detector_pool": detector_pool.get_stats() if detector_pool is not None else None,
+        "roi": roi_tracker.get_stats(),
+        "motion_gate": motion_gate.get_stats(),
+        "idle_sampler": idle_sampler.get_stats(),
+        "landmark_filter": landmark_filter.get_stats(),
+        "trajectory": trajectory_buffer.get_stats(),
+        "speculation": speculator.get_stats(),
+        "landmark_log": landmark_log.get_stats() if landmark_log is not None else None
     }
 
 
 @health_router.get("/ready")
 async def readiness_check():
-    """Readiness check for Kubernetes."""
+    """Readiness check for Kubernetes; not ready until the detectors are warmed up."""
+    if not lifecycle.ready:
+        return JSONResponse(status_code=503, content={
+            "ready": False,
+            "state": lifecycle.state,
+            "service": "media_pipe"
+        })
     return {
         "ready": True,
         "service": "media_pipe"
@@ -1,30 +1,167 @@
 """WebSocket endpoint for real-time sign detection."""
 
 import json
+import time
 import asyncio
 import httpx
-from typing import Dict
+import numpy as np
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
 from app.services.hand_detector import HandDetector
 from app.services.sign_buffer import SignBuffer
+from app.services.connection_manager import ConnectionManager
+from app.services.frame_scheduler import FrameScheduler
+from app.services.detector_pool import DetectorPool
+from app.services.frame_decoder import FrameDecoder
+from app.services.landmark_log import create_landmark_log_writer
+from app.services.roi_tracker import ROITracker
+from app.services.motion_gate import MotionGate
+from app.services.idle_sampler import IdleSampler, IDLE
+from app.services.landmark_buffers import LandmarkBuffers
+from app.services.landmark_filter import LandmarkFilter
+from app.services.trajectory_buffer import TrajectoryBuffer
+from app.services.speculator import Speculator
 from app.models.gesture_classifier import GestureClassifier
+from app.models.motion_classifier import MotionClassifier
 from app.config import settings
+from app.lifecycle import Lifecycle
+from app.metrics import metrics
+from app.tracing import tracer, NOOP_TRACE
 
 websocket_router = APIRouter()
 
 # Active connections and services
-active_connections: Dict[str, WebSocket] = {}
-hand_detector = HandDetector()
+connection_manager = ConnectionManager()
+frame_decoder = FrameDecoder()
 sign_buffer = SignBuffer()
 gesture_classifier = GestureClassifier()
+roi_tracker = ROITracker()
+motion_gate = MotionGate()
+idle_sampler = IdleSampler()
+landmark_buffers = LandmarkBuffers()
+landmark_filter = LandmarkFilter()
+trajectory_buffer = TrajectoryBuffer()
+motion_classifier = MotionClassifier()
+speculator = Speculator()
+
+
+# Client timestamps further than this from server time are not trusted
+MAX_CLIENT_CLOCK_SKEW_NS = 60 * 1_000_000_000
+
+
+def _frame_dropped(session_id: str, item: tuple, reason: str):
+    """Account for a queued frame discarded by the scheduler."""
+    websocket, payload, trace = item
+    connection = connection_manager.get(websocket)
+    if connection is not None:
+        connection.queued_frames -= 1
+        connection_manager.spawn(websocket, websocket.send_json(_dropped_message(session_id, payload, reason)))
+    trace.set_attribute("dropped", reason)
+    trace.release()
+
+
+def _dropped_message(session_id: str, payload: dict, reason: str) -> dict:
+    """Tell the client a frame was dropped unprocessed, so it can slow down."""
+    return {
+        "type": "frame_dropped",
+        "payload": {
+            "session_id": session_id,
+            "timestamp": payload.get("timestamp", 0),
+            "reason": reason
+        }
+    }
+
+
+async def _process_scheduled_frame(session_id: str, item: tuple):
+    """Run a frame picked by the scheduler."""
+    websocket, payload, trace = item
+    await process_frame(websocket, payload, trace)
+
+
+# With detector processes, keep two frames per process in flight
+frame_scheduler = FrameScheduler(_process_scheduled_frame, on_drop=_frame_dropped,
+                                 workers=max(1, 2 * settings.DETECTOR_WORKERS))
+
+# Optional pool of detector processes, started with the app
+detector_pool = DetectorPool(frame_decoder=frame_decoder, roi_tracker=roi_tracker,
+                             motion_gate=motion_gate) if settings.DETECTOR_WORKERS > 0 else None
+
+# MediaPipe is loaded and warmed up at start-up, not on import
+lifecycle = Lifecycle(lambda: HandDetector(decoder=frame_decoder), pool=detector_pool)
+
+connection_manager.register_store("sign_buffer", sign_buffer)
+connection_manager.register_store("frame_scheduler", frame_scheduler)
+connection_manager.register_store("roi_tracker", roi_tracker)
+connection_manager.register_store("frame_decoder", frame_decoder)
+connection_manager.register_store("motion_gate", motion_gate)
+connection_manager.register_store("idle_sampler", idle_sampler)
+connection_manager.register_store("landmark_buffers", landmark_buffers)
+connection_manager.register_store("landmark_filter", landmark_filter)
+if detector_pool is not None:
+    connection_manager.register_store("detector_pool", detector_pool)
+connection_manager.register_store("trajectory_buffer", trajectory_buffer)
+connection_manager.register_store("speculator", speculator)
+
+# Optional recording of landmark streams for replay and training data
+landmark_log = create_landmark_log_writer(
+    settings.LANDMARK_LOG_DIR, settings.LANDMARK_LOG_DTYPE, settings.LANDMARK_LOG_CHUNK_FRAMES
+)
+if landmark_log is not None:
+    connection_manager.register_store("landmark_log", landmark_log)
+
+# Metrics
+frames_received = metrics.counter("frames_received_total", "Frames received over WebSocket")
+hands_detected = metrics.counter("hands_detected_total", "Frames with a detected hand")
+signs_detected = metrics.counter("signs_detected_total", "Frames classified as a sign")
+motion_signs_detected = metrics.counter("motion_signs_total", "Signs recognized from hand motion")
+sequences_committed = metrics.counter("sequences_committed_total", "Sign sequences committed to the LLM")
+llm_failures = metrics.counter("llm_request_failures_total", "Failed requests to the LLM service")
+metrics.counter("speculations_total", "Sequences sent for speculative translation",
+                callback=lambda: speculator.speculated)
+metrics.counter("speculations_diverged_total", "Speculations cancelled by a later sign",
+                callback=lambda: speculator.diverged)
+metrics.counter("speculations_matched_total", "Committed sequences equal to their speculation",
+                callback=lambda: speculator.matched)
+metrics.counter("frames_processed_total", "Frames processed by the scheduler",
+                callback=lambda: frame_scheduler.total_processed)
+metrics.counter("frames_dropped_total", "Frames dropped before processing", {"reason": "rate_limit"},
+                callback=lambda: frame_scheduler.total_dropped_rate)
+metrics.counter("frames_dropped_total", "Frames dropped before processing", {"reason": "overflow"},
+                callback=lambda: frame_scheduler.total_dropped_overflow)
+metrics.counter("roi_frames_total", "Frames detected, by cropped or full-frame input", {"mode": "cropped"},
+                callback=lambda: roi_tracker.frames_cropped)
+metrics.counter("roi_frames_total", "Frames detected, by cropped or full-frame input", {"mode": "full"},
+                callback=lambda: roi_tracker.frames_full)
+metrics.counter("roi_fallbacks_total", "Cropped detections retried on the full frame",
+                callback=lambda: roi_tracker.fallbacks)
+metrics.counter("motion_gate_skipped_total", "Frames that reused the previous detection",
+                callback=lambda: motion_gate.frames_skipped)
+metrics.counter("idle_frames_skipped_total", "Frames not processed while the session had no hand in view",
+                callback=lambda: idle_sampler.frames_sampled_out)
+metrics.gauge("idle_sessions", "Sessions sampled at the idle rate",
+              callback=lambda: idle_sampler.get_stats()["idle_sessions"])
+for _reduction in (1, 2, 4):
+    metrics.counter("decoded_frames_total", "Frames decoded, by JPEG downscale factor",
+                    {"reduction": str(_reduction)},
+                    callback=lambda r=_reduction: frame_decoder.frames_by_reduction[r])
+metrics.gauge("websocket_connections", "Open WebSocket connections",
+              callback=lambda: len(connection_manager.connections))
+metrics.gauge("sessions", "Sessions bound to a connection",
+              callback=lambda: len(connection_manager.session_owners))
+metrics.gauge("frame_queue_depth", "Frames waiting in the scheduler",
+              callback=frame_scheduler.queue_depth)
+metrics.gauge("pending_llm_tasks", "Background LLM requests in flight",
+              callback=lambda: connection_manager.get_stats()["pending_tasks"])
+for _phase in ("import", "warmup", "ready", "time_to_first_frame"):
+    metrics.gauge("startup_seconds", "Start-up timings: import and warm-up durations, ready and first frame since import",
+                  labels={"phase": _phase},
+                  callback=lambda p=_phase: (lifecycle.get_stats()[f"{p}_ms"] or 0) / 1000)
 
 
 @websocket_router.websocket("/ws/sign-detection")
 async def websocket_endpoint(websocket: WebSocket):
     """WebSocket endpoint for real-time sign detection."""
-    await websocket.accept()
-    session_id = None
+    connection = await connection_manager.connect(websocket)
     
     try:
         while True:
@@ -48,9 +185,7 @@ async def websocket_endpoint(websocket: WebSocket):
                 })
                 
     except WebSocketDisconnect:
-        print(f"Client disconnected: {session_id}")
-        if session_id and session_id in active_connections:
-            del active_connections[session_id]
+        print(f"Client disconnected: {sorted(connection.sessions)}")
     except Exception as e:
         print(f"WebSocket error: {e}")
         try:
@@ -60,16 +195,86 @@ async def websocket_endpoint(websocket: WebSocket):
             })
         except:
             pass
+    finally:
+        await connection_manager.disconnect(websocket)
 
 
 async def handle_frame(websocket: WebSocket, payload: dict):
+    """Queue video frame for fair scheduling across sessions."""
+    session_id = payload.get("session_id", "default")
+    connection = connection_manager.bind_session(websocket, session_id)
+    if connection is not None:
+        connection.frames_received += 1
+    frames_received.inc()
+    
+    trace = _start_frame_trace(session_id, payload.get("timestamp", 0))
+    trace.start_span("queue_wait")
+    
+    if frame_scheduler.submit(session_id, (websocket, payload, trace)):
+        if connection is not None:
+            connection.queued_frames += 1
+    else:
+        trace.set_attribute("dropped", "rate_limit")
+        trace.release()
+        await websocket.send_json(_dropped_message(session_id, payload, "rate_limit"))
+
+
+def _start_frame_trace(session_id: str, timestamp: int):
+    """
+    Start the trace of one frame.
+    When the client timestamp (epoch ms) is plausible, the client-to-server
+    leg is recorded as its own span.
+    """
+    trace = tracer.start_trace("frame", session_id=session_id, client_timestamp_ms=timestamp)
+    if trace.sampled and timestamp:
+        client_ns = int(timestamp) * 1_000_000
+        received_ns = trace.root.start_ns
+        if 0 <= received_ns - client_ns < MAX_CLIENT_CLOCK_SKEW_NS:
+            span = trace.start_span("client_to_server", start_ns=client_ns)
+            span.end(received_ns)
+    return trace
+
+
+def _hand_keys(handedness, count: int) -> list:
+    """Per-hand stream names: the handedness labels when they tell the hands apart."""
+    if handedness and len(set(handedness)) == count and None not in handedness:
+        return list(handedness)
+    return [f"hand{i}" for i in range(count)]
+
+
+def _control_message(session_id: str, state: str) -> dict:
+    """Advise the client of a send rate for the session's new sampling state."""
+    if state == IDLE:
+        fps, reason = settings.IDLE_CLIENT_FPS, "no_hand"
+    else:
+        queue = frame_scheduler.queues.get(session_id)
+        fps, reason = (queue.max_fps if queue is not None and queue.max_fps else None), "hand_detected"
+    return {
+        "type": "control",
+        "payload": {
+            "action": "set_fps",
+            "session_id": session_id,
+            "fps": fps,
+            "state": state,
+            "reason": reason
+        }
+    }
+
+
+@metrics.timed("process_frame")
+async def process_frame(websocket: WebSocket, payload: dict, trace=NOOP_TRACE):
     """Process video frame and return detection result."""
+    connection = connection_manager.get(websocket)
+    trace.end_span("queue_wait")
+    frame_started = time.perf_counter()
+    
     try:
         image_b64 = payload.get("image")
+        client_landmarks = payload.get("landmarks")
         timestamp = payload.get("timestamp", 0)
         session_id = payload.get("session_id", "default")
         
-        if not image_b64:
+        if not image_b64 and not client_landmarks:
             await websocket.send_json({
                 "type": "detection",
                 "payload": {
@@ -81,46 +286,148 @@ async def handle_frame(websocket: WebSocket, payload: dict):
             })
             return
         
-        # Detect hand
-        hand_detected, landmarks, handedness, detection_conf = hand_detector.detect(image_b64)
+        if not client_landmarks and not idle_sampler.should_process(session_id):
+            # No hand in view for a while: only a sample of frames is detected
+            await websocket.send_json({
+                "type": "detection",
+                "payload": {
+                    "sign": None,
+                    "confidence": 0,
+                    "hand_detected": False,
+                    "idle": True,
+                    "timestamp": timestamp
+                }
+            })
+            return
+        
+        cached = False
+        if client_landmarks:
+            # Landmarks extracted upstream (e.g. load tests, replay): skip detection
+            landmarks = np.asarray(client_landmarks, dtype=np.float32)
+            if landmarks.ndim == 2:
+                landmarks = landmarks[np.newaxis]
+            if landmarks.ndim != 3 or landmarks.shape[1:] != (21, 3):
+                raise ValueError("Expected 21 landmarks per hand")
+            hand_detected, handedness = True, None
+        else:
+            # Detect hand off the event loop so other sessions keep receiving
+            with trace.span("detect") as span:
+                if detector_pool is not None:
+                    (hand_detected, landmarks, handedness, detection_conf), cached = await detector_pool.detect(
+                        session_id, image_b64
+                    )
+                else:
+                    hand_detected, landmarks, handedness, detection_conf = await asyncio.to_thread(
+                        lifecycle.detector.detect, image_b64, session_id, roi_tracker, motion_gate
+                    )
+                    cached = motion_gate.is_cached(session_id)
+                span.set_attribute("hand_detected", hand_detected)
+                span.set_attribute("cached", cached)
+            transition = idle_sampler.observe(session_id, hand_detected)
+            if transition is not None:
+                await websocket.send_json(_control_message(session_id, transition))
         
         if not hand_detected:
+            # A motion must be drawn with the hand in view throughout,
+            # and smoothing restarts from the next sighting
+            trajectory_buffer.clear_session(session_id)
+            landmark_filter.clear_session(session_id)
+            # The hand usually drops when the user stops signing
+            _advance_sequence(websocket, session_id, False, trace)
             await websocket.send_json({
                 "type": "detection",
                 "payload": {
                     "sign": None,
                     "confidence": 0,
                     "hand_detected": False,
+                    "cached": cached,
                     "timestamp": timestamp
                 }
             })
             return
         
-        # Normalize landmarks
-        normalized_landmarks = hand_detector.normalize_landmarks(landmarks)
+        hands_detected.inc()
         
-        # Classify gesture
-        sign, confidence = gesture_classifier.classify(normalized_landmarks)
+        with trace.span("classify") as span:
+            # Normalize into the session's buffer; landmarks stay ndarrays until the JSON below
+            normalized_landmarks = HandDetector.normalize_landmarks(
+                landmarks, out=landmark_buffers.get(session_id, len(landmarks))
+            )
+            # Smooth out frame-to-frame jitter before the finger thresholds see it
+            landmark_filter.apply(session_id, normalized_landmarks, keys=handedness)
+            
+            # Classify all hands in one call
+            hand_results = gesture_classifier.classify_batch(normalized_landmarks)
+            sign, confidence = hand_results[0]
+            # Signs for the buffer as (sign, confidence, hand stream)
+            buffered = [(sign, confidence, None)]
+            if len(hand_results) > 1:
+                hand_keys = _hand_keys(handedness, len(hand_results))
+                two_hand = gesture_classifier.classify_two_hands(landmarks[:2], hand_results[:2])
+                if two_hand is not None:
+                    sign, confidence = two_hand
+                    buffered = [(sign, confidence, "both")]
+                else:
+                    sign, confidence = max(hand_results, key=lambda result: result[1])
+                    buffered = [(s, c, key) for (s, c), key in zip(hand_results, hand_keys)]
+            
+            # Letters drawn in the air: track the primary hand over recent frames
+            replaces = None
+            if settings.DYNAMIC_SIGNS_ENABLED:
+                trajectory = trajectory_buffer.push(
+                    session_id, landmarks[0], normalized_landmarks[0], hand_results[0][0], time.time()
+                )
+                motion_sign, motion_confidence = motion_classifier.classify(trajectory)
+                if motion_sign is not None:
+                    motion_signs_detected.inc()
+                    replaces = motion_classifier.MOTION_PATTERNS[motion_sign]["shape"]
+                    sign, confidence = motion_sign, motion_confidence
+                    buffered = [(sign, confidence, buffered[0][2])]
+                    trajectory_buffer.clear_session(session_id)
+            span.set_attribute("sign", sign or "")
+            span.set_attribute("hands", len(hand_results))
+        
+        if landmark_log is not None:
+            # The log records one hand per frame: the first
+            landmark_log.append(session_id, time.time(), landmarks[0], handedness[0] if handedness else None,
+                                *hand_results[0])
         
         # Add to buffer if valid sign
-        if sign and confidence >= settings.CONFIDENCE_THRESHOLD:
-            is_new = sign_buffer.add_sign(session_id, sign, confidence)
-            
-            # Check if we should commit to LLM
-            if is_new and sign_buffer.should_commit(session_id):
-                sequence = sign_buffer.commit_sequence(session_id)
-                await send_to_llm(session_id, sequence)
+        is_new = False
+        for buffered_sign, buffered_confidence, hand in buffered:
+            if buffered_sign and buffered_confidence >= settings.CONFIDENCE_THRESHOLD:
+                signs_detected.inc()
+                with trace.span("sign_buffer"):
+                    is_new = sign_buffer.add_sign(
+                        session_id, buffered_sign, buffered_confidence, hand=hand, replaces=replaces
+                    ) or is_new
+        
+        # Commit to LLM after the timeout, speculating once the sequence is stable
+        _advance_sequence(websocket, session_id, is_new, trace)
+        
+        result = {
+            "sign": sign,
+            "confidence": confidence,
+            "hand_detected": True,
+            "landmarks": landmarks[0].tolist() if settings.DEBUG else None,
+            "cached": cached,
+            "timestamp": timestamp
+        }
+        if len(hand_results) > 1:
+            result["hands"] = [
+                {
+                    "handedness": key,
+                    "sign": hand_sign,
+                    "confidence": hand_confidence,
+                    "landmarks": hand_landmarks.tolist() if settings.DEBUG else None
+                }
+                for (hand_sign, hand_confidence), key, hand_landmarks in zip(hand_results, hand_keys, landmarks)
+            ]
         
         # Send detection result
         await websocket.send_json({
             "type": "detection",
-            "payload": {
-                "sign": sign,
-                "confidence": confidence,
-                "hand_detected": True,
-                "landmarks": landmarks if settings.DEBUG else None,
-                "timestamp": timestamp
-            }
+            "payload": result
         })
         
     except Exception as e:
@@ -129,6 +436,11 @@ async def handle_frame(websocket: WebSocket, payload: dict):
             "type": "error",
             "payload": {"message": f"Processing error: {str(e)}"}
         })
+    finally:
+        if connection is not None:
+            connection.queued_frames -= 1
+        lifecycle.frame_processed(frame_started)
+        trace.release()
 
 
 async def handle_command(websocket: WebSocket, payload: dict):
@@ -137,15 +449,17 @@ async def handle_command(websocket: WebSocket, payload: dict):
     session_id = payload.get("session_id", "default")
     
     if action == "start":
-        active_connections[session_id] = websocket
+        connection_manager.bind_session(websocket, session_id)
+        if payload.get("max_fps") is not None:
+            frame_scheduler.configure_session(session_id, max_fps=float(payload["max_fps"]))
         await websocket.send_json({
             "type": "command",
             "payload": {"status": "started", "session_id": session_id}
         })
         
     elif action == "stop":
-        if session_id in active_connections:
-            del active_connections[session_id]
+        if connection_manager.get_websocket(session_id) is websocket:
+            connection_manager.release_session(session_id)
         await websocket.send_json({
             "type": "command",
             "payload": {"status": "stopped", "session_id": session_id}
@@ -153,14 +467,79 @@ async def handle_command(websocket: WebSocket, payload: dict):
         
     elif action == "clear":
         sign_buffer.clear_session(session_id)
+        if speculator.cancel(session_id):
+            _queue_speculation_call(websocket, session_id, cancel_speculation(session_id))
         await websocket.send_json({
             "type": "command",
             "payload": {"status": "cleared", "session_id": session_id}
         })
 
 
-async def send_to_llm(session_id: str, sequence: list):
+def _advance_sequence(websocket: WebSocket, session_id: str, is_new: bool, trace=NOOP_TRACE):
+    """
+    Commit the session's sequence once no sign arrived for the timeout.
+    Before that, send it for speculative translation as soon as it has
+    been stable for a shorter time, and cancel that when a sign is added.
+    """
+    if is_new and speculator.sign_added(session_id):
+        _queue_speculation_call(websocket, session_id, cancel_speculation(session_id))
+    
+    if sign_buffer.should_commit(session_id):
+        with trace.span("commit"):
+            sequence = sign_buffer.commit_sequence(session_id)
+        sequences_committed.inc()
+        speculator.committed(session_id, sequence)
+        connection_manager.spawn(
+            websocket, send_to_llm(session_id, sequence, trace.acquire())
+        )
+        return
+    
+    sequence = speculator.due(sign_buffer, session_id)
+    if sequence is not None:
+        _queue_speculation_call(websocket, session_id, send_speculation(session_id, sequence))
+
+
+def _queue_speculation_call(websocket: WebSocket, session_id: str, coro):
+    """Send a speculation call once the session's previous one has finished."""
+    speculator.queue_call(session_id, coro, lambda call: connection_manager.spawn(websocket, call))
+
+
+async def send_speculation(session_id: str, sequence: list):
+    """Ask the LLM service to start translating a sequence that may still change."""
+    try:
+        async with httpx.AsyncClient() as client:
+            response = await client.post(
+                f"{settings.LLM_SERVICE_URL}/api/v1/translate/speculate",
+                json={
+                    "sign_sequence": sequence,
+                    "session_id": session_id,
+                    "context": ""
+                },
+                timeout=2.0
+            )
+            if response.status_code != 202:
+                llm_failures.inc()
+    except Exception as e:
+        llm_failures.inc()
+        print(f"Failed to send speculation to LLM: {e}")
+
+
+async def cancel_speculation(session_id: str):
+    """Cancel the LLM service's speculative translation for a session."""
+    try:
+        async with httpx.AsyncClient() as client:
+            await client.delete(
+                f"{settings.LLM_SERVICE_URL}/api/v1/translate/speculate/{session_id}",
+                timeout=2.0
+            )
+    except Exception as e:
+        print(f"Failed to cancel speculation: {e}")
+
+
+@metrics.timed("send_to_llm")
+async def send_to_llm(session_id: str, sequence: list, trace=NOOP_TRACE):
     """Send sign sequence to LLM service for translation."""
+    span = trace.start_span("llm_request", signs=len(sequence))
     try:
         async with httpx.AsyncClient() as client:
             response = await client.post(
@@ -170,13 +549,21 @@ async def send_to_llm(session_id: str, sequence: list):
                     "session_id": session_id,
                     "context": ""
                 },
+                headers=trace.headers(),
                 timeout=10.0
             )
+            span.set_attribute("status_code", response.status_code)
             
             if response.status_code == 200:
                 result = response.json()
                 # Could broadcast to frontend here if needed
                 print(f"LLM translation: {result.get('translation')}")
+            else:
+                llm_failures.inc()
             
     except Exception as e:
+        llm_failures.inc()
         print(f"Failed to send to LLM: {e}")
+    finally:
+        span.end()
+        trace.release()
@@ -1,4 +1,16 @@
 from .hand_detector import HandDetector
 from .sign_buffer import SignBuffer
+from .connection_manager import ConnectionManager
+from .frame_scheduler import FrameScheduler
+from .detector_pool import DetectorPool
+from .landmark_log import LandmarkLogWriter, LandmarkLogReader
+from .roi_tracker import ROITracker
+from .frame_decoder import FrameDecoder
+from .motion_gate import MotionGate
+from .idle_sampler import IdleSampler
+from .landmark_buffers import LandmarkBuffers
+from .landmark_filter import LandmarkFilter
+from .trajectory_buffer import TrajectoryBuffer
+from .speculator import Speculator
 
-__all__ = ["HandDetector", "SignBuffer"]
+__all__ = ["HandDetector", "SignBuffer", "ConnectionManager", "FrameScheduler", "DetectorPool", "LandmarkLogWriter", "LandmarkLogReader", "ROITracker", "FrameDecoder", "MotionGate", "IdleSampler", "LandmarkBuffers", "LandmarkFilter", "TrajectoryBuffer", "Speculator"]
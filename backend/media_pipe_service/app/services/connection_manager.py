@@ -0,0 +1,138 @@
+"""WebSocket connection lifecycle and per-connection resource accounting."""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Coroutine, Dict, Optional, Set
+from fastapi import WebSocket
+
+
+@dataclass
+class Connection:
+    """State owned by a single WebSocket connection."""
+    connection_id: int
+    websocket: WebSocket
+    connected_at: float = field(default_factory=time.time)
+    sessions: Set[str] = field(default_factory=set)
+    tasks: Set[asyncio.Task] = field(default_factory=set)
+    queued_frames: int = 0
+    frames_received: int = 0
+
+
+class ConnectionManager:
+    """
+    Binds WebSocket connections to the sessions they drive and releases
+    every per-session resource when the connection goes away.
+
+    Per-session stores (sign buffers, trackers, frame queues, ...) are
+    registered once with ``register_store``. A store only needs a
+    ``clear_session(session_id)`` method and ``__len__`` returning the
+    number of sessions it currently holds state for.
+    """
+    
+    def __init__(self):
+        self.connections: Dict[int, Connection] = {}
+        self.session_owners: Dict[str, int] = {}
+        self.stores: Dict[str, Any] = {}
+        self.total_connections = 0
+        self.total_released_sessions = 0
+    
+    def register_store(self, name: str, store: Any):
+        """Register a per-session store to be cleared on release."""
+        self.stores[name] = store
+    
+    async def connect(self, websocket: WebSocket) -> Connection:
+        """Accept a WebSocket and start tracking it."""
+        await websocket.accept()
+        connection = Connection(connection_id=id(websocket), websocket=websocket)
+        self.connections[connection.connection_id] = connection
+        self.total_connections += 1
+        return connection
+    
+    def get(self, websocket: WebSocket) -> Optional[Connection]:
+        """Get the connection record for a WebSocket."""
+        return self.connections.get(id(websocket))
+    
+    def bind_session(self, websocket: WebSocket, session_id: str) -> Optional[Connection]:
+        """
+        Bind a session to the connection that sent it.
+        A session re-bound from another connection (e.g. a reconnect)
+        moves ownership to the new connection.
+        """
+        connection = self.connections.get(id(websocket))
+        if connection is None:
+            return None
+        
+        if session_id in connection.sessions:
+            return connection
+        
+        previous_owner = self.session_owners.get(session_id)
+        if previous_owner is not None and previous_owner in self.connections:
+            self.connections[previous_owner].sessions.discard(session_id)
+        
+        connection.sessions.add(session_id)
+        self.session_owners[session_id] = connection.connection_id
+        return connection
+    
+    def get_websocket(self, session_id: str) -> Optional[WebSocket]:
+        """Get the WebSocket currently owning a session."""
+        owner = self.session_owners.get(session_id)
+        connection = self.connections.get(owner) if owner is not None else None
+        return connection.websocket if connection else None
+    
+    def spawn(self, websocket: WebSocket, coro: Coroutine) -> asyncio.Task:
+        """
+        Run a background coroutine owned by the connection.
+        Pending tasks are cancelled when the connection is released.
+        """
+        task = asyncio.create_task(coro)
+        connection = self.connections.get(id(websocket))
+        if connection is not None:
+            connection.tasks.add(task)
+            task.add_done_callback(connection.tasks.discard)
+        return task
+    
+    def release_session(self, session_id: str):
+        """Release all store state held for a session."""
+        owner = self.session_owners.pop(session_id, None)
+        if owner is not None and owner in self.connections:
+            self.connections[owner].sessions.discard(session_id)
+        
+        for store in self.stores.values():
+            store.clear_session(session_id)
+        self.total_released_sessions += 1
+    
+    async def disconnect(self, websocket: WebSocket):
+        """
+        Release everything the connection holds.
+        Safe to call more than once.
+        """
+        connection = self.connections.pop(id(websocket), None)
+        if connection is None:
+            return
+        
+        for session_id in list(connection.sessions):
+            # Only release sessions this connection still owns
+            if self.session_owners.get(session_id) == connection.connection_id:
+                self.release_session(session_id)
+        connection.sessions.clear()
+        
+        tasks = [task for task in connection.tasks if not task.done()]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        connection.tasks.clear()
+        connection.queued_frames = 0
+    
+    def get_stats(self) -> dict:
+        """Get live connection and resource counts."""
+        return {
+            "active_connections": len(self.connections),
+            "bound_sessions": len(self.session_owners),
+            "pending_tasks": sum(len(c.tasks) for c in self.connections.values()),
+            "queued_frames": sum(c.queued_frames for c in self.connections.values()),
+            "total_connections": self.total_connections,
+            "released_sessions": self.total_released_sessions,
+            "store_sessions": {name: len(store) for name, store in self.stores.items()},
+        }
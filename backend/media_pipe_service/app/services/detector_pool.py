@@ -0,0 +1,468 @@
+"""Multi-process hand detection fed through shared-memory frame rings."""
+
+import asyncio
+import base64
+import multiprocessing
+import threading
+import time
+import zlib
+from collections import deque
+from dataclasses import dataclass, field
+from multiprocessing import shared_memory
+from multiprocessing.connection import wait
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from app.config import settings
+from app.metrics import metrics
+
+
+# Messages to a worker: (FRAME, slot, length, session_id), (CLEAR, session_id) or (STOP,).
+# Workers answer (READY, index, generation) once, then one result tuple per frame.
+FRAME = "frame"
+CLEAR = "clear"
+STOP = "stop"
+READY = "ready"
+
+NO_HAND = (False, None, None, None)
+
+# Counters of the worker's stores and stages it times. Each result carries
+# what a frame added to them, which the server adds to its own stores and
+# histograms so health and /metrics read the same as without a pool.
+ROI_COUNTERS = ("frames_cropped", "frames_full", "fallbacks", "pixels_processed", "pixels_total")
+GATE_COUNTERS = ("frames_checked", "frames_skipped", "forced_detections")
+WORKER_STAGES = ("decode_frame", "hands_process")
+
+
+def _read_counters(decoder, roi_tracker, motion_gate) -> Tuple[tuple, tuple, tuple]:
+    """Cumulative counters of a worker's decoder, ROI tracker and motion gate."""
+    return (
+        tuple(decoder.frames_by_reduction.values()),
+        tuple(getattr(roi_tracker, name) for name in ROI_COUNTERS),
+        tuple(getattr(motion_gate, name) for name in GATE_COUNTERS),
+    )
+
+
+def _worker_main(index: int, generation: int, frames_name: str, results_name: str, slots: int,
+                 slot_bytes: int, max_hands: int, connection):
+    """
+    Detector process loop.
+    Reads encoded frames from its input ring, writes landmarks to its output
+    ring and answers with the slot, the per-hand labels and scores, and
+    what the frame added to the counters and stage timings.
+    """
+    from app.services.hand_detector import HandDetector
+    from app.services.roi_tracker import ROITracker
+    from app.services.motion_gate import MotionGate
+    
+    frames = shared_memory.SharedMemory(name=frames_name)
+    results = shared_memory.SharedMemory(name=results_name)
+    landmarks_out = np.ndarray((slots, max_hands, 21, 3), dtype=np.float32, buffer=results.buf)
+    
+    # Sessions always land on the same worker, so their tracking state lives here
+    detector = HandDetector()
+    roi_tracker = ROITracker()
+    motion_gate = MotionGate()
+    stores = [detector.decoder, motion_gate, roi_tracker]
+    stages = [metrics.stage(stage) for stage in WORKER_STAGES]
+    if settings.WARMUP_ENABLED:
+        detector.warm_up()
+    # Only frames from the server are reported
+    counters = _read_counters(detector.decoder, roi_tracker, motion_gate)
+    for histogram in stages:
+        histogram.take()
+    connection.send((READY, index, generation))
+    
+    try:
+        while True:
+            try:
+                message = connection.recv()
+            except EOFError:
+                break
+            if message[0] == STOP:
+                break
+            if message[0] == CLEAR:
+                for store in stores:
+                    store.clear_session(message[1])
+                continue
+            
+            _, slot, length, session_id = message
+            hands, handedness, confidence, cached = 0, None, None, False
+            try:
+                start = slot * slot_bytes
+                detected, landmarks, handedness, confidence = detector.detect_encoded(
+                    bytes(frames.buf[start:start + length]), session_id, roi_tracker, motion_gate
+                )
+                if detected:
+                    hands = min(len(landmarks), max_hands)
+                    landmarks_out[slot, :hands] = landmarks[:hands]
+                    handedness = list(handedness[:hands])
+                    confidence = [float(c) for c in confidence[:hands]]
+                cached = motion_gate.is_cached(session_id)
+            except Exception as e:
+                print(f"Detector worker {index} error: {e}")
+            
+            previous, counters = counters, _read_counters(detector.decoder, roi_tracker, motion_gate)
+            added = tuple(
+                tuple(after - before for before, after in zip(old, new))
+                for old, new in zip(previous, counters)
+            )
+            timings = tuple((i, *histogram.take()) for i, histogram in enumerate(stages) if histogram.count)
+            connection.send((index, generation, slot, hands, handedness, confidence, cached, added, timings))
+    finally:
+        del landmarks_out
+        frames.close()
+        results.close()
+        detector.close()
+        connection.close()
+
+
+@dataclass
+class DetectorWorker:
+    """One detector process and its rings, as seen from the server process."""
+    index: int
+    frames: shared_memory.SharedMemory  # Input ring: encoded frames
+    results: shared_memory.SharedMemory  # Output ring: (slots, max_hands, 21, 3) float32
+    landmarks: np.ndarray  # View of the output ring
+    free_slots: deque
+    slot_available: asyncio.Semaphore
+    ready: asyncio.Event  # Set once the process has loaded its model
+    process: Optional[multiprocessing.process.BaseProcess] = None
+    connection: Optional[multiprocessing.connection.Connection] = None  # Pipe to the process
+    pending: Dict[int, asyncio.Future] = field(default_factory=dict)
+    abandoned: set = field(default_factory=set)  # Pending slots whose frame stopped waiting
+    answered_at: float = 0.0  # When the process last answered or became ready
+    sessions: set = field(default_factory=set)
+    processed: int = 0
+    restarts: int = 0  # Also the generation: answers from a replaced process are ignored
+
+
+class DetectorPool:
+    """
+    Pool of detector processes, each owning its own HandDetector.
+
+    A session is pinned to one worker by hashing its id, so the worker's
+    per-session state (decode reduction, ROI, motion gate) stays valid.
+    Frames are base64-decoded here and copied into a slot of the worker's
+    shared-memory input ring; only the slot index travels over the pipe.
+    The worker writes landmarks into the same slot of its output ring and
+    answers with the slot, so frames and landmark arrays are never pickled.
+    Each worker has its own pipe rather than sharing a queue, so a killed
+    process cannot leave a lock held; it is restarted and its in-flight
+    frames fail. A frame waits at most ``timeout_ms`` for a slot and its
+    answer together. A worker that answered nothing during a timed-out
+    frame's wait, or whose slots are all held by frames that stopped
+    waiting, is taken to be hung and restarted too.
+
+    Decode reduction, ROI and motion gate counters and the decode and
+    MediaPipe stage timings of each frame come back with its result and
+    are added to the given server-side stores and the stage histograms.
+    Their per-session state stays in the workers.
+    """
+    
+    def __init__(
+        self,
+        workers: int = settings.DETECTOR_WORKERS,
+        slots: int = settings.DETECTOR_RING_SLOTS,
+        slot_bytes: int = settings.DETECTOR_SLOT_BYTES,
+        max_hands: int = settings.MAX_NUM_HANDS,
+        timeout_ms: int = settings.DETECTOR_TIMEOUT_MS,
+        startup_timeout_ms: int = 60000,
+        frame_decoder=None,
+        roi_tracker=None,
+        motion_gate=None
+    ):
+        self.num_workers = max(1, workers)
+        self.slots = max(1, slots)
+        self.slot_bytes = slot_bytes
+        self.max_hands = max_hands
+        self.timeout_s = timeout_ms / 1000
+        self.startup_timeout_s = startup_timeout_ms / 1000
+        self.frame_decoder = frame_decoder
+        self.roi_tracker = roi_tracker
+        self.motion_gate = motion_gate
+        self.stages = [metrics.stage(stage) for stage in WORKER_STAGES]
+        self.context = multiprocessing.get_context("spawn")
+        self.workers: List[DetectorWorker] = []
+        self._reader: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._running = False
+        self.timeouts = 0
+        self.failures = 0
+        self.frames_too_large = 0
+    
+    def __len__(self) -> int:
+        """Number of sessions pinned to a worker."""
+        return sum(len(worker.sessions) for worker in self.workers)
+    
+    def start(self):
+        """Create the rings and spawn the worker processes."""
+        if self._running:
+            return
+        self._loop = asyncio.get_running_loop()
+        for index in range(self.num_workers):
+            frames = shared_memory.SharedMemory(create=True, size=self.slots * self.slot_bytes)
+            results = shared_memory.SharedMemory(create=True, size=self.slots * self.max_hands * 21 * 3 * 4)
+            worker = DetectorWorker(
+                index=index,
+                frames=frames,
+                results=results,
+                landmarks=np.ndarray((self.slots, self.max_hands, 21, 3), dtype=np.float32, buffer=results.buf),
+                free_slots=deque(range(self.slots)),
+                slot_available=asyncio.Semaphore(self.slots),
+                ready=asyncio.Event()
+            )
+            self._spawn(worker)
+            self.workers.append(worker)
+        self._running = True
+        self._reader = threading.Thread(target=self._read_responses, name="detector-pool-reader", daemon=True)
+        self._reader.start()
+    
+    def _spawn(self, worker: DetectorWorker, generation: int = 0):
+        worker.connection, child_connection = self.context.Pipe()
+        process = self.context.Process(
+            target=_worker_main,
+            args=(worker.index, generation, worker.frames.name, worker.results.name, self.slots,
+                  self.slot_bytes, self.max_hands, child_connection),
+            name=f"detector-{worker.index}",
+            daemon=True
+        )
+        process.start()
+        # The reader thread only ever sees started processes
+        worker.process = process
+        child_connection.close()
+    
+    async def stop(self):
+        """Stop the workers and release the rings."""
+        if not self._running:
+            return
+        self._running = False
+        await asyncio.to_thread(self._reader.join, 5)
+        for worker in self.workers:
+            self._send(worker, (STOP,))
+        for worker in self.workers:
+            await asyncio.to_thread(worker.process.join, 5)
+            if worker.process.is_alive():
+                worker.process.terminate()
+            for future in worker.pending.values():
+                if not future.done():
+                    future.set_exception(RuntimeError("Detector pool stopped"))
+            worker.pending.clear()
+            worker.connection.close()
+            del worker.landmarks
+            for memory in (worker.frames, worker.results):
+                memory.close()
+                memory.unlink()
+        self.workers = []
+    
+    def worker_for(self, session_id: str) -> DetectorWorker:
+        """The worker a session is pinned to (stable across restarts)."""
+        return self.workers[zlib.crc32(session_id.encode()) % len(self.workers)]
+    
+    def clear_session(self, session_id: str):
+        """Unpin a session and drop its state in the worker."""
+        if not self._running:
+            return
+        worker = self.worker_for(session_id)
+        if session_id in worker.sessions:
+            worker.sessions.discard(session_id)
+            self._send(worker, (CLEAR, session_id))
+    
+    @staticmethod
+    def _send(worker: DetectorWorker, message: tuple) -> bool:
+        """Send a message to a worker; False if its process is gone."""
+        try:
+            worker.connection.send(message)
+            return True
+        except (OSError, ValueError):
+            return False
+    
+    async def detect(self, session_id: str, base64_image: str) -> Tuple[tuple, bool]:
+        """
+        Detect hands in a frame on the session's worker.
+
+        Returns:
+            (result, cached): result as returned by HandDetector.detect,
+            cached when the worker's motion gate reused its last detection
+        """
+        if "," in base64_image:
+            base64_image = base64_image.split(",")[1]
+        data = base64.b64decode(base64_image)
+        if len(data) > self.slot_bytes:
+            self.frames_too_large += 1
+            raise ValueError(f"Frame of {len(data)} bytes exceeds DETECTOR_SLOT_BYTES ({self.slot_bytes})")
+        
+        worker = self.worker_for(session_id)
+        worker.sessions.add(session_id)
+        if not worker.ready.is_set():
+            # Frames wait for a starting process instead of timing out on it
+            try:
+                await asyncio.wait_for(worker.ready.wait(), self.startup_timeout_s)
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                print(f"Detector worker {worker.index} not ready for session {session_id}")
+                return NO_HAND, False
+        
+        started, generation = time.monotonic(), worker.restarts
+        try:
+            return await asyncio.wait_for(self._detect_on(worker, session_id, data), self.timeout_s)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            print(f"Detector worker {worker.index} timed out on session {session_id}")
+            if worker.answered_at < started or len(worker.abandoned) >= self.slots:
+                print(f"Detector worker {worker.index} is not answering")
+                self._restart(worker, generation)
+            return NO_HAND, False
+        except RuntimeError as e:
+            self.failures += 1
+            print(f"Detection error: {e}")
+            return NO_HAND, False
+    
+    async def _detect_on(self, worker: DetectorWorker, session_id: str, data: bytes) -> Tuple[tuple, bool]:
+        """Copy a frame into a free slot of the worker and wait for its answer."""
+        await worker.slot_available.acquire()
+        slot = worker.free_slots.popleft()
+        start = slot * self.slot_bytes
+        worker.frames.buf[start:start + len(data)] = data
+        
+        future = self._loop.create_future()
+        worker.pending[slot] = future
+        if not self._send(worker, (FRAME, slot, len(data), session_id)):
+            # The restart fails this frame along with the rest in flight
+            self._restart(worker)
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            # The slot stays with the worker until it answers
+            if worker.pending.get(slot) is future:
+                worker.abandoned.add(slot)
+            raise
+    
+    def _read_responses(self):
+        """Thread: hand worker answers to the event loop; watch for dead workers."""
+        reported = set()
+        while self._running:
+            workers = {}
+            for worker in self.workers:
+                workers[worker.connection] = workers[worker.process.sentinel] = (worker, worker.restarts)
+            try:
+                ready_list = wait(list(workers), timeout=0.5)
+            except (OSError, ValueError):
+                # A pipe was closed by a restart on the event loop
+                continue
+            for ready in ready_list:
+                worker, generation = workers[ready]
+                try:
+                    if ready is worker.connection:
+                        message = ready.recv()
+                        if message[0] == READY:
+                            self._loop.call_soon_threadsafe(self._ready, *message[1:])
+                        else:
+                            self._loop.call_soon_threadsafe(self._complete, *message)
+                        continue
+                except (EOFError, OSError):
+                    pass
+                # Process exited (sentinel ready or pipe closed): restart it once
+                if (worker.index, generation) not in reported:
+                    reported.add((worker.index, generation))
+                    self._loop.call_soon_threadsafe(self._restart, worker, generation)
+    
+    def _ready(self, index: int, generation: int):
+        """Event loop: a worker process finished starting."""
+        worker = self.workers[index] if index < len(self.workers) else None
+        if worker is not None and worker.restarts == generation:
+            worker.answered_at = time.monotonic()
+            worker.ready.set()
+    
+    async def wait_ready(self, timeout: float = None) -> bool:
+        """Wait until every worker has loaded its model."""
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*(worker.ready.wait() for worker in self.workers)),
+                timeout if timeout is not None else self.startup_timeout_s
+            )
+            return True
+        except asyncio.TimeoutError:
+            return False
+    
+    def _complete(self, index: int, generation: int, slot: int, hands: int, handedness, confidence,
+                  cached: bool, added: tuple, timings: tuple):
+        """Event loop: copy the landmarks out of the slot and free it."""
+        worker = self.workers[index] if index < len(self.workers) else None
+        if worker is None or worker.restarts != generation or slot not in worker.pending:
+            return
+        self._record(added, timings)
+        worker.answered_at = time.monotonic()
+        worker.abandoned.discard(slot)
+        future = worker.pending.pop(slot)
+        if hands:
+            result = (True, worker.landmarks[slot, :hands].copy(), handedness, confidence)
+        else:
+            result = NO_HAND
+        worker.processed += 1
+        worker.free_slots.append(slot)
+        worker.slot_available.release()
+        if not future.done():
+            future.set_result((result, cached))
+    
+    def _record(self, added: tuple, timings: tuple):
+        """Add what a worker's frame counted and timed to the server's stores and histograms."""
+        for stage, counts, total in timings:
+            self.stages[stage].merge(counts, total)
+        decoded, roi, gate = added
+        if self.frame_decoder is not None:
+            # Both processes list the reductions in the same order
+            for reduction, count in zip(list(self.frame_decoder.frames_by_reduction), decoded):
+                self.frame_decoder.frames_by_reduction[reduction] += count
+        for store, names, values in ((self.roi_tracker, ROI_COUNTERS, roi), (self.motion_gate, GATE_COUNTERS, gate)):
+            if store is not None:
+                for name, value in zip(names, values):
+                    setattr(store, name, getattr(store, name) + value)
+    
+    def _restart(self, worker: DetectorWorker, generation: Optional[int] = None):
+        """Event loop: fail a dead or hung worker's frames and spawn a replacement."""
+        if not self._running or (generation is not None and generation != worker.restarts):
+            return
+        if worker.process.is_alive():
+            worker.process.kill()
+            worker.process.join(1)
+        print(f"Detector worker {worker.index} exited with {worker.process.exitcode}, restarting")
+        for slot, future in worker.pending.items():
+            if slot in worker.abandoned:
+                # Nobody waits for these any more
+                future.cancel()
+            elif not future.done():
+                future.set_exception(RuntimeError(f"Detector worker {worker.index} exited"))
+            worker.free_slots.append(slot)
+            worker.slot_available.release()
+        worker.pending.clear()
+        worker.abandoned.clear()
+        worker.sessions.clear()
+        worker.ready.clear()
+        worker.connection.close()
+        # Bumped once the replacement is in place, so the reader thread never
+        # pairs the dead process with the new generation
+        self._spawn(worker, worker.restarts + 1)
+        worker.restarts += 1
+    
+    def get_stats(self) -> dict:
+        """Get pool statistics."""
+        return {
+            "workers": [
+                {
+                    "pid": worker.process.pid if worker.process is not None else None,
+                    "alive": worker.process is not None and worker.process.is_alive(),
+                    "ready": worker.ready.is_set(),
+                    "sessions": len(worker.sessions),
+                    "in_flight": len(worker.pending),
+                    "processed": worker.processed,
+                    "restarts": worker.restarts,
+                }
+                for worker in self.workers
+            ],
+            "slots": self.slots,
+            "slot_bytes": self.slot_bytes,
+            "timeouts": self.timeouts,
+            "failures": self.failures,
+            "frames_too_large": self.frames_too_large,
+        }
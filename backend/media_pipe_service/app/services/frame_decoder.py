@@ -0,0 +1,202 @@
+"""JPEG frame decoding with reduced-resolution decode and reusable buffers."""
+
+import io
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from app.config import settings
+
+
+REDUCTIONS = (4, 2)
+
+
+@dataclass
+class DecodeState:
+    """Per-session decoding state."""
+    source_shape: Optional[Tuple[int, int]] = None  # (height, width) at full resolution
+    hand_span: Optional[float] = None  # Hand bounding box side, fraction of the frame
+    buffer: Optional[np.ndarray] = None  # Reused RGB output for colour conversion
+
+
+class FrameDecoder:
+    """
+    Decodes JPEG frames to RGB, at reduced resolution when the hand allows it.
+
+    JPEG can be decoded at 1/2 or 1/4 scale for a fraction of the cost of
+    a full decode, since the reduction happens in the DCT. The factor is
+    picked per session from the previous frame: the largest reduction
+    that keeps the short side above ``min_side`` and the last seen hand
+    above ``min_hand_px`` pixels. A session's first frame is decoded at
+    full size.
+
+    Backends:
+        cv2: ``cv2.imdecode``, straight to RGB on OpenCV builds that
+            support it, otherwise BGR converted into a per-session buffer
+        pillow: Pillow with ``draft`` mode for reduced decoding
+        turbojpeg: PyTurboJPEG with scaling factors
+    """
+    
+    BACKENDS = ("cv2", "pillow", "turbojpeg")
+    
+    def __init__(
+        self,
+        backend: str = settings.DECODE_BACKEND,
+        max_reduction: int = settings.DECODE_MAX_REDUCTION,
+        min_side: int = settings.DECODE_MIN_SIDE,
+        min_hand_px: int = settings.DECODE_MIN_HAND_PX
+    ):
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown decoder backend {backend!r}, expected one of {self.BACKENDS}")
+        if max_reduction not in (1, 2, 4):
+            raise ValueError("max_reduction must be 1, 2 or 4")
+        
+        self.backend = backend
+        self.max_reduction = max_reduction
+        self.min_side = min_side
+        self.min_hand_px = min_hand_px
+        self.sessions: Dict[str, DecodeState] = {}
+        self.frames_by_reduction = {1: 0, 2: 0, 4: 0}
+        self._cv2 = None  # Imported on first use, see prepare
+        self._cv2_flags: Dict[int, int] = {}
+        self._cv2_rgb_flag = None
+        self._turbojpeg = None
+        
+        if backend == "pillow":
+            try:
+                import PIL.Image  # noqa: F401
+            except ImportError:
+                raise ImportError("DECODE_BACKEND=pillow requires Pillow")
+        elif backend == "turbojpeg":
+            try:
+                from turbojpeg import TurboJPEG
+            except ImportError:
+                raise ImportError("DECODE_BACKEND=turbojpeg requires PyTurboJPEG and libjpeg-turbo")
+            self._turbojpeg = TurboJPEG()
+    
+    def prepare(self):
+        """Import OpenCV for the cv2 backend, at start-up rather than on the first frame."""
+        if self.backend != "cv2" or self._cv2 is not None:
+            return
+        import cv2
+        self._cv2_flags = {
+            1: cv2.IMREAD_COLOR,
+            2: cv2.IMREAD_REDUCED_COLOR_2,
+            4: cv2.IMREAD_REDUCED_COLOR_4,
+        }
+        self._cv2_rgb_flag = getattr(cv2, "IMREAD_COLOR_RGB", None)
+        self._cv2 = cv2
+    
+    def __len__(self) -> int:
+        """Number of sessions with decoding state."""
+        return len(self.sessions)
+    
+    def clear_session(self, session_id: str):
+        """Drop a session's state and buffer."""
+        self.sessions.pop(session_id, None)
+    
+    def choose_reduction(self, state: Optional[DecodeState]) -> int:
+        """Largest reduction factor the session's last frame allows."""
+        if state is None or state.source_shape is None:
+            return 1
+        short_side = min(state.source_shape)
+        hand_px = state.hand_span * short_side if state.hand_span is not None else None
+        for reduction in REDUCTIONS:
+            if reduction > self.max_reduction:
+                continue
+            if short_side / reduction < self.min_side:
+                continue
+            if hand_px is not None and hand_px / reduction < self.min_hand_px:
+                continue
+            return reduction
+        return 1
+    
+    def observe(self, session_id: str, landmarks):
+        """Record the size of the smallest hand in a session's latest detection."""
+        state = self.sessions.get(session_id)
+        if state is None or state.source_shape is None:
+            return
+        if landmarks is None or len(landmarks) == 0:
+            state.hand_span = None
+            return
+        points = np.asarray(landmarks, dtype=np.float32).reshape(-1, 21, 3)[..., :2]
+        height, width = state.source_shape
+        extent = (points.max(axis=1) - points.min(axis=1)) * (width, height)
+        state.hand_span = float(extent.max(axis=1).min()) / min(height, width)
+    
+    def decode(self, data: bytes, session_id: Optional[str] = None) -> np.ndarray:
+        """
+        Decode an encoded frame to an RGB array.
+        With a session id the result may be a reused per-session buffer,
+        valid until that session's next frame.
+        """
+        state = None
+        if session_id is not None:
+            state = self.sessions.get(session_id)
+            if state is None:
+                state = self.sessions[session_id] = DecodeState()
+        
+        reduction = self.choose_reduction(state)
+        if self.backend == "pillow":
+            image, source_shape = self._decode_pillow(data, reduction)
+        elif self.backend == "turbojpeg":
+            image, source_shape = self._decode_turbojpeg(data, reduction)
+        else:
+            image, source_shape = self._decode_cv2(data, reduction, state)
+        
+        if state is not None:
+            state.source_shape = source_shape
+        self.frames_by_reduction[reduction] += 1
+        return image
+    
+    def _decode_cv2(self, data: bytes, reduction: int, state: Optional[DecodeState]):
+        if self._cv2 is None:
+            self.prepare()
+        cv2 = self._cv2
+        buffer = np.frombuffer(data, np.uint8)
+        flags = self._cv2_flags[reduction]
+        if self._cv2_rgb_flag is not None:
+            image = cv2.imdecode(buffer, flags | self._cv2_rgb_flag)
+            if image is None:
+                raise ValueError("Failed to decode image")
+        else:
+            bgr = cv2.imdecode(buffer, flags)
+            if bgr is None:
+                raise ValueError("Failed to decode image")
+            if state is None:
+                image = cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB)
+            else:
+                if state.buffer is None or state.buffer.shape != bgr.shape:
+                    state.buffer = np.empty_like(bgr)
+                image = cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB, dst=state.buffer)
+        # Reduced decodes round up, so this recovers the source size to within a block
+        height, width = image.shape[:2]
+        return image, (height * reduction, width * reduction)
+    
+    def _decode_pillow(self, data: bytes, reduction: int):
+        from PIL import Image
+        
+        with Image.open(io.BytesIO(data)) as image:
+            source_shape = (image.height, image.width)
+            if reduction > 1:
+                # JPEG only; other formats decode at full size
+                image.draft("RGB", (image.width // reduction, image.height // reduction))
+            if image.mode != "RGB":
+                image = image.convert("RGB")
+            return np.asarray(image), source_shape
+    
+    def _decode_turbojpeg(self, data: bytes, reduction: int):
+        from turbojpeg import TJPF_RGB
+        
+        width, height, _, _ = self._turbojpeg.decode_header(data)
+        image = self._turbojpeg.decode(data, pixel_format=TJPF_RGB, scaling_factor=(1, reduction))
+        return image, (height, width)
+    
+    def get_stats(self) -> dict:
+        """Get decoding statistics."""
+        return {
+            "backend": self.backend,
+            "max_reduction": self.max_reduction,
+            "sessions": len(self.sessions),
+            "frames_by_reduction": {str(k): v for k, v in self.frames_by_reduction.items()},
+        }
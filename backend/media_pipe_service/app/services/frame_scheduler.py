@@ -0,0 +1,262 @@
+"""Weighted fair frame scheduling across sessions."""
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from app.config import settings
+
+
+@dataclass
+class SessionQueue:
+    """Pending frames and scheduling state for a single session."""
+    session_id: str
+    frames: deque
+    weight: float = 1.0
+    max_fps: float = 0.0
+    deficit: float = 0.0
+    active: bool = False
+    busy: bool = False
+    tokens: float = 0.0
+    refilled_at: Optional[float] = None
+    accepted: int = 0
+    processed: int = 0
+    dropped_rate: int = 0
+    dropped_overflow: int = 0
+
+
+class FrameScheduler:
+    """
+    Deficit round robin scheduler keyed by session_id.
+
+    Each session gets a small bounded queue. When a queue overflows the
+    oldest frame is dropped, so a session never waits behind more than
+    ``max_queue`` of its own frames. Sessions are served in round robin
+    order, ``weight`` frames per round, so one client sending at a high
+    rate cannot starve the others.
+
+    The session's FPS cap is a token bucket holding up to ``burst``
+    frames, so a client sending at the cap does not lose frames to
+    network jitter. Frames beyond it are dropped on submit.
+    """
+    
+    def __init__(
+        self,
+        handler: Callable[[str, Any], Awaitable[None]],
+        on_drop: Optional[Callable[[str, Any, str], None]] = None,
+        quantum: float = None,
+        max_fps: float = None,
+        max_queue: int = None,
+        burst: int = None,
+        workers: int = 1
+    ):
+        self.handler = handler
+        self.on_drop = on_drop
+        self.quantum = quantum if quantum is not None else settings.SCHEDULER_QUANTUM
+        self.default_max_fps = max_fps if max_fps is not None else settings.SESSION_MAX_FPS
+        self.max_queue = max_queue if max_queue is not None else settings.SESSION_MAX_QUEUED_FRAMES
+        self.burst = max(1, burst if burst is not None else settings.SESSION_FPS_BURST)
+        self.workers = workers
+        self.queues: Dict[str, SessionQueue] = {}
+        self.active: deque = deque()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._tasks: list = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.total_processed = 0
+        self.total_dropped_rate = 0
+        self.total_dropped_overflow = 0
+    
+    def __len__(self) -> int:
+        """Number of sessions with scheduling state."""
+        return len(self.queues)
+    
+    def get_or_create_queue(self, session_id: str) -> SessionQueue:
+        """Get existing session queue or create new one."""
+        queue = self.queues.get(session_id)
+        if queue is None:
+            queue = SessionQueue(
+                session_id=session_id,
+                frames=deque(),
+                max_fps=self.default_max_fps
+            )
+            self.queues[session_id] = queue
+        return queue
+    
+    def configure_session(self, session_id: str, max_fps: float = None, weight: float = None):
+        """Set per-session FPS cap and scheduling weight."""
+        queue = self.get_or_create_queue(session_id)
+        if max_fps is not None:
+            # Clients may lower their cap but never raise it above the server's
+            if self.default_max_fps > 0:
+                max_fps = min(max_fps, self.default_max_fps)
+            queue.max_fps = max_fps
+        if weight is not None and weight > 0:
+            queue.weight = weight
+    
+    def submit(self, session_id: str, item: Any, now: float = None) -> bool:
+        """
+        Queue a frame for a session.
+        Returns False if the frame was dropped by the FPS cap.
+        """
+        queue = self.get_or_create_queue(session_id)
+        now = time.monotonic() if now is None else now
+        
+        if queue.max_fps > 0 and not self._take_token(queue, now):
+            queue.dropped_rate += 1
+            self.total_dropped_rate += 1
+            return False
+        
+        if len(queue.frames) >= self.max_queue:
+            # Keep the newest frames; stale frames only add latency
+            queue.dropped_overflow += 1
+            self.total_dropped_overflow += 1
+            self._drop(session_id, queue.frames.popleft(), "overflow")
+        
+        queue.frames.append(item)
+        queue.accepted += 1
+        
+        if not queue.active:
+            queue.active = True
+            self.active.append(session_id)
+        
+        self._ensure_started()
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return True
+    
+    def _take_token(self, queue: SessionQueue, now: float) -> bool:
+        """Refill the session's bucket at its FPS cap and spend one frame from it."""
+        if queue.refilled_at is None:
+            queue.tokens = float(self.burst)
+        else:
+            queue.tokens = min(float(self.burst), queue.tokens + (now - queue.refilled_at) * queue.max_fps)
+        queue.refilled_at = now
+        if queue.tokens < 1.0:
+            return False
+        queue.tokens -= 1.0
+        return True
+    
+    def next_item(self) -> Optional[Tuple[str, Any]]:
+        """
+        Pick the next frame to process in deficit round robin order.
+        Sessions with a frame already in flight are skipped so each
+        session's frames are processed in order.
+        """
+        skipped = 0
+        while self.active and skipped < len(self.active):
+            session_id = self.active[0]
+            queue = self.queues.get(session_id)
+            
+            if queue is None or not queue.frames:
+                self.active.popleft()
+                if queue is not None:
+                    queue.active = False
+                    queue.deficit = 0.0
+                continue
+            
+            if queue.busy:
+                self.active.rotate(-1)
+                skipped += 1
+                continue
+            
+            if queue.deficit < 1.0:
+                queue.deficit += self.quantum * queue.weight
+                if queue.deficit < 1.0:
+                    self.active.rotate(-1)
+                    continue
+            
+            queue.deficit -= 1.0
+            item = queue.frames.popleft()
+            
+            if not queue.frames:
+                self.active.popleft()
+                queue.active = False
+                queue.deficit = 0.0
+            elif queue.deficit < 1.0:
+                self.active.rotate(-1)
+            
+            return session_id, item
+        
+        return None
+    
+    def queue_depth(self) -> int:
+        """Total frames waiting across all sessions."""
+        return sum(len(q.frames) for q in self.queues.values())
+    
+    def clear_session(self, session_id: str):
+        """Drop queued frames and state for a session."""
+        queue = self.queues.pop(session_id, None)
+        if queue is None:
+            return
+        while queue.frames:
+            self._drop(session_id, queue.frames.popleft(), "session_cleared")
+        if queue.active:
+            try:
+                self.active.remove(session_id)
+            except ValueError:
+                pass
+    
+    def _drop(self, session_id: str, item: Any, reason: str):
+        """Notify the owner that a queued frame was discarded."""
+        if self.on_drop is not None:
+            self.on_drop(session_id, item, reason)
+    
+    def _ensure_started(self):
+        """Start worker tasks on first use inside a running loop."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if self._tasks and self._loop is loop:
+            return
+        self._loop = loop
+        self._wakeup = asyncio.Event()
+        self._tasks = [loop.create_task(self._worker()) for _ in range(self.workers)]
+    
+    async def _worker(self):
+        """Serve frames until stopped."""
+        while True:
+            picked = self.next_item()
+            if picked is None:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            
+            session_id, item = picked
+            queue = self.queues.get(session_id)
+            if queue is not None:
+                queue.busy = True
+            try:
+                await self.handler(session_id, item)
+            except Exception as e:
+                print(f"Frame scheduler handler error: {e}")
+            finally:
+                self.total_processed += 1
+                if queue is not None:
+                    queue.busy = False
+                    queue.processed += 1
+                # Another worker may be waiting on this session's next frame
+                self._wakeup.set()
+    
+    async def stop(self):
+        """Stop worker tasks."""
+        for task in self._tasks:
+            task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._loop = None
+    
+    def get_stats(self) -> dict:
+        """Get scheduler statistics."""
+        return {
+            "sessions": len(self.queues),
+            "active_sessions": len(self.active),
+            "queue_depth": self.queue_depth(),
+            "processed": self.total_processed,
+            "dropped_rate_limited": self.total_dropped_rate,
+            "dropped_overflow": self.total_dropped_overflow,
+            "default_max_fps": self.default_max_fps,
+            "burst": self.burst
+        }
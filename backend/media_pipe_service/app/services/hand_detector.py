@@ -1,23 +1,35 @@
 """MediaPipe hand detection service."""
 
 import base64
-import io
+import itertools
+import time
 import numpy as np
-import cv2
-import mediapipe as mp
 from typing import Optional, Tuple, List
 from app.config import settings
+from app.metrics import metrics
+from app.services.frame_decoder import FrameDecoder
 
 
 class HandDetector:
     """MediaPipe hand landmark detector."""
     
-    def __init__(self):
-        """Initialize MediaPipe Hands."""
+    def __init__(self, static_image_mode: bool = False, decoder: Optional[FrameDecoder] = None):
+        """
+        Initialize MediaPipe Hands.
+        MediaPipe is imported here rather than with the module, so processes
+        that never detect (health checks, tests, tools) do not load it.
+        
+        Args:
+            static_image_mode: Detect on every frame instead of tracking,
+                for unrelated images such as datasets
+            decoder: Frame decoder, configured from settings by default
+        """
+        import mediapipe as mp
+        
         mp_hands = mp.solutions.hands
         
         self.hands = mp_hands.Hands(
-            static_image_mode=False,
+            static_image_mode=static_image_mode,
             max_num_hands=settings.MAX_NUM_HANDS,
             min_detection_confidence=settings.MIN_DETECTION_CONFIDENCE,
             min_tracking_confidence=settings.MIN_TRACKING_CONFIDENCE
@@ -25,89 +37,164 @@ class HandDetector:
         
         self.mp_drawing = mp.solutions.drawing_utils
         self.mp_hands = mp_hands
+        self.decoder = decoder or FrameDecoder()
         
-    def decode_frame(self, base64_image: str) -> np.ndarray:
-        """Decode base64 image to numpy array."""
+    @metrics.timed("decode_frame")
+    def decode_frame(self, base64_image: str, session_id: Optional[str] = None) -> np.ndarray:
+        """
+        Decode base64 image to an RGB numpy array.
+        With a session id the frame may be decoded at reduced resolution
+        into a buffer reused for that session's next frame.
+        """
         try:
             # Remove data URL prefix if present
             if "," in base64_image:
                 base64_image = base64_image.split(",")[1]
             
             image_bytes = base64.b64decode(base64_image)
-            nparr = np.frombuffer(image_bytes, np.uint8)
-            image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-            
-            if image is None:
-                raise ValueError("Failed to decode image")
-                
-            # Convert BGR to RGB
-            image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-            return image_rgb
+            return self.decoder.decode(image_bytes, session_id)
             
         except Exception as e:
             raise ValueError(f"Image decoding error: {str(e)}")
     
-    def detect(self, base64_image: str) -> Tuple[bool, Optional[List], Optional[str], float]:
+    @metrics.timed("decode_frame")
+    def decode_encoded(self, image_bytes: bytes, session_id: Optional[str] = None) -> np.ndarray:
+        """Like decode_frame, for an encoded frame that is not base64."""
+        return self.decoder.decode(image_bytes, session_id)
+    
+    def detect(self, base64_image: str, session_id: Optional[str] = None,
+               roi_tracker=None, motion_gate=None) -> Tuple[bool, Optional[np.ndarray], Optional[List[str]], Optional[List[float]]]:
         """
         Detect hand landmarks in image.
+        With a ROI tracker, inference runs on the area around the
+        session's last hand instead of the full frame. With a motion gate,
+        the session's previous result is reused while the frame is static.
         
         Returns:
             Tuple of (hand_detected, landmarks, handedness, confidence)
+            as returned by detect_image
+        """
+        try:
+            image = self.decode_frame(base64_image, session_id)
+        except Exception as e:
+            print(f"Detection error: {e}")
+            return False, None, None, None
+        return self._detect_decoded(image, session_id, roi_tracker, motion_gate)
+    
+    def detect_encoded(self, image_bytes: bytes, session_id: Optional[str] = None,
+                       roi_tracker=None, motion_gate=None) -> Tuple[bool, Optional[np.ndarray], Optional[List[str]], Optional[List[float]]]:
+        """Like detect, for an encoded (e.g. JPEG) frame that is not base64."""
+        try:
+            image = self.decode_encoded(image_bytes, session_id)
+        except Exception as e:
+            print(f"Detection error: Image decoding error: {e}")
+            return False, None, None, None
+        return self._detect_decoded(image, session_id, roi_tracker, motion_gate)
+    
+    def _detect_decoded(self, image: np.ndarray, session_id: Optional[str],
+                        roi_tracker, motion_gate) -> Tuple[bool, Optional[np.ndarray], Optional[List[str]], Optional[List[float]]]:
+        """Shared tail of detect and detect_encoded."""
+        try:
+            if motion_gate is not None and session_id is not None:
+                cached = motion_gate.check(session_id, image)
+                if cached is not None:
+                    return cached
+            if roi_tracker is not None and session_id is not None:
+                result = roi_tracker.detect(self, session_id, image)
+            else:
+                result = self.detect_image(image)
+            if session_id is not None:
+                self.decoder.observe(session_id, result[1])
+                if motion_gate is not None:
+                    motion_gate.record(session_id, result)
+            return result
+        except Exception as e:
+            print(f"Detection error: {e}")
+            return False, None, None, None
+    
+    def detect_image(self, image: np.ndarray) -> Tuple[bool, Optional[np.ndarray], Optional[List[str]], Optional[List[float]]]:
+        """
+        Detect hand landmarks in a decoded RGB image.
+        
+        Returns:
+            Tuple of (hand_detected, landmarks, handedness, confidence)
+            with landmarks as an (H, 21, 3) float32 array of all H hands
+            found (up to MAX_NUM_HANDS) and handedness and confidence
+            as per-hand lists
         """
         try:
-            image = self.decode_frame(base64_image)
-            
             # Process with MediaPipe
-            results = self.hands.process(image)
+            results = self._process(image)
             
             if not results.multi_hand_landmarks:
-                return False, None, None, 0.0
-            
-            # Get first hand
-            hand_landmarks = results.multi_hand_landmarks[0]
-            handedness = results.multi_handedness[0].classification[0].label
-            confidence = results.multi_handedness[0].classification[0].score
+                return False, None, None, None
             
-            # Extract 21 landmarks [x, y, z]
-            landmarks = []
-            for landmark in hand_landmarks.landmark:
-                landmarks.append([
-                    landmark.x,  # Normalized 0-1
-                    landmark.y,  # Normalized 0-1
-                    landmark.z   # Relative depth
-                ])
+            classifications = [hand.classification[0] for hand in results.multi_handedness]
+            handedness = [c.label for c in classifications]
+            confidence = [c.score for c in classifications]
             
-            return True, landmarks, handedness, confidence
+            return True, self.landmarks_to_array(results.multi_hand_landmarks), handedness, confidence
             
         except Exception as e:
             print(f"Detection error: {e}")
-            return False, None, None, 0.0
+            return False, None, None, None
     
-    def normalize_landmarks(self, landmarks: List[List[float]]) -> List[List[float]]:
+    @staticmethod
+    def landmarks_to_array(hands) -> np.ndarray:
+        """
+        Copy MediaPipe landmark lists into an (H, 21, 3) float32 array of
+        [x, y, z]: x and y normalized 0-1, z relative depth.
+        """
+        coordinates = itertools.chain.from_iterable(
+            (lm.x, lm.y, lm.z) for hand in hands for lm in hand.landmark
+        )
+        return np.fromiter(coordinates, dtype=np.float32, count=63 * len(hands)).reshape(-1, 21, 3)
+    
+    @metrics.timed("hands_process")
+    def _process(self, image: np.ndarray):
+        """Run the MediaPipe Hands graph on a decoded RGB frame."""
+        return self.hands.process(image)
+    
+    @staticmethod
+    @metrics.timed("normalize_landmarks")
+    def normalize_landmarks(landmarks, out: Optional[np.ndarray] = None) -> np.ndarray:
         """
         Normalize landmarks to be relative to wrist position.
         Makes detection invariant to hand position in frame.
-        """
-        if not landmarks or len(landmarks) < 21:
-            return landmarks
         
-        # Wrist is landmark 0
-        wrist = np.array(landmarks[0])
-        
-        # Calculate scale (distance from wrist to middle finger MCP - landmark 9)
-        middle_finger_mcp = np.array(landmarks[9])
-        scale = np.linalg.norm(middle_finger_mcp - wrist)
+        Args:
+            landmarks: (21, 3) or (H, 21, 3) array, or nested lists, of [x, y, z]
+            out: Optional float32 array of the same shape to write the result
+                into, so the hot path can reuse one buffer per session
+        """
+        points = np.asarray(landmarks, dtype=np.float32)
+        if points.ndim < 2 or points.shape[-2] < 21:
+            return points
+        if out is None:
+            out = np.empty_like(points)
         
-        if scale == 0:
-            scale = 1.0
+        # Relative to the wrist (landmark 0) of each hand
+        np.subtract(points, points[..., :1, :], out=out)
         
-        # Normalize all landmarks
-        normalized = []
-        for lm in landmarks:
-            norm_point = (np.array(lm) - wrist) / scale
-            normalized.append(norm_point.tolist())
+        # Scale by the wrist to middle finger MCP distance (landmark 9)
+        scale = np.linalg.norm(out[..., 9:10, :], axis=-1, keepdims=True)
+        scale[scale == 0] = 1.0
+        out /= scale
+        return out
+    
+    def warm_up(self, size: int = 256) -> float:
+        """
+        Run one frame through decoding and MediaPipe so the graph is built
+        and the model loaded now instead of on the first client frame.
         
-        return normalized
+        Returns:
+            Seconds taken
+        """
+        start = time.perf_counter()
+        self.decoder.prepare()
+        frame = np.full((size, size, 3), 127, dtype=np.uint8)
+        self.detect_image(frame)
+        return time.perf_counter() - start
     
     def draw_landmarks(self, image: np.ndarray, landmarks: List) -> np.ndarray:
         """Draw landmarks on image for visualization."""
@@ -0,0 +1,108 @@
+"""Per-session frame sampling while no hand is in view."""
+
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+from app.config import settings
+
+
+ACTIVE = "active"
+IDLE = "idle"
+
+
+@dataclass
+class SamplerState:
+    """Sampling state of one session."""
+    state: str = ACTIVE
+    last_hand_at: Optional[float] = None
+    idle_frames: int = 0
+
+
+class IdleSampler:
+    """
+    Throttles processing for sessions with no hand in view.
+
+    A session goes idle after ``idle_after_ms`` without a detected hand.
+    While idle only every ``sample_every``-th frame is decoded and run
+    through MediaPipe; the rest are answered as no hand. The first
+    processed frame with a hand switches the session back to full rate.
+    Transitions are returned from ``observe`` so the caller can advise
+    the client to change its send rate.
+    """
+    
+    def __init__(
+        self,
+        enabled: bool = settings.IDLE_SAMPLING_ENABLED,
+        idle_after_ms: int = settings.IDLE_AFTER_MS,
+        sample_every: int = settings.IDLE_SAMPLE_EVERY
+    ):
+        self.enabled = enabled
+        self.idle_after_s = idle_after_ms / 1000
+        self.sample_every = max(1, sample_every)
+        self.sessions: Dict[str, SamplerState] = {}
+        self.frames_sampled_out = 0
+        self.idle_entered = 0
+        self.idle_exited = 0
+    
+    def __len__(self) -> int:
+        """Number of sessions with sampling state."""
+        return len(self.sessions)
+    
+    def clear_session(self, session_id: str):
+        """Forget a session's sampling state."""
+        self.sessions.pop(session_id, None)
+    
+    def is_idle(self, session_id: str) -> bool:
+        """Whether the session is currently sampled at the idle rate."""
+        state = self.sessions.get(session_id)
+        return state is not None and state.state == IDLE
+    
+    def should_process(self, session_id: str) -> bool:
+        """Whether this frame should be detected, or answered as no hand."""
+        state = self.sessions.get(session_id)
+        if not self.enabled or state is None or state.state != IDLE:
+            return True
+        state.idle_frames += 1
+        if state.idle_frames % self.sample_every == 0:
+            return True
+        self.frames_sampled_out += 1
+        return False
+    
+    def observe(self, session_id: str, hand_detected: bool, now: float = None) -> Optional[str]:
+        """
+        Record a processed frame's result.
+        Returns the new state ("idle" or "active") on a transition, else None.
+        """
+        if not self.enabled:
+            return None
+        now = now if now is not None else time.monotonic()
+        state = self.sessions.get(session_id)
+        if state is None:
+            state = self.sessions[session_id] = SamplerState(last_hand_at=now)
+        
+        if hand_detected:
+            state.last_hand_at = now
+            if state.state == IDLE:
+                state.state = ACTIVE
+                state.idle_frames = 0
+                self.idle_exited += 1
+                return ACTIVE
+            return None
+        
+        if state.state == ACTIVE and now - state.last_hand_at >= self.idle_after_s:
+            state.state = IDLE
+            state.idle_frames = 0
+            self.idle_entered += 1
+            return IDLE
+        return None
+    
+    def get_stats(self) -> dict:
+        """Get sampling statistics."""
+        return {
+            "enabled": self.enabled,
+            "sessions": len(self.sessions),
+            "idle_sessions": sum(1 for s in self.sessions.values() if s.state == IDLE),
+            "frames_sampled_out": self.frames_sampled_out,
+            "idle_entered": self.idle_entered,
+            "idle_exited": self.idle_exited,
+        }
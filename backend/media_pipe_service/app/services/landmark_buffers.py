@@ -0,0 +1,34 @@
+"""Per-session landmark work buffers."""
+
+from typing import Dict
+
+import numpy as np
+
+
+class LandmarkBuffers:
+    """
+    One preallocated (H, 21, 3) float32 array per session.
+
+    Normalized landmarks are written into the session's array every frame
+    instead of building new arrays and lists. Sessions are processed one
+    frame at a time, so the array is free again by the session's next frame.
+    """
+    
+    def __init__(self, num_landmarks: int = 21):
+        self.num_landmarks = num_landmarks
+        self.buffers: Dict[str, np.ndarray] = {}
+    
+    def __len__(self) -> int:
+        """Number of sessions holding a buffer."""
+        return len(self.buffers)
+    
+    def get(self, session_id: str, hands: int = 1) -> np.ndarray:
+        """The session's buffer for ``hands`` hands, reallocated only when the count changes."""
+        buffer = self.buffers.get(session_id)
+        if buffer is None or len(buffer) != hands:
+            buffer = self.buffers[session_id] = np.empty((hands, self.num_landmarks, 3), dtype=np.float32)
+        return buffer
+    
+    def clear_session(self, session_id: str):
+        """Release a session's buffer."""
+        self.buffers.pop(session_id, None)
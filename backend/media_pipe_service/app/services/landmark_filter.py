@@ -0,0 +1,135 @@
+"""Per-session One-Euro smoothing of normalized landmarks."""
+
+import math
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+from app.config import settings
+
+
+@dataclass
+class FilterState:
+    """Filter state of one session, shaped like its (H, 21, 3) landmarks."""
+    value: np.ndarray  # Last filtered landmarks
+    derivative: np.ndarray  # Last filtered velocity, units per second
+    step: np.ndarray  # Scratch: change since the last filtered value
+    alpha: np.ndarray  # Scratch: per-coordinate smoothing factor
+    timestamp: float
+    keys: Optional[List[str]] = None
+
+
+class LandmarkFilter:
+    """
+    One-Euro filter over every landmark coordinate of a session at once.
+
+    The filter is a low-pass whose cutoff rises with speed: a still hand is
+    smoothed strongly (``min_cutoff``), so jitter no longer flips finger
+    thresholds, while a moving hand is followed with little lag (``beta``).
+    All 63 coordinates of each hand are updated in one NumPy step, in place
+    on the caller's array. State is reset when the hands change (count or
+    handedness) or after a gap of more than ``reset_ms``.
+    """
+    
+    def __init__(
+        self,
+        enabled: bool = settings.LANDMARK_FILTER_ENABLED,
+        min_cutoff: float = settings.LANDMARK_FILTER_MIN_CUTOFF,
+        beta: float = settings.LANDMARK_FILTER_BETA,
+        derivative_cutoff: float = settings.LANDMARK_FILTER_DERIVATIVE_CUTOFF,
+        reset_ms: int = settings.LANDMARK_FILTER_RESET_MS
+    ):
+        self.enabled = enabled
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.derivative_cutoff = derivative_cutoff
+        self.reset_s = reset_ms / 1000
+        self.sessions: Dict[str, FilterState] = {}
+        self.frames_filtered = 0
+        self.resets = 0
+    
+    def __len__(self) -> int:
+        """Number of sessions with filter state."""
+        return len(self.sessions)
+    
+    def clear_session(self, session_id: str):
+        """Forget a session's filter state, e.g. when its hand is lost."""
+        self.sessions.pop(session_id, None)
+    
+    @staticmethod
+    def _alpha(cutoff, elapsed: float):
+        """Smoothing factor of a first-order low-pass at ``cutoff`` Hz."""
+        return 1.0 / (1.0 + 1.0 / (2 * math.pi * cutoff * elapsed))
+    
+    def apply(self, session_id: str, landmarks: np.ndarray, now: float = None,
+              keys: Optional[List[str]] = None) -> np.ndarray:
+        """
+        Smooth one frame of landmarks in place.
+
+        Args:
+            landmarks: (H, 21, 3) float32 normalized landmarks, overwritten
+                with the filtered values
+            now: Frame time in seconds, monotonic clock by default
+            keys: Per-hand labels (e.g. handedness); a change resets the filter
+
+        Returns:
+            The same array
+        """
+        if not self.enabled:
+            return landmarks
+        now = time.monotonic() if now is None else now
+        state = self.sessions.get(session_id)
+        
+        if (state is None or state.value.shape != landmarks.shape or state.keys != keys
+                or now - state.timestamp > self.reset_s):
+            if state is not None:
+                self.resets += 1
+            self.sessions[session_id] = FilterState(
+                value=landmarks.copy(),
+                derivative=np.zeros_like(landmarks),
+                step=np.empty_like(landmarks),
+                alpha=np.empty_like(landmarks),
+                timestamp=now,
+                keys=keys
+            )
+            return landmarks
+        
+        elapsed = now - state.timestamp
+        if elapsed <= 0:
+            # Same instant as the last frame: nothing to integrate
+            landmarks[...] = state.value
+            return landmarks
+        
+        # Filtered velocity, from the step since the last filtered value
+        np.subtract(landmarks, state.value, out=state.step)
+        derivative_alpha = self._alpha(self.derivative_cutoff, elapsed)
+        state.derivative *= 1 - derivative_alpha
+        state.derivative += state.step * (derivative_alpha / elapsed)
+        
+        # Cutoff per coordinate from its speed, turned into the smoothing
+        # factor in place: alpha = c / (c + 1) with c = 2 pi cutoff elapsed
+        alpha = state.alpha
+        np.abs(state.derivative, out=alpha)
+        alpha *= self.beta
+        alpha += self.min_cutoff
+        alpha *= 2 * math.pi * elapsed
+        np.divide(alpha, alpha + 1, out=alpha)
+        
+        # The low-pass itself
+        state.step *= alpha
+        state.value += state.step
+        
+        landmarks[...] = state.value
+        state.timestamp = now
+        self.frames_filtered += 1
+        return landmarks
+    
+    def get_stats(self) -> dict:
+        """Get filter statistics."""
+        return {
+            "enabled": self.enabled,
+            "sessions": len(self.sessions),
+            "frames_filtered": self.frames_filtered,
+            "resets": self.resets,
+        }
@@ -0,0 +1,319 @@
+"""
+Compact binary log of per-session landmark streams.
+
+File layout (little endian, every section 8-byte aligned):
+
+    file header   magic "LMLOG\\0", version u16, landmark dtype u8, padding
+    chunk         magic "CHNK", frames u32, session bytes u32, vocab bytes u32, body bytes u32
+                  session id (utf-8)
+                  sign vocabulary (utf-8, newline separated)
+                  timestamps      float64[frames]      epoch seconds
+                  landmarks       float16/32[frames, 21, 3]
+                  confidences     float32[frames]
+                  sign codes      int16[frames]        index into vocabulary, -1 = none
+                  handedness      int8[frames]         0 = left, 1 = right, -1 = unknown
+    chunk ...
+
+Chunks only ever get appended. A chunk cut short by a crash is detected
+from its body size and ignored by the reader.
+"""
+
+import os
+import struct
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+
+from app.services.hand_detector import HandDetector
+
+FILE_MAGIC = b"LMLOG\0"
+FILE_VERSION = 1
+FILE_HEADER = struct.Struct("<6sHB7x")
+CHUNK_MAGIC = b"CHNK"
+CHUNK_HEADER = struct.Struct("<4sIIII4x")
+
+DTYPE_CODES = {"float16": 1, "float32": 2}
+CODE_DTYPES = {code: np.dtype(name) for name, code in DTYPE_CODES.items()}
+HANDEDNESS_CODES = {"Left": 0, "Right": 1}
+HANDEDNESS_NAMES = {code: name for name, code in HANDEDNESS_CODES.items()}
+
+
+def _pad(size: int) -> int:
+    """Bytes needed to reach the next 8-byte boundary."""
+    return -size % 8
+
+
+@dataclass
+class _PendingFrames:
+    """Frames of one session waiting to be written as a chunk."""
+    timestamps: List[float] = field(default_factory=list)
+    landmarks: List = field(default_factory=list)
+    confidences: List[float] = field(default_factory=list)
+    signs: List[Optional[str]] = field(default_factory=list)
+    handedness: List[int] = field(default_factory=list)
+
+
+class LandmarkLogWriter:
+    """
+    Append-only writer buffering frames per session.
+
+    Each session is written as a chunk once it has ``chunk_frames``
+    frames, or when it is cleared or the writer is closed. Registered
+    with the connection manager, so a disconnecting session is flushed.
+    """
+    
+    def __init__(self, path: str, dtype: str = "float16", chunk_frames: int = 256):
+        if dtype not in DTYPE_CODES:
+            raise ValueError(f"Unsupported landmark dtype '{dtype}', expected float16 or float32")
+        self.path = path
+        self.dtype = np.dtype(dtype)
+        self.chunk_frames = chunk_frames
+        self._pending: Dict[str, _PendingFrames] = {}
+        self.frames_written = 0
+        self.chunks_written = 0
+        self.bytes_written = 0
+        
+        self._file = open(path, "ab")
+        if self._file.tell() == 0:
+            self._file.write(FILE_HEADER.pack(FILE_MAGIC, FILE_VERSION, DTYPE_CODES[dtype]))
+        elif self._read_dtype(path) != self.dtype:
+            raise ValueError(f"{path} was written with a different landmark dtype")
+    
+    @staticmethod
+    def _read_dtype(path: str) -> np.dtype:
+        with open(path, "rb") as f:
+            magic, _, code = FILE_HEADER.unpack(f.read(FILE_HEADER.size))
+        if magic != FILE_MAGIC:
+            raise ValueError(f"{path} is not a landmark log")
+        return CODE_DTYPES[code]
+    
+    def __len__(self) -> int:
+        """Number of sessions with unwritten frames."""
+        return len(self._pending)
+    
+    def append(self, session_id: str, timestamp: float, landmarks, handedness: Optional[str] = None,
+               sign: Optional[str] = None, confidence: float = 0.0):
+        """Buffer one frame of 21 [x, y, z] landmarks."""
+        pending = self._pending.get(session_id)
+        if pending is None:
+            pending = self._pending[session_id] = _PendingFrames()
+        pending.timestamps.append(timestamp)
+        pending.landmarks.append(landmarks)
+        pending.confidences.append(confidence)
+        pending.signs.append(sign)
+        pending.handedness.append(HANDEDNESS_CODES.get(handedness, -1))
+        
+        if len(pending.timestamps) >= self.chunk_frames:
+            self.flush(session_id)
+    
+    def flush(self, session_id: Optional[str] = None):
+        """Write buffered frames of one session, or of all sessions."""
+        session_ids = [session_id] if session_id is not None else list(self._pending)
+        for sid in session_ids:
+            pending = self._pending.pop(sid, None)
+            if pending is not None and pending.timestamps:
+                self._write_chunk(sid, pending)
+        self._file.flush()
+    
+    def _write_chunk(self, session_id: str, pending: _PendingFrames):
+        """Encode and append one chunk."""
+        frames = len(pending.timestamps)
+        vocab = sorted({sign for sign in pending.signs if sign})
+        codes = {sign: i for i, sign in enumerate(vocab)}
+        session_bytes = session_id.encode("utf-8")
+        vocab_bytes = "\n".join(vocab).encode("utf-8")
+        
+        sections = [
+            session_bytes,
+            vocab_bytes,
+            np.asarray(pending.timestamps, dtype="<f8").tobytes(),
+            np.asarray(pending.landmarks, dtype=self.dtype.newbyteorder("<")).reshape(frames, 21, 3).tobytes(),
+            np.asarray(pending.confidences, dtype="<f4").tobytes(),
+            np.asarray([codes.get(sign, -1) for sign in pending.signs], dtype="<i2").tobytes(),
+            np.asarray(pending.handedness, dtype=np.int8).tobytes(),
+        ]
+        body = b"".join(section + b"\0" * _pad(len(section)) for section in sections)
+        header = CHUNK_HEADER.pack(CHUNK_MAGIC, frames, len(session_bytes), len(vocab_bytes), len(body))
+        self._file.write(header + body)
+        
+        self.frames_written += frames
+        self.chunks_written += 1
+        self.bytes_written += len(header) + len(body)
+    
+    def clear_session(self, session_id: str):
+        """Write out a finished session."""
+        self.flush(session_id)
+    
+    def close(self):
+        """Flush everything and close the file."""
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+    
+    def get_stats(self) -> dict:
+        """Get writer statistics."""
+        return {
+            "path": self.path,
+            "dtype": self.dtype.name,
+            "frames_written": self.frames_written,
+            "chunks_written": self.chunks_written,
+            "bytes_written": self.bytes_written,
+            "pending_sessions": len(self._pending),
+            "pending_frames": sum(len(p.timestamps) for p in self._pending.values()),
+        }
+
+
+@dataclass
+class LandmarkChunk:
+    """One chunk of a session; arrays are read-only views into the mapped file."""
+    session_id: str
+    vocab: List[str]
+    timestamps: np.ndarray
+    landmarks: np.ndarray
+    confidences: np.ndarray
+    sign_codes: np.ndarray
+    handedness: np.ndarray
+    
+    def __len__(self) -> int:
+        return len(self.timestamps)
+    
+    def sign(self, index: int) -> Optional[str]:
+        """Predicted sign of one frame."""
+        code = self.sign_codes[index]
+        return self.vocab[code] if code >= 0 else None
+
+
+class LandmarkLogReader:
+    """Memory-maps a landmark log and yields chunks without copying."""
+    
+    def __init__(self, path: str):
+        self.path = path
+        self._map = np.memmap(path, dtype=np.uint8, mode="r")
+        magic, version, code = FILE_HEADER.unpack(self._map[:FILE_HEADER.size].tobytes())
+        if magic != FILE_MAGIC:
+            raise ValueError(f"{path} is not a landmark log")
+        if version != FILE_VERSION:
+            raise ValueError(f"Unsupported landmark log version {version}")
+        self.dtype = CODE_DTYPES[code]
+        self.truncated = False
+    
+    def _view(self, offset: int, dtype, count: int) -> np.ndarray:
+        dtype = np.dtype(dtype)
+        return self._map[offset:offset + count * dtype.itemsize].view(dtype)
+    
+    def __iter__(self) -> Iterator[LandmarkChunk]:
+        offset = FILE_HEADER.size
+        size = len(self._map)
+        while offset + CHUNK_HEADER.size <= size:
+            magic, frames, session_len, vocab_len, body_len = CHUNK_HEADER.unpack(
+                self._map[offset:offset + CHUNK_HEADER.size].tobytes()
+            )
+            body = offset + CHUNK_HEADER.size
+            if magic != CHUNK_MAGIC or body + body_len > size:
+                # Partial chunk from an interrupted write
+                self.truncated = True
+                return
+            
+            cursor = body
+            session_id = self._map[cursor:cursor + session_len].tobytes().decode("utf-8")
+            cursor += session_len + _pad(session_len)
+            vocab_text = self._map[cursor:cursor + vocab_len].tobytes().decode("utf-8")
+            cursor += vocab_len + _pad(vocab_len)
+            
+            sections = {}
+            for name, dtype, count in (
+                ("timestamps", "<f8", frames),
+                ("landmarks", self.dtype.newbyteorder("<"), frames * 63),
+                ("confidences", "<f4", frames),
+                ("sign_codes", "<i2", frames),
+                ("handedness", np.int8, frames),
+            ):
+                sections[name] = self._view(cursor, dtype, count)
+                nbytes = count * np.dtype(dtype).itemsize
+                cursor += nbytes + _pad(nbytes)
+            sections["landmarks"] = sections["landmarks"].reshape(frames, 21, 3)
+            
+            yield LandmarkChunk(
+                session_id=session_id,
+                vocab=vocab_text.split("\n") if vocab_text else [],
+                **sections
+            )
+            offset = body + body_len
+    
+    def sessions(self) -> List[str]:
+        """Session ids in the order they first appear."""
+        return list(dict.fromkeys(chunk.session_id for chunk in self))
+    
+    def frame_count(self) -> int:
+        """Total frames in complete chunks."""
+        return sum(len(chunk) for chunk in self)
+
+
+@dataclass
+class ReplayResult:
+    """Outcome of replaying a log."""
+    frames: int = 0
+    signs: int = 0
+    sequences: List[tuple] = field(default_factory=list)  # (session_id, [signs])
+    elapsed_s: float = 0.0
+    
+    @property
+    def frames_per_second(self) -> float:
+        return self.frames / self.elapsed_s if self.elapsed_s else 0.0
+
+
+def replay(reader: LandmarkLogReader, classifier, sign_buffer,
+           session_id: Optional[str] = None) -> ReplayResult:
+    """
+    Feed a log through the classifier and sign buffer as fast as possible.
+
+    Recorded timestamps drive the buffer's debounce and commit timeout,
+    so sequences are committed as they would have been live. Pending
+    signs of each session are committed at the end of the log.
+    """
+    result = ReplayResult()
+    start = time.perf_counter()
+    seen = []
+    
+    def commit(sid: str):
+        sequence = sign_buffer.commit_sequence(sid)
+        if sequence:
+            result.sequences.append((sid, sequence))
+    
+    for chunk in reader:
+        if session_id is not None and chunk.session_id != session_id:
+            continue
+        sid = chunk.session_id
+        if sid not in seen:
+            seen.append(sid)
+        # Same normalization as the live path; it takes (N, 21, 3) as a batch of hands
+        normalized = HandDetector.normalize_landmarks(chunk.landmarks)
+        timestamps = chunk.timestamps
+        
+        for i in range(len(chunk)):
+            now = float(timestamps[i])
+            if sign_buffer.should_commit(sid, now=now):
+                commit(sid)
+            sign, confidence = classifier.classify(normalized[i])
+            if sign and sign_buffer.add_sign(sid, sign, confidence, now=now):
+                result.signs += 1
+        result.frames += len(chunk)
+    
+    for sid in seen:
+        if len(sign_buffer.get_sequence(sid)) >= sign_buffer.min_sequence_length:
+            commit(sid)
+    
+    result.elapsed_s = time.perf_counter() - start
+    return result
+
+
+def create_landmark_log_writer(log_dir: str, dtype: str = "float16",
+                               chunk_frames: int = 256) -> Optional[LandmarkLogWriter]:
+    """Open a new log in ``log_dir`` for this process, or None when recording is off."""
+    if not log_dir:
+        return None
+    os.makedirs(log_dir, exist_ok=True)
+    name = f"landmarks-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.lmlog"
+    return LandmarkLogWriter(os.path.join(log_dir, name), dtype=dtype, chunk_frames=chunk_frames)
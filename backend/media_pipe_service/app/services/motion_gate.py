@@ -0,0 +1,141 @@
+"""Per-session motion gating to skip detection on static frames."""
+
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from app.config import settings
+
+
+@dataclass
+class GateState:
+    """Motion state of one session."""
+    reference: Optional[np.ndarray] = None  # Thumbnail of the last detected frame
+    pending: Optional[np.ndarray] = None  # Thumbnail of the frame being detected
+    result: Optional[Tuple] = None  # Last detection result
+    detected_at: float = 0.0
+    landmark_speed: Optional[float] = None  # Mean landmark displacement between the last two detections
+    cached: bool = False  # Whether the last frame reused the previous result
+
+
+class MotionGate:
+    """
+    Reuses the previous detection while a session's frames are static.
+
+    Each frame is reduced to a small grayscale thumbnail and compared with
+    the thumbnail of the last frame that was actually detected. When the
+    mean absolute difference is below ``threshold`` and the hand was not
+    moving between the last two detections, the previous result is
+    returned instead of running MediaPipe. Detection is forced at least
+    every ``max_skip_ms`` so slow drift is still picked up.
+    """
+    
+    def __init__(
+        self,
+        enabled: bool = settings.MOTION_GATE_ENABLED,
+        threshold: float = settings.MOTION_THRESHOLD,
+        max_landmark_speed: float = settings.MOTION_MAX_LANDMARK_SPEED,
+        max_skip_ms: int = settings.MOTION_MAX_SKIP_MS,
+        thumbnail_size: int = settings.MOTION_THUMBNAIL_SIZE
+    ):
+        self.enabled = enabled
+        self.threshold = threshold
+        self.max_landmark_speed = max_landmark_speed
+        self.max_skip_s = max_skip_ms / 1000
+        self.thumbnail_size = thumbnail_size
+        self.sessions: Dict[str, GateState] = {}
+        self.frames_checked = 0
+        self.frames_skipped = 0
+        self.forced_detections = 0
+    
+    def __len__(self) -> int:
+        """Number of sessions with motion state."""
+        return len(self.sessions)
+    
+    def clear_session(self, session_id: str):
+        """Forget a session's reference frame and result."""
+        self.sessions.pop(session_id, None)
+    
+    def thumbnail(self, image: np.ndarray) -> np.ndarray:
+        """Small grayscale version of an RGB frame."""
+        import cv2
+        
+        size = (self.thumbnail_size, self.thumbnail_size)
+        small = cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(small, cv2.COLOR_RGB2GRAY).astype(np.int16)
+    
+    def check(self, session_id: str, image: np.ndarray, now: float = None) -> Optional[Tuple]:
+        """
+        Return the previous detection if the frame is effectively unchanged,
+        otherwise None; the frame must then be detected and passed to record.
+        """
+        now = now if now is not None else time.monotonic()
+        state = self.sessions.get(session_id)
+        if state is None:
+            state = self.sessions[session_id] = GateState()
+        
+        state.cached = False
+        if not self.enabled:
+            return None
+        self.frames_checked += 1
+        state.pending = self.thumbnail(image)
+        if state.result is None or state.reference is None:
+            return None
+        
+        difference = float(np.abs(state.pending - state.reference).mean())
+        if difference >= self.threshold:
+            return None
+        if state.landmark_speed is not None and state.landmark_speed >= self.max_landmark_speed:
+            return None
+        if now - state.detected_at >= self.max_skip_s:
+            self.forced_detections += 1
+            return None
+        
+        self.frames_skipped += 1
+        state.cached = True
+        return state.result
+    
+    def record(self, session_id: str, result: Tuple, now: float = None):
+        """Store a fresh detection as the reference for later frames."""
+        state = self.sessions.get(session_id)
+        if state is None or state.pending is None:
+            return
+        now = now if now is not None else time.monotonic()
+        
+        state.landmark_speed = self._speed(state.result, result)
+        state.reference = state.pending
+        state.pending = None
+        state.result = result
+        state.detected_at = now
+    
+    def is_cached(self, session_id: str) -> bool:
+        """Whether the session's last frame reused the previous detection."""
+        state = self.sessions.get(session_id)
+        return state is not None and state.cached
+    
+    @staticmethod
+    def _speed(previous: Optional[Tuple], current: Tuple) -> Optional[float]:
+        """
+        Mean landmark displacement between two detections, if both found a
+        hand; a change in the number of hands counts as movement.
+        """
+        if previous is None or not previous[0] or not current[0]:
+            return None
+        before = np.asarray(previous[1], dtype=np.float32)
+        after = np.asarray(current[1], dtype=np.float32)
+        if before.shape != after.shape:
+            return float("inf")
+        displacement = after[..., :2] - before[..., :2]
+        return float(np.linalg.norm(displacement, axis=-1).mean())
+    
+    def get_stats(self) -> dict:
+        """Get gating statistics."""
+        return {
+            "enabled": self.enabled,
+            "sessions": len(self.sessions),
+            "frames_checked": self.frames_checked,
+            "frames_skipped": self.frames_skipped,
+            "forced_detections": self.forced_detections,
+            "skip_ratio": round(self.frames_skipped / self.frames_checked, 3) if self.frames_checked else None,
+        }
@@ -0,0 +1,181 @@
+"""Per-session region-of-interest tracking for hand detection."""
+
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from app.config import settings
+
+
+@dataclass
+class ROI:
+    """A crop of the full frame, in pixels of a frame of the given size."""
+    x0: int
+    y0: int
+    x1: int
+    y1: int
+    frame_width: int = 0
+    frame_height: int = 0
+    
+    @property
+    def width(self) -> int:
+        return self.x1 - self.x0
+    
+    @property
+    def height(self) -> int:
+        return self.y1 - self.y0
+    
+    def fit(self, frame_shape: Tuple[int, ...]) -> "ROI":
+        """The same region in a frame decoded at a different resolution."""
+        height, width = frame_shape[:2]
+        if not self.frame_width or (self.frame_width, self.frame_height) == (width, height):
+            return self
+        sx, sy = width / self.frame_width, height / self.frame_height
+        return ROI(
+            int(self.x0 * sx), int(self.y0 * sy),
+            min(width, round(self.x1 * sx)), min(height, round(self.y1 * sy)),
+            width, height
+        )
+
+
+class ROITracker:
+    """
+    Crops each frame to the area around the session's last hand.
+
+    The box is the bounding box of the previous landmarks, expanded by
+    ``expand`` to allow for motion and made square. Frames are cropped
+    (and downscaled when larger than ``max_size``) before inference and
+    landmarks are mapped back to full-frame coordinates. When the hand is
+    not found in the crop the same frame is retried at full size and the
+    session stays on full frames until the hand is found again.
+    """
+    
+    def __init__(
+        self,
+        enabled: bool = settings.ROI_TRACKING_ENABLED,
+        expand: float = settings.ROI_EXPAND,
+        min_size: int = settings.ROI_MIN_SIZE,
+        max_size: int = settings.ROI_MAX_SIZE,
+        max_coverage: float = 0.8
+    ):
+        self.enabled = enabled
+        self.expand = expand
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_coverage = max_coverage
+        self.rois: Dict[str, ROI] = {}
+        self.frames_cropped = 0
+        self.frames_full = 0
+        self.fallbacks = 0
+        self.pixels_processed = 0
+        self.pixels_total = 0
+    
+    def __len__(self) -> int:
+        """Number of sessions with a tracked hand."""
+        return len(self.rois)
+    
+    def clear_session(self, session_id: str):
+        """Forget the hand position of a session."""
+        self.rois.pop(session_id, None)
+    
+    def roi_from_landmarks(self, landmarks, frame_shape: Tuple[int, ...]) -> Optional[ROI]:
+        """
+        Expanded square box around normalized landmarks (of all hands),
+        clamped to the frame. Returns None when the box would cover most
+        of the frame anyway.
+        """
+        height, width = frame_shape[:2]
+        points = np.asarray(landmarks, dtype=np.float32).reshape(-1, 3)[:, :2] * (width, height)
+        (min_x, min_y), (max_x, max_y) = points.min(axis=0), points.max(axis=0)
+        
+        size = max(max_x - min_x, max_y - min_y) * self.expand
+        size = max(size, self.min_size)
+        cx, cy = (min_x + max_x) / 2, (min_y + max_y) / 2
+        
+        x0 = int(max(0, cx - size / 2))
+        y0 = int(max(0, cy - size / 2))
+        x1 = int(min(width, cx + size / 2))
+        y1 = int(min(height, cy + size / 2))
+        if x1 <= x0 or y1 <= y0:
+            return None
+        if (x1 - x0) * (y1 - y0) > self.max_coverage * width * height:
+            return None
+        return ROI(x0, y0, x1, y1, width, height)
+    
+    def crop(self, image: np.ndarray, roi: ROI) -> np.ndarray:
+        """Cut the ROI out of the frame, downscaling large crops."""
+        import cv2
+        
+        crop = image[roi.y0:roi.y1, roi.x0:roi.x1]
+        longest = max(roi.width, roi.height)
+        if self.max_size and longest > self.max_size:
+            scale = self.max_size / longest
+            size = (max(1, round(roi.width * scale)), max(1, round(roi.height * scale)))
+            return cv2.resize(crop, size, interpolation=cv2.INTER_AREA)
+        return np.ascontiguousarray(crop)
+    
+    @staticmethod
+    def remap(landmarks, roi: ROI, frame_shape: Tuple[int, ...]) -> np.ndarray:
+        """
+        Map landmarks normalized to the crop back to full-frame coordinates.
+        Depth is scaled by the crop width, like x.
+        """
+        height, width = frame_shape[:2]
+        points = np.array(landmarks, dtype=np.float32)
+        points[..., 0] = (roi.x0 + points[..., 0] * roi.width) / width
+        points[..., 1] = (roi.y0 + points[..., 1] * roi.height) / height
+        points[..., 2] = points[..., 2] * roi.width / width
+        return points
+    
+    def detect(self, detector, session_id: str, image: np.ndarray):
+        """
+        Detect a hand using the session's ROI.
+
+        Returns:
+            Tuple of (hand_detected, landmarks, handedness, confidence)
+            with landmarks in full-frame coordinates
+        """
+        frame_pixels = image.shape[0] * image.shape[1]
+        self.pixels_total += frame_pixels
+        roi = self.rois.get(session_id) if self.enabled else None
+        
+        if roi is not None:
+            # The decoder may have changed resolution since the last frame
+            roi = roi.fit(image.shape)
+            crop = self.crop(image, roi)
+            self.frames_cropped += 1
+            self.pixels_processed += crop.shape[0] * crop.shape[1]
+            hand_detected, landmarks, handedness, confidence = detector.detect_image(crop)
+            if hand_detected:
+                landmarks = self.remap(landmarks, roi, image.shape)
+                self._update(session_id, landmarks, image.shape)
+                return hand_detected, landmarks, handedness, confidence
+            # Hand left the box: retry this frame at full size
+            self.fallbacks += 1
+            self.rois.pop(session_id, None)
+        
+        self.frames_full += 1
+        self.pixels_processed += frame_pixels
+        hand_detected, landmarks, handedness, confidence = detector.detect_image(image)
+        if hand_detected and self.enabled:
+            self._update(session_id, landmarks, image.shape)
+        return hand_detected, landmarks, handedness, confidence
+    
+    def _update(self, session_id: str, landmarks, frame_shape: Tuple[int, ...]):
+        """Track the box around the latest landmarks."""
+        roi = self.roi_from_landmarks(landmarks, frame_shape)
+        if roi is None:
+            self.rois.pop(session_id, None)
+        else:
+            self.rois[session_id] = roi
+    
+    def get_stats(self) -> dict:
+        """Get tracking statistics."""
+        return {
+            "enabled": self.enabled,
+            "tracked_sessions": len(self.rois),
+            "frames_cropped": self.frames_cropped,
+            "frames_full": self.frames_full,
+            "fallbacks": self.fallbacks,
+            "pixel_ratio": round(self.pixels_processed / self.pixels_total, 3) if self.pixels_total else None,
+        }
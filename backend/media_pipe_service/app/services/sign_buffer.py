@@ -5,6 +5,16 @@ from typing import List, Optional, Dict
 from collections import deque
 from dataclasses import dataclass, field
 from app.config import settings
+from app.metrics import metrics
+
+
+@dataclass
+class HandStream:
+    """Debounce state of one hand within a session."""
+    last_sign: Optional[str] = None
+    last_sign_time: float = 0.0
+    held_sign: Optional[str] = None  # Hand shape consumed by a motion sign
+    held_sign_time: float = 0.0
 
 
 @dataclass
@@ -15,6 +25,9 @@ class SessionBuffer:
     last_sign: Optional[str] = None
     last_sign_time: float = field(default_factory=time.time)
     sign_count: Dict[str, int] = field(default_factory=dict)
+    hands: Dict[str, HandStream] = field(default_factory=dict)
+    held_sign: Optional[str] = None
+    held_sign_time: float = 0.0
 
 
 class SignBuffer:
@@ -26,16 +39,31 @@ class SignBuffer:
         self.timeout_ms = settings.SIGN_BUFFER_TIMEOUT_MS
         self.min_sequence_length = settings.MIN_SEQUENCE_LENGTH
         
+    def __len__(self) -> int:
+        """Number of sessions with buffered state."""
+        return len(self.buffers)
+    
     def get_or_create_session(self, session_id: str) -> SessionBuffer:
         """Get existing session or create new one."""
         if session_id not in self.buffers:
             self.buffers[session_id] = SessionBuffer(session_id=session_id)
         return self.buffers[session_id]
     
-    def add_sign(self, session_id: str, sign: str, confidence: float) -> bool:
+    @metrics.timed("sign_buffer_add")
+    def add_sign(self, session_id: str, sign: str, confidence: float, now: Optional[float] = None,
+                 hand: Optional[str] = None, replaces: Optional[str] = None) -> bool:
         """
         Add a detected sign to the buffer.
         Returns True if this is a new unique sign.
+        ``now`` overrides the wall clock, e.g. when replaying recordings.
+        ``hand`` (e.g. "Left", "Right" or "both") keeps a separate debounce
+        stream per hand when several hands are signing; signs from all
+        streams go into the one session sequence in arrival order.
+        ``replaces`` names a sign this one supersedes: when it is the last
+        buffered sign it is removed first, e.g. a J recognized from its
+        motion replaces the I its hand shape was read as. The replaced
+        sign is then held: it is not added again while it keeps arriving
+        less than 500ms apart, as the hand still shows that shape.
         """
         if confidence < self.min_confidence:
             return False
@@ -44,21 +72,47 @@ class SignBuffer:
             return False
         
         buffer = self.get_or_create_session(session_id)
-        current_time = time.time()
+        current_time = time.time() if now is None else now
+        
+        stream = buffer
+        if hand is not None:
+            stream = buffer.hands.get(hand)
+            if stream is None:
+                stream = buffer.hands[hand] = HandStream()
+        
+        if stream.held_sign is not None:
+            if stream.held_sign == sign and (current_time - stream.held_sign_time) * 1000 < 500:
+                stream.held_sign_time = current_time
+                return False
+            stream.held_sign = None
         
         # Debounce: don't add same sign twice in a row too quickly
-        if buffer.last_sign == sign:
-            time_since_last = (current_time - buffer.last_sign_time) * 1000
+        if stream.last_sign == sign:
+            time_since_last = (current_time - stream.last_sign_time) * 1000
             if time_since_last < 500:  # 500ms debounce
                 return False
         
+        if replaces is not None:
+            if buffer.signs and buffer.signs[-1]["sign"] == replaces:
+                buffer.signs.pop()
+                buffer.sign_count[replaces] -= 1
+                if not buffer.sign_count[replaces]:
+                    del buffer.sign_count[replaces]
+            stream.held_sign = replaces
+            stream.held_sign_time = current_time
+        
         # Add sign to buffer
-        buffer.signs.append({
+        entry = {
             "sign": sign,
             "confidence": confidence,
             "timestamp": current_time
-        })
+        }
+        if hand is not None:
+            entry["hand"] = hand
+        buffer.signs.append(entry)
         
+        stream.last_sign = sign
+        stream.last_sign_time = current_time
         buffer.last_sign = sign
         buffer.last_sign_time = current_time
         buffer.sign_count[sign] = buffer.sign_count.get(sign, 0) + 1
@@ -72,7 +126,7 @@ class SignBuffer:
             return []
         return [s["sign"] for s in buffer.signs]
     
-    def should_commit(self, session_id: str) -> bool:
+    def should_commit(self, session_id: str, now: Optional[float] = None) -> bool:
         """
         Check if we should commit the current sequence.
         This happens after a timeout with no new signs.
@@ -84,9 +138,11 @@ class SignBuffer:
         if len(buffer.signs) < self.min_sequence_length:
             return False
         
-        time_since_last = (time.time() - buffer.last_sign_time) * 1000
+        current_time = time.time() if now is None else now
+        time_since_last = (current_time - buffer.last_sign_time) * 1000
         return time_since_last > self.timeout_ms
     
+    @metrics.timed("sign_buffer_commit")
     def commit_sequence(self, session_id: str) -> List[str]:
         """
         Commit current sequence and return it.
@@ -102,6 +158,7 @@ class SignBuffer:
         buffer.signs.clear()
         buffer.last_sign = None
         buffer.sign_count.clear()
+        buffer.hands.clear()
         
         return sequence
     
@@ -119,5 +176,6 @@ class SignBuffer:
         return {
             "signs_count": len(buffer.signs),
             "unique_signs": len(buffer.sign_count),
-            "sign_counts": dict(buffer.sign_count)
+            "sign_counts": dict(buffer.sign_count),
+            "hands": sorted(buffer.hands)
         }
@@ -0,0 +1,149 @@
+"""Per-session speculation on sign sequences before they are committed."""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Callable, Coroutine, Dict, List, Optional, Tuple
+from app.config import settings
+
+
+@dataclass
+class SpeculationState:
+    """The sequence last sent for speculative translation."""
+    version: Tuple[int, float]  # Buffered signs and last sign time when sent
+    sequence: List[str]
+
+
+class Speculator:
+    """
+    Decides when to ask the LLM service for a speculative translation.
+
+    A sequence is committed only after ``SIGN_BUFFER_TIMEOUT_MS`` with no
+    new sign. Once it has been stable for the shorter ``stable_ms``, its
+    current contents are sent ahead. If nothing changes until the commit,
+    the LLM service answers the commit from that translation. A new sign
+    after speculating means the sequence diverged, and the caller cancels
+    the speculation. Calls to the LLM service are queued per session, so
+    a cancel never overtakes the speculation it cancels.
+    """
+    
+    def __init__(
+        self,
+        enabled: bool = settings.SPECULATION_ENABLED,
+        stable_ms: int = settings.SPECULATION_STABLE_MS,
+        min_length: int = settings.MIN_SEQUENCE_LENGTH
+    ):
+        self.enabled = enabled
+        self.stable_s = stable_ms / 1000
+        self.min_length = min_length
+        self.sessions: Dict[str, SpeculationState] = {}
+        self.calls: Dict[str, asyncio.Task] = {}  # Last queued LLM call per session
+        self.speculated = 0
+        self.diverged = 0
+        self.matched = 0
+    
+    def __len__(self) -> int:
+        """Number of sessions with a speculation outstanding."""
+        return len(self.sessions)
+    
+    def clear_session(self, session_id: str):
+        """Forget a session's speculation."""
+        self.sessions.pop(session_id, None)
+        self.calls.pop(session_id, None)
+    
+    def cancel(self, session_id: str) -> bool:
+        """Forget a session's speculation; returns whether there was one to cancel."""
+        return self.sessions.pop(session_id, None) is not None
+    
+    def due(self, sign_buffer, session_id: str, now: Optional[float] = None) -> Optional[List[str]]:
+        """
+        Get the sequence to speculate on, if any.
+
+        Returns:
+            The session's sequence when it has been stable for
+            ``stable_ms`` and was not sent yet, otherwise None
+        """
+        if not self.enabled:
+            return None
+        buffer = sign_buffer.buffers.get(session_id)
+        if buffer is None or len(buffer.signs) < self.min_length:
+            return None
+        now = time.time() if now is None else now
+        if now - buffer.last_sign_time < self.stable_s:
+            return None
+        
+        # Every accepted sign moves last_sign_time, so this changes with the sequence
+        version = (len(buffer.signs), buffer.last_sign_time)
+        state = self.sessions.get(session_id)
+        if state is not None and state.version == version:
+            return None
+        
+        sequence = [s["sign"] for s in buffer.signs]
+        self.sessions[session_id] = SpeculationState(version=version, sequence=sequence)
+        self.speculated += 1
+        return sequence
+    
+    def sign_added(self, session_id: str) -> bool:
+        """
+        Note a new sign in the session's sequence.
+
+        Returns:
+            True if an outstanding speculation no longer matches and
+            should be cancelled
+        """
+        if not self.cancel(session_id):
+            return False
+        self.diverged += 1
+        return True
+    
+    def committed(self, session_id: str, sequence: List[str]) -> bool:
+        """Forget the session's speculation; returns whether it matched the committed sequence."""
+        state = self.sessions.pop(session_id, None)
+        matched = state is not None and state.sequence == sequence
+        if matched:
+            self.matched += 1
+        return matched
+    
+    def queue_call(
+        self,
+        session_id: str,
+        coro: Coroutine,
+        spawn: Callable[[Coroutine], asyncio.Task]
+    ) -> asyncio.Task:
+        """
+        Run a speculation call to the LLM service after the session's
+        previous one has finished.
+
+        Args:
+            session_id: Session the call belongs to
+            coro: The call
+            spawn: Starts a coroutine as a task
+        """
+        previous = self.calls.get(session_id)
+        
+        async def run():
+            if previous is not None:
+                # Wait without raising if the previous call failed or was cancelled
+                await asyncio.wait({previous})
+            await coro
+        
+        task = spawn(run())
+        self.calls[session_id] = task
+        
+        def forget(done: asyncio.Task):
+            coro.close()  # Never started if cancelled while queued
+            if self.calls.get(session_id) is done:
+                del self.calls[session_id]
+        
+        task.add_done_callback(forget)
+        return task
+    
+    def get_stats(self) -> dict:
+        """Get speculation statistics."""
+        return {
+            "enabled": self.enabled,
+            "sessions": len(self.sessions),
+            "speculated": self.speculated,
+            "diverged": self.diverged,
+            "matched": self.matched,
+        }
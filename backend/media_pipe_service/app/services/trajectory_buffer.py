@@ -0,0 +1,199 @@
+"""Per-session landmark trajectories with incrementally updated features."""
+
+import math
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+import numpy as np
+from app.config import settings
+
+
+WRIST = 0
+MIDDLE_MCP = 9
+INDEX_TIP = 8
+PINKY_TIP = 20
+TRACKED_POINTS = (INDEX_TIP, PINKY_TIP)
+
+
+class PointTrack:
+    """
+    Path of one landmark over the window, in units of hand size.
+
+    Every feature is a running sum over deques of per-step contributions,
+    so a new frame costs O(1) regardless of the window length: the step
+    leaving the window is subtracted as the new one is added. Steps
+    shorter than ``min_step`` (jitter) move the point but do not change
+    its direction or add turns. Sharp turns are counted by direction:
+    with y pointing down, a positive turn is clockwise on screen.
+    """
+    
+    def __init__(self, window: int, min_step: float, sharp_turn: float):
+        self.min_step = min_step
+        self.sharp_turn = sharp_turn
+        self.points: deque = deque(maxlen=window)
+        self.steps: deque = deque(maxlen=window - 1)
+        self.turns: deque = deque(maxlen=window - 1)
+        self.direction: Optional[float] = None
+        self.path_length = 0.0
+        self.turning = 0.0
+        self.sharp_turns_cw = 0
+        self.sharp_turns_ccw = 0
+    
+    def push(self, x: float, y: float):
+        """Add the landmark's position in the newest frame."""
+        step, turn = 0.0, 0.0
+        if self.points:
+            last_x, last_y = self.points[-1]
+            dx, dy = x - last_x, y - last_y
+            step = math.hypot(dx, dy)
+            if step >= self.min_step:
+                direction = math.atan2(dy, dx)
+                if self.direction is not None:
+                    # Signed turn in (-pi, pi]
+                    turn = (direction - self.direction + math.pi) % (2 * math.pi) - math.pi
+                self.direction = direction
+            
+            if len(self.steps) == self.steps.maxlen:
+                self._evict(self.steps[0], self.turns[0])
+            self.steps.append(step)
+            self.turns.append(turn)
+            self.path_length += step
+            self.turning += turn
+            self._count_sharp(turn, 1)
+        self.points.append((x, y))
+    
+    def _evict(self, step: float, turn: float):
+        self.path_length -= step
+        self.turning -= turn
+        self._count_sharp(turn, -1)
+    
+    def _count_sharp(self, turn: float, change: int):
+        if turn >= self.sharp_turn:
+            self.sharp_turns_cw += change
+        elif turn <= -self.sharp_turn:
+            self.sharp_turns_ccw += change
+    
+    def features(self, duration: float) -> dict:
+        """Trajectory features over the current window."""
+        if len(self.points) < 2:
+            return {"path_length": 0.0, "dx": 0.0, "dy": 0.0, "speed": 0.0, "turning": 0.0,
+                    "sharp_turns": 0, "sharp_turns_cw": 0, "sharp_turns_ccw": 0}
+        (start_x, start_y), (end_x, end_y) = self.points[0], self.points[-1]
+        return {
+            "path_length": self.path_length,
+            "dx": end_x - start_x,
+            "dy": end_y - start_y,  # Positive is downward in image coordinates
+            "speed": self.path_length / duration if duration > 0 else 0.0,
+            "turning": self.turning,
+            "sharp_turns": self.sharp_turns_cw + self.sharp_turns_ccw,
+            "sharp_turns_cw": self.sharp_turns_cw,
+            "sharp_turns_ccw": self.sharp_turns_ccw,
+        }
+
+
+@dataclass
+class Trajectory:
+    """Recent frames of one session."""
+    landmarks: np.ndarray  # (window, 21, 3) ring of normalized landmarks
+    tracks: Dict[int, PointTrack]
+    timestamps: deque
+    shapes: deque  # Static sign of each frame
+    shape_counts: Dict[str, int] = field(default_factory=dict)
+    head: int = 0
+    count: int = 0
+
+
+class TrajectoryBuffer:
+    """
+    Fixed-size per-session window of the primary hand's landmarks.
+
+    Each frame's normalized landmarks go into a preallocated ring, and the
+    fingertips that draw motion letters (index for Z, pinky for J) are
+    tracked in frame coordinates divided by hand size, so features do not
+    depend on distance to the camera. The static sign of each frame is
+    counted too, so motion rules can require a hand shape.
+    """
+    
+    def __init__(
+        self,
+        window: int = settings.TRAJECTORY_WINDOW,
+        min_step: float = settings.TRAJECTORY_MIN_STEP,
+        sharp_turn_degrees: float = 100.0
+    ):
+        self.window = max(3, window)
+        self.min_step = min_step
+        self.sharp_turn = math.radians(sharp_turn_degrees)
+        self.sessions: Dict[str, Trajectory] = {}
+    
+    def __len__(self) -> int:
+        """Number of sessions with a trajectory."""
+        return len(self.sessions)
+    
+    def clear_session(self, session_id: str):
+        """Drop a session's trajectory, e.g. after a motion sign was recognized."""
+        self.sessions.pop(session_id, None)
+    
+    def _create(self) -> Trajectory:
+        return Trajectory(
+            landmarks=np.empty((self.window, 21, 3), dtype=np.float32),
+            tracks={point: PointTrack(self.window, self.min_step, self.sharp_turn) for point in TRACKED_POINTS},
+            timestamps=deque(maxlen=self.window),
+            shapes=deque(maxlen=self.window),
+        )
+    
+    def push(self, session_id: str, landmarks: np.ndarray, normalized: np.ndarray,
+             shape: Optional[str], timestamp: float) -> Trajectory:
+        """
+        Add one frame of the primary hand.
+
+        Args:
+            landmarks: (21, 3) landmarks in frame coordinates
+            normalized: (21, 3) wrist-relative landmarks from normalize_landmarks
+            shape: Static sign classified for this frame, if any
+            timestamp: Frame time in seconds
+        """
+        trajectory = self.sessions.get(session_id)
+        if trajectory is None:
+            trajectory = self.sessions[session_id] = self._create()
+        
+        trajectory.landmarks[trajectory.head] = normalized
+        trajectory.head = (trajectory.head + 1) % self.window
+        trajectory.count = min(trajectory.count + 1, self.window)
+        trajectory.timestamps.append(timestamp)
+        
+        if len(trajectory.shapes) == trajectory.shapes.maxlen:
+            oldest = trajectory.shapes[0]
+            trajectory.shape_counts[oldest] -= 1
+        trajectory.shapes.append(shape)
+        trajectory.shape_counts[shape] = trajectory.shape_counts.get(shape, 0) + 1
+        
+        wrist, middle_mcp, *tips = landmarks[[WRIST, MIDDLE_MCP, *TRACKED_POINTS]].tolist()
+        scale = math.dist(wrist, middle_mcp) or 1.0
+        for (x, y, _), track in zip(tips, trajectory.tracks.values()):
+            track.push(x / scale, y / scale)
+        return trajectory
+    
+    def window_landmarks(self, session_id: str) -> Optional[np.ndarray]:
+        """The session's normalized landmarks, oldest first (a copy)."""
+        trajectory = self.sessions.get(session_id)
+        if trajectory is None:
+            return None
+        if trajectory.count < self.window:
+            return trajectory.landmarks[:trajectory.count].copy()
+        return np.roll(trajectory.landmarks, -trajectory.head, axis=0)
+    
+    @staticmethod
+    def duration(trajectory: Trajectory) -> float:
+        """Seconds covered by the window."""
+        if len(trajectory.timestamps) < 2:
+            return 0.0
+        return trajectory.timestamps[-1] - trajectory.timestamps[0]
+    
+    def get_stats(self) -> dict:
+        """Get trajectory statistics."""
+        return {
+            "sessions": len(self.sessions),
+            "window": self.window,
+            "frames": sum(t.count for t in self.sessions.values()),
+        }
@@ -0,0 +1,317 @@
+"""
+Offline batch processing of videos and image datasets.
+
+Runs recorded sessions and labeled image directories through HandDetector
+and GestureClassifier on a process pool, and writes landmarks and
+predictions to a single columnar file. Images are detected in static
+mode; each video segment gets its own tracking detector.
+
+Work is split into units (a segment of a video, or a chunk of images).
+Each finished unit is written to ``<output>.parts/`` and recorded in a
+manifest, so an interrupted run picks up where it stopped with --resume.
+
+Image directories are treated as datasets: the name of the directory an
+image sits in is stored as its label (e.g. ``dataset/A/0001.jpg`` -> ``A``).
+
+Examples:
+    python scripts/process_dataset.py recordings/*.mp4 -o sessions.npz --stride 2
+    python scripts/process_dataset.py dataset/ -o dataset.parquet --workers 8 --resume
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from multiprocessing import get_context
+from typing import Dict, List
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+VIDEO_EXTENSIONS = {".mp4", ".avi", ".mov", ".mkv", ".webm"}
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".bmp"}
+HANDEDNESS_CODES = {"Left": 0, "Right": 1}
+
+
+@dataclass
+class WorkUnit:
+    """A slice of one input processed by a single worker."""
+    source: str
+    kind: str  # "video" or "images"
+    start: int
+    stop: int
+    stride: int
+    paths: List[str] = None  # Image paths for "images" units
+    
+    @property
+    def unit_id(self) -> str:
+        unit_id = f"{self.kind}:{self.source}:{self.start}-{self.stop}:{self.stride}"
+        if self.paths:
+            # Image chunks change if files are added to the dataset
+            unit_id += ":" + hashlib.sha1("\n".join(self.paths).encode()).hexdigest()[:8]
+        return unit_id
+    
+    @property
+    def part_name(self) -> str:
+        return hashlib.sha1(self.unit_id.encode()).hexdigest()[:16] + ".npz"
+
+
+def plan_units(inputs: List[str], stride: int, segment_frames: int, image_chunk: int) -> List[WorkUnit]:
+    """Split inputs into work units."""
+    import cv2
+    
+    units = []
+    for path in inputs:
+        if os.path.isdir(path):
+            images = sorted(
+                os.path.join(root, name)
+                for root, _, names in os.walk(path)
+                for name in names
+                if os.path.splitext(name)[1].lower() in IMAGE_EXTENSIONS
+            )[::stride]
+            for start in range(0, len(images), image_chunk):
+                chunk = images[start:start + image_chunk]
+                units.append(WorkUnit(path, "images", start, start + len(chunk), 1, chunk))
+        elif os.path.splitext(path)[1].lower() in VIDEO_EXTENSIONS:
+            capture = cv2.VideoCapture(path)
+            total = int(capture.get(cv2.CAP_PROP_FRAME_COUNT))
+            capture.release()
+            if total <= 0:
+                print(f"Skipping {path}: no frames")
+                continue
+            for start in range(0, total, segment_frames):
+                units.append(WorkUnit(path, "video", start, min(start + segment_frames, total), stride))
+        else:
+            print(f"Skipping {path}: not a video or directory")
+    return units
+
+
+# Per-process state, created once in each worker
+_image_detector = None
+_video_detector = None
+_classifier = None
+
+
+def _init_worker():
+    """Keep each worker single threaded so processes scale with cores."""
+    import cv2
+    cv2.setNumThreads(1)
+
+
+def _get_detector(unit: WorkUnit):
+    """
+    Detector for a unit.
+    Images are unrelated, so all image units share one static-mode
+    detector. Each video segment gets a fresh tracking detector, so no
+    tracking state carries over from another segment or video.
+    """
+    global _image_detector, _video_detector
+    from app.services.hand_detector import HandDetector
+    
+    if unit.kind == "images":
+        if _image_detector is None:
+            _image_detector = HandDetector(static_image_mode=True)
+        return _image_detector
+    
+    if _video_detector is not None:
+        _video_detector.close()
+    _video_detector = HandDetector(static_image_mode=False)
+    return _video_detector
+
+
+def _iter_video(unit: WorkUnit):
+    """Yield (frame_index, timestamp_ms, rgb_image) for a video segment."""
+    import cv2
+    
+    capture = cv2.VideoCapture(unit.source)
+    fps = capture.get(cv2.CAP_PROP_FPS) or 30.0
+    capture.set(cv2.CAP_PROP_POS_FRAMES, unit.start)
+    try:
+        for index in range(unit.start, unit.stop):
+            # Skipped frames are grabbed but not decoded
+            if (index - unit.start) % unit.stride:
+                if not capture.grab():
+                    return
+                continue
+            ok, frame = capture.read()
+            if not ok:
+                return
+            yield index, index * 1000.0 / fps, cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    finally:
+        capture.release()
+
+
+def _iter_images(unit: WorkUnit):
+    """Yield (frame_index, timestamp_ms, rgb_image) for an image chunk."""
+    import cv2
+    
+    for offset, path in enumerate(unit.paths):
+        frame = cv2.imread(path, cv2.IMREAD_COLOR)
+        if frame is None:
+            print(f"Could not read {path}")
+            continue
+        yield unit.start + offset, 0.0, cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+
+
+def process_unit(unit: WorkUnit, parts_dir: str) -> dict:
+    """Detect and classify every frame of a unit and write it as a part file."""
+    global _classifier
+    from app.models.gesture_classifier import GestureClassifier
+    
+    if _classifier is None:
+        _classifier = GestureClassifier()
+    detector = _get_detector(unit)
+    
+    frames = _iter_images(unit) if unit.kind == "images" else _iter_video(unit)
+    rows = {
+        "frame_index": [], "timestamp_ms": [], "hand_detected": [], "handedness": [],
+        "detection_confidence": [], "landmarks": [], "sign": [], "sign_confidence": [], "path": [],
+    }
+    normalized = np.empty((21, 3), dtype=np.float32)
+    start = time.perf_counter()
+    for frame_index, timestamp_ms, image in frames:
+        hand_detected, hands, handedness, confidences = detector.detect_image(image)
+        sign, sign_confidence = None, 0.0
+        landmarks, hand, confidence = None, None, 0.0
+        if hand_detected:
+            # One row per frame: the first hand
+            landmarks, hand, confidence = hands[0], handedness[0], confidences[0]
+            sign, sign_confidence = _classifier.classify(detector.normalize_landmarks(landmarks, out=normalized))
+        rows["frame_index"].append(frame_index)
+        rows["timestamp_ms"].append(timestamp_ms)
+        rows["hand_detected"].append(hand_detected)
+        rows["handedness"].append(HANDEDNESS_CODES.get(hand, -1))
+        rows["detection_confidence"].append(confidence)
+        rows["landmarks"].append(landmarks if hand_detected else np.full((21, 3), np.nan))
+        rows["sign"].append(sign or "")
+        rows["sign_confidence"].append(sign_confidence)
+        rows["path"].append(unit.paths[frame_index - unit.start] if unit.kind == "images" else "")
+    
+    count = len(rows["frame_index"])
+    columns = {
+        "frame_index": np.array(rows["frame_index"], dtype=np.int64),
+        "timestamp_ms": np.array(rows["timestamp_ms"], dtype=np.float64),
+        "hand_detected": np.array(rows["hand_detected"], dtype=bool),
+        "handedness": np.array(rows["handedness"], dtype=np.int8),
+        "detection_confidence": np.array(rows["detection_confidence"], dtype=np.float32),
+        "landmarks": np.array(rows["landmarks"], dtype=np.float32).reshape(count, 21, 3),
+        "sign": np.array(rows["sign"], dtype=str),
+        "sign_confidence": np.array(rows["sign_confidence"], dtype=np.float32),
+        "path": np.array(rows["path"], dtype=str),
+    }
+    
+    # Write then rename so a crash never leaves a half-written part behind
+    part_path = os.path.join(parts_dir, unit.part_name)
+    tmp_path = part_path + ".tmp.npz"
+    np.savez(tmp_path, **columns)
+    os.replace(tmp_path, part_path)
+    return {"unit_id": unit.unit_id, "part": unit.part_name, "frames": count,
+            "seconds": time.perf_counter() - start}
+
+
+def load_manifest(path: str) -> Dict[str, dict]:
+    """Read completed units from the manifest."""
+    done = {}
+    if os.path.exists(path):
+        with open(path) as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    done[entry["unit_id"]] = entry
+    return done
+
+
+def label_for(path: str) -> str:
+    """Dataset label of an image: its parent directory name."""
+    return os.path.basename(os.path.dirname(path)) if path else ""
+
+
+def merge_parts(units: List[WorkUnit], parts_dir: str, output: str):
+    """Concatenate part files in input order into one columnar file."""
+    sources = sorted({unit.source for unit in units})
+    source_index = {source: i for i, source in enumerate(sources)}
+    columns: Dict[str, list] = {}
+    for unit in units:
+        with np.load(os.path.join(parts_dir, unit.part_name)) as part:
+            count = len(part["frame_index"])
+            for name in part.files:
+                columns.setdefault(name, []).append(part[name])
+            columns.setdefault("source", []).append(np.full(count, source_index[unit.source], dtype=np.int32))
+    merged = {name: np.concatenate(values) for name, values in columns.items()}
+    merged["label"] = np.array([label_for(path) for path in merged.get("path", [])], dtype=str)
+    
+    if output.endswith(".parquet"):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        
+        count = len(merged["frame_index"])
+        flat = merged.pop("landmarks").reshape(count, 63)
+        table = pa.table({
+            **{name: values for name, values in merged.items()},
+            "landmarks": pa.FixedSizeListArray.from_arrays(pa.array(flat.ravel()), 63),
+        })
+        table = table.replace_schema_metadata({"sources": json.dumps(sources)})
+        pq.write_table(table, output)
+    else:
+        np.savez(output, sources=np.array(sources, dtype=str), **merged)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch hand detection and classification")
+    parser.add_argument("inputs", nargs="+", help="Video files and/or image directories")
+    parser.add_argument("-o", "--output", required=True, help="Output file (.npz, or .parquet with pyarrow)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--stride", type=int, default=1, help="Process every Nth frame/image")
+    parser.add_argument("--segment-frames", type=int, default=300, help="Video frames per work unit")
+    parser.add_argument("--image-chunk", type=int, default=64, help="Images per work unit")
+    parser.add_argument("--resume", action="store_true", help="Skip units finished by an earlier run")
+    args = parser.parse_args()
+    
+    if args.output.endswith(".parquet"):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise SystemExit("Parquet output requires pyarrow; use an .npz output instead")
+    
+    parts_dir = args.output + ".parts"
+    manifest_path = os.path.join(parts_dir, "manifest.jsonl")
+    os.makedirs(parts_dir, exist_ok=True)
+    if not args.resume and os.path.exists(manifest_path):
+        os.remove(manifest_path)
+    
+    units = plan_units(args.inputs, args.stride, args.segment_frames, args.image_chunk)
+    done = load_manifest(manifest_path)
+    todo = [
+        unit for unit in units
+        if unit.unit_id not in done or not os.path.exists(os.path.join(parts_dir, unit.part_name))
+    ]
+    print(f"{len(units)} units, {len(units) - len(todo)} already done, {args.workers} workers")
+    
+    start = time.perf_counter()
+    frames = 0
+    if todo:
+        # Spawn so every worker builds its own MediaPipe graph from scratch
+        with ProcessPoolExecutor(args.workers, mp_context=get_context("spawn"),
+                                 initializer=_init_worker) as pool, \
+                open(manifest_path, "a") as manifest:
+            futures = [pool.submit(process_unit, unit, parts_dir) for unit in todo]
+            for completed, future in enumerate(as_completed(futures), 1):
+                entry = future.result()
+                manifest.write(json.dumps(entry) + "\n")
+                manifest.flush()
+                frames += entry["frames"]
+                elapsed = time.perf_counter() - start
+                print(f"[{completed}/{len(todo)}] {entry['unit_id']}: {entry['frames']} frames "
+                      f"({frames / elapsed:.1f} frames/s overall)")
+    
+    merge_parts(units, parts_dir, args.output)
+    print(f"Wrote {args.output} ({frames} new frames in {time.perf_counter() - start:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
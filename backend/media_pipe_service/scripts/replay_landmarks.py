@@ -0,0 +1,46 @@
+"""
+Replay recorded landmark logs through GestureClassifier and SignBuffer.
+
+Frames are fed as fast as the CPU allows while the recorded timestamps
+drive debouncing and commits, so the committed sequences match what the
+service would have produced live.
+
+Examples:
+    python scripts/replay_landmarks.py logs/landmarks-20240101-120000-42.lmlog
+    python scripts/replay_landmarks.py logs/*.lmlog --session abc123 --sequences
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.gesture_classifier import GestureClassifier  # noqa: E402
+from app.services.landmark_log import LandmarkLogReader, replay  # noqa: E402
+from app.services.sign_buffer import SignBuffer  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay landmark logs")
+    parser.add_argument("logs", nargs="+", help="Landmark log files")
+    parser.add_argument("--session", help="Only replay this session")
+    parser.add_argument("--sequences", action="store_true", help="Print committed sequences")
+    args = parser.parse_args()
+    
+    classifier = GestureClassifier()
+    for path in args.logs:
+        reader = LandmarkLogReader(path)
+        result = replay(reader, classifier, SignBuffer(), session_id=args.session)
+        size_mb = os.path.getsize(path) / 1e6
+        print(f"{path}: {result.frames} frames ({reader.dtype.name}, {size_mb:.1f} MB), "
+              f"{result.signs} signs, {len(result.sequences)} sequences in {result.elapsed_s:.2f}s "
+              f"({result.frames_per_second:,.0f} frames/s)"
+              + (" [truncated tail ignored]" if reader.truncated else ""))
+        if args.sequences:
+            for session_id, sequence in result.sequences:
+                print(f"  {session_id}: {' '.join(sequence)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Tests for connection manager."""
+
+import asyncio
+import pytest
+from app.services.connection_manager import ConnectionManager
+from app.services.sign_buffer import SignBuffer
+
+
+class FakeWebSocket:
+    """Minimal stand-in for a FastAPI WebSocket."""
+    
+    def __init__(self):
+        self.accepted = False
+    
+    async def accept(self):
+        self.accepted = True
+
+
+class TestConnectionManager:
+    """Test cases for ConnectionManager."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.manager = ConnectionManager()
+        self.sign_buffer = SignBuffer()
+        self.manager.register_store("sign_buffer", self.sign_buffer)
+    
+    def test_connect_and_bind(self):
+        """Test that sessions are bound to their connection."""
+        async def scenario():
+            ws = FakeWebSocket()
+            connection = await self.manager.connect(ws)
+            self.manager.bind_session(ws, "session-1")
+            return ws, connection
+        
+        ws, connection = asyncio.run(scenario())
+        assert ws.accepted
+        assert connection.sessions == {"session-1"}
+        assert self.manager.get_websocket("session-1") is ws
+    
+    def test_disconnect_releases_sessions(self):
+        """Test that disconnect clears store state for owned sessions."""
+        async def scenario():
+            ws = FakeWebSocket()
+            await self.manager.connect(ws)
+            self.manager.bind_session(ws, "session-1")
+            self.sign_buffer.add_sign("session-1", "A", 0.9)
+            assert len(self.sign_buffer) == 1
+            await self.manager.disconnect(ws)
+        
+        asyncio.run(scenario())
+        stats = self.manager.get_stats()
+        assert len(self.sign_buffer) == 0
+        assert stats["active_connections"] == 0
+        assert stats["bound_sessions"] == 0
+        assert stats["store_sessions"] == {"sign_buffer": 0}
+    
+    def test_disconnect_cancels_pending_tasks(self):
+        """Test that pending background tasks are cancelled."""
+        async def scenario():
+            ws = FakeWebSocket()
+            await self.manager.connect(ws)
+            task = self.manager.spawn(ws, asyncio.sleep(60))
+            assert self.manager.get_stats()["pending_tasks"] == 1
+            await self.manager.disconnect(ws)
+            return task
+        
+        task = asyncio.run(scenario())
+        assert task.cancelled()
+    
+    def test_rebound_session_survives_old_disconnect(self):
+        """Test that a reconnect keeps the session when the old socket closes."""
+        async def scenario():
+            old_ws, new_ws = FakeWebSocket(), FakeWebSocket()
+            await self.manager.connect(old_ws)
+            await self.manager.connect(new_ws)
+            self.manager.bind_session(old_ws, "session-1")
+            self.sign_buffer.add_sign("session-1", "A", 0.9)
+            self.manager.bind_session(new_ws, "session-1")
+            await self.manager.disconnect(old_ws)
+            return new_ws
+        
+        new_ws = asyncio.run(scenario())
+        assert self.sign_buffer.get_sequence("session-1") == ["A"]
+        assert self.manager.get_websocket("session-1") is new_ws
+    
+    def test_disconnect_twice(self):
+        """Test that disconnect is idempotent."""
+        async def scenario():
+            ws = FakeWebSocket()
+            await self.manager.connect(ws)
+            await self.manager.disconnect(ws)
+            await self.manager.disconnect(ws)
+        
+        asyncio.run(scenario())
+        assert self.manager.get_stats()["active_connections"] == 0
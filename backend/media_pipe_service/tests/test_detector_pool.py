@@ -0,0 +1,157 @@
+"""Tests for DetectorPool."""
+
+import asyncio
+import base64
+import os
+import signal
+
+import cv2
+import numpy as np
+import pytest
+
+from app.metrics import metrics
+from app.services.detector_pool import DetectorPool, NO_HAND
+from app.services.frame_decoder import FrameDecoder
+from app.services.motion_gate import MotionGate
+from app.services.roi_tracker import ROITracker
+
+
+def blank_jpeg() -> str:
+    """Base64 JPEG without a hand in it."""
+    ok, encoded = cv2.imencode(".jpg", np.full((120, 160, 3), 128, np.uint8))
+    return base64.b64encode(encoded.tobytes()).decode()
+
+
+class TestDetectorPool:
+    """Test cases for DetectorPool, with real worker processes."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.pool = DetectorPool(workers=2, slots=2, slot_bytes=64 * 1024, timeout_ms=60000)
+    
+    def run(self, scenario):
+        async def wrapper():
+            self.pool.start()
+            try:
+                await scenario()
+            finally:
+                await self.pool.stop()
+        asyncio.run(wrapper())
+    
+    def test_detects_through_ring(self):
+        """Test frames go through the pinned workers and every slot is freed again."""
+        frame = blank_jpeg()
+        
+        async def scenario():
+            # Sessions are pinned by id and spread over the workers
+            assert {self.pool.worker_for(f"s{i}").index for i in range(20)} == {0, 1}
+            assert self.pool.worker_for("s1") is self.pool.worker_for("s1")
+            
+            results = await asyncio.gather(*[self.pool.detect(f"s{i}", frame) for i in range(10)])
+            
+            assert results == [(NO_HAND, False)] * 10
+            stats = self.pool.get_stats()
+            assert sum(worker["processed"] for worker in stats["workers"]) == 10
+            assert all(len(worker.free_slots) == 2 for worker in self.pool.workers)
+            assert all(worker["ready"] for worker in stats["workers"])
+            assert len(self.pool) == 10
+            
+            self.pool.clear_session("s0")
+            assert len(self.pool) == 9
+        
+        self.run(scenario)
+    
+    def test_worker_counters_reach_server_stores(self):
+        """Test decode, ROI and motion gate counters and stage timings of worker frames are recorded here."""
+        frame = blank_jpeg()
+        decoder, roi_tracker, gate = FrameDecoder(), ROITracker(), MotionGate()
+        self.pool = DetectorPool(workers=1, slots=2, slot_bytes=64 * 1024, timeout_ms=60000,
+                                 frame_decoder=decoder, roi_tracker=roi_tracker, motion_gate=gate)
+        decode_frame, hands_process = metrics.stage("decode_frame"), metrics.stage("hands_process")
+        
+        async def scenario():
+            await self.pool.wait_ready()
+            decoded, processed = decode_frame.count, hands_process.count
+            for _ in range(3):
+                await self.pool.detect("s1", frame)
+            
+            # The unchanged frames reuse the first detection
+            assert sum(decoder.frames_by_reduction.values()) == 3
+            assert (gate.frames_checked, gate.frames_skipped) == (3, 2)
+            assert roi_tracker.frames_full == 1
+            assert decode_frame.count - decoded == 3
+            assert hands_process.count - processed == 1
+        
+        self.run(scenario)
+    
+    def test_rejects_oversized_frame(self):
+        """Test a frame larger than a slot is refused before it is queued."""
+        async def scenario():
+            with pytest.raises(ValueError):
+                await self.pool.detect("s1", base64.b64encode(b"x" * (65 * 1024)).decode())
+            assert self.pool.get_stats()["frames_too_large"] == 1
+        
+        self.run(scenario)
+    
+    def test_dead_worker_is_restarted(self):
+        """Test a killed worker is replaced and its sessions keep working."""
+        frame = blank_jpeg()
+        
+        async def scenario():
+            await self.pool.detect("s1", frame)
+            worker = self.pool.worker_for("s1")
+            os.kill(worker.process.pid, signal.SIGKILL)
+            for _ in range(50):
+                await asyncio.sleep(0.1)
+                if worker.restarts:
+                    break
+            
+            assert worker.restarts == 1
+            assert await self.pool.detect("s1", frame) == (NO_HAND, False)
+        
+        self.run(scenario)
+    
+    def test_hung_worker_is_restarted(self):
+        """Test frames for a worker that stops answering without exiting time out and the worker is replaced."""
+        frame = blank_jpeg()
+        self.pool = DetectorPool(workers=1, slots=2, slot_bytes=64 * 1024, timeout_ms=500)
+        
+        async def scenario():
+            await self.pool.detect("s1", frame)
+            worker = self.pool.worker_for("s1")
+            pid = worker.process.pid
+            os.kill(pid, signal.SIGSTOP)
+            
+            # More frames than slots: the last ones never get a slot
+            results = await asyncio.wait_for(
+                asyncio.gather(*[self.pool.detect("s1", frame) for _ in range(4)]), timeout=5
+            )
+            
+            assert results == [(NO_HAND, False)] * 4
+            assert worker.restarts == 1 and worker.process.pid != pid
+            assert len(worker.free_slots) == 2 and not worker.abandoned
+            assert await self.pool.wait_ready(60)
+            assert await self.pool.detect("s1", frame) == (NO_HAND, False)
+            assert worker.processed == 2
+        
+        self.run(scenario)
+    
+    def test_landmarks_are_copied_out_of_slot(self):
+        """Test an answer's landmarks stay valid after the slot is reused."""
+        async def scenario():
+            worker = self.pool.workers[0]
+            future = asyncio.get_running_loop().create_future()
+            worker.pending[1] = future
+            worker.free_slots.remove(1)
+            await worker.slot_available.acquire()
+            worker.landmarks[1, :1] = 0.25
+            
+            self.pool._complete(0, worker.restarts, 1, 1, ["Right"], [0.9], False, ((), (), ()), ())
+            worker.landmarks[1] = 0.0
+            
+            (detected, landmarks, handedness, confidence), cached = await future
+            assert detected and handedness == ["Right"] and confidence == [0.9]
+            assert landmarks.shape == (1, 21, 3) and np.all(landmarks == 0.25)
+            assert 1 in worker.free_slots
+        
+        self.run(scenario)
@@ -0,0 +1,108 @@
+"""Tests for FrameDecoder."""
+
+import cv2
+import numpy as np
+import pytest
+from app.services.frame_decoder import FrameDecoder
+
+
+def make_jpeg(width: int = 640, height: int = 480) -> bytes:
+    """Solid red JPEG."""
+    image = np.zeros((height, width, 3), dtype=np.uint8)
+    image[..., 2] = 255  # BGR
+    ok, buffer = cv2.imencode(".jpg", image)
+    return buffer.tobytes()
+
+
+def hand_of_size(span: float) -> list:
+    """Landmarks whose bounding box is ``span`` of the frame width."""
+    return [[0.3 + span * i / 20, 0.5, 0.0] for i in range(21)]
+
+
+class TestFrameDecoder:
+    """Test cases for FrameDecoder."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.decoder = FrameDecoder(backend="cv2", max_reduction=4, min_side=120, min_hand_px=96)
+        self.data = make_jpeg()
+    
+    def test_decodes_rgb(self):
+        """Test frames come out as RGB."""
+        image = self.decoder.decode(self.data)
+        
+        assert image.shape == (480, 640, 3)
+        assert image[0, 0, 0] > 250 and image[0, 0, 2] < 5
+    
+    def test_first_frame_full_size(self):
+        """Test a new session starts at full resolution."""
+        image = self.decoder.decode(self.data, "s1")
+        
+        assert image.shape == (480, 640, 3)
+        assert self.decoder.sessions["s1"].source_shape == (480, 640)
+    
+    def test_reduction_follows_hand_size(self):
+        """Test the reduction keeps the hand above min_hand_px."""
+        self.decoder.decode(self.data, "s1")
+        
+        self.decoder.observe("s1", hand_of_size(0.7))  # 448 px
+        assert self.decoder.decode(self.data, "s1").shape == (120, 160, 3)
+        
+        self.decoder.observe("s1", hand_of_size(0.4))  # 256 px
+        assert self.decoder.decode(self.data, "s1").shape == (240, 320, 3)
+        
+        self.decoder.observe("s1", hand_of_size(0.1))  # 64 px
+        assert self.decoder.decode(self.data, "s1").shape == (480, 640, 3)
+        assert self.decoder.frames_by_reduction == {1: 2, 2: 1, 4: 1}
+    
+    def test_min_side_limits_reduction(self):
+        """Test frames are never decoded below min_side."""
+        decoder = FrameDecoder(backend="cv2", max_reduction=4, min_side=240, min_hand_px=0)
+        decoder.decode(self.data, "s1")
+        
+        assert decoder.decode(self.data, "s1").shape == (240, 320, 3)
+    
+    def test_max_reduction_one_disables(self):
+        """Test max_reduction=1 always decodes at full size."""
+        decoder = FrameDecoder(backend="cv2", max_reduction=1, min_side=0, min_hand_px=0)
+        for _ in range(3):
+            assert decoder.decode(self.data, "s1").shape == (480, 640, 3)
+    
+    def test_conversion_reuses_session_buffer(self):
+        """Test BGR decoding converts into the session's buffer."""
+        decoder = FrameDecoder(backend="cv2", max_reduction=1)
+        decoder.prepare()
+        decoder._cv2_rgb_flag = None
+        first = decoder.decode(self.data, "s1")
+        second = decoder.decode(self.data, "s1")
+        
+        assert second is first
+        assert first[0, 0, 0] > 250
+        assert decoder.decode(self.data) is not first
+    
+    def test_pillow_backend(self):
+        """Test the Pillow backend decodes and reduces like cv2."""
+        pytest.importorskip("PIL")
+        decoder = FrameDecoder(backend="pillow", max_reduction=2, min_side=0, min_hand_px=0)
+        
+        assert decoder.decode(self.data, "s1").shape == (480, 640, 3)
+        image = decoder.decode(self.data, "s1")
+        assert image.shape == (240, 320, 3)
+        assert image[0, 0, 0] > 250
+    
+    def test_invalid_data(self):
+        """Test undecodable data raises ValueError."""
+        with pytest.raises(ValueError):
+            self.decoder.decode(b"not an image", "s1")
+    
+    def test_unknown_backend(self):
+        """Test an unknown backend is rejected."""
+        with pytest.raises(ValueError):
+            FrameDecoder(backend="libjpeg")
+    
+    def test_clear_session(self):
+        """Test clearing a session drops its state."""
+        self.decoder.decode(self.data, "s1")
+        self.decoder.clear_session("s1")
+        
+        assert len(self.decoder) == 0
@@ -0,0 +1,122 @@
+"""Tests for frame scheduler."""
+
+import asyncio
+import pytest
+from app.services.frame_scheduler import FrameScheduler
+
+
+async def noop_handler(session_id, item):
+    """Frame handler that does nothing."""
+    pass
+
+
+class TestFrameScheduler:
+    """Test cases for FrameScheduler."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.dropped = []
+        self.scheduler = FrameScheduler(
+            noop_handler,
+            on_drop=lambda sid, item, reason: self.dropped.append(item),
+            quantum=1.0,
+            max_fps=0,
+            max_queue=4
+        )
+    
+    def drain(self):
+        """Pop every queued frame in scheduling order."""
+        order = []
+        while True:
+            picked = self.scheduler.next_item()
+            if picked is None:
+                return order
+            order.append(picked)
+    
+    def test_round_robin_between_sessions(self):
+        """Test that a busy session does not starve a quiet one."""
+        for i in range(4):
+            self.scheduler.submit("greedy", f"g{i}")
+        self.scheduler.submit("quiet", "q0")
+        
+        order = [item for _, item in self.drain()]
+        assert order.index("q0") == 1
+    
+    def test_weighted_sessions(self):
+        """Test that weight controls frames served per round."""
+        self.scheduler.configure_session("heavy", weight=2)
+        for i in range(4):
+            self.scheduler.submit("heavy", f"h{i}")
+            self.scheduler.submit("light", f"l{i}")
+        
+        sessions = [sid for sid, _ in self.drain()]
+        assert sessions[:3] == ["heavy", "heavy", "light"]
+    
+    def test_overflow_drops_oldest(self):
+        """Test that a full queue keeps the newest frames."""
+        for i in range(6):
+            self.scheduler.submit("s1", i)
+        
+        assert self.dropped == [0, 1]
+        assert [item for _, item in self.drain()] == [2, 3, 4, 5]
+        assert self.scheduler.get_stats()["dropped_overflow"] == 2
+    
+    def test_fps_cap(self):
+        """Test that frames beyond the FPS cap and its burst are rejected."""
+        scheduler = FrameScheduler(noop_handler, max_fps=10, max_queue=8, burst=2)
+        
+        assert scheduler.submit("s1", "a", now=0.0) is True
+        assert scheduler.submit("s1", "b", now=0.0) is True
+        assert scheduler.submit("s1", "c", now=0.05) is False
+        assert scheduler.submit("s1", "d", now=0.11) is True
+        assert scheduler.get_stats()["dropped_rate_limited"] == 1
+    
+    def test_fps_cap_tolerates_jitter(self):
+        """Test that a client sending at the cap keeps every frame despite uneven arrival."""
+        scheduler = FrameScheduler(noop_handler, max_fps=10, max_queue=8, burst=2)
+        arrivals = [0.0, 0.13, 0.17, 0.31, 0.38, 0.52, 0.59]
+        
+        assert all(scheduler.submit("s1", i, now=t) for i, t in enumerate(arrivals))
+        assert scheduler.get_stats()["dropped_rate_limited"] == 0
+    
+    def test_client_cannot_exceed_server_cap(self):
+        """Test that a requested FPS cap is clamped to the server default."""
+        scheduler = FrameScheduler(noop_handler, max_fps=15)
+        scheduler.configure_session("s1", max_fps=60)
+        
+        assert scheduler.queues["s1"].max_fps == 15
+    
+    def test_busy_session_is_skipped(self):
+        """Test that frames of a session in flight are not handed out."""
+        self.scheduler.submit("s1", "a")
+        self.scheduler.submit("s1", "b")
+        self.scheduler.queues["s1"].busy = True
+        
+        assert self.scheduler.next_item() is None
+    
+    def test_clear_session(self):
+        """Test that clearing a session drops its queued frames."""
+        self.scheduler.submit("s1", "a")
+        self.scheduler.submit("s2", "b")
+        self.scheduler.clear_session("s1")
+        
+        assert self.dropped == ["a"]
+        assert len(self.scheduler) == 1
+        assert self.drain() == [("s2", "b")]
+    
+    def test_worker_processes_frames(self):
+        """Test that the worker runs the handler for queued frames."""
+        handled = []
+        
+        async def handler(session_id, item):
+            handled.append((session_id, item))
+        
+        async def scenario():
+            scheduler = FrameScheduler(handler, max_fps=0)
+            scheduler.submit("s1", "a")
+            scheduler.submit("s2", "b")
+            await asyncio.sleep(0.01)
+            await scheduler.stop()
+        
+        asyncio.run(scenario())
+        assert handled == [("s1", "a"), ("s2", "b")]
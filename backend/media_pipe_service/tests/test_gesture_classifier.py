@@ -3,6 +3,32 @@
 import pytest
 import numpy as np
 from app.models.gesture_classifier import GestureClassifier
+from app.services.hand_detector import HandDetector
+
+# Finger patterns, thumb first, that _match_pattern labels with each hand shape
+SHAPES = {
+    "0": [False, False, False, False, False],
+    "2": [False, True, True, False, False],
+    "5": [True, True, True, True, True],
+    "A": [True, False, False, False, False],
+    "Y": [True, False, False, False, True],
+}
+
+
+def hand_shape(fingers: list, x: float) -> np.ndarray:
+    """Frame-coordinate landmarks of an upright hand with the given fingers extended."""
+    hand = np.zeros((21, 3), dtype=np.float32)
+    hand[0] = [x, 0.9, 0]
+    # Thumb: CMC, MCP, IP, then the tip away from or back across the palm
+    hand[1:4] = [[x - 0.05, 0.85, 0], [x - 0.07, 0.8, 0], [x - 0.09, 0.75, 0]]
+    hand[4] = [x - 0.12, 0.7, 0] if fingers[0] else [x, 0.78, 0]
+    for finger in range(1, 5):
+        column = x + (finger - 2.5) * 0.03
+        mcp = 4 * finger + 1
+        hand[mcp:mcp + 2] = [[column, 0.75, 0], [column, 0.7, 0]]
+        # Extended tips rise above the PIP joint, curled ones fold below it
+        hand[mcp + 2:mcp + 4] = [[column, 0.6, 0], [column, 0.55, 0]] if fingers[finger] else [[column, 0.72, 0], [column, 0.74, 0]]
+    return hand
 
 
 class TestGestureClassifier:
@@ -93,3 +119,33 @@ class TestGestureClassifier:
         for i in range(1, 21):
             assert isinstance(normalized[i], list)
             assert len(normalized[i]) == 3
+    
+    def test_classify_batch_matches_single(self):
+        """Test batched classification gives the per-hand results."""
+        rng = np.random.default_rng(0)
+        hands = rng.normal(size=(4, 21, 3)).astype(np.float32)
+        
+        results = self.classifier.classify_batch(hands)
+        
+        assert results == [self.classifier.classify(hand) for hand in hands]
+    
+    def test_two_hand_sign(self):
+        """Test a two-hand pattern needs both shapes and, if required, closeness."""
+        hand = np.zeros((21, 3), dtype=np.float32)
+        hand[9] = [0.0, -0.1, 0.0]  # Hand size 0.1
+        near = np.stack([hand, hand + [0.1, 0.0, 0.0]])
+        far = np.stack([hand, hand + [0.6, 0.0, 0.0]])
+        
+        assert self.classifier.classify_two_hands(near, [("A", 0.8), ("5", 0.9)]) == ("HELP", 0.8)
+        assert self.classifier.classify_two_hands(far, [("A", 0.8), ("5", 0.9)]) is None
+        assert self.classifier.classify_two_hands(far, [("Y", 0.8), ("Y", 0.9)]) == ("PLAY", 0.8)
+        assert self.classifier.classify_two_hands(near, [("A", 0.8), (None, 0.0)]) is None
+    
+    def test_every_two_hand_pattern_is_reachable(self):
+        """Test each two-hand sign is produced from hand shapes the classifier itself labels."""
+        for (left, right), (sign, _) in GestureClassifier.TWO_HAND_PATTERNS.items():
+            landmarks = np.stack([hand_shape(SHAPES[left], 0.4), hand_shape(SHAPES[right], 0.6)])
+            results = self.classifier.classify_batch(HandDetector.normalize_landmarks(landmarks))
+            
+            assert [result[0] for result in results] == [left, right]
+            assert self.classifier.classify_two_hands(landmarks, results)[0] == sign
@@ -0,0 +1,67 @@
+"""Tests for IdleSampler."""
+
+from app.services.idle_sampler import IdleSampler, IDLE, ACTIVE
+
+
+class TestIdleSampler:
+    """Test cases for IdleSampler."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.sampler = IdleSampler(enabled=True, idle_after_ms=1000, sample_every=3)
+    
+    def go_idle(self):
+        self.sampler.observe("s1", True, now=0.0)
+        return self.sampler.observe("s1", False, now=1.5)
+    
+    def test_active_processes_every_frame(self):
+        """Test frames are processed at full rate while a hand is seen."""
+        self.sampler.observe("s1", True, now=0.0)
+        
+        assert all(self.sampler.should_process("s1") for _ in range(10))
+    
+    def test_goes_idle_after_timeout(self):
+        """Test a session goes idle only after idle_after_ms without a hand."""
+        self.sampler.observe("s1", True, now=0.0)
+        
+        assert self.sampler.observe("s1", False, now=0.5) is None
+        assert self.sampler.observe("s1", False, now=1.0) == IDLE
+        assert self.sampler.observe("s1", False, now=1.5) is None
+        assert self.sampler.is_idle("s1")
+    
+    def test_idle_samples_every_nth_frame(self):
+        """Test only every Nth frame is processed while idle."""
+        self.go_idle()
+        
+        processed = [self.sampler.should_process("s1") for _ in range(9)]
+        
+        assert processed.count(True) == 3
+        assert self.sampler.frames_sampled_out == 6
+    
+    def test_hand_resumes_full_rate(self):
+        """Test a detected hand immediately returns the session to full rate."""
+        self.go_idle()
+        
+        assert self.sampler.observe("s1", True, now=2.0) == ACTIVE
+        assert not self.sampler.is_idle("s1")
+        assert all(self.sampler.should_process("s1") for _ in range(5))
+    
+    def test_new_session_starts_active(self):
+        """Test a session without a hand yet is not idle straight away."""
+        assert self.sampler.observe("s2", False, now=10.0) is None
+        assert self.sampler.should_process("s2")
+    
+    def test_disabled(self):
+        """Test a disabled sampler never throttles."""
+        sampler = IdleSampler(enabled=False, idle_after_ms=0)
+        
+        assert sampler.observe("s1", False, now=5.0) is None
+        assert sampler.should_process("s1")
+    
+    def test_clear_session(self):
+        """Test clearing a session drops its state."""
+        self.go_idle()
+        self.sampler.clear_session("s1")
+        
+        assert len(self.sampler) == 0
+        assert self.sampler.should_process("s1")
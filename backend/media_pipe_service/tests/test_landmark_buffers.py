@@ -0,0 +1,80 @@
+"""Tests for the ndarray landmark path."""
+
+import numpy as np
+from mediapipe.framework.formats import landmark_pb2
+from app.services.hand_detector import HandDetector
+from app.services.landmark_buffers import LandmarkBuffers
+
+
+def make_landmarks() -> list:
+    """Hand-like 21x3 landmarks."""
+    return [[0.5 + 0.01 * i, 0.8 - 0.02 * i, -0.01 * (i % 3)] for i in range(21)]
+
+
+class TestLandmarkBuffers:
+    """Test cases for LandmarkBuffers and in-place normalization."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.buffers = LandmarkBuffers()
+    
+    def test_buffer_is_reused(self):
+        """Test a session gets the same preallocated array every time."""
+        buffer = self.buffers.get("s1")
+        
+        assert buffer.shape == (1, 21, 3) and buffer.dtype == np.float32
+        assert self.buffers.get("s1") is buffer
+        assert self.buffers.get("s2") is not buffer
+        assert self.buffers.get("s1", hands=2).shape == (2, 21, 3)
+    
+    def test_normalize_into_buffer(self):
+        """Test normalization writes into the given buffer."""
+        landmarks = np.array([make_landmarks()], dtype=np.float32)
+        buffer = self.buffers.get("s1")
+        
+        normalized = HandDetector.normalize_landmarks(landmarks, out=buffer)
+        
+        assert normalized is buffer
+        np.testing.assert_allclose(normalized[0, 0], [0, 0, 0])
+        np.testing.assert_allclose(np.linalg.norm(normalized[0, 9]), 1.0, rtol=1e-6)
+    
+    def test_normalize_each_hand(self):
+        """Test every hand is normalized to its own wrist and scale."""
+        hand = np.array(make_landmarks(), dtype=np.float32)
+        hands = np.stack([hand, hand * 2 + 0.1])
+        
+        normalized = HandDetector.normalize_landmarks(hands)
+        
+        np.testing.assert_allclose(normalized[0], normalized[1], atol=1e-5)
+        np.testing.assert_allclose(normalized[0], HandDetector.normalize_landmarks(hand), atol=1e-6)
+    
+    def test_normalize_accepts_lists(self):
+        """Test list input gives the same result as an array."""
+        landmarks = make_landmarks()
+        
+        np.testing.assert_allclose(
+            HandDetector.normalize_landmarks(landmarks),
+            HandDetector.normalize_landmarks(np.array(landmarks, dtype=np.float32))
+        )
+    
+    def test_landmarks_to_array(self):
+        """Test MediaPipe landmark lists become one (H, 21, 3) float32 array."""
+        hands = []
+        for offset in (0.0, 0.2):
+            hand = landmark_pb2.NormalizedLandmarkList()
+            for x, y, z in make_landmarks():
+                hand.landmark.add(x=x + offset, y=y, z=z)
+            hands.append(hand)
+        
+        points = HandDetector.landmarks_to_array(hands)
+        
+        assert points.shape == (2, 21, 3) and points.dtype == np.float32
+        np.testing.assert_allclose(points[0], make_landmarks(), rtol=1e-6)
+        np.testing.assert_allclose(points[1, :, 0], np.array(make_landmarks())[:, 0] + 0.2, rtol=1e-6)
+    
+    def test_clear_session(self):
+        """Test clearing a session releases its buffer."""
+        self.buffers.get("s1")
+        self.buffers.clear_session("s1")
+        
+        assert len(self.buffers) == 0
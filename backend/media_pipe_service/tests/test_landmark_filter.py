@@ -0,0 +1,105 @@
+"""Tests for LandmarkFilter."""
+
+import numpy as np
+
+from app.services.landmark_filter import LandmarkFilter
+
+
+def make_hands(hands=1, seed=0):
+    """Random (hands, 21, 3) float32 landmarks."""
+    return np.random.default_rng(seed).uniform(-1, 1, (hands, 21, 3)).astype(np.float32)
+
+
+class TestLandmarkFilter:
+    """Test cases for LandmarkFilter."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.filter = LandmarkFilter(enabled=True, min_cutoff=1.0, beta=0.5, derivative_cutoff=1.0, reset_ms=500)
+    
+    def run(self, frames, keys=None, fps=30.0):
+        out = []
+        for i, frame in enumerate(frames):
+            out.append(self.filter.apply("s1", frame.copy(), now=i / fps, keys=keys).copy())
+        return np.stack(out)
+    
+    def test_first_frame_passes_through(self):
+        """Test a new session's first frame is returned unchanged, in place."""
+        frame = make_hands()
+        expected = frame.copy()
+        
+        result = self.filter.apply("s1", frame, now=0.0)
+        
+        assert result is frame
+        np.testing.assert_array_equal(result, expected)
+    
+    def test_jitter_is_smoothed(self):
+        """Test noise on a still hand is strongly reduced."""
+        rng = np.random.default_rng(1)
+        still = make_hands()
+        frames = [still + rng.normal(0, 0.02, still.shape).astype(np.float32) for _ in range(90)]
+        
+        filtered = self.run(frames)
+        
+        raw_std = np.std(np.stack(frames)[30:], axis=0).mean()
+        filtered_std = np.std(filtered[30:], axis=0).mean()
+        assert filtered_std < raw_std / 3
+    
+    def test_jitter_does_not_flip_threshold(self):
+        """Test a tip hovering just above its PIP stops crossing it every few frames."""
+        rng = np.random.default_rng(2)
+        frames = []
+        for _ in range(90):
+            hand = np.zeros((1, 21, 3), dtype=np.float32)
+            hand[0, 6, 1] = -1.0
+            hand[0, 8, 1] = -1.03 + rng.normal(0, 0.03)
+            frames.append(hand)
+        
+        def flips(sequence):
+            extended = sequence[:, 0, 8, 1] < sequence[:, 0, 6, 1]
+            return int(np.count_nonzero(extended[1:] != extended[:-1]))
+        
+        assert flips(self.run(frames)[15:]) < flips(np.stack(frames)[15:]) / 4
+    
+    def test_speed_reduces_lag(self):
+        """Test the speed term lets a moving hand through with less lag."""
+        frames = [make_hands() + np.float32(0.1 * i) for i in range(30)]
+        still_tuned = LandmarkFilter(enabled=True, min_cutoff=1.0, beta=0.0, derivative_cutoff=1.0, reset_ms=500)
+        
+        adaptive_lag = np.abs(self.run(frames)[-1] - frames[-1]).mean()
+        fixed_lag = np.abs(
+            [still_tuned.apply("s1", f.copy(), now=i / 30) for i, f in enumerate(frames)][-1] - frames[-1]
+        ).mean()
+        assert adaptive_lag < fixed_lag / 2
+    
+    def test_resets_on_gap_and_hand_change(self):
+        """Test the filter restarts after a gap, a new hand count or new handedness."""
+        self.filter.apply("s1", make_hands(seed=0), now=0.0, keys=["Left"])
+        
+        cases = [
+            (make_hands(seed=1), 1.0, ["Left"]),  # gap above reset_ms
+            (make_hands(2, seed=2), 1.03, ["Left", "Right"]),  # hand count
+            (make_hands(2, seed=3), 1.06, ["Right", "Left"]),  # hands swapped
+        ]
+        for frame, now, keys in cases:
+            expected = frame.copy()
+            np.testing.assert_array_equal(self.filter.apply("s1", frame, now=now, keys=keys), expected)
+        assert self.filter.get_stats()["resets"] == 3
+    
+    def test_disabled_is_passthrough(self):
+        """Test a disabled filter keeps no state and changes nothing."""
+        disabled = LandmarkFilter(enabled=False)
+        frames = [make_hands(seed=i) for i in range(3)]
+        
+        for i, frame in enumerate(frames):
+            np.testing.assert_array_equal(disabled.apply("s1", frame.copy(), now=i / 30), frame)
+        assert len(disabled) == 0
+    
+    def test_clear_session(self):
+        """Test sessions can be dropped."""
+        self.filter.apply("a", make_hands(), now=0.0)
+        self.filter.apply("b", make_hands(), now=0.0)
+        
+        self.filter.clear_session("a")
+        
+        assert len(self.filter) == 1
@@ -0,0 +1,145 @@
+"""Tests for the binary landmark log."""
+
+import os
+import tempfile
+import numpy as np
+import pytest
+from app.services.landmark_log import (
+    LandmarkLogWriter, LandmarkLogReader, replay
+)
+from app.services.hand_detector import HandDetector
+from app.services.sign_buffer import SignBuffer
+
+
+def make_landmarks(seed: int) -> list:
+    """Random 21x3 landmarks."""
+    return np.random.default_rng(seed).random((21, 3)).tolist()
+
+
+class TestLandmarkLog:
+    """Test cases for the landmark log writer, reader and replay."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "test.lmlog")
+    
+    def teardown_method(self):
+        self.tmpdir.cleanup()
+    
+    def test_round_trip(self):
+        """Test frames come back as written, chunked per session."""
+        writer = LandmarkLogWriter(self.path, dtype="float32", chunk_frames=4)
+        for i in range(10):
+            writer.append("s1", 100.0 + i, make_landmarks(i), "Right", "A" if i % 2 else None, 0.8)
+        writer.append("s2", 200.0, make_landmarks(99), "Left", "B", 0.9)
+        writer.close()
+        
+        reader = LandmarkLogReader(self.path)
+        chunks = list(reader)
+        
+        assert [len(c) for c in chunks if c.session_id == "s1"] == [4, 4, 2]
+        assert reader.sessions() == ["s1", "s2"]
+        assert reader.frame_count() == 11
+        first = chunks[0]
+        np.testing.assert_array_equal(first.landmarks[1], np.float32(make_landmarks(1)))
+        assert first.timestamps[3] == 103.0
+        assert first.sign(0) is None and first.sign(1) == "A"
+        assert first.handedness[0] == 1
+        s2 = [c for c in chunks if c.session_id == "s2"][0]
+        assert s2.sign(0) == "B" and s2.handedness[0] == 0
+    
+    def test_views_are_zero_copy(self):
+        """Test reader arrays are views into the mapped file."""
+        writer = LandmarkLogWriter(self.path, chunk_frames=8)
+        for i in range(8):
+            writer.append("s1", float(i), make_landmarks(i))
+        writer.close()
+        
+        chunk = next(iter(LandmarkLogReader(self.path)))
+        
+        assert chunk.landmarks.dtype == np.float16
+        assert chunk.landmarks.shape == (8, 21, 3)
+        assert isinstance(chunk.landmarks.base, np.ndarray)
+        assert not chunk.landmarks.flags.writeable
+    
+    def test_float16_is_compact(self):
+        """Test float16 frames take a fraction of their JSON size."""
+        import json
+        writer = LandmarkLogWriter(self.path, chunk_frames=256)
+        frames = [make_landmarks(i) for i in range(256)]
+        for i, landmarks in enumerate(frames):
+            writer.append("s1", float(i), landmarks, "Right", "A", 0.9)
+        writer.close()
+        
+        json_size = sum(len(json.dumps(f)) for f in frames)
+        assert os.path.getsize(self.path) * 5 < json_size
+    
+    def test_truncated_chunk_is_ignored(self):
+        """Test a partially written final chunk does not break reading."""
+        writer = LandmarkLogWriter(self.path, chunk_frames=4)
+        for i in range(8):
+            writer.append("s1", float(i), make_landmarks(i))
+        writer.close()
+        with open(self.path, "r+b") as f:
+            f.truncate(os.path.getsize(self.path) - 10)
+        
+        reader = LandmarkLogReader(self.path)
+        
+        assert reader.frame_count() == 4
+        assert reader.truncated
+    
+    def test_append_to_existing_log(self):
+        """Test reopening a log appends chunks after the existing ones."""
+        for start in (0, 5):
+            writer = LandmarkLogWriter(self.path)
+            for i in range(start, start + 5):
+                writer.append("s1", float(i), make_landmarks(i))
+            writer.close()
+        
+        assert LandmarkLogReader(self.path).frame_count() == 10
+        with pytest.raises(ValueError):
+            LandmarkLogWriter(self.path, dtype="float32")
+    
+    def test_replay_normalizes_like_detector(self):
+        """Test replay feeds the classifier what HandDetector.normalize_landmarks gives live."""
+        frames = [make_landmarks(i) for i in range(3)]
+        seen = []
+        
+        class Classifier:
+            def classify(self, landmarks):
+                seen.append(np.array(landmarks))
+                return None, 0.0
+        
+        writer = LandmarkLogWriter(self.path, dtype="float32")
+        for i, frame in enumerate(frames):
+            writer.append("s1", float(i), frame)
+        writer.close()
+        replay(LandmarkLogReader(self.path), Classifier(), SignBuffer())
+        
+        expected = [HandDetector.normalize_landmarks(frame) for frame in frames]
+        np.testing.assert_allclose(seen, expected, atol=1e-5)
+    
+    def test_replay_commits_on_recorded_timeout(self):
+        """Test replay uses recorded timestamps for debounce and commits."""
+        signs = ["A", "B", "C"]
+        
+        class Classifier:
+            def __init__(self):
+                self.calls = 0
+            
+            def classify(self, landmarks):
+                sign = signs[self.calls % 3]
+                self.calls += 1
+                return sign, 0.9
+        
+        writer = LandmarkLogWriter(self.path, chunk_frames=4)
+        # Three signs, a 5 s pause (> commit timeout), then three more
+        for i, ts in enumerate([0.0, 0.6, 1.2, 6.2, 6.8, 7.4]):
+            writer.append("s1", ts, make_landmarks(i))
+        writer.close()
+        
+        result = replay(LandmarkLogReader(self.path), Classifier(), SignBuffer())
+        
+        assert result.frames == 6
+        assert result.sequences == [("s1", ["A", "B", "C"]), ("s1", ["A", "B", "C"])]
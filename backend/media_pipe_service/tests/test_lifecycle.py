@@ -0,0 +1,128 @@
+"""Tests for Lifecycle."""
+
+import asyncio
+import time
+
+from app.lifecycle import Lifecycle, FAILED, READY, STARTING
+
+
+class FakeDetector:
+    """Stands in for HandDetector; counts warm-ups."""
+    
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.warm_ups = 0
+    
+    def warm_up(self) -> float:
+        if self.fail:
+            raise RuntimeError("no model")
+        self.warm_ups += 1
+        return 0.01
+
+
+class FakePool:
+    """Stands in for DetectorPool."""
+    
+    def __init__(self, becomes_ready: bool = True):
+        self.becomes_ready = becomes_ready
+        self.started = False
+    
+    def start(self):
+        self.started = True
+    
+    async def wait_ready(self):
+        return self.becomes_ready
+
+
+class TestLifecycle:
+    """Test cases for Lifecycle."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.created = []
+        self.lifecycle = Lifecycle(self.create_detector, warm_up=True)
+    
+    def create_detector(self, fail=False):
+        detector = FakeDetector(fail)
+        self.created.append(detector)
+        return detector
+    
+    def test_not_ready_before_start(self):
+        """Test nothing is created or ready until start-up runs."""
+        assert self.lifecycle.state == STARTING
+        assert not self.lifecycle.ready
+        assert self.created == []
+    
+    def test_start_warms_up_then_ready(self):
+        """Test start-up creates the detector once and warms it up before reporting ready."""
+        asyncio.run(self.lifecycle.start())
+        
+        assert self.lifecycle.ready
+        assert len(self.created) == 1
+        assert self.created[0].warm_ups == 1
+        assert self.lifecycle.detector is self.created[0]
+        stats = self.lifecycle.get_stats()
+        assert stats["state"] == READY
+        assert stats["warmup_ms"] == 10.0
+        assert stats["ready_ms"] is not None
+    
+    def test_warm_up_disabled(self):
+        """Test the detector is still created, but no synthetic frame is run."""
+        lifecycle = Lifecycle(self.create_detector, warm_up=False)
+        
+        asyncio.run(lifecycle.start())
+        
+        assert lifecycle.ready
+        assert self.created[0].warm_ups == 0
+        assert lifecycle.get_stats()["warmup_ms"] is None
+    
+    def test_failed_warm_up_is_not_ready(self):
+        """Test a failing warm-up leaves the service unready with the error recorded."""
+        lifecycle = Lifecycle(lambda: self.create_detector(fail=True), warm_up=True)
+        
+        asyncio.run(lifecycle.start())
+        
+        assert not lifecycle.ready
+        assert lifecycle.state == FAILED
+        assert "no model" in lifecycle.error
+    
+    def test_detector_created_lazily_without_start(self):
+        """Test tools that skip start-up still get a detector on first use."""
+        detector = self.lifecycle.detector
+        
+        assert detector is self.lifecycle.detector
+        assert len(self.created) == 1
+        assert self.lifecycle.get_stats()["detector_init_ms"] is not None
+        assert not self.lifecycle.ready
+    
+    def test_pool_start(self):
+        """Test with a pool, readiness waits for its workers and no in-process detector is made."""
+        pool = FakePool()
+        lifecycle = Lifecycle(self.create_detector, pool=pool, warm_up=True)
+        
+        asyncio.run(lifecycle.start())
+        
+        assert pool.started
+        assert lifecycle.ready
+        assert self.created == []
+    
+    def test_pool_not_ready(self):
+        """Test workers that never report ready fail start-up."""
+        lifecycle = Lifecycle(self.create_detector, pool=FakePool(becomes_ready=False))
+        
+        asyncio.run(lifecycle.start())
+        
+        assert lifecycle.state == FAILED
+    
+    def test_first_frame_recorded_once(self):
+        """Test only the first processed frame sets the time-to-first-frame."""
+        self.lifecycle.record_import(time.perf_counter() - 1.0)
+        
+        self.lifecycle.frame_processed(time.perf_counter() - 0.05)
+        first = self.lifecycle.get_stats()
+        self.lifecycle.frame_processed(time.perf_counter())
+        
+        assert first["import_ms"] >= 1000
+        assert first["time_to_first_frame_ms"] >= 1000
+        assert first["first_frame_latency_ms"] >= 50
+        assert self.lifecycle.get_stats()["time_to_first_frame_ms"] == first["time_to_first_frame_ms"]
@@ -0,0 +1,95 @@
+"""Tests for metrics registry."""
+
+import asyncio
+import pytest
+from app.metrics import MetricsRegistry
+
+
+class TestMetricsRegistry:
+    """Test cases for MetricsRegistry."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.registry = MetricsRegistry("test")
+    
+    def test_counter_render(self):
+        """Test counter exposition."""
+        counter = self.registry.counter("frames_total", "Frames seen")
+        counter.inc()
+        counter.inc(2)
+        
+        text = self.registry.render()
+        assert "# TYPE test_frames_total counter" in text
+        assert "test_frames_total 3" in text
+    
+    def test_same_metric_returned(self):
+        """Test that metrics are looked up by name and labels."""
+        a = self.registry.counter("drops_total", "Drops", {"reason": "x"})
+        b = self.registry.counter("drops_total", "Drops", {"reason": "x"})
+        c = self.registry.counter("drops_total", "Drops", {"reason": "y"})
+        
+        assert a is b
+        assert a is not c
+    
+    def test_gauge_callback(self):
+        """Test that callback gauges are read at render time."""
+        value = {"n": 1}
+        self.registry.gauge("sessions", "Sessions", callback=lambda: value["n"])
+        value["n"] = 7
+        
+        assert "test_sessions 7" in self.registry.render()
+    
+    def test_histogram_buckets(self):
+        """Test cumulative histogram buckets."""
+        histogram = self.registry.histogram("latency_seconds", "Latency")
+        histogram.observe(0.0002)
+        histogram.observe(0.003)
+        histogram.observe(100)
+        
+        text = self.registry.render()
+        assert 'test_latency_seconds_bucket{le="0.00025"} 1' in text
+        assert 'test_latency_seconds_bucket{le="0.005"} 2' in text
+        assert 'test_latency_seconds_bucket{le="+Inf"} 3' in text
+        assert "test_latency_seconds_count 3" in text
+    
+    def test_histogram_take_and_merge(self):
+        """Test observations taken from one histogram are added to another."""
+        source = MetricsRegistry("worker").histogram("latency_seconds", "Latency")
+        source.observe(0.0002)
+        source.observe(0.003)
+        target = self.registry.histogram("latency_seconds", "Latency")
+        target.observe(100)
+        
+        target.merge(*source.take())
+        
+        assert source.count == 0 and source.sum == 0.0
+        text = self.registry.render()
+        assert 'test_latency_seconds_bucket{le="0.005"} 2' in text
+        assert "test_latency_seconds_count 3" in text
+    
+    def test_timed_records_stage(self):
+        """Test that the timing decorator records into the stage histogram."""
+        @self.registry.timed("work")
+        def work():
+            return 42
+        
+        assert work() == 42
+        assert self.registry.stage("work").count == 1
+    
+    def test_timed_async(self):
+        """Test timing of coroutine functions."""
+        @self.registry.timed("async_work")
+        async def work():
+            return 1
+        
+        assert asyncio.run(work()) == 1
+        assert self.registry.stage("async_work").count == 1
+    
+    def test_timed_disabled_returns_function(self):
+        """Test that disabled metrics leave functions unwrapped."""
+        registry = MetricsRegistry("test", enabled=False)
+        
+        def work():
+            return 42
+        
+        assert registry.timed("work")(work) is work
@@ -0,0 +1,92 @@
+"""Tests for MotionGate."""
+
+import numpy as np
+from app.services.motion_gate import MotionGate
+
+
+HAND = [[0.4 + 0.01 * i, 0.5, 0.0] for i in range(21)]
+
+
+def make_frame(value: int = 100) -> np.ndarray:
+    """Uniform RGB frame."""
+    return np.full((240, 320, 3), value, dtype=np.uint8)
+
+
+class TestMotionGate:
+    """Test cases for MotionGate."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.gate = MotionGate(enabled=True, threshold=2.0, max_landmark_speed=0.01, max_skip_ms=500)
+        self.result = (True, HAND, "Right", 0.9)
+    
+    def detect(self, frame, now, result=None):
+        """Run a frame through the gate, recording a fresh result on a miss."""
+        cached = self.gate.check("s1", frame, now=now)
+        if cached is not None:
+            return cached
+        self.gate.record("s1", result or self.result, now=now)
+        return None
+    
+    def test_first_frame_is_detected(self):
+        """Test a session's first frame always runs detection."""
+        assert self.gate.check("s1", make_frame(), now=0.0) is None
+        assert not self.gate.is_cached("s1")
+    
+    def test_static_frame_reuses_result(self):
+        """Test an unchanged frame returns the previous detection."""
+        self.detect(make_frame(), 0.0)
+        
+        cached = self.detect(make_frame(), 0.1)
+        
+        assert cached == self.result
+        assert self.gate.is_cached("s1")
+        assert self.gate.frames_skipped == 1
+    
+    def test_changed_frame_is_detected(self):
+        """Test a frame that differs from the reference runs detection."""
+        self.detect(make_frame(100), 0.0)
+        
+        assert self.detect(make_frame(120), 0.1) is None
+        assert not self.gate.is_cached("s1")
+    
+    def test_slow_drift_compares_with_detected_frame(self):
+        """Test small changes accumulate against the last detected frame."""
+        self.detect(make_frame(100), 0.0)
+        
+        assert self.detect(make_frame(101), 0.1) is not None
+        assert self.detect(make_frame(102), 0.2) is None
+    
+    def test_forced_after_max_skip(self):
+        """Test detection runs again once max_skip_ms has passed."""
+        self.detect(make_frame(), 0.0)
+        assert self.detect(make_frame(), 0.3) is not None
+        
+        assert self.detect(make_frame(), 0.6) is None
+        assert self.gate.forced_detections == 1
+    
+    def test_moving_hand_is_not_skipped(self):
+        """Test frames are detected while landmarks were moving."""
+        moved = (True, [[x + 0.05, y, z] for x, y, z in HAND], "Right", 0.9)
+        self.detect(make_frame(), 0.0)
+        self.gate.check("s1", make_frame(120), now=0.1)
+        self.gate.record("s1", moved, now=0.1)
+        
+        assert self.detect(make_frame(120), 0.2) is None
+    
+    def test_disabled(self):
+        """Test a disabled gate never reuses results."""
+        gate = MotionGate(enabled=False)
+        for now in (0.0, 0.1):
+            assert gate.check("s1", make_frame(), now=now) is None
+            gate.record("s1", self.result, now=now)
+        
+        assert gate.get_stats()["frames_checked"] == 0
+    
+    def test_clear_session(self):
+        """Test clearing a session forgets its reference frame."""
+        self.detect(make_frame(), 0.0)
+        self.gate.clear_session("s1")
+        
+        assert len(self.gate) == 0
+        assert self.gate.check("s1", make_frame(), now=0.1) is None
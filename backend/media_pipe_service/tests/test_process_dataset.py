@@ -0,0 +1,74 @@
+"""Tests for the offline dataset processing script."""
+
+import importlib.util
+import os
+import subprocess
+import sys
+
+import cv2
+import numpy as np
+
+SCRIPT = os.path.join(os.path.dirname(__file__), "..", "scripts", "process_dataset.py")
+
+
+def load_script():
+    """Import the script as a module."""
+    spec = importlib.util.spec_from_file_location("process_dataset", SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def write_video(path: str, frames: int):
+    """Write a short video of plain gray frames."""
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 10.0, (64, 48))
+    for i in range(frames):
+        writer.write(np.full((48, 64, 3), 100 + i, np.uint8))
+    writer.release()
+
+
+def run_script(*args) -> str:
+    result = subprocess.run([sys.executable, SCRIPT, *args], capture_output=True, text=True, timeout=300)
+    assert result.returncode == 0, result.stderr
+    return result.stdout
+
+
+class TestProcessDataset:
+    """Test cases for process_dataset.py."""
+    
+    def test_end_to_end(self, tmp_path):
+        """Test a tiny dataset of labeled images and a video is processed, merged and resumed."""
+        for label in ("A", "B"):
+            os.makedirs(tmp_path / "dataset" / label)
+            cv2.imwrite(str(tmp_path / "dataset" / label / "0.png"), np.full((48, 64, 3), 128, np.uint8))
+        write_video(str(tmp_path / "clip.avi"), frames=5)
+        output = str(tmp_path / "out.npz")
+        inputs = [str(tmp_path / "dataset"), str(tmp_path / "clip.avi")]
+        options = ["-o", output, "--workers", "2", "--segment-frames", "3", "--image-chunk", "1"]
+        
+        stdout = run_script(*inputs, *options)
+        
+        assert "4 units, 0 already done" in stdout
+        with np.load(output) as result:
+            assert len(result["frame_index"]) == 7
+            assert list(result["label"][:2]) == ["A", "B"]
+            assert list(result["frame_index"][2:]) == [0, 1, 2, 3, 4]
+            assert not result["hand_detected"].any()
+            assert np.isnan(result["landmarks"]).all()
+        
+        stdout = run_script(*inputs, *options, "--resume")
+        assert "4 units, 4 already done" in stdout
+    
+    def test_video_segments_do_not_share_tracking(self):
+        """Test each video segment gets a fresh detector while image chunks share a static one."""
+        script = load_script()
+        images = script.WorkUnit("dataset", "images", 0, 1, 1, ["dataset/A/0.png"])
+        first = script.WorkUnit("clip.avi", "video", 0, 3, 1)
+        second = script.WorkUnit("clip.avi", "video", 3, 5, 1)
+        
+        try:
+            assert script._get_detector(images) is script._get_detector(images)
+            assert script._get_detector(first) is not script._get_detector(second)
+        finally:
+            script._image_detector.close()
+            script._video_detector.close()
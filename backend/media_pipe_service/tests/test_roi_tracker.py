@@ -0,0 +1,124 @@
+"""Tests for ROI tracking."""
+
+import numpy as np
+from app.services.roi_tracker import ROITracker, ROI
+
+
+HAND = np.array([[0.40 + 0.01 * (i % 5), 0.50 + 0.01 * (i // 5), -0.02] for i in range(21)])
+
+
+class FakeDetector:
+    """
+    Finds a hand at fixed full-frame coordinates if it lies inside the
+    image it is given. The crop it receives is the tracker's current ROI.
+    """
+    
+    def __init__(self, tracker, frame_shape, hand=HAND):
+        self.tracker = tracker
+        self.frame_shape = frame_shape
+        self.hand = hand
+        self.inputs = []
+    
+    def detect_image(self, image):
+        self.inputs.append(image.shape)
+        height, width = self.frame_shape[:2]
+        roi = self.tracker.rois.get("s1") if self.tracker.enabled else None
+        roi = roi or ROI(0, 0, width, height)
+        points = self.hand.copy()
+        points[:, 0] = (points[:, 0] * width - roi.x0) / roi.width
+        points[:, 1] = (points[:, 1] * height - roi.y0) / roi.height
+        points[:, 2] = points[:, 2] * width / roi.width
+        if points[:, :2].min() < 0 or points[:, :2].max() > 1:
+            return False, None, None, 0.0
+        return True, points.tolist(), "Right", 0.9
+
+
+class TestROITracker:
+    """Test cases for ROITracker."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.tracker = ROITracker(enabled=True, expand=2.0, min_size=64, max_size=0)
+        self.image = np.zeros((480, 640, 3), dtype=np.uint8)
+        self.detector = FakeDetector(self.tracker, self.image.shape)
+    
+    def detect(self):
+        return self.tracker.detect(self.detector, "s1", self.image)
+    
+    def test_first_frame_is_full(self):
+        """Test a session without a hand is detected on the full frame."""
+        detected, landmarks, _, _ = self.detect()
+        
+        assert detected
+        assert self.detector.inputs == [(480, 640, 3)]
+        assert "s1" in self.tracker.rois
+    
+    def test_crops_to_previous_hand(self):
+        """Test later frames run on a crop and landmarks map back to the full frame."""
+        self.detect()
+        detected, landmarks, _, _ = self.detect()
+        
+        assert detected
+        height, width = self.detector.inputs[-1][:2]
+        assert width * height < 0.2 * 640 * 480
+        np.testing.assert_allclose(landmarks, HAND, atol=1e-6)
+        assert self.tracker.get_stats()["pixel_ratio"] < 0.7
+    
+    def test_lost_hand_falls_back_to_full_frame(self):
+        """Test a miss in the crop retries the same frame at full size."""
+        self.detect()
+        self.detector.hand = HAND + [0.3, -0.3, 0.0]  # Hand jumped out of the box
+        
+        detected, landmarks, _, _ = self.detect()
+        
+        assert detected
+        assert self.detector.inputs[-1] == (480, 640, 3)
+        assert self.tracker.fallbacks == 1
+        np.testing.assert_allclose(landmarks, self.detector.hand, atol=1e-6)
+        assert "s1" in self.tracker.rois
+    
+    def test_no_hand_clears_roi(self):
+        """Test the ROI is dropped when no hand is found at all."""
+        self.detect()
+        self.detector.hand = HAND + [1.0, 0.0, 0.0]  # Off screen
+        
+        detected, _, _, _ = self.detect()
+        
+        assert not detected
+        assert len(self.tracker) == 0
+    
+    def test_large_hand_uses_full_frame(self):
+        """Test no ROI is kept when the box would cover most of the frame."""
+        landmarks = [[0.1, 0.1, 0], [0.9, 0.9, 0]] + [[0.5, 0.5, 0]] * 19
+        
+        assert self.tracker.roi_from_landmarks(landmarks, self.image.shape) is None
+    
+    def test_downscale_large_crops(self):
+        """Test crops larger than max_size are resized."""
+        tracker = ROITracker(enabled=True, max_size=64)
+        crop = tracker.crop(self.image, ROI(0, 0, 200, 100))
+        
+        assert crop.shape == (32, 64, 3)
+    
+    def test_disabled_always_full_frame(self):
+        """Test a disabled tracker never crops."""
+        self.tracker.enabled = False
+        for _ in range(3):
+            self.detect()
+        
+        assert self.detector.inputs == [(480, 640, 3)] * 3
+        assert len(self.tracker) == 0
+    
+    def test_roi_follows_decode_resolution(self):
+        """Test the ROI is rescaled when the frame is decoded smaller."""
+        roi = ROI(100, 80, 300, 280, 640, 480)
+        
+        assert roi.fit((240, 320, 3)) == ROI(50, 40, 150, 140, 320, 240)
+        assert roi.fit((480, 640, 3)) is roi
+    
+    def test_clear_session(self):
+        """Test clearing a session forgets its ROI."""
+        self.detect()
+        self.tracker.clear_session("s1")
+        
+        assert len(self.tracker) == 0
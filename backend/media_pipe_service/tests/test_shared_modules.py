@@ -0,0 +1,56 @@
+"""
+Tests that modules copied between the two services stay in sync.
+
+Each service is built from its own directory, so shared helpers are
+copied rather than imported. Everything but the imports and the
+service-specific names below must be identical in both copies.
+"""
+
+import ast
+import os
+import pytest
+
+BACKEND = os.path.join(os.path.dirname(__file__), "..", "..")
+
+# Top-level names each copy may define differently, or only in one service
+SERVICE_SPECIFIC = {
+    "metrics.py": {"metrics"},
+    # The LLM service also tracks the current request's trace across awaits
+    "tracing.py": {"_create_tracer", "_current_trace", "current_trace", "set_current_trace", "reset_current_trace"},
+}
+
+
+def shared_definitions(path: str, skip: set) -> dict:
+    """Top-level classes, functions and assignments of a module, by name, as AST dumps."""
+    with open(path) as f:
+        tree = ast.parse(f.read())
+    definitions = {}
+    for node in tree.body:
+        if isinstance(node, (ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)):
+            names = [node.name]
+        elif isinstance(node, (ast.Assign, ast.AnnAssign)):
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            names = [t.id for t in targets if isinstance(t, ast.Name)]
+        else:
+            continue
+        for name in names:
+            if name not in skip:
+                definitions[name] = ast.dump(node)
+    return definitions
+
+
+@pytest.mark.parametrize("module", sorted(SERVICE_SPECIFIC))
+def test_copies_match(module):
+    """Test both services' copies of a shared module define the same code."""
+    media = os.path.join(BACKEND, "media_pipe_service", "app", module)
+    llm = os.path.join(BACKEND, "llm_service", "app", module)
+    if not os.path.exists(llm):
+        pytest.skip("llm_service is not checked out alongside this service")
+    
+    skip = SERVICE_SPECIFIC[module]
+    media_definitions = shared_definitions(media, skip)
+    llm_definitions = shared_definitions(llm, skip)
+    
+    assert sorted(media_definitions) == sorted(llm_definitions)
+    differing = [name for name in media_definitions if media_definitions[name] != llm_definitions[name]]
+    assert differing == [], f"{module} differs between services in: {differing}"
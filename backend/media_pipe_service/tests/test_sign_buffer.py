@@ -101,3 +101,34 @@ class TestSignBuffer:
         stats = self.buffer.get_session_stats(self.session_id)
         assert stats["signs_count"] == 2
         assert stats["unique_signs"] == 2
+    
+    def test_per_hand_debounce(self):
+        """Test each hand is debounced on its own stream."""
+        assert self.buffer.add_sign(self.session_id, "A", 0.9, hand="Left")
+        assert self.buffer.add_sign(self.session_id, "B", 0.9, hand="Right")
+        assert not self.buffer.add_sign(self.session_id, "A", 0.9, hand="Left")
+        assert not self.buffer.add_sign(self.session_id, "B", 0.9, hand="Right")
+        
+        assert self.buffer.get_sequence(self.session_id) == ["A", "B"]
+        assert self.buffer.get_session_stats(self.session_id)["hands"] == ["Left", "Right"]
+    
+    def test_commit_resets_hand_streams(self):
+        """Test committing clears per-hand debounce state."""
+        self.buffer.add_sign(self.session_id, "PLAY", 0.9, now=100.0, hand="both")
+        self.buffer.add_sign(self.session_id, "A", 0.9, now=100.1, hand="Right")
+        self.buffer.commit_sequence(self.session_id)
+        
+        assert self.buffer.add_sign(self.session_id, "PLAY", 0.9, now=100.2, hand="both")
+    
+    def test_motion_sign_replaces_hand_shape(self):
+        """Test a motion sign replaces the static sign its hand shape was read as."""
+        self.buffer.add_sign(self.session_id, "A", 0.9, now=100.0)
+        self.buffer.add_sign(self.session_id, "I", 0.9, now=101.0)
+        
+        assert self.buffer.add_sign(self.session_id, "J", 0.9, now=101.8, replaces="I")
+        # The hand still shows I right after the motion
+        assert not self.buffer.add_sign(self.session_id, "I", 0.9, now=101.9)
+        assert not self.buffer.add_sign(self.session_id, "I", 0.9, now=102.3)
+        
+        assert self.buffer.get_sequence(self.session_id) == ["A", "J"]
+        assert self.buffer.get_session_stats(self.session_id)["unique_signs"] == 2
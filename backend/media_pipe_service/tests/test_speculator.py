@@ -0,0 +1,107 @@
+"""Tests for Speculator."""
+
+import asyncio
+
+from app.services.sign_buffer import SignBuffer
+from app.services.speculator import Speculator
+
+
+class TestSpeculator:
+    """Test cases for Speculator."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.buffer = SignBuffer()
+        self.buffer.timeout_ms = 2000
+        self.buffer.min_sequence_length = 2
+        self.speculator = Speculator(enabled=True, stable_ms=500, min_length=2)
+        self.session_id = "test-session"
+    
+    def add(self, sign, now):
+        return self.buffer.add_sign(self.session_id, sign, 0.9, now=now)
+    
+    def test_speculates_once_stable(self):
+        """Test the sequence is sent once after it stops changing, not before."""
+        self.add("H", 0.0)
+        self.add("I", 0.4)
+        
+        assert self.speculator.due(self.buffer, self.session_id, now=0.6) is None
+        assert self.speculator.due(self.buffer, self.session_id, now=1.0) == ["H", "I"]
+        assert self.speculator.due(self.buffer, self.session_id, now=1.5) is None
+        assert self.speculator.speculated == 1
+    
+    def test_too_short_is_not_speculated(self):
+        """Test sequences shorter than the commit minimum are not sent."""
+        self.add("H", 0.0)
+        
+        assert self.speculator.due(self.buffer, self.session_id, now=5.0) is None
+    
+    def test_new_sign_diverges(self):
+        """Test a sign after speculating cancels it, and the longer sequence is sent in turn."""
+        self.add("H", 0.0)
+        self.add("I", 0.4)
+        self.speculator.due(self.buffer, self.session_id, now=1.0)
+        
+        self.add("M", 1.2)
+        assert self.speculator.sign_added(self.session_id)
+        assert not self.speculator.sign_added(self.session_id)
+        
+        assert self.speculator.due(self.buffer, self.session_id, now=1.8) == ["H", "I", "M"]
+        assert self.speculator.diverged == 1
+    
+    def test_commit_matches_speculation(self):
+        """Test the committed sequence is recognized as the speculated one."""
+        self.add("H", 0.0)
+        self.add("I", 0.4)
+        self.speculator.due(self.buffer, self.session_id, now=1.0)
+        
+        assert self.buffer.should_commit(self.session_id, now=2.5)
+        sequence = self.buffer.commit_sequence(self.session_id)
+        
+        assert self.speculator.committed(self.session_id, sequence)
+        assert len(self.speculator) == 0
+        assert self.speculator.matched == 1
+    
+    def test_disabled(self):
+        """Test nothing is sent when speculation is off."""
+        speculator = Speculator(enabled=False)
+        self.add("H", 0.0)
+        self.add("I", 0.4)
+        
+        assert speculator.due(self.buffer, self.session_id, now=5.0) is None
+    
+    def test_calls_run_in_order(self):
+        """Test a cancel queued behind a slower speculation call is not sent before it."""
+        sent = []
+        
+        async def call(name, delay):
+            await asyncio.sleep(delay)
+            sent.append(name)
+        
+        async def scenario():
+            post = self.speculator.queue_call(self.session_id, call("post", 0.05), asyncio.create_task)
+            delete = self.speculator.queue_call(self.session_id, call("delete", 0), asyncio.create_task)
+            other = self.speculator.queue_call("other-session", call("other", 0), asyncio.create_task)
+            await asyncio.gather(post, delete, other)
+        
+        asyncio.run(scenario())
+        
+        assert sent == ["other", "post", "delete"]
+        assert self.speculator.calls == {}
+    
+    def test_cancelled_call_does_not_block_the_next(self):
+        """Test a call still runs after the one before it was cancelled."""
+        sent = []
+        
+        async def call(name):
+            await asyncio.sleep(0.01)
+            sent.append(name)
+        
+        async def scenario():
+            first = self.speculator.queue_call(self.session_id, call("first"), asyncio.create_task)
+            first.cancel()
+            await self.speculator.queue_call(self.session_id, call("second"), asyncio.create_task)
+        
+        asyncio.run(scenario())
+        
+        assert sent == ["second"]
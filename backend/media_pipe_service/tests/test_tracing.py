@@ -0,0 +1,99 @@
+"""Tests for request tracing."""
+
+import pytest
+from app.tracing import Tracer, NOOP_TRACE, parse_traceparent
+
+
+class RecordingTracer(Tracer):
+    """Tracer that keeps exported traces in memory."""
+    
+    def __init__(self, **kwargs):
+        super().__init__("test", enabled=True, **kwargs)
+        self.exported = []
+    
+    def export(self, trace):
+        self.exported.append(trace)
+
+
+class TestTracing:
+    """Test cases for tracing."""
+    
+    def test_disabled_returns_noop(self):
+        """Test that a disabled tracer does not allocate traces."""
+        tracer = Tracer("test", enabled=False)
+        assert tracer.start_trace("frame") is NOOP_TRACE
+    
+    def test_unsampled_returns_noop(self):
+        """Test that sample ratio 0 skips tracing."""
+        tracer = RecordingTracer(sample_ratio=0.0)
+        trace = tracer.start_trace("frame")
+        
+        assert trace is NOOP_TRACE
+        with trace.span("detect"):
+            pass
+        trace.release()
+        assert tracer.exported == []
+    
+    def test_noop_span_discards_writes(self):
+        """Test attributes set on the shared unsampled span do not accumulate."""
+        with NOOP_TRACE.span("detect") as span:
+            span.set_attribute("hand_detected", True)
+            span.attributes["cached"] = True
+            span.end()
+        
+        assert NOOP_TRACE.start_span("classify").attributes == {}
+    
+    def test_spans_exported_on_release(self):
+        """Test that child spans are exported with the root."""
+        tracer = RecordingTracer(sample_ratio=1.0)
+        trace = tracer.start_trace("frame", session_id="s1")
+        with trace.span("detect"):
+            pass
+        trace.release()
+        
+        assert len(tracer.exported) == 1
+        names = [span.name for span in tracer.exported[0].spans]
+        assert names == ["frame", "detect"]
+        assert all(span.end_ns >= span.start_ns for span in tracer.exported[0].spans)
+    
+    def test_acquire_delays_export(self):
+        """Test that outstanding references keep the trace open."""
+        tracer = RecordingTracer(sample_ratio=1.0)
+        trace = tracer.start_trace("frame")
+        held = trace.acquire()
+        
+        trace.release()
+        assert tracer.exported == []
+        held.release()
+        assert len(tracer.exported) == 1
+    
+    def test_traceparent_roundtrip(self):
+        """Test W3C traceparent propagation."""
+        tracer = RecordingTracer(sample_ratio=1.0)
+        trace = tracer.start_trace("frame")
+        header = trace.headers()["traceparent"]
+        
+        trace_id, parent_id, sampled = parse_traceparent(header)
+        assert trace_id == trace.trace_id
+        assert parent_id == trace.root.span_id
+        assert sampled is True
+        
+        child = tracer.start_trace("request", traceparent=header)
+        assert child.trace_id == trace.trace_id
+        assert child.root.parent_id == trace.root.span_id
+    
+    def test_invalid_traceparent(self):
+        """Test that malformed headers are ignored."""
+        assert parse_traceparent("garbage") is None
+        assert parse_traceparent(None) is None
+    
+    def test_otlp_span_format(self):
+        """Test OTLP/JSON span conversion."""
+        tracer = RecordingTracer(sample_ratio=1.0)
+        trace = tracer.start_trace("frame", hand_detected=True, signs=3)
+        trace.release()
+        
+        span = trace.root.to_otlp()
+        assert span["traceId"] == trace.trace_id
+        assert {"key": "signs", "value": {"intValue": "3"}} in span["attributes"]
+        assert {"key": "hand_detected", "value": {"boolValue": True}} in span["attributes"]
@@ -0,0 +1,150 @@
+"""Tests for TrajectoryBuffer and MotionClassifier."""
+
+import math
+
+import numpy as np
+
+from app.models.motion_classifier import MotionClassifier
+from app.services.trajectory_buffer import TrajectoryBuffer, PointTrack
+
+
+def make_hand(offset_x=0.0, offset_y=0.0):
+    """Hand with its wrist at (0.5, 0.5) shifted by the offset; hand size 0.1."""
+    hand = np.zeros((21, 3), dtype=np.float32)
+    hand[:, 0] = 0.5 + offset_x
+    hand[:, 1] = 0.4 + offset_y
+    hand[0] = (0.5 + offset_x, 0.5 + offset_y, 0.0)
+    return hand
+
+
+def path(directions, step=0.03):
+    """Offsets of a hand moved ``step`` per frame in each direction (degrees)."""
+    x, y = 0.0, 0.0
+    offsets = [(x, y)]
+    for degrees in directions:
+        x += step * math.cos(math.radians(degrees))
+        y += step * math.sin(math.radians(degrees))
+        offsets.append((x, y))
+    return offsets
+
+
+def reference_turns(points, min_step):
+    """Per-step turns recomputed over the whole point history."""
+    turns, direction = [], None
+    for (x0, y0), (x1, y1) in zip(points, points[1:]):
+        turn = 0.0
+        if math.hypot(x1 - x0, y1 - y0) >= min_step:
+            new_direction = math.atan2(y1 - y0, x1 - x0)
+            if direction is not None:
+                turn = (new_direction - direction + math.pi) % (2 * math.pi) - math.pi
+            direction = new_direction
+        turns.append(turn)
+    return turns
+
+
+class TestTrajectoryBuffer:
+    """Test cases for TrajectoryBuffer."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.buffer = TrajectoryBuffer(window=10, min_step=0.05)
+        self.classifier = MotionClassifier()
+    
+    def push_path(self, offsets, shape, session_id="s1"):
+        trajectory = None
+        for i, (x, y) in enumerate(offsets):
+            hand = make_hand(x, y)
+            trajectory = self.buffer.push(session_id, hand, hand - hand[0], shape, i / 30)
+        return trajectory
+    
+    def test_incremental_features_match_recompute(self):
+        """Test running sums equal features recomputed over the window."""
+        rng = np.random.default_rng(0)
+        points = rng.uniform(0, 5, size=(50, 2)).tolist()
+        track = PointTrack(window=10, min_step=0.05, sharp_turn=math.radians(100))
+        
+        for x, y in points:
+            track.push(x, y)
+        features = track.features(duration=1.0)
+        
+        window = points[-10:]
+        expected_path = sum(math.dist(a, b) for a, b in zip(window, window[1:]))
+        expected_turns = reference_turns(points, 0.05)[-9:]
+        assert math.isclose(features["path_length"], expected_path, rel_tol=1e-9)
+        assert math.isclose(features["turning"], sum(expected_turns), abs_tol=1e-9)
+        assert features["sharp_turns"] == sum(abs(t) >= math.radians(100) for t in expected_turns)
+        assert features["sharp_turns_cw"] == sum(t >= math.radians(100) for t in expected_turns)
+        assert features["dx"] == window[-1][0] - window[0][0]
+    
+    def test_old_frames_are_evicted(self):
+        """Test the window only keeps the latest frames and their turns."""
+        zigzag = path([0, 135, 0, 135, 0])
+        self.push_path(zigzag, "1")
+        trajectory = self.push_path([zigzag[-1]] * 10, "1")
+        
+        features = trajectory.tracks[8].features(1.0)
+        assert trajectory.count == 10
+        assert len(trajectory.tracks[8].points) == 10
+        assert features["sharp_turns"] == 0
+        assert math.isclose(features["path_length"], 0.0, abs_tol=1e-6)
+        assert trajectory.shape_counts["1"] == 10
+    
+    def test_window_landmarks_oldest_first(self):
+        """Test the ring is returned in frame order once it wraps."""
+        self.push_path(path([0] * 12), None)
+        
+        window = self.buffer.window_landmarks("s1")
+        
+        assert window.shape == (10, 21, 3)
+        assert self.buffer.window_landmarks("missing") is None
+    
+    def test_features_scale_with_hand_size(self):
+        """Test distances are measured in hand sizes, not frame units."""
+        trajectory = self.push_path(path([0] * 5), None)
+        
+        # 5 steps of 0.03 with a hand size of 0.1
+        assert math.isclose(trajectory.tracks[8].features(1.0)["path_length"], 1.5, rel_tol=1e-5)
+    
+    def test_recognizes_j(self):
+        """Test an I hand moving down then hooking round is a J."""
+        trajectory = self.push_path(path([90] * 5 + [112.5, 135, 157.5, 180]), "I")
+        
+        sign, confidence = self.classifier.classify(trajectory)
+        
+        assert sign == "J"
+        assert confidence >= 0.7
+    
+    def test_recognizes_z(self):
+        """Test a 1 hand drawing a zigzag is a Z."""
+        trajectory = self.push_path(path([0, 0, 0, 135, 135, 135, 0, 0, 0]), "1")
+        
+        assert self.classifier.classify(trajectory)[0] == "Z"
+    
+    def test_same_way_turns_are_not_z(self):
+        """Test two sharp turns in the same direction are not a Z."""
+        trajectory = self.push_path(path([0, 0, 0, 135, 135, 135, 270, 270, 270]), "1")
+        
+        assert trajectory.tracks[8].features(1.0)["sharp_turns"] == 2
+        assert self.classifier.classify(trajectory) == (None, 0.0)
+    
+    def test_static_hand_is_not_a_motion_sign(self):
+        """Test a hand held still is left to the static classifier."""
+        trajectory = self.push_path([(0.0, 0.0)] * 10, "I")
+        
+        assert self.classifier.classify(trajectory) == (None, 0.0)
+    
+    def test_motion_needs_hand_shape(self):
+        """Test a zigzag with the wrong hand shape is not a Z."""
+        trajectory = self.push_path(path([0, 0, 0, 135, 135, 135, 0, 0, 0]), "5")
+        
+        assert self.classifier.classify(trajectory) == (None, 0.0)
+    
+    def test_clear_session(self):
+        """Test sessions are counted and can be dropped."""
+        self.push_path(path([0] * 3), None, session_id="a")
+        self.push_path(path([0] * 3), None, session_id="b")
+        
+        self.buffer.clear_session("a")
+        
+        assert len(self.buffer) == 1
+        assert self.buffer.get_stats()["sessions"] == 1